@@ -1,5 +1,5 @@
 import config
-import requests
+from services.http_client import get_http_client
 
 def refine_address_for_search(raw_address: str) -> str:
     """
@@ -64,7 +64,7 @@ def get_coordinates_from_address_enhanced(address: str) -> dict:
     for i, strategy in enumerate(search_strategies):
         try:
             params = {"query": strategy['query'], "size": 1}
-            response = requests.get(strategy['url'], headers=headers, params=params, timeout=10)
+            response = get_http_client("kakao_local").get(strategy['url'], headers=headers, params=params, timeout=10)
             response.raise_for_status()
             
             data = response.json()
@@ -11,6 +11,11 @@ from LLM.llm_sub_def import preprocess_with_sector_data
 import google.generativeai as genai
 from google.api_core import exceptions as google_exceptions
 import json
+import atexit
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timezone, timedelta # datetime 임포트 추가
 from optimizer.engine import run_optimization
 
@@ -226,6 +231,193 @@ def _ensure_route_distance_fields(optimization_result: dict) -> dict:
     return optimization_result
 
 
+def _process_single_run(i: int, total_runs: int, run_id: str, run_item: dict, vehicle_ids: list) -> dict:
+    """
+    Run 1건 파이프라인: DB 저장 → 최적화 엔진 → LLM 비교 분석.
+    프로세스 풀 워커에서 실행되므로 모듈 최상위 함수로 두고, 예외는 모두 결과 dict로 변환합니다.
+    (한 Run의 실패가 다른 Run에 영향을 주지 않도록)
+    """
+    conn = None
+
+    try:
+        # ⭐ [추가] 10-1. 좌표 유효성 검사 (DB 저장 전)
+        if not run_item.get('depot_lat') or not run_item.get('depot_lon'):
+            raise ValueError(f"출발지 '{run_item.get('depot_address')}'의 좌표를 찾을 수 없습니다. (Geocoding 실패)")
+
+        jobs_data = run_item.get('jobs', [])
+        if not jobs_data:
+            raise ValueError(f"Jobs가 없습니다. (run index: {i})")
+
+        # ⭐ [추가] 10-1. Job 좌표 유효성 검사
+        for job in jobs_data:
+            if not job.get('lat') or not job.get('lon'):
+                raise ValueError(f"도착지 '{job.get('address')}'의 좌표를 찾을 수 없습니다. (Geocoding 실패)")
+
+        conn = get_db_connection()
+        cursor = conn.cursor()
+
+        # --- 1. RUNS 테이블에 저장 ---
+        run_date_str = run_item.get('run_date')
+        if not run_date_str:
+            raise ValueError(f"run_date가 없습니다. (run index: {i})")
+
+        run_params = {
+            "run_id": run_id,
+            "run_date_str": run_date_str,
+            "depot_lat": run_item.get('depot_lat'),
+            "depot_lon": run_item.get('depot_lon'),
+            "natural_language_input": run_item.get('natural_language_input'),
+            "optimization_status": "ANALYZED",
+        }
+        save_run(cursor, run_params)
+
+        # --- 2. 해당 RUN에 속한 JOBS 저장 ---
+        jobs_data = run_item.get('jobs', [])
+        if not jobs_data:
+            raise ValueError(f"Jobs가 없습니다. (run index: {i})")
+
+        for job in jobs_data:
+            job_params = {
+                "run_id": run_id, # ⬅️ 이 Run에 종속된 ID 사용
+                "run_date_str": run_date_str,
+                "sector_id": job.get('sector_id'),
+                "address": job.get('resolved_address', job['address']),
+                "lat": job.get('lat'),
+                "lon": job.get('lon'),
+                "demand_kg": job.get('demand_kg'),
+                "tw_start": job.get('tw_start'), 
+                "tw_end": job.get('tw_end')
+            }
+            save_job(cursor, job_params)
+
+        conn.commit() # 1. 이 Run의 DB 저장 완료
+
+        # --- 2. 최적화 엔진 실행 ---
+        print(f"▶ (Run {i+1}/{total_runs}) 1단계 (DB 저장) 완료. 2단계 (최적화 엔진) 호출 시작 (Run ID: {run_id})")
+        optimization_result = run_optimization(run_id, vehicle_ids)
+        optimization_result = _ensure_route_distance_fields(optimization_result)
+
+        if optimization_result.get("status") != "success":
+            raise Exception(f"최적화 엔진 실행 실패: {optimization_result.get('message', '알 수 없는 오류')}")
+
+        # --- 3. LLM 비교 분석 실행 ---
+        print(f"▶ (Run {i+1}/{total_runs}) 2단계 (최적화 엔진) 완료. 3단계 (LLM 분석) 호출 시작 (Run ID: {run_id})")
+        llm_explanation_text = generate_route_comparison_explanation(run_id)
+
+        # --- 4. 이 Run의 결과 저장 ---
+        return {
+            "status": "success",
+            "run_id": run_id,
+            "optimization_result": optimization_result,
+            "llm_explanation": llm_explanation_text
+        }
+
+    except Exception as e:
+        if conn: conn.rollback()
+        print(f"❌ Run ID {run_id} 처리 중 오류 발생: {e}")
+        return {
+            "status": "failed",
+            "run_id": run_id,
+            "message": str(e),
+            "llm_explanation": None # ⬅️ 실패 시에도 필드를 맞춰줍니다.
+        }
+    finally:
+        if conn:
+            conn.close()
+
+
+# --- 멀티 Run 배치: 프로세스 풀 병렬 실행 ---
+# OR-Tools 콜백이 GIL을 잡고 있어 스레드로는 병렬화가 되지 않으므로 프로세스 풀을 사용합니다.
+# oracledb 세션 풀/HTTP 세션은 fork 안전하지 않으므로 spawn 컨텍스트로 워커를 띄웁니다.
+_run_executor = None
+_run_executor_lock = threading.Lock()
+
+
+def _get_run_executor() -> ProcessPoolExecutor:
+    """워커 기동 비용(모듈 import)을 매 요청마다 치르지 않도록 풀을 재사용합니다."""
+    global _run_executor
+    if _run_executor is None:
+        with _run_executor_lock:
+            if _run_executor is None:
+                max_workers = max(1, int(getattr(config, "LLM_RUN_MAX_WORKERS", 4)))
+                _run_executor = ProcessPoolExecutor(
+                    max_workers=max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+                print(f"✅ Run 배치 프로세스 풀 생성 (max_workers={max_workers})")
+    return _run_executor
+
+
+def _reset_run_executor() -> None:
+    """워커 프로세스가 비정상 종료되어 풀이 깨진 경우 다음 요청에서 새로 만들도록 합니다."""
+    global _run_executor
+    with _run_executor_lock:
+        if _run_executor is not None:
+            _run_executor.shutdown(wait=False, cancel_futures=True)
+            _run_executor = None
+
+
+@atexit.register
+def _shutdown_run_executor() -> None:
+    if _run_executor is not None:
+        _run_executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _run_batch_in_process_pool(runs_data: list, run_ids: list, vehicle_ids: list) -> list:
+    """
+    Run 목록을 프로세스 풀에 분배하고, 입력 순서(run index)대로 결과를 돌려줍니다.
+    - 동시 실행 수는 LLM_RUN_MAX_WORKERS로 제한
+    - Run 1건이거나 워커 수가 1이면 현재 프로세스에서 순차 실행 (프로세스 기동 비용 회피)
+    - 워커 크래시 등 future 자체가 실패해도 해당 Run만 failed로 기록
+    """
+    total_runs = len(runs_data)
+    max_workers = max(1, int(getattr(config, "LLM_RUN_MAX_WORKERS", 4)))
+    if total_runs <= 1 or max_workers <= 1:
+        return [
+            _process_single_run(i, total_runs, run_ids[i], run_item, vehicle_ids)
+            for i, run_item in enumerate(runs_data)
+        ]
+
+    results = [None] * total_runs
+    started = time.perf_counter()
+    executor = _get_run_executor()
+    futures = {}
+    try:
+        for i, run_item in enumerate(runs_data):
+            future = executor.submit(_process_single_run, i, total_runs, run_ids[i], run_item, vehicle_ids)
+            futures[future] = i
+    except BrokenProcessPool as e:
+        print(f"❌ Run 배치 프로세스 풀 오류 (제출 단계): {e}")
+        _reset_run_executor()
+
+    for future in as_completed(futures):
+        i = futures[future]
+        try:
+            results[i] = future.result()
+        except Exception as e:
+            print(f"❌ Run ID {run_ids[i]} 워커 실행 오류: {e}")
+            results[i] = {
+                "status": "failed",
+                "run_id": run_ids[i],
+                "message": f"워커 프로세스 오류: {e}",
+                "llm_explanation": None,
+            }
+            if isinstance(e, BrokenProcessPool):
+                _reset_run_executor()
+
+    for i in range(total_runs):
+        if results[i] is None:
+            results[i] = {
+                "status": "failed",
+                "run_id": run_ids[i],
+                "message": "워커 프로세스에 제출하지 못했습니다.",
+                "llm_explanation": None,
+            }
+
+    print(f"⏱️ Run {total_runs}건 병렬 처리 완료 ({time.perf_counter() - started:.2f}s, workers={max_workers})")
+    return results
+
+
 @llm_bp.route('/api/save-plan-and-analyze', methods=['POST'])
 def save_plan_and_analyze():
     if request.method == 'OPTIONS':
@@ -237,9 +429,6 @@ def save_plan_and_analyze():
     if not plan_data:
         return jsonify({"error": "계획 데이터(JSON)가 필요합니다."}), 400
     
-    # ⭐ [수정] 모든 Run의 결과를 담을 리스트
-    all_run_results = []
-    
     # 공통 차량 ID (루프 밖에서 한 번만 가져옴)
     vehicle_ids = plan_data.get('vehicles', [])
     if not vehicle_ids:
@@ -250,95 +439,10 @@ def save_plan_and_analyze():
     if not runs_data:
         return jsonify({"error": "JSON에 'runs' 데이터가 없습니다."}), 400
     
-    for i, run_item in enumerate(runs_data):
-        conn = None
-        run_id = f"RUN_{datetime.now().strftime('%Y%m%d_%H%M')}_{i}"
-        
-        try:
-            # ⭐ [추가] 10-1. 좌표 유효성 검사 (DB 저장 전)
-            if not run_item.get('depot_lat') or not run_item.get('depot_lon'):
-                raise ValueError(f"출발지 '{run_item.get('depot_address')}'의 좌표를 찾을 수 없습니다. (Geocoding 실패)")
-
-            jobs_data = run_item.get('jobs', [])
-            if not jobs_data:
-                raise ValueError(f"Jobs가 없습니다. (run index: {i})")
-
-            # ⭐ [추가] 10-1. Job 좌표 유효성 검사
-            for job in jobs_data:
-                if not job.get('lat') or not job.get('lon'):
-                    raise ValueError(f"도착지 '{job.get('address')}'의 좌표를 찾을 수 없습니다. (Geocoding 실패)")
-                
-            conn = get_db_connection()
-            cursor = conn.cursor()
-
-            # --- 1. RUNS 테이블에 저장 ---
-            run_date_str = run_item.get('run_date')
-            if not run_date_str:
-                raise ValueError(f"run_date가 없습니다. (run index: {i})")
-
-            run_params = {
-                "run_id": run_id,
-                "run_date_str": run_date_str,
-                "depot_lat": run_item.get('depot_lat'),
-                "depot_lon": run_item.get('depot_lon'),
-                "natural_language_input": run_item.get('natural_language_input'),
-                "optimization_status": "ANALYZED",
-            }
-            save_run(cursor, run_params)
-
-            # --- 2. 해당 RUN에 속한 JOBS 저장 ---
-            jobs_data = run_item.get('jobs', [])
-            if not jobs_data:
-                raise ValueError(f"Jobs가 없습니다. (run index: {i})")
-
-            for job in jobs_data:
-                job_params = {
-                    "run_id": run_id, # ⬅️ 이 Run에 종속된 ID 사용
-                    "run_date_str": run_date_str,
-                    "sector_id": job.get('sector_id'),
-                    "address": job.get('resolved_address', job['address']),
-                    "lat": job.get('lat'),
-                    "lon": job.get('lon'),
-                    "demand_kg": job.get('demand_kg'),
-                    "tw_start": job.get('tw_start'), 
-                    "tw_end": job.get('tw_end')
-                }
-                save_job(cursor, job_params)
-
-            conn.commit() # 1. 이 Run의 DB 저장 완료
-            
-            # --- 2. 최적화 엔진 실행 ---
-            print(f"▶ (Run {i+1}/{len(runs_data)}) 1단계 (DB 저장) 완료. 2단계 (최적화 엔진) 호출 시작 (Run ID: {run_id})")
-            optimization_result = run_optimization(run_id, vehicle_ids)
-            optimization_result = _ensure_route_distance_fields(optimization_result)
-            
-            if optimization_result.get("status") != "success":
-                raise Exception(f"최적화 엔진 실행 실패: {optimization_result.get('message', '알 수 없는 오류')}")
-
-            # --- 3. LLM 비교 분석 실행 ---
-            print(f"▶ (Run {i+1}/{len(runs_data)}) 2단계 (최적화 엔진) 완료. 3단계 (LLM 분석) 호출 시작 (Run ID: {run_id})")
-            llm_explanation_text = generate_route_comparison_explanation(run_id)
-
-            # --- 4. 이 Run의 결과 저장 ---
-            all_run_results.append({
-                "status": "success",
-                "run_id": run_id,
-                "optimization_result": optimization_result,
-                "llm_explanation": llm_explanation_text
-            })
-
-        except Exception as e:
-            if conn: conn.rollback()
-            print(f"❌ Run ID {run_id} 처리 중 오류 발생: {e}")
-            all_run_results.append({
-                "status": "failed",
-                "run_id": run_id,
-                "message": str(e),
-                "llm_explanation": None # ⬅️ 실패 시에도 필드를 맞춰줍니다.
-            })
-        finally:
-            if conn:
-                conn.close()
+    # Run ID는 입력 순서대로 부모 프로세스에서 미리 확정 (결과 순서도 동일하게 유지)
+    batch_stamp = datetime.now().strftime('%Y%m%d_%H%M')
+    run_ids = [f"RUN_{batch_stamp}_{i}" for i in range(len(runs_data))]
+    all_run_results = _run_batch_in_process_pool(runs_data, run_ids, vehicle_ids)
 
     # --- 최종 결과 반환 (모든 Run 처리 후) ---
     print("✅ 모든 Run 배치 처리 완료.")
@@ -21,11 +21,17 @@ except ImportError as e:
 try:
     from services.db_handler import (
         test_db_connection,
+        get_db_pool_stats,
         get_dashboard_data,
         get_weekly_co2_trend,
         get_vehicle_distance_stats,
+        get_optimizer_input_data,
     )
+    from services.path_data_loader import get_route_cache_stats, get_provider_latency_stats
+    from services.http_client import get_http_client_stats
     from optimizer.engine import run_optimization
+    from services.optimizer import optimize_plan
+    from services.job_queue import get_optimization_job_queue, QueueFullError
 except ImportError as e:
     print(
         f"[FATAL] Failed to import core services: {e}. "
@@ -105,10 +111,157 @@ def db_connection_test_endpoint():
         )
 
 
+@app.route("/api/db-pool", methods=["GET"])
+def db_pool_stats_endpoint():
+    """Oracle connection pool usage statistics."""
+    return jsonify(get_db_pool_stats()), 200
+
+
+@app.route("/api/route-stats", methods=["GET"])
+def route_provider_stats_endpoint():
+    """Route cache hit rates, per-provider latency histograms and HTTP pool reuse."""
+    return (
+        jsonify(
+            {
+                "cache": get_route_cache_stats(),
+                "providers": get_provider_latency_stats(),
+                "http": get_http_client_stats(),
+            }
+        ),
+        200,
+    )
+
+
 # --------------------------------------------------------------------------
 # Optimization main API
 # --------------------------------------------------------------------------
 
+def _parse_optimization_request(data):
+    """Validate the /optimize body and return (run_id, vehicle_ids)."""
+    if not isinstance(data, dict):
+        raise ValueError("Request body must be a valid JSON object.")
+    if "run_id" not in data or "vehicle_ids" not in data:
+        raise ValueError("Fields 'run_id' and 'vehicle_ids' are required.")
+
+    run_id = data["run_id"]
+    vehicle_ids = data["vehicle_ids"]
+    if not isinstance(vehicle_ids, list):
+        raise ValueError("'vehicle_ids' must be a list.")
+    return run_id, vehicle_ids
+
+
+def _parse_solver_options(data):
+    """
+    Validate the optional solver controls of the /optimize body.
+    Returns kwargs for run_optimization(): time_budget_ms (int, ms), quality (fast|balanced|best),
+    portfolio (bool, multi-start solver portfolio) and pareto (bool, extra CO2/time weight combinations).
+    """
+    options = {}
+    if data.get("time_budget_ms") is not None:
+        budget = data["time_budget_ms"]
+        if isinstance(budget, bool) or not isinstance(budget, (int, float)) or budget <= 0:
+            raise ValueError("'time_budget_ms' must be a positive number.")
+        options["time_budget_ms"] = int(budget)
+    if data.get("quality") is not None:
+        quality = str(data["quality"]).lower()
+        if quality not in ("fast", "balanced", "best"):
+            raise ValueError("'quality' must be one of: fast, balanced, best.")
+        options["quality"] = quality
+    if data.get("portfolio") is not None:
+        if not isinstance(data["portfolio"], bool):
+            raise ValueError("'portfolio' must be a boolean.")
+        options["portfolio"] = data["portfolio"]
+    if data.get("pareto") is not None:
+        if not isinstance(data["pareto"], bool):
+            raise ValueError("'pareto' must be a boolean.")
+        options["pareto"] = data["pareto"]
+    return options
+
+
+def _build_optimization_response(optimization_result):
+    """
+    Normalize a run_optimization() result for the frontend.
+    Returns (payload, http_status). Shared by the sync and async (job) paths.
+    """
+    if not isinstance(optimization_result, dict):
+        return (
+            {
+                "status": "failed",
+                "message": "Unexpected optimization_result type.",
+            },
+            500,
+        )
+
+    status = optimization_result.get("status", "unknown")
+    if status == "success":
+        print("[INFO] Optimization successful, building response payload.")
+
+        routes = []
+        for r in optimization_result.get("results", []):
+            summary = r.get("summary") or {}
+            route_distance = float(summary.get("total_distance_km") or 0.0)
+            route_co2_g = float(summary.get("total_co2_g") or 0.0)
+            route_time = float(summary.get("total_time_min") or 0.0)
+
+            route = {
+                "route_name": r.get("route_name"),
+                "summary": summary,
+                "total_distance_km": route_distance,
+                "total_co2_g": route_co2_g,
+                "total_co2_kg": round(route_co2_g / 1000.0, 3),
+                "total_time_min": route_time,
+            }
+            if r.get("pareto"):
+                route["pareto"] = r["pareto"]
+            routes.append(route)
+
+        # Aggregate KPIs using normalized route entries (Pareto alternatives are options, not extra plans)
+        kpi_routes = [route for route in routes if "pareto" not in route]
+        total_distance = sum(route.get("total_distance_km", 0.0) for route in kpi_routes)
+        total_co2_g = sum(route.get("total_co2_g", 0.0) for route in kpi_routes)
+        total_time_min = sum(route.get("total_time_min", 0.0) for route in kpi_routes)
+
+        comparison = optimization_result.get("comparison") or {}
+        kpis = {
+            "total_distance_km": round(total_distance, 2),
+            "total_co2_kg": round(total_co2_g / 1000.0, 3),
+            "total_time_min": round(total_time_min, 2),
+            "saving_percent": comparison.get("co2_saving_pct", 0.0),
+        }
+
+        # Solver controls actually applied + objective trajectory (for tuning time budgets)
+        solver_stats = optimization_result.get("solver_stats") or {}
+        solver = {
+            key: solver_stats.get(key)
+            for key in ("quality", "time_limit_ms", "plateau_sec", "stop_reason",
+                        "solve_time_sec", "objective", "objective_trajectory", "portfolio", "pareto")
+            if key in solver_stats
+        }
+
+        run_history_entry = {
+            "run_id": optimization_result.get("run_id"),
+            "timestamp": datetime.now().isoformat(),
+            "result_summary": routes[0] if routes else None,
+        }
+
+        return (
+            {
+                "status": "success",
+                "routes": routes,
+                "kpis": kpis,
+                "run_history_entry": run_history_entry,
+                "solver": solver,
+            },
+            200,
+        )
+
+    elif status == "warning":
+        print("[WARN] Optimization succeeded with warnings.")
+        return optimization_result, 206
+    else:
+        return optimization_result, 500
+
+
 @app.route("/optimize", methods=["POST"])
 def handle_optimization_request():
     """
@@ -116,100 +269,53 @@ def handle_optimization_request():
     Expected JSON:
     {
         "run_id": "RUN_...",
-        "vehicle_ids": ["TRK01", "TRK02", ...]
+        "vehicle_ids": ["TRK01", "TRK02", ...],
+        "async": false,         # optional; true -> 202 + job_id (poll /api/optimize/<job_id>)
+        "quality": "balanced",  # optional; fast | balanced | best
+        "time_budget_ms": 3000, # optional; overrides the quality tier's solver time limit
+        "portfolio": false,     # optional; race several solver configurations, keep the best
+        "pareto": false         # optional; also solve PARETO_WEIGHTS, return non-dominated plans as extra routes
     }
+    Solver search also stops early once the objective stops improving;
+    the achieved trajectory is returned under "solver".
     """
     print("[INFO] Received optimization request...")
     try:
         data = request.get_json()
-        if not isinstance(data, dict):
-            raise ValueError("Request body must be a valid JSON object.")
-        if "run_id" not in data or "vehicle_ids" not in data:
-            raise ValueError("Fields 'run_id' and 'vehicle_ids' are required.")
-
-        run_id = data["run_id"]
-        vehicle_ids = data["vehicle_ids"]
-        if not isinstance(vehicle_ids, list):
-            raise ValueError("'vehicle_ids' must be a list.")
+        run_id, vehicle_ids = _parse_optimization_request(data)
+        solver_options = _parse_solver_options(data)
 
         print(f"[INFO] Run ID: {run_id}, Vehicles: {vehicle_ids}")
 
-        # Call optimization engine (run_optimization defined in optimizer/engine.py)
-        optimization_result = run_optimization(run_id, vehicle_ids)
-
-        # Normalize response for frontend
-        if isinstance(optimization_result, dict):
-            status = optimization_result.get("status", "unknown")
-            if status == "success":
-                print("[INFO] Optimization successful, building response payload.")
-
-                routes = []
-                for r in optimization_result.get("results", []):
-                    summary = r.get("summary") or {}
-                    route_distance = float(summary.get("total_distance_km") or 0.0)
-                    route_co2_g = float(summary.get("total_co2_g") or 0.0)
-                    route_time = float(summary.get("total_time_min") or 0.0)
-
-                    routes.append(
-                        {
-                            "route_name": r.get("route_name"),
-                            "summary": summary,
-                            "total_distance_km": route_distance,
-                            "total_co2_g": route_co2_g,
-                            "total_co2_kg": round(route_co2_g / 1000.0, 3),
-                            "total_time_min": route_time,
-                        }
-                    )
-
-                # Aggregate KPIs using normalized route entries
-                total_distance = sum(route.get("total_distance_km", 0.0) for route in routes)
-                total_co2_g = sum(route.get("total_co2_g", 0.0) for route in routes)
-                total_time_min = sum(route.get("total_time_min", 0.0) for route in routes)
-
-                comparison = optimization_result.get("comparison") or {}
-                kpis = {
-                    "total_distance_km": round(total_distance, 2),
-                    "total_co2_kg": round(total_co2_g / 1000.0, 3),
-                    "total_time_min": round(total_time_min, 2),
-                    "saving_percent": comparison.get("co2_saving_pct", 0.0),
-                }
-
-                run_history_entry = {
-                    "run_id": optimization_result.get("run_id"),
-                    "timestamp": datetime.now().isoformat(),
-                    "result_summary": routes[0] if routes else None,
-                }
-
-                return (
-                    jsonify(
-                        {
-                            "status": "success",
-                            "routes": routes,
-                            "kpis": kpis,
-                            "run_history_entry": run_history_entry,
-                        }
-                    ),
-                    200,
-                )
-
-            elif status == "warning":
-                print("[WARN] Optimization succeeded with warnings.")
-                return jsonify(optimization_result), 206
-            else:
-                return jsonify(optimization_result), 500
-        else:
+        # Async mode: enqueue and return immediately
+        if bool(data.get("async", False)):
+            job = get_optimization_job_queue().submit(run_id, vehicle_ids, solver_options=solver_options)
+            print(f"[INFO] Optimization job queued: {job['job_id']} (queue depth {job['queue_depth_at_submit']})")
             return (
                 jsonify(
                     {
-                        "status": "failed",
-                        "message": "Unexpected optimization_result type.",
+                        "status": "accepted",
+                        "job_id": job["job_id"],
+                        "run_id": run_id,
+                        "job_status": job["status"],
+                        "queue_depth": job["queue_depth_at_submit"],
+                        "status_url": f"/api/optimize/{job['job_id']}",
                     }
                 ),
-                500,
+                202,
             )
 
+        # Call optimization engine (run_optimization defined in optimizer/engine.py)
+        optimization_result = run_optimization(run_id, vehicle_ids, **solver_options)
+
+        # Normalize response for frontend
+        payload, http_status = _build_optimization_response(optimization_result)
+        return jsonify(payload), http_status
+
     except ValueError as ve:
         return jsonify({"status": "failed", "message": f"Invalid request: {ve}"}), 400
+    except QueueFullError as qf_err:
+        return jsonify({"status": "failed", "message": str(qf_err)}), 503
     except Exception as e:
         error_details = traceback.format_exc()
         print(f"[ERROR] Internal server error during /optimize:\n{error_details}")
@@ -233,6 +339,58 @@ app.add_url_rule(
 )
 
 
+@app.route("/api/optimize/<job_id>", methods=["GET"])
+def get_optimization_job_status(job_id):
+    """
+    Poll an async optimization job.
+    Returns status/phase/progress and queue timings; once the job has
+    succeeded the normalized optimization response is included under "result".
+    """
+    job = get_optimization_job_queue().get(job_id)
+    if job is None:
+        return jsonify({"status": "failed", "message": f"Unknown job_id: {job_id}"}), 404
+
+    raw_result = job.pop("result", None)
+    if job["status"] == "succeeded":
+        payload, http_status = _build_optimization_response(raw_result)
+        job["result"] = payload
+        job["result_http_status"] = http_status
+    return jsonify(job), 200
+
+
+@app.route("/api/optimize/quote", methods=["POST"])
+def handle_quote_request():
+    """
+    Instant plan (Clarke-Wright + 2-opt/or-opt on haversine distances) for the UI
+    to show while the full engine runs. Same body as /optimize; no routing API calls.
+    """
+    try:
+        run_id, vehicle_ids = _parse_optimization_request(request.get_json())
+        input_data = get_optimizer_input_data(run_id, vehicle_ids)
+        if not input_data.get("depot") or not input_data.get("vehicles"):
+            raise ValueError(f"Run '{run_id}' has no depot or matching vehicles.")
+
+        vehicles = [
+            {"id": v["vehicle_id"], "capacity_kg": v.get("capacity_kg"), "ef_gpkm": v.get("co2_gpkm")}
+            for v in input_data["vehicles"]
+        ]
+        depot = (input_data["depot"]["latitude"], input_data["depot"]["longitude"])
+        plan = optimize_plan(run_id, str(input_data.get("run_date") or ""), vehicles,
+                             input_data.get("jobs", []), {}, depot=depot)
+        return jsonify({"status": "success", "run_id": run_id, **plan}), 200
+    except ValueError as ve:
+        return jsonify({"status": "failed", "message": f"Invalid request: {ve}"}), 400
+    except Exception as e:
+        print(f"[ERROR] /api/optimize/quote failed:\n{traceback.format_exc()}")
+        return jsonify({"status": "failed", "message": f"Quote failed: {e}"}), 500
+
+
+@app.route("/api/optimize-jobs", methods=["GET"])
+def optimization_job_queue_stats():
+    """Job queue depth / wait time / run time statistics."""
+    return jsonify(get_optimization_job_queue().stats()), 200
+
+
 # --------------------------------------------------------------------------
 # Dashboard data APIs
 # --------------------------------------------------------------------------
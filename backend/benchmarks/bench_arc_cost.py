@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+아크 비용 평가 방식 벤치마크: Python 콜백에서 매번 CO2 계산 (기존) vs 사전 계산 정수 행렬.
+행렬 방식은 차량 클래스(동일 VehicleEF)별 행렬 1개 + 차량별 평가기(SetArcCostEvaluatorOfVehicle)를 씁니다.
+동일한 시간 제한 안에서 찾은 해의 목적함수 값과 해 개선 횟수를 비교합니다.
+실행 (backend 디렉토리에서):
+    python -m benchmarks.bench_arc_cost --jobs 40 --vehicles 3 --time-limit 10
+    python -m benchmarks.bench_arc_cost --jobs 60 --vehicles 30 --models 3
+"""
+import argparse
+import time
+
+from ortools.constraint_solver import pywrapcp, routing_enums_pb2
+
+from optimizer.engine import _precompute_arc_matrices, convert_time_window_to_seconds
+from services.co2_calculator import Segment, VehicleEF, co2_for_route
+from benchmarks.synthetic import BENCH_CONG, BENCH_SETTINGS, BENCH_WEATHER, make_input_data, stub_route_matrices
+
+CO2_SCALE_FACTOR = 1000
+
+
+def solve(input_data, segment_data_map, mode: str, time_limit: int):
+    jobs = input_data["jobs"]
+    vehicles = input_data["vehicles"]
+    base_datetime = input_data["run_date"]
+    num_locations = len(jobs) + 1
+    num_vehicles = len(vehicles)
+    total_demand = sum(int(float(j["demand_kg"])) for j in jobs)
+    vehicle_efs = [VehicleEF(v["co2_gpkm"], v["idle_gps"], v["capacity_kg"]) for v in vehicles]
+    co2_w, time_w = BENCH_SETTINGS["ECO_CO2_WEIGHT"], BENCH_SETTINGS["ECO_TIME_WEIGHT"]
+
+    manager = pywrapcp.RoutingIndexManager(num_locations, num_vehicles, [0] * num_vehicles, [0] * num_vehicles)
+    routing = pywrapcp.RoutingModel(manager)
+    evaluations = [0]
+
+    precompute_sec = 0.0
+    if mode == "legacy":
+        def eco_cost(from_index, to_index):
+            evaluations[0] += 1
+            segs = segment_data_map.get((manager.IndexToNode(from_index), manager.IndexToNode(to_index)), [])
+            if not segs:
+                return 0
+            v = vehicle_efs[routing.VehicleIndex(from_index)]   # 시작 노드가 아니면 -1 → 마지막 차량 EF (기존 동작)
+            segments = [Segment(s["distance_km"], s["link_id"], s["base_time_sec"], 0.0, float(total_demand)) for s in segs]
+            r = co2_for_route(segments, v, base_datetime, BENCH_CONG, BENCH_SETTINGS, BENCH_WEATHER)
+            return int(((co2_w * (r["co2_total_g"] / CO2_SCALE_FACTOR)) + (time_w * r["total_time_sec"])) * 1000)
+
+        def transit_time(from_index, to_index):
+            evaluations[0] += 1
+            segs = segment_data_map.get((manager.IndexToNode(from_index), manager.IndexToNode(to_index)), [])
+            if not segs:
+                return 0
+            v = vehicle_efs[routing.VehicleIndex(from_index)]
+            segments = [Segment(s["distance_km"], s["link_id"], s["base_time_sec"]) for s in segs]
+            return int(co2_for_route(segments, v, base_datetime, BENCH_CONG, BENCH_SETTINGS, BENCH_WEATHER)["total_time_sec"])
+
+        cost_indices = [routing.RegisterTransitCallback(eco_cost)]
+        vehicle_class_index = [0] * num_vehicles
+        time_index = routing.RegisterTransitCallback(transit_time)
+    else:
+        class_efs = []
+        for v in vehicle_efs:
+            if v not in class_efs:
+                class_efs.append(v)
+        vehicle_class_index = [class_efs.index(v) for v in vehicle_efs]
+        t0 = time.perf_counter()
+        eco_matrices, time_matrix = _precompute_arc_matrices(
+            num_locations, segment_data_map, class_efs, float(total_demand), base_datetime,
+            BENCH_CONG, BENCH_SETTINGS, BENCH_WEATHER, 0.0, co2_w, time_w, CO2_SCALE_FACTOR
+        )
+        precompute_sec = time.perf_counter() - t0
+        cost_indices = [routing.RegisterTransitMatrix(matrix) for matrix in eco_matrices]
+        time_index = routing.RegisterTransitMatrix(time_matrix)
+
+    demands = [0] + [-int(float(j["demand_kg"])) for j in jobs]
+    demand_index = routing.RegisterUnaryTransitCallback(lambda idx: demands[manager.IndexToNode(idx)])
+    routing.AddDimension(demand_index, 0, int(max(v.capacity_kg for v in vehicle_efs)), False, "Capacity")
+    routing.AddDimension(time_index, 86400, 86400, True, "Time")
+    time_dim = routing.GetDimensionOrDie("Time")
+    cap_dim = routing.GetDimensionOrDie("Capacity")
+    for k, job in enumerate(jobs, start=1):
+        tw = convert_time_window_to_seconds(job.get("tw_start"), job.get("tw_end"), base_datetime)
+        time_dim.CumulVar(manager.NodeToIndex(k)).SetRange(int(tw[0]), int(tw[1]))
+    for v in range(num_vehicles):
+        time_dim.CumulVar(routing.Start(v)).SetRange(0, 0)
+        cap_dim.CumulVar(routing.Start(v)).SetRange(total_demand, total_demand)
+    for v, class_idx in enumerate(vehicle_class_index):
+        routing.SetArcCostEvaluatorOfVehicle(cost_indices[class_idx], v)
+
+    improvements = []
+    started = time.perf_counter()
+    routing.AddAtSolutionCallback(lambda: improvements.append((time.perf_counter() - started, routing.CostVar().Max())))
+
+    params = pywrapcp.DefaultRoutingSearchParameters()
+    params.first_solution_strategy = routing_enums_pb2.FirstSolutionStrategy.PATH_CHEAPEST_ARC
+    params.local_search_metaheuristic = routing_enums_pb2.LocalSearchMetaheuristic.GUIDED_LOCAL_SEARCH
+    params.time_limit.FromSeconds(time_limit)
+    solution = routing.SolveWithParameters(params)
+
+    return {
+        "mode": mode,
+        "objective": solution.ObjectiveValue() if solution else None,
+        "solutions_found": len(improvements),
+        "first_solution_sec": round(improvements[0][0], 3) if improvements else None,
+        "python_evaluations": evaluations[0],
+        "precompute_sec": round(precompute_sec, 3),
+        "cost_evaluators": len(cost_indices),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Python CO2 콜백 vs 사전 계산 행렬 비교")
+    parser.add_argument("--jobs", type=int, default=40)
+    parser.add_argument("--vehicles", type=int, default=3)
+    parser.add_argument("--models", type=int, default=1, help="차량 모델(배출계수) 종류 수")
+    parser.add_argument("--time-limit", type=int, default=10, help="Solve 시간 제한(초), 엔진 기본값 10")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    input_data = make_input_data(args.jobs, args.vehicles, seed=args.seed, vehicle_models=args.models)
+    _, _, segment_data_map = stub_route_matrices([input_data["depot"]] + input_data["jobs"])
+
+    print(f"--- 아크 비용 벤치마크: jobs={args.jobs}, vehicles={args.vehicles}, models={args.models}, limit={args.time_limit}s ---")
+    for mode in ("legacy", "matrix"):
+        result = solve(input_data, segment_data_map, mode, args.time_limit)
+        print(result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+아크 특징 벡터 벤치마크: (차량 × 적재량) 조합마다 co2_for_route_batch로 구간을 다시 계산 vs
+arc_co2_features로 1회 집계 후 co2_from_arc_features로 곱셈·덧셈만 수행.
+조합별 CO2 최대 오차(부동소수점 합산 순서 차이)도 함께 확인합니다.
+실행 (backend 디렉토리에서):
+    python -m benchmarks.bench_arc_features --arcs 5000 --arc-len 100 --loads 8 --vehicles 3
+"""
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.bench_co2_batch import BENCH_CONG, BENCH_SETTINGS, BENCH_WEATHER, make_arcs
+from services.co2_calculator import VehicleEF, arc_co2_features, co2_for_route_batch, co2_from_arc_features
+
+
+def main():
+    parser = argparse.ArgumentParser(description="아크 특징 벡터 vs 구간 재계산 벤치마크")
+    parser.add_argument("--arcs", type=int, default=5000, help="아크 수")
+    parser.add_argument("--arc-len", type=int, default=100, help="아크당 평균 구간 수")
+    parser.add_argument("--loads", type=int, default=8, help="적재량 단계 수")
+    parser.add_argument("--vehicles", type=int, default=3, help="차량 클래스 수")
+    args = parser.parse_args()
+
+    arcs = make_arcs(args.arcs * args.arc_len, args.arc_len)
+    lengths = np.array([len(arc) for arc in arcs], dtype=np.int64)
+    arc_offsets = np.concatenate([[0], np.cumsum(lengths)])
+    flat = [seg for arc in arcs for seg in arc]
+    distance = np.array([f[0] for f in flat])
+    base_time = np.array([f[1] for f in flat])
+    slope = np.array([f[2] for f in flat])
+
+    vehicles = [VehicleEF(ef_gpkm=900.0 + 150.0 * k, idle_gps=9.0 + k, capacity_kg=5000.0 * (k + 1))
+                for k in range(args.vehicles)]
+    loads = np.linspace(0.0, 25000.0, args.loads)
+    print(f"🧮 아크 {len(arcs)}개 / 구간 {len(flat)}개, 차량 {len(vehicles)} × 적재량 {len(loads)} = {len(vehicles) * len(loads)} 조합")
+
+    started = time.perf_counter()
+    batch_results = {}
+    for v_idx, vehicle in enumerate(vehicles):
+        for load in loads:
+            batch_results[(v_idx, load)] = co2_for_route_batch(distance, base_time, slope, load, arc_offsets,
+                                                               vehicle, BENCH_CONG, BENCH_SETTINGS, BENCH_WEATHER)
+    batch_sec = time.perf_counter() - started
+
+    started = time.perf_counter()
+    features = arc_co2_features(distance, base_time, slope, arc_offsets, BENCH_CONG, BENCH_SETTINGS)
+    feature_sec = time.perf_counter() - started
+    started = time.perf_counter()
+    feature_results = {}
+    for v_idx, vehicle in enumerate(vehicles):
+        # 적재량 전체를 (적재량 수, 1)로 브로드캐스트해 한 번에 계산
+        result = co2_from_arc_features(features, vehicle, loads[:, None], BENCH_SETTINGS, BENCH_WEATHER)
+        for l_idx, load in enumerate(loads):
+            feature_results[(v_idx, load)] = {key: values[l_idx] for key, values in result.items()}
+    combine_sec = time.perf_counter() - started
+
+    max_err = 0.0
+    for key, batch in batch_results.items():
+        diff = np.abs(np.round(feature_results[key]["co2_total_g"], 2) - batch["co2_total_g"])
+        max_err = max(max_err, float(diff.max()))
+
+    print(f"   구간 재계산 (co2_for_route_batch × 조합): {batch_sec:.3f}s")
+    print(f"   특징 벡터 집계 1회: {feature_sec:.3f}s + 조합 계산 {combine_sec * 1000:.1f} ms "
+          f"({batch_sec / max(1e-9, feature_sec + combine_sec):.1f}배)")
+    print(f"   CO2 최대 오차 (2자리 반올림 기준): {max_err:.4f} g")
+
+
+if __name__ == "__main__":
+    main()
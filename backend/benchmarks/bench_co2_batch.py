@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+CO2 계산 처리량 벤치마크: co2_for_route (구간 단위 Python 루프) vs co2_for_route_batch (NumPy).
+두 결과가 비트 단위로 동일한지도 함께 검증합니다.
+실행 (backend 디렉토리에서):
+    python -m benchmarks.bench_co2_batch --sizes 1000 10000 100000 1000000
+"""
+import argparse
+import datetime as dt
+import random
+import time
+
+import numpy as np
+
+from services.co2_calculator import Segment, VehicleEF, co2_for_route, co2_for_route_batch
+from benchmarks.synthetic import BENCH_SETTINGS
+
+# 공회전·날씨 항이 결과에 크게 드러나도록 엔진 하니스보다 혼잡/날씨 값을 높게 둠
+BENCH_CONG = {"tf": 1.35, "idle_f": 0.08}
+BENCH_WEATHER = 1.05
+BENCH_VEHICLE = VehicleEF(ef_gpkm=1250.5, idle_gps=11.2, capacity_kg=25000.0)
+KEYS = ("co2_drive_g", "co2_idle_g", "co2_total_g", "total_time_sec")
+
+
+def make_arcs(num_segments: int, mean_arc_len: int, seed: int = 0):
+    """구간 수가 num_segments인 아크 집합 (구간별 거리/시간/경사/적재)을 만듭니다."""
+    rng = random.Random(seed)
+    arcs = []
+    remaining = num_segments
+    while remaining > 0:
+        n = min(remaining, rng.randint(1, 2 * mean_arc_len))
+        load = rng.uniform(0, 30000)
+        arcs.append([
+            (rng.choice([0.0, rng.uniform(0.01, 2.0)]) if rng.random() < 0.02 else rng.uniform(0.01, 2.0),
+             rng.choice([0.0, rng.uniform(1, 400)]) if rng.random() < 0.05 else rng.uniform(1, 400),
+             rng.uniform(-3, 8),
+             load)
+            for _ in range(n)
+        ])
+        remaining -= n
+    return arcs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="co2_for_route vs co2_for_route_batch 처리량 비교")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000, 1000000])
+    parser.add_argument("--arc-len", type=int, default=100, help="아크당 평균 구간 수")
+    args = parser.parse_args()
+
+    start_time = dt.datetime(2025, 10, 15, 8, 0, 0)
+    print(f"{'segments':>10} {'arcs':>8} {'scalar(s)':>10} {'batch(s)':>10} {'speedup':>8} {'Mseg/s':>8}  identical")
+    for size in args.sizes:
+        arcs = make_arcs(size, args.arc_len)
+        flat = [seg for arc in arcs for seg in arc]
+        distance = np.array([f[0] for f in flat])
+        base_time = np.array([f[1] for f in flat])
+        slope = np.array([f[2] for f in flat])
+        load = np.array([f[3] for f in flat])
+        offsets = np.zeros(len(arcs) + 1, dtype=np.int64)
+        np.cumsum([len(a) for a in arcs], out=offsets[1:])
+
+        t0 = time.perf_counter()
+        scalar = [
+            co2_for_route([Segment(d, None, t, sl, ld) for d, t, sl, ld in arc], BENCH_VEHICLE, start_time,
+                          BENCH_CONG, BENCH_SETTINGS, BENCH_WEATHER)
+            for arc in arcs
+        ]
+        scalar_sec = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        batch = co2_for_route_batch(distance, base_time, slope, load, offsets, BENCH_VEHICLE,
+                                    BENCH_CONG, BENCH_SETTINGS, BENCH_WEATHER)
+        batch_sec = time.perf_counter() - t0
+
+        identical = all(
+            batch[key][k] == scalar[k][key] for k in range(len(arcs)) for key in KEYS
+        )
+        print(f"{size:>10} {len(arcs):>8} {scalar_sec:>10.4f} {batch_sec:>10.4f} "
+              f"{scalar_sec / batch_sec:>7.1f}x {size / batch_sec / 1e6:>8.2f}  {identical}")
+
+
+if __name__ == "__main__":
+    main()
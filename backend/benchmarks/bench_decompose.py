@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+분할 풀이 벤치마크: 단일 OR-Tools 모델 vs k-means 클러스터별 하위 VRP(프로세스 풀) + 전역 개선.
+같은 시간 예산(balanced 10초)에서 최종 Eco-Cost, 총 CO2, 풀이 시간을 비교합니다.
+실행 (backend 디렉토리에서):
+    python -m benchmarks.bench_decompose --sizes 150,300 --jobs-per-vehicle 25
+"""
+import argparse
+import math
+
+import optimizer.engine as engine
+from benchmarks.engine_harness import run_engine_instance
+from benchmarks.synthetic import make_input_data
+
+
+def run_case(num_jobs: int, num_vehicles: int, seed: int, decompose: bool):
+    original = engine.DECOMPOSE_ENABLED
+    engine.DECOMPOSE_ENABLED = decompose
+    try:
+        measured = run_engine_instance(make_input_data(num_jobs, num_vehicles, seed=seed),
+                                       run_id=f"RUN_DECOMPOSE_{num_jobs}_{int(decompose)}")
+    finally:
+        engine.DECOMPOSE_ENABLED = original
+    stats = measured["result"].get("solver_stats", {})
+    return {"objective": stats.get("objective"), "solve_time_sec": stats.get("solve_time_sec"),
+            "total_co2_g": measured["total_co2_g"], "feasible": measured["feasible"],
+            "decomposition": stats.get("decomposition")}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="대규모 VRP 분할 풀이 벤치마크")
+    parser.add_argument("--sizes", default="150,300", help="Job 수 목록 (쉼표 구분)")
+    parser.add_argument("--jobs-per-vehicle", type=int, default=25)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for num_jobs in [int(x) for x in args.sizes.split(",") if x.strip()]:
+        num_vehicles = max(2, math.ceil(num_jobs / args.jobs_per_vehicle))
+        print(f"\n🚚 Job {num_jobs}개, 차량 {num_vehicles}대 (분할 기준 {engine.DECOMPOSE_MIN_JOBS}개 이상)")
+        single = run_case(num_jobs, num_vehicles, args.seed, decompose=False)
+        split = run_case(num_jobs, num_vehicles, args.seed, decompose=True)
+        for label, row in (("단일 모델", single), ("분할 풀이", split)):
+            print(f"   {label}: Eco-Cost {row['objective']}, CO2 {row['total_co2_g']} g, "
+                  f"풀이 {row['solve_time_sec']}s, feasible={row['feasible']}")
+        if split["decomposition"]:
+            d = split["decomposition"]
+            print(f"   클러스터 {d.get('clusters')}개 (Job {d.get('cluster_jobs')}, 차량 {d.get('cluster_vehicles')}), "
+                  f"하위 풀이 {d.get('sub_wall_sec')}s / 워커 {d.get('workers')}, 전역 개선 {d.get('polished')}")
+        if single["objective"] and split["objective"]:
+            print(f"   → Eco-Cost {(split['objective'] - single['objective']) / single['objective'] * 100:+.2f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+동일 좌표 위치 병합 벤치마크: 같은 주소의 Job이 섞인 인스턴스에서
+병합 전/후 경로 API 호출 수와 최종 해(총 CO2)를 비교합니다.
+실행 (backend 디렉토리에서):
+    python -m benchmarks.bench_dedupe --jobs 30 --colocated 0.4
+"""
+import argparse
+import math
+
+import services.path_data_loader as path_data_loader
+from benchmarks.engine_harness import run_engine_instance
+from benchmarks.stub_providers import make_stub_kakao_route
+from benchmarks.synthetic import make_input_data
+
+
+def run_case(input_data, dedupe: bool, seed: int):
+    stub = make_stub_kakao_route(latency_sec=0.0, seed=seed)
+    path_data_loader._request_kakao_route = stub
+    path_data_loader.ROUTE_DEDUPE_LOCATIONS = dedupe
+    measured = run_engine_instance(input_data, run_id="RUN_DEDUPE",
+                                   route_matrices=path_data_loader.create_kakao_route_matrices)
+    return stub.calls, measured, measured["result"].get("matrix_stats", {})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="동일 좌표 위치 병합 벤치마크")
+    parser.add_argument("--jobs", type=int, default=30)
+    parser.add_argument("--vehicles", type=int, default=None, help="차량 수 (기본: Job 25개당 1대)")
+    parser.add_argument("--colocated", type=float, default=0.4, help="같은 좌표를 공유하는 Job 비율")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    path_data_loader.ROUTE_CACHE_ENABLED = False
+    path_data_loader.ROUTE_MATRIX_RATE_PER_SEC = 0
+    original_request = path_data_loader._request_kakao_route
+    original_dedupe = path_data_loader.ROUTE_DEDUPE_LOCATIONS
+
+    num_vehicles = args.vehicles or max(1, math.ceil(args.jobs / 25))
+    input_data = make_input_data(args.jobs, num_vehicles, seed=args.seed, colocated_fraction=args.colocated)
+    try:
+        print(f"🚚 Job {args.jobs}개 (동일 좌표 비율 {args.colocated:.0%}), 차량 {num_vehicles}대")
+        for dedupe in (False, True):
+            calls, measured, stats = run_case(input_data, dedupe, args.seed)
+            print(f"   dedupe={dedupe!s:<5}: API {calls:>5}회, 위치 {stats.get('unique_locations')}/{stats.get('nodes')}, "
+                  f"절약 {stats.get('dedupe_pairs_saved', 0)}쌍, CO2 {measured['total_co2_g']} g, "
+                  f"feasible={measured['feasible']}, {measured['wall_time_sec']:.2f}s")
+    finally:
+        path_data_loader._request_kakao_route = original_request
+        path_data_loader.ROUTE_DEDUPE_LOCATIONS = original_dedupe
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+"""
+소규모 단일 차량 VRP 벤치마크: Held-Karp 정확해 vs OR-Tools GLS (정체 조기 종료 포함).
+Job 수별로 여러 시드의 목적함수(Eco-Cost)와 풀이 시간을 비교합니다.
+Held-Karp 목적함수가 OR-Tools보다 크면 정확해가 아니므로 오류로 표시합니다.
+실행 (backend 디렉토리에서):
+    python -m benchmarks.bench_exact --sizes 2,4,6,8,10 --seeds 5
+"""
+import argparse
+import statistics
+
+import optimizer.engine as engine
+from benchmarks.engine_harness import run_engine_instance
+from benchmarks.synthetic import make_input_data
+
+
+def run_case(num_jobs: int, seed: int, exact: bool):
+    original = engine.EXACT_SOLVER_MAX_JOBS
+    engine.EXACT_SOLVER_MAX_JOBS = original if exact else 0
+    try:
+        measured = run_engine_instance(make_input_data(num_jobs, 1, seed=seed),
+                                       run_id=f"RUN_EXACT_{num_jobs}_{seed}_{int(exact)}")
+    finally:
+        engine.EXACT_SOLVER_MAX_JOBS = original
+    stats = measured["result"].get("solver_stats", {})
+    return {"objective": stats.get("objective"), "solve_time_sec": stats.get("solve_time_sec", 0.0),
+            "wall_time_sec": measured["wall_time_sec"], "feasible": measured["feasible"],
+            "exact_used": stats.get("exact", {}).get("used", False)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Held-Karp 정확해 vs OR-Tools 벤치마크")
+    parser.add_argument("--sizes", default="2,4,6,8,10", help="Job 수 목록 (쉼표 구분)")
+    parser.add_argument("--seeds", type=int, default=5, help="크기별 인스턴스 수")
+    args = parser.parse_args()
+
+    for num_jobs in [int(x) for x in args.sizes.split(",") if x.strip()]:
+        rows = [(run_case(num_jobs, seed, True), run_case(num_jobs, seed, False)) for seed in range(args.seeds)]
+        better = sum(1 for hk, ort in rows if hk["objective"] < ort["objective"])
+        worse = sum(1 for hk, ort in rows if hk["objective"] > ort["objective"])
+        print(f"🧮 Job {num_jobs:>2}: Held-Karp 풀이 p50 {statistics.median(hk['solve_time_sec'] for hk, _ in rows) * 1000:7.1f} ms "
+              f"(전체 {statistics.median(hk['wall_time_sec'] for hk, _ in rows):.3f}s) | "
+              f"OR-Tools p50 {statistics.median(ort['solve_time_sec'] for _, ort in rows):.2f}s "
+              f"(전체 {statistics.median(ort['wall_time_sec'] for _, ort in rows):.3f}s) | "
+              f"목적함수 HK<ORT {better}, 같음 {len(rows) - better - worse}, HK>ORT {worse}"
+              f"{' ❌' if worse else ''}, 정확해 사용 {sum(hk['exact_used'] for hk, _ in rows)}/{len(rows)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+HTTP 커넥션 재사용 벤치마크: 매 호출 requests.get (새 연결) vs 공용 HttpClient (keep-alive 풀).
+로컬 HTTP/1.1 서버에 동시 요청을 보내고 서버가 받은 TCP 연결 수(= 핸드셰이크 수)와 소요 시간을 비교합니다.
+실행 (backend 디렉토리에서):
+    python -m benchmarks.bench_http_pool --requests 400 --workers 8
+"""
+import argparse
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from services.http_client import HttpClient
+
+
+class _CountingHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive 허용
+    disable_nagle_algorithm = True
+    connections = 0
+    lock = threading.Lock()
+
+    def setup(self):
+        super().setup()
+        with _CountingHandler.lock:
+            _CountingHandler.connections += 1
+
+    def do_GET(self):
+        body = json.dumps({"routes": [{"summary": {"distance": 1000, "duration": 60}}]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def run(label, get, url, num_requests, workers):
+    _CountingHandler.connections = 0
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        statuses = list(executor.map(lambda _: get(url).status_code, range(num_requests)))
+    elapsed = time.perf_counter() - started
+    print(f"   {label:<22}: {elapsed:.2f}s, 서버 TCP 연결 {_CountingHandler.connections}개, "
+          f"성공 {statuses.count(200)}/{num_requests}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP keep-alive 풀 재사용 벤치마크")
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _CountingHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/v1/directions"
+
+    try:
+        print(f"🌐 로컬 서버 {url}, 요청 {args.requests}건, 동시 {args.workers}")
+        run("requests.get (매번 연결)", lambda u: requests.get(u, timeout=5), url, args.requests, args.workers)
+        client = HttpClient("bench", pool_maxsize=args.workers)
+        run("HttpClient (keep-alive)", lambda u: client.get(u, timeout=5), url, args.requests, args.workers)
+        stats = client.stats()
+        print(f"   클라이언트 통계: 요청 {stats['pool_requests']}, 새 연결 {stats['new_connections']}, "
+              f"재사용률 {stats['connection_reuse_rate']:.1%}")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+2단계(지연 상세) 경로 행렬 벤치마크: 모든 N² 아크의 road_details 조회 vs 요약만 조회 + 해에 쓰인 아크만 상세 조회.
+스텁 카카오 API 아래에서 road_details 요청 수, 행렬 단계에서 보관하는 Segment 수/직렬화 크기,
+최종 해의 총 CO2(상세 Segment 기준)를 비교합니다.
+실행 (backend 디렉토리에서):
+    python -m benchmarks.bench_lazy_segments --sizes 30,80
+"""
+import argparse
+import math
+import pickle
+
+import services.path_data_loader as path_data_loader
+from benchmarks.engine_harness import run_engine_instance
+from benchmarks.stub_providers import make_stub_kakao_route
+from benchmarks.synthetic import make_input_data
+
+
+def run_case(num_jobs: int, num_vehicles: int, lazy: bool, seed: int):
+    stub = make_stub_kakao_route(latency_sec=0.0, seed=seed)
+    path_data_loader._request_kakao_route = stub
+    footprint = {}
+
+    def _matrices(locations, stats=None, progress_callback=None):
+        result = path_data_loader.create_kakao_route_matrices(
+            locations, stats=stats, progress_callback=progress_callback, lazy_segments=lazy)
+        segment_data_map = result[2]
+        footprint["segments"] = segment_data_map.num_segments
+        footprint["bytes"] = len(pickle.dumps(segment_data_map, protocol=pickle.HIGHEST_PROTOCOL))
+        return result
+
+    measured = run_engine_instance(make_input_data(num_jobs, num_vehicles, seed=seed),
+                                   run_id=f"RUN_LAZY_{num_jobs}_{int(lazy)}", route_matrices=_matrices)
+    solver_stats = measured["result"].get("solver_stats", {})
+    return {
+        "requests": stub.calls,
+        "detail_requests": stub.detail_calls,
+        "segments": footprint.get("segments", 0),
+        "bytes": footprint.get("bytes", 0),
+        "detailed": solver_stats.get("summary_arcs_detailed", 0),
+        "total_co2_g": measured["total_co2_g"],
+        "feasible": measured["feasible"],
+        "wall_time_sec": measured["wall_time_sec"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="지연 상세(2단계) 경로 행렬 벤치마크")
+    parser.add_argument("--sizes", default="30,80", help="Job 수 목록 (쉼표 구분)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    path_data_loader.ROUTE_CACHE_ENABLED = False
+    path_data_loader.ROUTE_MATRIX_RATE_PER_SEC = 0
+    original_request = path_data_loader._request_kakao_route
+
+    try:
+        for num_jobs in [int(x) for x in args.sizes.split(",") if x.strip()]:
+            num_vehicles = max(1, math.ceil(num_jobs / 25))
+            print(f"\n🚚 Job {num_jobs}개, 차량 {num_vehicles}대")
+            for label, lazy in (("전체 상세", False), ("지연 상세", True)):
+                row = run_case(num_jobs, num_vehicles, lazy, args.seed)
+                print(f"   {label}: 요청 {row['requests']:>6}회 (road_details {row['detail_requests']:>6}), "
+                      f"행렬 Segment {row['segments']:>7}개 / {row['bytes'] / 1024:8.1f} KiB, "
+                      f"상세 교체 {row['detailed']}, CO2 {row['total_co2_g']} g, "
+                      f"feasible={row['feasible']}, {row['wall_time_sec']:.2f}s")
+    finally:
+        path_data_loader._request_kakao_route = original_request
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+경로 행렬 제공자 벤치마크: Kakao 쌍별 길찾기(N² 요청) vs ORS /v2/matrix 일괄 조회 + 해에 쓰인 아크만 상세 조회.
+Kakao는 스텁 함수, ORS는 로컬 대역 서버(ors_stub_server)에 같은 요청당 지연을 주고
+왕복(요청) 수, 행렬 생성 시간, 최종 해의 총 CO2를 비교합니다.
+실행 (backend 디렉토리에서):
+    python -m benchmarks.bench_ors_matrix --sizes 20,60 --latency 0.05 --chunk 50
+"""
+import argparse
+import math
+
+import services.path_data_loader as path_data_loader
+from benchmarks.engine_harness import run_engine_instance
+from benchmarks.ors_stub_server import OrsStubHandler, start_ors_stub_server
+from benchmarks.stub_providers import make_stub_kakao_route
+from benchmarks.synthetic import make_input_data
+
+
+def run_case(provider: str, num_jobs: int, num_vehicles: int, args):
+    stub = make_stub_kakao_route(latency_sec=args.latency, seed=args.seed)
+    path_data_loader._request_kakao_route = stub
+    path_data_loader.ROUTE_MATRIX_PROVIDER = provider
+    OrsStubHandler.counts = {"matrix": 0, "directions": 0}
+    measured = run_engine_instance(make_input_data(num_jobs, num_vehicles, seed=args.seed),
+                                   run_id=f"RUN_ORS_{provider}_{num_jobs}",
+                                   route_matrices=path_data_loader.create_route_matrices)
+    result = measured["result"]
+    return {
+        "round_trips": stub.calls + OrsStubHandler.counts["matrix"] + OrsStubHandler.counts["directions"],
+        "ors_counts": dict(OrsStubHandler.counts),
+        "fetch_sec": measured["phase_wall_sec"].get("fetch_routes", 0.0),
+        "total_co2_g": measured["total_co2_g"],
+        "feasible": measured["feasible"],
+        "detailed": result.get("solver_stats", {}).get("summary_arcs_detailed", 0),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ORS Matrix vs Kakao 쌍별 경로 행렬 벤치마크")
+    parser.add_argument("--sizes", default="20,60", help="Job 수 목록 (쉼표 구분)")
+    parser.add_argument("--latency", type=float, default=0.05, help="요청당 지연(초), 두 제공자 동일")
+    parser.add_argument("--chunk", type=int, default=50, help="ORS Matrix 요청당 출발/도착 위치 수")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    server = start_ors_stub_server(latency_sec=args.latency)
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    originals = (path_data_loader._request_kakao_route, path_data_loader.ROUTE_MATRIX_PROVIDER,
+                 path_data_loader.ORS_API_KEY, path_data_loader.ORS_DIRECTIONS_URL, path_data_loader.ORS_MATRIX_URL)
+    path_data_loader.ROUTE_CACHE_ENABLED = False
+    path_data_loader.ROUTE_MATRIX_RATE_PER_SEC = 0
+    path_data_loader.ORS_API_KEY = path_data_loader.ORS_API_KEY or "stub"
+    path_data_loader.ORS_DIRECTIONS_URL = f"{base_url}/v2/directions"
+    path_data_loader.ORS_MATRIX_URL = f"{base_url}/v2/matrix"
+    path_data_loader.ORS_MATRIX_CHUNK_SIZE = args.chunk
+
+    try:
+        for num_jobs in [int(x) for x in args.sizes.split(",") if x.strip()]:
+            num_vehicles = max(1, math.ceil(num_jobs / 25))
+            print(f"\n🚚 Job {num_jobs}개, 차량 {num_vehicles}대 (요청당 지연 {args.latency}s)")
+            kakao = run_case("kakao", num_jobs, num_vehicles, args)
+            ors = run_case("ors_matrix", num_jobs, num_vehicles, args)
+            print(f"   kakao      : 왕복 {kakao['round_trips']:>6}회, 행렬 {kakao['fetch_sec']:.2f}s, "
+                  f"CO2 {kakao['total_co2_g']} g, feasible={kakao['feasible']}")
+            print(f"   ors_matrix : 왕복 {ors['round_trips']:>6}회 (matrix {ors['ors_counts']['matrix']}, "
+                  f"상세 {ors['ors_counts']['directions']}), 행렬 {ors['fetch_sec']:.2f}s, "
+                  f"CO2 {ors['total_co2_g']} g, feasible={ors['feasible']}")
+    finally:
+        (path_data_loader._request_kakao_route, path_data_loader.ROUTE_MATRIX_PROVIDER,
+         path_data_loader.ORS_API_KEY, path_data_loader.ORS_DIRECTIONS_URL, path_data_loader.ORS_MATRIX_URL) = originals
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""
+P2P 대안 경로 조회 벤치마크: Kakao → ORS 순차 호출 vs 동시 호출 vs 동시 + hedged request.
+꼬리 지연이 있는 스텁 제공자를 _request_* 자리에 끼워 요청당 지연 분포를 비교합니다.
+실행 (backend 디렉토리에서):
+    python -m benchmarks.bench_p2p_alternatives --requests 60 --tail-rate 0.03
+"""
+import argparse
+import time
+
+import services.path_data_loader as path_data_loader
+from benchmarks.stub_providers import make_stub_route_alternatives
+from benchmarks.synthetic import random_locations
+
+
+def _percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q / 100))]
+
+
+def _sequential(origin, destination):
+    """기존 동작: Kakao 응답을 기다린 뒤 ORS 호출."""
+    candidates = []
+    candidates.extend(path_data_loader.get_kakao_route_alternatives(origin, destination) or [])
+    candidates.extend(path_data_loader.get_ors_route_alternatives(origin, destination) or [])
+    return candidates
+
+
+def install_stubs(args):
+    """모드마다 같은 시드로 스텁을 새로 끼워 동일한 지연 순서를 재현합니다."""
+    path_data_loader._request_kakao_route_alternatives = make_stub_route_alternatives(
+        "kakao", args.kakao_latency, args.tail_latency, args.tail_rate, seed=1)
+    path_data_loader._request_ors_route_alternatives = make_stub_route_alternatives(
+        "ors", args.ors_latency, args.tail_latency, args.tail_rate, seed=2)
+
+
+def run_mode(label, fn, pairs):
+    latencies, complete = [], 0
+    for origin, destination in pairs:
+        started = time.perf_counter()
+        candidates = fn(origin, destination)
+        latencies.append(time.perf_counter() - started)
+        complete += len({c["provider"] for c in candidates}) == 2
+    print(f"   {label:<18}: p50 {_percentile(latencies, 50):.2f}s, p95 {_percentile(latencies, 95):.2f}s, "
+          f"max {max(latencies):.2f}s, 합계 {sum(latencies):.1f}s, 두 제공자 모두 도착 {complete}/{len(pairs)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="P2P 대안 경로 동시 조회/hedge 벤치마크")
+    parser.add_argument("--requests", type=int, default=60, help="측정할 P2P 요청 수")
+    parser.add_argument("--warmup", type=int, default=30, help="히스토그램 표본을 쌓는 사전 요청 수")
+    parser.add_argument("--kakao-latency", type=float, default=0.3)
+    parser.add_argument("--ors-latency", type=float, default=0.5)
+    parser.add_argument("--tail-latency", type=float, default=4.0)
+    parser.add_argument("--tail-rate", type=float, default=0.03, help="꼬리 지연 확률 (p95 hedge는 5%% 미만일 때 효과)")
+    parser.add_argument("--deadline", type=float, default=6.0)
+    args = parser.parse_args()
+
+    path_data_loader.ROUTE_CACHE_ENABLED = False
+    originals = (path_data_loader._request_kakao_route_alternatives, path_data_loader._request_ors_route_alternatives)
+    install_stubs(args)
+
+    points = random_locations(2 * args.requests, seed=7)
+    pairs = [((points[2 * k]["longitude"], points[2 * k]["latitude"]),
+              (points[2 * k + 1]["longitude"], points[2 * k + 1]["latitude"])) for k in range(args.requests)]
+
+    try:
+        print(f"🧭 P2P 요청 {args.requests}건 (꼬리 지연 {args.tail_latency}s @ {args.tail_rate:.0%}, 데드라인 {args.deadline}s)")
+        for origin, destination in pairs[:args.warmup]:
+            path_data_loader.fetch_alternatives_concurrently([
+                ("kakao_alt", lambda: path_data_loader.get_kakao_route_alternatives(origin, destination)),
+                ("ors_alt", lambda: path_data_loader.get_ors_route_alternatives(origin, destination)),
+            ], deadline_sec=args.deadline, hedge=False)
+
+        install_stubs(args)
+        run_mode("순차 (기존)", _sequential, pairs)
+        path_data_loader.ROUTE_ALTERNATIVES_DEADLINE_SEC = args.deadline
+        path_data_loader.ROUTE_HEDGE_ENABLED = False
+        install_stubs(args)
+        run_mode("동시", path_data_loader.get_combined_route_alternatives, pairs)
+        path_data_loader.ROUTE_HEDGE_ENABLED = True
+        install_stubs(args)
+        run_mode("동시 + hedge(p95)", path_data_loader.get_combined_route_alternatives, pairs)
+
+        print("\n📊 제공자 지연 통계")
+        for name, row in path_data_loader.get_provider_latency_stats().items():
+            print(f"   {name}: count {row['count']}, p50 {row['p50_ms']}ms, p95 {row['p95_ms']}ms, "
+                  f"hedge {row['hedges_sent']}회 (선착 {row['hedges_won']}), 데드라인 초과 {row['deadline_misses']}")
+    finally:
+        path_data_loader._request_kakao_route_alternatives, path_data_loader._request_ors_route_alternatives = originals
+
+
+if __name__ == "__main__":
+    main()
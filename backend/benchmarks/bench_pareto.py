@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+Pareto 모드 벤치마크: 가중치 조합마다 전체 Run 반복(경로 조회 포함) vs Pareto 모드 1회(행렬 재사용 + 프로세스 풀).
+조합별 총 CO2 / 총 시간과 비지배 해 집합, 전체 벽시계 시간을 비교합니다.
+CO2와 시간이 서로 다른 방향을 갖도록 일부 아크(정체 구간)는 같은 거리에 시간을 CONGESTED_TIME_FACTOR배로 늘립니다.
+스텁 경로 조회는 지연이 없으므로 실제 서비스에서는 반복 방식의 fetch_routes 시간이 조합 수만큼 더해집니다.
+실행 (backend 디렉토리에서):
+    python -m benchmarks.bench_pareto --jobs 40 --vehicles 2 --budget-ms 3000
+"""
+import argparse
+
+import benchmarks.engine_harness as harness
+import optimizer.engine as engine
+from benchmarks.engine_harness import run_engine_instance
+from benchmarks.synthetic import make_input_data, stub_route_matrices
+
+CONGESTED_TIME_FACTOR = 3.0
+
+
+def congested_route_matrices(locations):
+    """stub_route_matrices + 결정적으로 고른 아크 40%의 통행 시간을 CONGESTED_TIME_FACTOR배로 (거리는 그대로)."""
+    distance_matrix, time_matrix, segment_data_map = stub_route_matrices(locations)
+    for (i, j), segments in segment_data_map.items():
+        if (i * 7 + j * 13) % 5 < 2:
+            time_matrix[i][j] *= CONGESTED_TIME_FACTOR
+            for segment in segments:
+                segment["base_time_sec"] *= CONGESTED_TIME_FACTOR
+    return distance_matrix, time_matrix, segment_data_map
+
+
+def run_with_weights(input_data, co2_weight: float, time_weight: float, budget_ms: int):
+    original = dict(harness.BENCH_SETTINGS)
+    harness.BENCH_SETTINGS.update({"ECO_CO2_WEIGHT": co2_weight, "ECO_TIME_WEIGHT": time_weight})
+    try:
+        return run_engine_instance(input_data, run_id=f"RUN_WEIGHT_{co2_weight}_{time_weight}",
+                                   route_matrices=congested_route_matrices,
+                                   solver_options={"time_budget_ms": budget_ms, "pareto": False})
+    finally:
+        harness.BENCH_SETTINGS.clear()
+        harness.BENCH_SETTINGS.update(original)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pareto 모드 벤치마크")
+    parser.add_argument("--jobs", type=int, default=40)
+    parser.add_argument("--vehicles", type=int, default=2)
+    parser.add_argument("--budget-ms", type=int, default=3000, help="풀이 시간 예산 (ms)")
+    parser.add_argument("--weights", default=engine.PARETO_WEIGHTS, help="co2:time 가중치 조합 (쉼표 구분)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    input_data = make_input_data(args.jobs, args.vehicles, seed=args.seed)
+    default_pair = (harness.BENCH_SETTINGS["ECO_CO2_WEIGHT"], harness.BENCH_SETTINGS["ECO_TIME_WEIGHT"])
+    pairs = [default_pair] + [p for p in engine._parse_weight_pairs(args.weights) if p != default_pair]
+
+    print(f"🔁 조합별 전체 Run ({len(pairs)}회, Job {args.jobs}개, 차량 {args.vehicles}대)")
+    repeated_wall, repeated_fetch = 0.0, 0.0
+    for co2_weight, time_weight in pairs:
+        measured = run_with_weights(input_data, co2_weight, time_weight, args.budget_ms)
+        repeated_wall += measured["wall_time_sec"]
+        repeated_fetch += measured["phase_wall_sec"].get("fetch_routes", 0.0)
+        print(f"   CO2 {co2_weight:.2f} / Time {time_weight:.2f}: CO2 {measured['total_co2_g']} g, "
+              f"시간 {measured['total_time_min']} min, 전체 {measured['wall_time_sec']:.2f}s")
+    print(f"   합계 {repeated_wall:.2f}s (경로 조회 {repeated_fetch:.2f}s)")
+
+    engine.PARETO_WEIGHTS = args.weights
+    measured = run_engine_instance(input_data, run_id="RUN_PARETO", route_matrices=congested_route_matrices,
+                                   solver_options={"time_budget_ms": args.budget_ms, "pareto": True})
+    stats = measured["result"].get("solver_stats", {}).get("pareto", {})
+    print(f"\n📈 Pareto 모드 1회: 전체 {measured['wall_time_sec']:.2f}s "
+          f"(경로 조회 {measured['phase_wall_sec'].get('fetch_routes', 0.0):.2f}s, "
+          f"조합 풀이 {stats.get('wall_sec')}s / 워커 {stats.get('workers')}, 설정별 한도 {stats.get('member_time_limit_ms')} ms)")
+    print(f"   서로 다른 해 {stats.get('distinct_plans')}개 → 비지배 {len(stats.get('front', []))}개, "
+          f"기본 해 지배됨 {stats.get('default_dominated')}")
+    for plan in stats.get("front", []):
+        print(f"   - {plan['route_name']:<30} CO2 {plan['total_co2_g']} g, 시간 {plan['total_time_min']} min")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""
+솔버 포트폴리오 벤치마크: 단일 설정(PATH_CHEAPEST_ARC + GLS) vs 다중 시작 포트폴리오(프로세스 풀, 공유 메모리 행렬).
+같은 시간 예산에서 최종 Eco-Cost, 벽시계 시간, 우승 설정을 비교합니다.
+CPU 코어가 설정 수보다 적으면 설정별 시간 한도가 라운드 수만큼 줄어드므로 코어 수를 함께 출력합니다.
+실행 (backend 디렉토리에서):
+    python -m benchmarks.bench_portfolio --sizes 20,40,80 --size 4 --budget-ms 4000
+"""
+import argparse
+import math
+import os
+
+import optimizer.engine as engine
+from benchmarks.engine_harness import run_engine_instance
+from benchmarks.synthetic import make_input_data
+
+
+def run_case(num_jobs: int, seed: int, budget_ms: int, portfolio: bool):
+    num_vehicles = max(1, math.ceil(num_jobs / 25))
+    measured = run_engine_instance(make_input_data(num_jobs, num_vehicles, seed=seed),
+                                   run_id=f"RUN_PORTFOLIO_{num_jobs}_{int(portfolio)}",
+                                   solver_options={"time_budget_ms": budget_ms, "portfolio": portfolio})
+    stats = measured["result"].get("solver_stats", {})
+    return {"objective": stats.get("objective"), "wall_time_sec": measured["wall_time_sec"],
+            "feasible": measured["feasible"], "portfolio": stats.get("portfolio")}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="다중 시작 솔버 포트폴리오 벤치마크")
+    parser.add_argument("--sizes", default="20,40,80", help="Job 수 목록 (쉼표 구분)")
+    parser.add_argument("--size", type=int, default=engine.PORTFOLIO_SIZE, help="포트폴리오 설정 수")
+    parser.add_argument("--budget-ms", type=int, default=4000, help="풀이 시간 예산 (ms)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    engine.PORTFOLIO_SIZE = args.size
+    print(f"🖥️  CPU {os.cpu_count()}개, 포트폴리오 {args.size}개 설정, 예산 {args.budget_ms} ms")
+    for num_jobs in [int(x) for x in args.sizes.split(",") if x.strip()]:
+        single = run_case(num_jobs, args.seed, args.budget_ms, portfolio=False)
+        multi = run_case(num_jobs, args.seed, args.budget_ms, portfolio=True)
+        gap = (multi["objective"] - single["objective"]) / single["objective"] * 100 if single["objective"] else 0.0
+        print(f"\n🚚 Job {num_jobs}개")
+        print(f"   단일 설정  : Eco-Cost {single['objective']}, 전체 {single['wall_time_sec']:.2f}s, "
+              f"feasible={single['feasible']}")
+        print(f"   포트폴리오 : Eco-Cost {multi['objective']} ({gap:+.2f}%), 전체 {multi['wall_time_sec']:.2f}s, "
+              f"feasible={multi['feasible']}")
+        p = multi["portfolio"] or {}
+        print(f"   우승 {p.get('winner')}, 워커 {p.get('workers')}, 설정별 한도 {p.get('member_time_limit_ms')} ms, "
+              f"공유 행렬 {p.get('shared_matrix_mb')} MB")
+        for member in p.get("members", []):
+            print(f"     - {member['config']:<32} obj {member['objective']}, {member['solve_time_sec']}s, "
+                  f"{member['stop_reason']}")
+
+
+if __name__ == "__main__":
+    main()
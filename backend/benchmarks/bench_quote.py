@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+빠른 견적(optimize_plan) 벤치마크: 입력 순서 단일 차량 왕복(이전 MVP) vs Clarke-Wright vs Clarke-Wright + 2-opt/or-opt.
+Job 수별 p50 계산 시간, 총 거리/CO2, 운행(trip)별 적재량이 차량 용량 이내인지 확인합니다.
+실행 (backend 디렉토리에서):
+    python -m benchmarks.bench_quote --sizes 50,200,500 --repeat 7
+"""
+import argparse
+import statistics
+import time
+
+import services.optimizer as quote
+from benchmarks.synthetic import make_input_data
+
+
+def to_quote_input(input_data):
+    """get_optimizer_input_data 형식 → optimize_plan 입력 (vehicles: id/capacity_kg/ef_gpkm, depot: (lat, lon))."""
+    vehicles = [{"id": v["vehicle_id"], "capacity_kg": v["capacity_kg"], "ef_gpkm": v["co2_gpkm"]}
+                for v in input_data["vehicles"]]
+    depot = (input_data["depot"]["latitude"], input_data["depot"]["longitude"])
+    return vehicles, input_data["jobs"], depot
+
+
+def capacity_ok(result, vehicles, jobs) -> bool:
+    """차고지 출발 ~ 복귀 사이(운행) 적재량 합이 차량 용량 이내인지."""
+    capacity = {v["id"]: v["capacity_kg"] for v in vehicles}
+    demand = {job["job_id"]: job["demand_kg"] for job in jobs}
+    trip_load = {}
+    for a in result["assignments"]:
+        key = a["vehicle_id"]
+        if a["end_job_id"] is None:
+            trip_load[key] = 0.0
+            continue
+        trip_load[key] = trip_load.get(key, 0.0) + demand[a["end_job_id"]]
+        if trip_load[key] > capacity[key] + 1e-6:
+            return False
+    return True
+
+
+def measure(vehicles, jobs, depot, repeat: int, improve_ms: float):
+    original = quote.IMPROVE_TIME_BUDGET_MS
+    quote.IMPROVE_TIME_BUDGET_MS = improve_ms
+    try:
+        times = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = quote.optimize_plan("RUN_QUOTE", "", vehicles, jobs, {}, depot=depot)
+            times.append(time.perf_counter() - started)
+    finally:
+        quote.IMPROVE_TIME_BUDGET_MS = original
+    return result, statistics.median(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="빠른 견적 배차 벤치마크")
+    parser.add_argument("--sizes", default="50,200,500", help="Job 수 목록 (쉼표 구분)")
+    parser.add_argument("--jobs-per-vehicle", type=int, default=25)
+    parser.add_argument("--capacity", type=float, default=8000.0, help="차량 용량(kg)")
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    quote.optimize_plan("RUN_WARMUP", "", [{"id": "W"}], [{"job_id": 1, "latitude": 35.9, "longitude": 126.9}], {})
+    for num_jobs in [int(x) for x in args.sizes.split(",") if x.strip()]:
+        input_data = make_input_data(num_jobs, max(1, num_jobs // args.jobs_per_vehicle), seed=args.seed,
+                                     capacity_kg=args.capacity, with_time_windows=False)
+        # 합성기는 총 수요를 차량 1대 용량에 맞추므로, 용량 제약이 걸리도록 Job당 수요를 키운다
+        for job in input_data["jobs"]:
+            job["demand_kg"] = round(job["demand_kg"] * num_jobs / args.jobs_per_vehicle, 1)
+        vehicles, jobs, depot = to_quote_input(input_data)
+        cw, cw_ms = measure(vehicles, jobs, depot, args.repeat, improve_ms=0.0)
+        full, full_ms = measure(vehicles, jobs, depot, args.repeat, improve_ms=quote.IMPROVE_TIME_BUDGET_MS)
+        baseline_co2 = full["summary"]["total_co2_g"] / (1 - full["summary"]["saving_pct"] / 100)
+        print(f"\n🧮 Job {num_jobs}개, 차량 {len(vehicles)}대 (용량 {args.capacity:.0f} kg)")
+        print(f"   입력 순서 왕복 (이전 MVP): CO2 {baseline_co2:12.1f} g")
+        print(f"   Clarke-Wright          : {cw_ms:6.1f} ms, 거리 {cw['summary']['total_distance_km']:9.2f} km, "
+              f"CO2 {cw['summary']['total_co2_g']:12.1f} g, 경로 {cw['summary']['num_routes']}, "
+              f"용량 준수 {capacity_ok(cw, vehicles, jobs)}")
+        print(f"   + 2-opt / or-opt       : {full_ms:6.1f} ms, 거리 {full['summary']['total_distance_km']:9.2f} km, "
+              f"CO2 {full['summary']['total_co2_g']:12.1f} g, 경로 {full['summary']['num_routes']}, "
+              f"용량 준수 {capacity_ok(full, vehicles, jobs)}, saving {full['summary']['saving_pct']}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""
+경로 행렬 생성 벤치마크: 순차 호출(워커 1개) vs 동시 호출.
+실행 (backend 디렉토리에서):
+    python -m benchmarks.bench_route_matrix --stops 20 --latency 0.05 --workers 8 --rate 50
+"""
+import argparse
+
+from services.path_data_loader import build_route_matrices_concurrent
+from benchmarks.stub_providers import make_stub_kakao_route
+from benchmarks.synthetic import random_locations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="경로 행렬 생성 순차/동시 비교")
+    parser.add_argument("--stops", type=int, default=20, help="위치 개수 (차고지 포함)")
+    parser.add_argument("--latency", type=float, default=0.05, help="스텁 API 응답 지연(초)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="지연 편차(초)")
+    parser.add_argument("--workers", type=int, default=8, help="동시 워커 수")
+    parser.add_argument("--rate", type=float, default=0.0, help="초당 호출 한도 (0 = 무제한)")
+    args = parser.parse_args()
+
+    locations = random_locations(args.stops)
+
+    seq_fetcher = make_stub_kakao_route(args.latency, args.jitter)
+    seq_dist, seq_time, _, seq_stats = build_route_matrices_concurrent(
+        locations, seq_fetcher, max_workers=1, rate_per_sec=0
+    )
+
+    par_fetcher = make_stub_kakao_route(args.latency, args.jitter)
+    par_dist, par_time, _, par_stats = build_route_matrices_concurrent(
+        locations, par_fetcher, max_workers=args.workers, rate_per_sec=args.rate
+    )
+
+    identical = seq_dist == par_dist and seq_time == par_time
+    speedup = seq_stats["wall_time_sec"] / par_stats["wall_time_sec"] if par_stats["wall_time_sec"] else float("inf")
+
+    print("\n--- 경로 행렬 벤치마크 ---")
+    print(f"위치 {args.stops}개, 쌍 {seq_stats['total_pairs']}개, 스텁 지연 {args.latency:.3f}s")
+    print(f"순차 (workers=1): {seq_stats['wall_time_sec']:.3f}s, 성공 {seq_stats['fetched']}, 실패 {seq_stats['failed']}")
+    print(f"동시 (workers={args.workers}, rate={args.rate or '무제한'}): {par_stats['wall_time_sec']:.3f}s, "
+          f"성공 {par_stats['fetched']}, 실패 {par_stats['failed']}")
+    print(f"속도 향상: x{speedup:.1f}, 결과 동일: {identical}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+Segment 맵 메모리 벤치마크: dict-of-lists (구간마다 dict 1개) vs SegmentStore (연속 구조 배열 + 아크 오프셋).
+N개 위치의 모든 아크에 경로당 구간 수(--roads)만큼 구간을 채우고
+tracemalloc 기준 보관 메모리, 생성 시간, 전체 아크 평탄화(CO2 배치 입력) 시간을 비교합니다.
+실행 (backend 디렉토리에서):
+    python -m benchmarks.bench_segment_store --sizes 30,60 --roads 200
+"""
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+
+from services.co2_calculator import flatten_segment_lists
+from services.segment_store import SegmentStore
+
+
+def _route_segments(rng: random.Random, num_roads: int):
+    """카카오 road_details 응답을 파싱한 것과 같은 형태의 구간 dict 리스트 (요청마다 새로 생성)."""
+    return [{"link_id": str(rng.randrange(10 ** 9, 10 ** 10)),
+             "distance_km": rng.uniform(0.05, 0.5),
+             "base_time_sec": rng.uniform(3.0, 40.0)} for _ in range(num_roads)]
+
+
+def build(kind: str, num_locations: int, num_roads: int, seed: int):
+    rng = random.Random(seed)
+    segment_data_map = {} if kind == "dict" else SegmentStore(num_locations)
+    for i in range(num_locations):
+        for j in range(num_locations):
+            if i != j:
+                segment_data_map[(i, j)] = _route_segments(rng, num_roads)
+    if kind == "store":
+        segment_data_map.shrink_to_fit()
+    return segment_data_map
+
+
+def measure(kind: str, num_locations: int, num_roads: int, seed: int):
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    segment_data_map = build(kind, num_locations, num_roads, seed)
+    build_sec = time.perf_counter() - started
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    arcs = [(i, j) for i in range(num_locations) for j in range(num_locations) if i != j]
+    started = time.perf_counter()
+    if kind == "dict":
+        distance_km, _, _ = flatten_segment_lists([segment_data_map[arc] for arc in arcs])
+    else:
+        distance_km, _, _ = segment_data_map.arc_arrays(arcs)
+    flatten_sec = time.perf_counter() - started
+    return {"retained_mb": retained / 2 ** 20, "peak_mb": peak / 2 ** 20, "build_sec": build_sec,
+            "flatten_sec": flatten_sec, "total_km": float(distance_km.sum()), "segments": len(distance_km)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Segment 맵 메모리 벤치마크")
+    parser.add_argument("--sizes", default="30,60", help="위치 수 목록 (쉼표 구분)")
+    parser.add_argument("--roads", type=int, default=200, help="경로당 도로 구간 수")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for num_locations in [int(x) for x in args.sizes.split(",") if x.strip()]:
+        print(f"\n🧮 위치 {num_locations}개, 아크 {num_locations * (num_locations - 1)}개 × 구간 {args.roads}개")
+        rows = {kind: measure(kind, num_locations, args.roads, args.seed) for kind in ("dict", "store")}
+        for kind, row in rows.items():
+            print(f"   {kind:<5}: 보관 {row['retained_mb']:8.1f} MiB (peak {row['peak_mb']:8.1f}), "
+                  f"생성 {row['build_sec']:.2f}s, 평탄화 {row['flatten_sec'] * 1000:8.1f} ms, "
+                  f"구간 {row['segments']}, 총 거리 {row['total_km']:.3f} km")
+        ratio = rows["dict"]["retained_mb"] / max(1e-9, rows["store"]["retained_mb"])
+        print(f"   → 보관 메모리 {ratio:.1f}배 감소")
+
+
+if __name__ == "__main__":
+    main()
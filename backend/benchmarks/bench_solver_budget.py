@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""
+탐색 한도 벤치마크: 고정 시간 한도(정체 조기 종료 없음) vs 정체(plateau) 조기 종료 / quality 등급.
+인스턴스 크기별로 풀이 시간(p50 비교용), 최종 Eco-Cost, 종료 사유를 출력합니다.
+실행 (backend 디렉토리에서):
+    python -m benchmarks.bench_solver_budget --sizes 3,10,40,80 --qualities fast,balanced
+"""
+import argparse
+import math
+import statistics
+
+import optimizer.engine as engine
+from benchmarks.engine_harness import run_engine_instance
+from benchmarks.synthetic import make_input_data
+
+
+def run_case(num_jobs: int, seed: int, quality: str, plateau: bool):
+    num_vehicles = max(1, math.ceil(num_jobs / 25))
+    original_tiers = {tier: dict(values) for tier, values in engine.SOLVER_QUALITY_TIERS.items()}
+    if not plateau:
+        for values in engine.SOLVER_QUALITY_TIERS.values():
+            values["plateau_sec"] = 0
+    try:
+        measured = run_engine_instance(make_input_data(num_jobs, num_vehicles, seed=seed),
+                                       run_id=f"RUN_BUDGET_{num_jobs}_{quality}",
+                                       solver_options={"quality": quality})
+    finally:
+        engine.SOLVER_QUALITY_TIERS.update(original_tiers)
+    stats = measured["result"].get("solver_stats", {})
+    return {"solve_time_sec": stats.get("solve_time_sec", 0.0), "objective": stats.get("objective"),
+            "stop_reason": stats.get("stop_reason"), "improvements": len(stats.get("objective_trajectory", [])),
+            "feasible": measured["feasible"]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="정체 조기 종료 / quality 등급 벤치마크")
+    parser.add_argument("--sizes", default="3,10,40,80", help="Job 수 목록 (쉼표 구분)")
+    parser.add_argument("--qualities", default="balanced", help="quality 등급 목록 (쉼표 구분)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    sizes = [int(x) for x in args.sizes.split(",") if x.strip()]
+    for quality in [q.strip() for q in args.qualities.split(",") if q.strip()]:
+        print(f"\n⏱️  quality={quality} ({engine.SOLVER_QUALITY_TIERS[quality]})")
+        times = {"fixed": [], "plateau": []}
+        for num_jobs in sizes:
+            fixed = run_case(num_jobs, args.seed, quality, plateau=False)
+            early = run_case(num_jobs, args.seed, quality, plateau=True)
+            times["fixed"].append(fixed["solve_time_sec"])
+            times["plateau"].append(early["solve_time_sec"])
+            gap = (early["objective"] - fixed["objective"]) / fixed["objective"] * 100 if fixed["objective"] else 0.0
+            print(f"   Job {num_jobs:>4}: 고정 {fixed['solve_time_sec']:6.2f}s (obj {fixed['objective']}) | "
+                  f"정체 종료 {early['solve_time_sec']:6.2f}s (obj {early['objective']}, {gap:+.2f}%, "
+                  f"{early['stop_reason']}, 개선 {early['improvements']}회), feasible={early['feasible']}")
+        print(f"   p50 풀이 시간: 고정 {statistics.median(times['fixed']):.2f}s → "
+              f"정체 종료 {statistics.median(times['plateau']):.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+희소(k-최근접) 경로 행렬 벤치마크: 전체 N² 조회 vs k-최근접 + 차고지 아크만 조회.
+스텁 카카오 API를 create_kakao_route_matrices 아래에 끼워 API 호출 수,
+최종 해의 총 CO2(추정 아크는 실측 재조회 후), 해에 쓰인 추정 아크 비율을 비교합니다.
+실행 (backend 디렉토리에서):
+    python -m benchmarks.bench_sparse_matrix --sizes 30,60 --k 5,8
+"""
+import argparse
+import functools
+import math
+
+import services.path_data_loader as path_data_loader
+from benchmarks.engine_harness import run_engine_instance
+from benchmarks.stub_providers import make_stub_kakao_route
+from benchmarks.synthetic import make_input_data
+
+
+def run_case(num_jobs: int, num_vehicles: int, sparse_k: int, seed: int):
+    stub = make_stub_kakao_route(latency_sec=0.0, seed=seed)
+    path_data_loader._request_kakao_route = stub
+    matrices = functools.partial(path_data_loader.create_kakao_route_matrices, sparse_k=sparse_k)
+    measured = run_engine_instance(make_input_data(num_jobs, num_vehicles, seed=seed),
+                                   run_id=f"RUN_SPARSE_{num_jobs}_{sparse_k}", route_matrices=matrices)
+    solver_stats = measured["result"].get("solver_stats", {})
+    return {
+        "api_calls": stub.calls,
+        "feasible": measured["feasible"],
+        "total_co2_g": measured["total_co2_g"],
+        "estimated_used": solver_stats.get("estimated_arcs_used", 0),
+        "arcs_used": solver_stats.get("arcs_used"),
+        "resolved": solver_stats.get("estimated_arcs_resolved", 0),
+        "wall_time_sec": measured["wall_time_sec"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="희소 경로 행렬 벤치마크")
+    parser.add_argument("--sizes", default="30,60", help="Job 수 목록 (쉼표 구분)")
+    parser.add_argument("--k", default="5,8", help="k-최근접 이웃 수 목록 (쉼표 구분)")
+    parser.add_argument("--vehicles", type=int, default=None, help="차량 수 (기본: Job 25개당 1대)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    # 네트워크/캐시/속도 제한 없이 호출 수만 비교
+    path_data_loader.ROUTE_CACHE_ENABLED = False
+    path_data_loader.ROUTE_MATRIX_RATE_PER_SEC = 0
+    path_data_loader.ROUTE_MATRIX_SPARSE_MIN_NODES = 0
+    original_request = path_data_loader._request_kakao_route
+
+    try:
+        for num_jobs in [int(x) for x in args.sizes.split(",") if x.strip()]:
+            num_vehicles = args.vehicles or max(1, math.ceil(num_jobs / 25))
+            print(f"\n🚚 Job {num_jobs}개, 차량 {num_vehicles}대")
+            dense = run_case(num_jobs, num_vehicles, 0, args.seed)
+            print(f"   dense     : API {dense['api_calls']:>6}회, CO2 {dense['total_co2_g']} g, "
+                  f"feasible={dense['feasible']}, {dense['wall_time_sec']:.2f}s")
+            for k in [int(x) for x in args.k.split(",") if x.strip()]:
+                sparse = run_case(num_jobs, num_vehicles, k, args.seed)
+                saved_pct = (1 - sparse["api_calls"] / dense["api_calls"]) * 100 if dense["api_calls"] else 0.0
+                co2_gap = ((sparse["total_co2_g"] - dense["total_co2_g"]) / dense["total_co2_g"] * 100
+                           if sparse["total_co2_g"] and dense["total_co2_g"] else float("nan"))
+                print(f"   sparse k={k:<2}: API {sparse['api_calls']:>6}회 (-{saved_pct:.1f}%), "
+                      f"CO2 {sparse['total_co2_g']} g ({co2_gap:+.2f}%), feasible={sparse['feasible']}, "
+                      f"추정 아크 사용 {sparse['estimated_used']}/{sparse['arcs_used']} "
+                      f"(재조회 {sparse['resolved']}), {sparse['wall_time_sec']:.2f}s")
+    finally:
+        path_data_loader._request_kakao_route = original_request
+
+
+if __name__ == "__main__":
+    main()
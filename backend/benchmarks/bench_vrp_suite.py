@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""
+오프라인 VRP 벤치마크 스위트.
+섹터 범위 안의 합성 인스턴스(5~200 Job, 시간창/용량 포함)로 run_optimization을 구동하고
+단계별 벽시계 시간, Eco-Cost(목적함수), 총 CO2, 실행 가능 비율을 JSON 리포트로 남깁니다.
+리포트는 커밋 간 비교(diff)가 가능하도록 인스턴스 이름 기준으로 정렬됩니다.
+실행 (backend 디렉토리에서):
+    python -m benchmarks.bench_vrp_suite --sizes 5,10,20,50 --seeds 2 --output /tmp/vrp_suite.json
+    python -m benchmarks.bench_vrp_suite --baseline /tmp/vrp_suite_prev.json
+"""
+import argparse
+import datetime as dt
+import json
+import math
+import platform
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import ortools
+
+from benchmarks.engine_harness import run_engine_instance
+from benchmarks.synthetic import make_input_data
+
+DEFAULT_SIZES = "5,10,20,50"
+JOBS_PER_VEHICLE = 25
+COMPARE_KEYS = ("eco_cost", "total_co2_g", "wall_time_sec")
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"],
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        return None
+
+
+def instance_name(num_jobs: int, num_vehicles: int, seed: int) -> str:
+    return f"n{num_jobs:03d}_v{num_vehicles}_s{seed}"
+
+
+def run_suite(sizes: List[int], seeds: int, vehicles: Optional[int],
+              with_time_windows: bool, verbose: bool = False) -> Dict:
+    records = []
+    for num_jobs in sizes:
+        num_vehicles = vehicles or max(1, math.ceil(num_jobs / JOBS_PER_VEHICLE))
+        for seed in range(seeds):
+            name = instance_name(num_jobs, num_vehicles, seed)
+            input_data = make_input_data(num_jobs, num_vehicles, seed=seed,
+                                         with_time_windows=with_time_windows)
+            measured = run_engine_instance(input_data, run_id=f"RUN_BENCH_{name}", verbose=verbose)
+            measured.pop("result", None)
+            record = {"name": name, "num_jobs": num_jobs, "num_vehicles": num_vehicles, "seed": seed, **measured}
+            records.append(record)
+            print(f"   {name}: {record['status']:<7} feasible={record['feasible']!s:<5} "
+                  f"eco_cost={record['eco_cost']} co2={record['total_co2_g']} g "
+                  f"wall={record['wall_time_sec']:.2f}s {record['phase_wall_sec']}")
+
+    by_size = {}
+    for num_jobs in sizes:
+        rows = [r for r in records if r["num_jobs"] == num_jobs]
+        solved = [r for r in rows if r["feasible"]]
+        by_size[str(num_jobs)] = {
+            "instances": len(rows),
+            "feasibility_rate": round(len(solved) / len(rows), 4) if rows else 0.0,
+            "mean_wall_time_sec": round(sum(r["wall_time_sec"] for r in rows) / len(rows), 4) if rows else 0.0,
+            "mean_eco_cost": round(sum(r["eco_cost"] for r in solved) / len(solved), 1) if solved else None,
+            "mean_total_co2_g": round(sum(r["total_co2_g"] for r in solved) / len(solved), 3) if solved else None,
+        }
+
+    return {
+        "meta": {
+            "generated_at": dt.datetime.now().isoformat(timespec="seconds"),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "ortools": getattr(ortools, "__version__", None),
+            "sizes": sizes,
+            "seeds": seeds,
+            "time_windows": with_time_windows,
+        },
+        "summary": {
+            "instances": len(records),
+            "feasibility_rate": round(sum(r["feasible"] for r in records) / len(records), 4) if records else 0.0,
+            "by_size": by_size,
+        },
+        "instances": sorted(records, key=lambda r: r["name"]),
+    }
+
+
+def compare_reports(current: Dict, baseline: Dict) -> None:
+    """인스턴스 이름이 같은 항목끼리 Eco-Cost / CO2 / 실행 시간 변화를 출력합니다."""
+    base_by_name = {r["name"]: r for r in baseline.get("instances", [])}
+    print(f"\n📊 기준 리포트 대비 (baseline commit: {baseline.get('meta', {}).get('git_commit')})")
+    for r in current["instances"]:
+        b = base_by_name.get(r["name"])
+        if b is None:
+            print(f"   {r['name']}: (기준 없음)")
+            continue
+        parts = []
+        for key in COMPARE_KEYS:
+            cur, old = r.get(key), b.get(key)
+            if cur is None or old is None:
+                parts.append(f"{key}: {old} → {cur}")
+            else:
+                pct = (cur - old) / old * 100 if old else 0.0
+                parts.append(f"{key}: {old} → {cur} ({pct:+.1f}%)")
+        if r["feasible"] != b["feasible"]:
+            parts.append(f"feasible: {b['feasible']} → {r['feasible']}")
+        print(f"   {r['name']}: " + ", ".join(parts))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="오프라인 VRP 벤치마크 스위트")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="Job 수 목록 (쉼표 구분, 5~200)")
+    parser.add_argument("--seeds", type=int, default=2, help="크기별 인스턴스 수")
+    parser.add_argument("--vehicles", type=int, default=None,
+                        help=f"차량 수 (기본: Job {JOBS_PER_VEHICLE}개당 1대)")
+    parser.add_argument("--no-time-windows", action="store_true", help="시간창 없이 생성")
+    parser.add_argument("--output", default="vrp_suite_report.json", help="JSON 리포트 경로")
+    parser.add_argument("--baseline", default=None, help="비교할 이전 리포트 경로")
+    parser.add_argument("--verbose", action="store_true", help="엔진 로그 출력")
+    args = parser.parse_args()
+
+    sizes = [int(x) for x in args.sizes.split(",") if x.strip()]
+    if any(n < 2 or n > 200 for n in sizes):
+        parser.error("--sizes 값은 2~200 범위여야 합니다. (1 Job은 P2P 분기)")
+
+    print(f"🚚 VRP 벤치마크: sizes={sizes}, seeds={args.seeds}, time_windows={not args.no_time_windows}")
+    report = run_suite(sizes, args.seeds, args.vehicles, not args.no_time_windows, args.verbose)
+
+    Path(args.output).write_text(json.dumps(report, ensure_ascii=False, indent=2, sort_keys=True),
+                                 encoding="utf-8")
+    print(f"\n✅ 리포트 저장: {args.output}")
+    print(f"   실행 가능 비율: {report['summary']['feasibility_rate']:.2%}")
+    for size, row in report["summary"]["by_size"].items():
+        print(f"   n={size:>3}: feasible {row['feasibility_rate']:.0%}, "
+              f"wall {row['mean_wall_time_sec']:.2f}s, eco_cost {row['mean_eco_cost']}, "
+              f"co2 {row['mean_total_co2_g']} g")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        compare_reports(report, baseline)
+
+
+if __name__ == "__main__":
+    main()
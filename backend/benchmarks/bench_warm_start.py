@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+Warm start 벤치마크: 이전 Run 경로를 초기해로 넣은 풀이 vs PATH_CHEAPEST_ARC 콜드 스타트.
+이전 인스턴스를 콜드로 풀어 저장된 ASSIGNMENTS를 get_previous_run_routes 반환 형식으로 만들고,
+Job 일부(--perturb)를 새 좌표로 바꾼 현재 인스턴스를 두 방식으로 풀어
+objective_trajectory 기준 '콜드 최종 목적함수 이하에 처음 도달한 시각'을 비교합니다.
+실행 (backend 디렉토리에서):
+    python -m benchmarks.bench_warm_start --sizes 40,80 --perturb 0.1
+"""
+import argparse
+import math
+import random
+
+from benchmarks.engine_harness import run_engine_instance
+from benchmarks.synthetic import SECTOR_BBOX, make_input_data
+
+
+def previous_routes_from(input_data, assignments, run_id: str):
+    """run_engine_instance가 저장한 assignments → get_previous_run_routes 반환 형식."""
+    jobs = {job["job_id"]: (job["longitude"], job["latitude"]) for job in input_data["jobs"]}
+    routes = {}
+    for a in sorted(assignments, key=lambda a: (a["vehicle_id"], a["step_order"])):
+        if a.get("end_job_id") is not None:
+            routes.setdefault(a["vehicle_id"], []).append(a["end_job_id"])
+    return {"run_id": run_id, "overlap": len(jobs), "jobs": jobs,
+            "routes": [{"vehicle_id": v, "job_ids": ids} for v, ids in routes.items()]}
+
+
+def perturb_jobs(input_data, fraction: float, seed: int):
+    """Job 일부를 새 좌표로 옮긴 인스턴스 (나머지 Job은 이전 Run과 같은 좌표)."""
+    rng = random.Random(seed + 1)
+    lon_min, lon_max, lat_min, lat_max = SECTOR_BBOX
+    jobs = [dict(job) for job in input_data["jobs"]]
+    for job in rng.sample(jobs, int(round(fraction * len(jobs)))):
+        job["longitude"] = rng.uniform(lon_min, lon_max)
+        job["latitude"] = rng.uniform(lat_min, lat_max)
+    return {**input_data, "jobs": jobs}
+
+
+def time_to_reach(trajectory, target):
+    """목적함수가 target 이하가 된 첫 시각 (도달 못 하면 None)."""
+    return next((t for t, objective in trajectory if objective <= target), None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="이전 Run 경로 warm start 벤치마크")
+    parser.add_argument("--sizes", default="40,80", help="Job 수 목록 (쉼표 구분)")
+    parser.add_argument("--perturb", type=float, default=0.1, help="현재 Run에서 바뀌는 Job 비율")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for num_jobs in [int(x) for x in args.sizes.split(",") if x.strip()]:
+        num_vehicles = max(1, math.ceil(num_jobs / 25))
+        print(f"\n🚚 Job {num_jobs}개, 차량 {num_vehicles}대, 변경 Job {args.perturb:.0%}")
+        previous_input = make_input_data(num_jobs, num_vehicles, seed=args.seed)
+        previous = run_engine_instance(previous_input, run_id=f"RUN_PREV_{num_jobs}")
+        previous_routes = previous_routes_from(previous_input, previous["assignments"], f"RUN_PREV_{num_jobs}")
+
+        current_input = perturb_jobs(previous_input, args.perturb, args.seed)
+        cold = run_engine_instance(current_input, run_id=f"RUN_COLD_{num_jobs}")
+        warm = run_engine_instance(current_input, run_id=f"RUN_WARM_{num_jobs}", previous_routes=previous_routes)
+
+        target = cold["eco_cost"]
+        for label, row in (("cold", cold), ("warm", warm)):
+            stats = row["result"].get("solver_stats", {})
+            trajectory = stats.get("objective_trajectory", [])
+            reached = time_to_reach(trajectory, target)
+            first = trajectory[0] if trajectory else (None, None)
+            print(f"   {label}: 첫 해 {first[1]} @ {first[0]}s, 최종 {row['eco_cost']}, "
+                  f"콜드 최종값 도달 {reached if reached is not None else '-'}s, "
+                  f"해 갱신 {len(trajectory)}회, warm_start={stats.get('warm_start')}, feasible={row['feasible']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""
+optimizer.engine.run_optimization을 Oracle/Kakao/ORS 없이 구동하기 위한 하니스.
+엔진 모듈이 참조하는 데이터 소스 함수를 스텁으로 바꿔 끼우고,
+progress_callback으로 단계별 벽시계 시간을 기록합니다.
+"""
+import contextlib
+import inspect
+import io
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import optimizer.engine as engine
+from benchmarks.synthetic import BENCH_CONG, BENCH_SETTINGS, BENCH_WEATHER, stub_route_matrices
+
+
+@contextlib.contextmanager
+def stub_engine(input_data: Dict, route_matrices: Callable = stub_route_matrices,
+                saved: Optional[List] = None, previous_routes: Optional[Dict] = None):
+    """
+    엔진의 외부 의존 함수를 스텁으로 교체합니다. (with 블록 종료 시 원복)
+    - get_optimizer_input_data → input_data 그대로 반환
+    - create_route_matrices → route_matrices(locations) (stats 인자를 받으면 함께 전달)
+    - save_optimization_results → saved 리스트에 (run_id, summary, assignments) 기록
+    - get_previous_run_routes → previous_routes (기본 None: 콜드 스타트)
+    - get_settings / get_congestion_factors / get_weather_penalty_value → 고정값
+    """
+    forwards_stats = "stats" in inspect.signature(route_matrices).parameters
+
+    def _matrices(locations, stats=None, progress_callback=None, **kwargs):
+        # 실제 create_kakao_route_matrices 등(스텁 API 아래)을 넘긴 경우 통계/진행률을 그대로 전달
+        if forwards_stats:
+            return route_matrices(locations, stats=stats, progress_callback=progress_callback)
+        result = route_matrices(locations)
+        if progress_callback is not None:
+            total = len(locations) * (len(locations) - 1)
+            progress_callback(total, total)
+        return result
+
+    def _save(run_id, summary, assignments):
+        if saved is not None:
+            saved.append((run_id, summary, assignments))
+        return True
+
+    replacements = {
+        "get_optimizer_input_data": lambda run_id, vehicle_ids: input_data,
+        "create_route_matrices": _matrices,
+        "save_optimization_results": _save,
+        "get_previous_run_routes": lambda run_id, **kwargs: previous_routes,
+        "get_settings": lambda: dict(BENCH_SETTINGS),
+        "get_congestion_factors": lambda run_datetime: dict(BENCH_CONG),
+        "get_weather_penalty_value": lambda run_datetime, settings: BENCH_WEATHER,
+    }
+    originals = {name: getattr(engine, name) for name in replacements}
+    try:
+        for name, fn in replacements.items():
+            setattr(engine, name, fn)
+        yield engine
+    finally:
+        for name, fn in originals.items():
+            setattr(engine, name, fn)
+
+
+def run_engine_instance(input_data: Dict, run_id: str = "RUN_BENCH",
+                        route_matrices: Callable = stub_route_matrices,
+                        verbose: bool = False, previous_routes: Optional[Dict] = None,
+                        solver_options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    합성 인스턴스 1개로 run_optimization을 실행하고 측정값을 돌려줍니다.
+    solver_options는 run_optimization의 time_budget_ms / quality / portfolio / pareto로 그대로 전달됩니다.
+    반환: status, feasible, jobs_served, eco_cost, total_co2_g, total_distance_km,
+          total_time_min, wall_time_sec, phase_wall_sec, assignments, result(원본)
+    """
+    saved: List = []
+    phase_marks: List = []
+
+    def _on_progress(phase: str, progress: float) -> None:
+        if not phase_marks or phase_marks[-1][0] != phase:
+            phase_marks.append((phase, time.perf_counter()))
+
+    vehicle_ids = [v["vehicle_id"] for v in input_data["vehicles"]]
+    sink = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+    with stub_engine(input_data, route_matrices, saved, previous_routes), sink:
+        started = time.perf_counter()
+        result = engine.run_optimization(run_id, vehicle_ids, progress_callback=_on_progress, **(solver_options or {}))
+        finished = time.perf_counter()
+
+    # 단계별 시간 = 다음 단계 진입 시각 - 현재 단계 진입 시각
+    phase_wall_sec: Dict[str, float] = {}
+    for k, (phase, mark) in enumerate(phase_marks):
+        if phase == "done":
+            continue
+        next_mark = phase_marks[k + 1][1] if k + 1 < len(phase_marks) else finished
+        phase_wall_sec[phase] = round(phase_wall_sec.get(phase, 0.0) + (next_mark - mark), 4)
+
+    job_ids = {job["job_id"] for job in input_data["jobs"]}
+    served = {a["end_job_id"] for _, _, assignments in saved for a in assignments
+              if a.get("end_job_id") is not None}
+    summary = saved[0][1] if saved else {}
+    solver_stats = result.get("solver_stats", {}) if isinstance(result, dict) else {}
+    status = result.get("status") if isinstance(result, dict) else "failed"
+
+    return {
+        "status": status,
+        "feasible": bool(status == "success" and job_ids <= served),
+        "jobs_served": len(served & job_ids),
+        "eco_cost": solver_stats.get("objective"),
+        "total_co2_g": summary.get("total_co2_g"),
+        "total_distance_km": summary.get("total_distance_km"),
+        "total_time_min": summary.get("total_time_min"),
+        "wall_time_sec": round(finished - started, 4),
+        "phase_wall_sec": phase_wall_sec,
+        "assignments": saved[0][2] if saved else [],
+        "result": result,
+    }
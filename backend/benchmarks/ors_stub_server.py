@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+ORS API 로컬 대역 서버 (벤치마크/수동 테스트용).
+- POST /v2/matrix/{profile}                 → distances(km) / durations(sec) 행렬
+- POST /v2/directions/{profile}/geojson     → 좌표열 geometry를 가진 단일 경로
+거리/시간은 stub_providers.build_stub_route와 같은 결정적인 값을 돌려줍니다.
+실행 (backend 디렉토리에서):
+    python -m benchmarks.ors_stub_server --port 8082
+    ORS_BASE_URL=http://127.0.0.1:8082 ORS_API_KEY=stub ROUTE_MATRIX_PROVIDER=ors_matrix python app.py
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+
+from benchmarks.stub_providers import build_stub_route
+
+
+class OrsStubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    latency_sec = 0.0
+    counts: Dict[str, int] = {"matrix": 0, "directions": 0}
+    lock = threading.Lock()
+
+    def _send_json(self, status: int, payload: Dict) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        if self.latency_sec:
+            time.sleep(self.latency_sec)
+
+        if self.path.startswith("/v2/matrix/"):
+            self._count("matrix")
+            self._send_json(200, _matrix_response(payload))
+        elif self.path.startswith("/v2/directions/") and self.path.endswith("/geojson"):
+            self._count("directions")
+            self._send_json(200, _directions_response(payload))
+        else:
+            self._send_json(404, {"error": f"unknown path {self.path}"})
+
+    def _count(self, key: str) -> None:
+        with OrsStubHandler.lock:
+            OrsStubHandler.counts[key] += 1
+
+    def log_message(self, *args):
+        pass
+
+
+def _matrix_response(payload: Dict) -> Dict:
+    locations = payload.get("locations") or []
+    sources = payload.get("sources") or list(range(len(locations)))
+    destinations = payload.get("destinations") or list(range(len(locations)))
+    distances: List[List[float]] = []
+    durations: List[List[float]] = []
+    for s in sources:
+        dist_row, dur_row = [], []
+        for d in destinations:
+            route = build_stub_route(tuple(locations[s]), tuple(locations[d]))
+            dist_row.append(round(route["total_distance_km"], 3))
+            dur_row.append(round(route["total_time_sec"], 1))
+        distances.append(dist_row)
+        durations.append(dur_row)
+    return {"distances": distances, "durations": durations}
+
+
+def _directions_response(payload: Dict) -> Dict:
+    (lon1, lat1), (lon2, lat2) = payload["coordinates"][:2]
+    route = build_stub_route((lon1, lat1), (lon2, lat2))
+    num_points = len(route["segments"]) + 1
+    coords = [[lon1 + (lon2 - lon1) * k / (num_points - 1), lat1 + (lat2 - lat1) * k / (num_points - 1)]
+              for k in range(num_points)] if num_points > 1 else [[lon1, lat1], [lon2, lat2]]
+    return {
+        "type": "FeatureCollection",
+        "features": [{
+            "type": "Feature",
+            "properties": {"summary": {"distance": route["total_distance_km"] * 1000.0,
+                                       "duration": route["total_time_sec"]}},
+            "geometry": {"type": "LineString", "coordinates": coords},
+        }],
+    }
+
+
+def start_ors_stub_server(port: int = 0, latency_sec: float = 0.0) -> ThreadingHTTPServer:
+    """백그라운드 스레드로 대역 서버를 띄웁니다. 주소: http://127.0.0.1:{server.server_port}"""
+    OrsStubHandler.latency_sec = latency_sec
+    OrsStubHandler.counts = {"matrix": 0, "directions": 0}
+    server = ThreadingHTTPServer(("127.0.0.1", port), OrsStubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ORS API 로컬 대역 서버")
+    parser.add_argument("--port", type=int, default=8082)
+    parser.add_argument("--latency", type=float, default=0.0, help="요청당 인위적 지연(초)")
+    args = parser.parse_args()
+
+    server = start_ors_stub_server(args.port, args.latency)
+    print(f"🧪 ORS 대역 서버 실행 중: http://127.0.0.1:{server.server_port} (Ctrl+C 종료)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+네트워크 없이 벤치마크를 돌리기 위한 로컬 스텁 경로 제공자.
+get_kakao_route와 같은 시그니처/반환 형식을 흉내 냅니다.
+"""
+import random
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from services.path_data_loader import _haversine_km, summary_segments
+
+ROAD_DETOUR_FACTOR = 1.3     # 직선거리 대비 도로거리 보정
+STUB_SPEED_KMH = 45.0        # 스텁 경로의 평균 주행 속도
+STUB_SEGMENT_KM = 0.5        # 스텁 도로 구간 길이
+
+
+def make_stub_kakao_route(latency_sec: float = 0.05, jitter_sec: float = 0.0,
+                          failure_rate: float = 0.0, seed: int = 0):
+    """
+    지연(latency_sec ± jitter_sec)과 실패율을 흉내 내는 get_kakao_route 대체 함수를 만듭니다.
+    경로 자체는 좌표만으로 결정되므로 동일 입력에는 항상 동일한 결과를 돌려줍니다.
+    반환된 함수의 .calls 속성으로 호출 횟수를, .detail_calls로 road_details 요청 횟수를 확인할 수 있습니다.
+    """
+    rng = random.Random(seed)
+    lock = threading.Lock()
+
+    def stub_kakao_route(origin_coord: Tuple[float, float], destination_coord: Tuple[float, float],
+                         car_type: int = 6, timeout: float = 20, road_details: bool = True) -> Optional[Dict]:
+        with lock:
+            stub_kakao_route.calls += 1
+            stub_kakao_route.detail_calls += int(road_details)
+            delay = max(0.0, latency_sec + rng.uniform(-jitter_sec, jitter_sec))
+            failed = rng.random() < failure_rate
+        if delay:
+            time.sleep(min(delay, timeout))
+        if failed or delay > timeout:
+            return None
+        route = build_stub_route(origin_coord, destination_coord)
+        if not road_details and route["segments"]:
+            route["segments"] = summary_segments(route["total_distance_km"], route["total_time_sec"], "kakao")
+        return route
+
+    stub_kakao_route.calls = 0
+    stub_kakao_route.detail_calls = 0
+    return stub_kakao_route
+
+
+def make_stub_route_alternatives(provider: str, latency_sec: float = 0.3, tail_latency_sec: float = 3.0,
+                                 tail_rate: float = 0.1, seed: int = 0):
+    """
+    get_kakao_route_alternatives / get_ors_route_alternatives 대체 함수를 만듭니다.
+    tail_rate 확률로 tail_latency_sec 만큼 늦게 응답합니다. (꼬리 지연 흉내)
+    """
+    rng = random.Random(seed)
+    lock = threading.Lock()
+
+    def stub_route_alternatives(origin_coord: Tuple[float, float], destination_coord: Tuple[float, float],
+                                *args, **kwargs) -> Optional[List[Dict]]:
+        with lock:
+            stub_route_alternatives.calls += 1
+            delay = tail_latency_sec if rng.random() < tail_rate else latency_sec
+        time.sleep(delay)
+        route = build_stub_route(origin_coord, destination_coord)
+        return [{"provider": provider, "route_name": f"{provider.upper()}_ALT_1", **route}]
+
+    stub_route_alternatives.calls = 0
+    return stub_route_alternatives
+
+
+def build_stub_route(origin_coord: Tuple[float, float], destination_coord: Tuple[float, float]) -> Dict:
+    """좌표 두 개로 get_kakao_route 형식의 결정적인 경로를 만듭니다."""
+    straight_km = _haversine_km(origin_coord[0], origin_coord[1], destination_coord[0], destination_coord[1])
+    total_distance_km = straight_km * ROAD_DETOUR_FACTOR
+    total_time_sec = total_distance_km / STUB_SPEED_KMH * 3600.0
+
+    segments = []
+    num_segments = max(1, int(total_distance_km / STUB_SEGMENT_KM)) if total_distance_km > 0 else 0
+    for k in range(num_segments):
+        segments.append({
+            "link_id": str(1000000 + k),
+            "distance_km": total_distance_km / num_segments,
+            "base_time_sec": total_time_sec / num_segments,
+        })
+    return {
+        "total_distance_km": total_distance_km,
+        "total_time_sec": total_time_sec,
+        "segments": segments,
+    }
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+벤치마크용 합성 VRP 인스턴스 생성기.
+get_optimizer_input_data와 같은 형식의 input_data를 만들고,
+스텁 경로 제공자로 segment_data_map까지 채울 수 있습니다.
+"""
+import datetime as dt
+import random
+from typing import Dict, List, Tuple
+
+from benchmarks.stub_providers import build_stub_route
+
+# 섹터가 분포한 군산/익산/전주 일대 범위 (lon_min, lon_max, lat_min, lat_max)
+SECTOR_BBOX = (126.68, 127.15, 35.82, 35.98)
+BENCH_RUN_DATE = dt.datetime(2025, 10, 15, 0, 0, 0)
+# (co2_gpkm, idle_gps) — 대형/중형/소형 화물차
+BENCH_VEHICLE_MODELS = [(1250.5, 11.2), (980.0, 9.1), (720.0, 7.4)]
+# get_settings / get_congestion_factors / 날씨 페널티 스텁 값 (벤치마크 공용)
+BENCH_SETTINGS = {
+    "alpha_load": 0.10, "beta_grade": 0.03,
+    "speed_idle_threshold": 15.0, "grade_cap": 0.30,
+    "weather_penalty": 0.05, "max_free_flow_speed": 90.0,
+    "ECO_CO2_WEIGHT": 0.8, "ECO_TIME_WEIGHT": 0.2,
+}
+BENCH_CONG = {"tf": 1.2, "idle_f": 0.05}
+BENCH_WEATHER = 1.0
+
+
+def random_locations(n: int, seed: int = 0) -> List[Dict]:
+    rng = random.Random(seed)
+    lon_min, lon_max, lat_min, lat_max = SECTOR_BBOX
+    return [
+        {"longitude": rng.uniform(lon_min, lon_max), "latitude": rng.uniform(lat_min, lat_max)}
+        for _ in range(n)
+    ]
+
+
+def make_input_data(num_jobs: int, num_vehicles: int = 1, seed: int = 0,
+                    capacity_kg: float = 25000.0, with_time_windows: bool = True,
+                    colocated_fraction: float = 0.0, vehicle_models: int = 1) -> Dict:
+    """
+    get_optimizer_input_data 반환 형식의 합성 인스턴스를 만듭니다.
+    colocated_fraction: 앞선 Job과 같은 좌표를 쓰는 Job 비율 (같은 주소로 여러 건 배송)
+    vehicle_models: 차량 모델(배출계수) 종류 수 — 차량에 순서대로 돌아가며 배정
+    """
+    rng = random.Random(seed)
+    points = random_locations(num_jobs + 1, seed)
+    depot = points[0]
+    for k in range(2, num_jobs + 1):
+        if rng.random() < colocated_fraction:
+            points[k] = dict(points[rng.randint(1, k - 1)])
+
+    # 엔진 모델은 각 차량이 총 수요를 싣고 출발하므로 총 수요를 차량 1대 용량 이내로 맞춘다
+    mean_demand = min(2000.0, 0.6 * capacity_kg / max(1, num_jobs))
+    jobs = []
+    for k, p in enumerate(points[1:]):
+        job = {
+            "job_id": k + 1,
+            "latitude": p["latitude"],
+            "longitude": p["longitude"],
+            "demand_kg": round(rng.uniform(0.5, 1.5) * mean_demand, 1),
+            "tw_start": None,
+            "tw_end": None,
+        }
+        if with_time_windows:
+            start_hour = rng.choice([8, 9, 10, 13])
+            job["tw_start"] = BENCH_RUN_DATE + dt.timedelta(hours=start_hour)
+            job["tw_end"] = BENCH_RUN_DATE + dt.timedelta(hours=start_hour + rng.choice([4, 6, 10]))
+        jobs.append(job)
+
+    models = BENCH_VEHICLE_MODELS[:max(1, min(vehicle_models, len(BENCH_VEHICLE_MODELS)))]
+    vehicles = [
+        {"vehicle_id": f"BENCH_TRK_{v:02d}", "capacity_kg": capacity_kg,
+         "co2_gpkm": models[v % len(models)][0], "idle_gps": models[v % len(models)][1]}
+        for v in range(num_vehicles)
+    ]
+    return {"depot": depot, "jobs": jobs, "vehicles": vehicles, "run_date": BENCH_RUN_DATE}
+
+
+def stub_route_matrices(locations: List[Dict]) -> Tuple[List[List[float]], List[List[float]], Dict]:
+    """create_kakao_route_matrices와 같은 반환 형식의 행렬을 네트워크 없이 만듭니다."""
+    n = len(locations)
+    distance_matrix = [[0.0] * n for _ in range(n)]
+    time_matrix = [[0.0] * n for _ in range(n)]
+    segment_data_map = {}
+    for i in range(n):
+        for j in range(n):
+            if i == j:
+                continue
+            route = build_stub_route(
+                (locations[i]["longitude"], locations[i]["latitude"]),
+                (locations[j]["longitude"], locations[j]["latitude"]),
+            )
+            distance_matrix[i][j] = route["total_distance_km"]
+            time_matrix[i][j] = route["total_time_sec"]
+            segment_data_map[(i, j)] = route["segments"]
+    return distance_matrix, time_matrix, segment_data_map
@@ -11,6 +11,13 @@ DB_USER = os.getenv('DB_USER')
 DB_PASSWORD = os.getenv('DB_PASSWORD')
 DB_DSN = os.getenv('DB_DSN')
 
+# DB 커넥션 풀
+DB_POOL_MIN = int(os.getenv('DB_POOL_MIN', 1))
+DB_POOL_MAX = int(os.getenv('DB_POOL_MAX', 8))
+DB_POOL_INCREMENT = int(os.getenv('DB_POOL_INCREMENT', 1))
+DB_POOL_WAIT_TIMEOUT_MS = int(os.getenv('DB_POOL_WAIT_TIMEOUT_MS', 5000))
+DB_STMT_CACHE_SIZE = int(os.getenv('DB_STMT_CACHE_SIZE', 40))
+
 # OCI SERVER
 OCI_WALLET_DIR = os.getenv('OCI_WALLET_DIR')
 OCI_WALLET_PASSWORD = os.getenv('OCI_WALLET_PASSWORD')
@@ -21,6 +28,90 @@ KAKAOMAP_SCRIPT = os.getenv('NEXT_PUBLIC_KAKAO_MAP_API_KEY')
 
 # OpenRouteService
 ORS_API_KEY = os.getenv('ORS_API_KEY')
+ORS_BASE_URL = os.getenv('ORS_BASE_URL', 'https://api.openrouteservice.org')
+ORS_MATRIX_PROFILE = os.getenv('ORS_MATRIX_PROFILE', 'driving-car')
+ORS_MATRIX_CHUNK_SIZE = int(os.getenv('ORS_MATRIX_CHUNK_SIZE', 50))   # 요청당 출발/도착 위치 수 (50x50 = 2500 ≤ ORS 한도 3500)
+
+# VRP 경로 행렬 제공자: kakao (쌍별 길찾기) | ors_matrix (ORS /v2/matrix 일괄 조회)
+ROUTE_MATRIX_PROVIDER = os.getenv('ROUTE_MATRIX_PROVIDER', 'kakao').lower()
+
+# 경로 행렬 생성 (동시 요청 수 / 초당 호출 한도 / 요청당 데드라인)
+ROUTE_MATRIX_MAX_WORKERS = int(os.getenv('ROUTE_MATRIX_MAX_WORKERS', 8))
+ROUTE_MATRIX_RATE_PER_SEC = float(os.getenv('ROUTE_MATRIX_RATE_PER_SEC', 10))
+ROUTE_REQUEST_DEADLINE_SEC = float(os.getenv('ROUTE_REQUEST_DEADLINE_SEC', 20))
+
+# 외부 API 공용 HTTP 클라이언트 (호스트별 keep-alive 커넥션 수 / 재시도 / 연결 타임아웃)
+HTTP_POOL_MAXSIZE = int(os.getenv('HTTP_POOL_MAXSIZE', 16))
+HTTP_RETRY_TOTAL = int(os.getenv('HTTP_RETRY_TOTAL', 2))
+HTTP_RETRY_BACKOFF = float(os.getenv('HTTP_RETRY_BACKOFF', 0.5))
+HTTP_CONNECT_TIMEOUT_SEC = float(os.getenv('HTTP_CONNECT_TIMEOUT_SEC', 5))
+
+# 희소(k-최근접) 경로 행렬: 0이면 전체 N² 조회
+ROUTE_MATRIX_SPARSE_K = int(os.getenv('ROUTE_MATRIX_SPARSE_K', 0))
+ROUTE_MATRIX_SPARSE_MIN_NODES = int(os.getenv('ROUTE_MATRIX_SPARSE_MIN_NODES', 30))
+ROUTE_ESTIMATE_DETOUR_FACTOR = float(os.getenv('ROUTE_ESTIMATE_DETOUR_FACTOR', 1.3))
+ROUTE_ESTIMATE_SPEED_KMH = float(os.getenv('ROUTE_ESTIMATE_SPEED_KMH', 40))
+ROUTE_ESTIMATE_COST_PENALTY = float(os.getenv('ROUTE_ESTIMATE_COST_PENALTY', 1.5))
+ROUTE_SPARSE_FORBID_ESTIMATED = os.getenv('ROUTE_SPARSE_FORBID_ESTIMATED', 'false').lower() in ('1', 'true', 'yes')
+
+# P2P 대안 경로: Kakao/ORS 동시 조회 데드라인, p95 지연 기반 hedged request
+# (Kakao 20초 / ORS 25초 요청 타임아웃보다 길게, 더 짧게 설정하면 요청 타임아웃도 데드라인으로 줄어듦)
+ROUTE_ALTERNATIVES_DEADLINE_SEC = float(os.getenv('ROUTE_ALTERNATIVES_DEADLINE_SEC', 30))
+ROUTE_HEDGE_ENABLED = os.getenv('ROUTE_HEDGE_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+ROUTE_HEDGE_MIN_SAMPLES = int(os.getenv('ROUTE_HEDGE_MIN_SAMPLES', 20))
+ROUTE_HEDGE_PERCENTILE = float(os.getenv('ROUTE_HEDGE_PERCENTILE', 95))
+
+# 같은 좌표(캐시 격자 기준)의 Job을 한 위치로 합쳐 경로 행렬 조회
+ROUTE_DEDUPE_LOCATIONS = os.getenv('ROUTE_DEDUPE_LOCATIONS', 'true').lower() in ('1', 'true', 'yes')
+
+# Eco-Cost 적재량 구간 수 (후보 해를 실제 적재량 반영 비용으로 재평가, 1 이하 = 사용 안 함)
+ECO_LOAD_BUCKETS = int(os.getenv('ECO_LOAD_BUCKETS', 5))
+
+# 2단계 경로 행렬: 요약 거리/시간만 조회해 풀고, 해에 쓰인 아크만 road_details 조회
+ROUTE_LAZY_SEGMENTS = os.getenv('ROUTE_LAZY_SEGMENTS', 'false').lower() in ('1', 'true', 'yes')
+
+# VRP warm start: 겹치는 Job이 있는 최근 Run의 배정 경로를 초기해로 사용
+WARM_START_ENABLED = os.getenv('WARM_START_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+WARM_START_LOOKBACK_RUNS = int(os.getenv('WARM_START_LOOKBACK_RUNS', 5))
+WARM_START_MIN_OVERLAP = float(os.getenv('WARM_START_MIN_OVERLAP', 0.5))
+
+# VRP 탐색 한도: balanced 등급 시간 한도, 목적함수 정체 시 조기 종료 기준 (0 = 사용 안 함)
+SOLVER_TIME_LIMIT_SEC = float(os.getenv('SOLVER_TIME_LIMIT_SEC', 10))
+SOLVER_PLATEAU_SEC = float(os.getenv('SOLVER_PLATEAU_SEC', 1.0))
+SOLVER_PLATEAU_SOLUTIONS = int(os.getenv('SOLVER_PLATEAU_SOLUTIONS', 0))
+SOLVER_PLATEAU_JOBS_SCALE = int(os.getenv('SOLVER_PLATEAU_JOBS_SCALE', 10))
+SOLVER_MAX_TIME_BUDGET_MS = int(os.getenv('SOLVER_MAX_TIME_BUDGET_MS', 60000))
+
+# 차량 1대 + Job 수가 이 값 이하면 Held-Karp 정확해 사용 (0 = 사용 안 함)
+EXACT_SOLVER_MAX_JOBS = int(os.getenv('EXACT_SOLVER_MAX_JOBS', 10))
+
+# 대규모 VRP 분할 풀이: Job 수가 기준 이상이면 지리 클러스터별 하위 VRP를 프로세스 풀에서 풀고 전역 개선
+DECOMPOSE_ENABLED = os.getenv('DECOMPOSE_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+DECOMPOSE_MIN_JOBS = int(os.getenv('DECOMPOSE_MIN_JOBS', 100))
+DECOMPOSE_JOBS_PER_CLUSTER = int(os.getenv('DECOMPOSE_JOBS_PER_CLUSTER', 40))
+DECOMPOSE_METHOD = os.getenv('DECOMPOSE_METHOD', 'kmeans')  # kmeans | sector
+DECOMPOSE_WORKERS = int(os.getenv('DECOMPOSE_WORKERS', 0))  # 0 = CPU 수
+DECOMPOSE_POLISH_MS = int(os.getenv('DECOMPOSE_POLISH_MS', 1500))
+PORTFOLIO_ENABLED = os.getenv('PORTFOLIO_ENABLED', 'false').lower() in ('1', 'true', 'yes')
+PORTFOLIO_SIZE = int(os.getenv('PORTFOLIO_SIZE', 4))
+PORTFOLIO_WORKERS = int(os.getenv('PORTFOLIO_WORKERS', 0))  # 0 = CPU 수
+PARETO_ENABLED = os.getenv('PARETO_ENABLED', 'false').lower() in ('1', 'true', 'yes')
+PARETO_WEIGHTS = os.getenv('PARETO_WEIGHTS', '1.0:0.0,0.5:0.5,0.2:0.8,0.0:1.0')  # ECO_CO2_WEIGHT:ECO_TIME_WEIGHT 목록
+
+# 경로 캐시 (메모리 LRU + SQLite)
+ROUTE_CACHE_ENABLED = os.getenv('ROUTE_CACHE_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+ROUTE_CACHE_PATH = os.getenv('ROUTE_CACHE_PATH', str(Path(__file__).resolve().parent / "data" / "route_cache.sqlite3"))
+ROUTE_CACHE_MEMORY_MB = float(os.getenv('ROUTE_CACHE_MEMORY_MB', 64))
+ROUTE_CACHE_TTL_SEC = float(os.getenv('ROUTE_CACHE_TTL_SEC', 7 * 24 * 3600))
+ROUTE_CACHE_COORD_PRECISION = int(os.getenv('ROUTE_CACHE_COORD_PRECISION', 4))
+
+# 비동기 최적화 작업 큐 (워커 수 / 대기열 한도 / 완료 작업 보관 시간)
+OPTIMIZE_JOB_WORKERS = int(os.getenv('OPTIMIZE_JOB_WORKERS', 2))
+OPTIMIZE_JOB_MAX_QUEUE = int(os.getenv('OPTIMIZE_JOB_MAX_QUEUE', 50))
+OPTIMIZE_JOB_RETENTION_SEC = float(os.getenv('OPTIMIZE_JOB_RETENTION_SEC', 3600))
+
+# 멀티 Run 배치(save-plan-and-analyze) 병렬 처리 프로세스 수
+LLM_RUN_MAX_WORKERS = int(os.getenv('LLM_RUN_MAX_WORKERS', 4))
 
 # Flask 포트 설정
 FLASK_PORT = int(os.getenv('FLASK_PORT', 5000))
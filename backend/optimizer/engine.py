@@ -1,22 +1,44 @@
 from ortools.constraint_solver import routing_enums_pb2
 from ortools.constraint_solver import pywrapcp
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Tuple, Optional, Callable, Iterable
+import atexit
 import math
+import multiprocessing
+import os
+import threading
+import time
 import datetime as dt
 import json
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+
+import numpy as np
 
 try:
-    from services.db_handler import get_optimizer_input_data, save_optimization_results
+    from services.db_handler import (
+        get_optimizer_input_data, save_optimization_results, get_previous_run_routes, PARETO_ROUTE_PREFIX
+    )
     from services.co2_calculator import (
-        co2_for_route,
+        co2_for_route_batch,
+        arc_co2_features,
+        co2_from_arc_features,
+        flatten_segment_lists,
         VehicleEF,
-        Segment,
         get_settings,
         get_congestion_factors,
         get_weather_penalty_value
     )
-    from services.path_data_loader import create_kakao_route_matrices, get_combined_route_alternatives
+    from services.path_data_loader import (
+        create_route_matrices,
+        fetch_arc_details,
+        get_combined_route_alternatives,
+        is_summary_arc,
+        resolve_estimated_arcs
+    )
+    from services.segment_store import ARC_FLAG_ESTIMATED, as_segment_store
+    import config
 except ImportError as e:
     print(f"ERROR: 'services' ?? ??? ??. ?? ?? ??: {e}")
     sys.exit(1)
@@ -66,9 +88,1004 @@ def _build_p2p_response_summary(summary_db: Dict, route_option_name: str,
     return response_summary
 
 
+# --- Helper Function: 아크 비용/시간 행렬 사전 계산 (VRP용) ---
+UNREACHABLE_ARC_TIME_SEC = 86400
+UNREACHABLE_ARC_COST = 10 ** 12
+
+
+def _precompute_arc_matrices(num_locations: int, segment_data_map: Dict[Tuple[int, int], List[Dict]],
+                             class_vehicle_efs: List[VehicleEF], load_kg: float,
+                             base_datetime: dt.datetime, cong_factors: Dict[str, float],
+                             co2_settings: Dict[str, float], weather_penalty: float, default_slope: float,
+                             co2_weight: float, time_weight: float, co2_scale_factor: float
+                             ) -> Tuple[List[List[List[int]]], List[List[int]]]:
+    """
+    차량 클래스별 정수 Eco-Cost 행렬과 (차량과 무관한) 정수 시간 행렬을 계산합니다.
+    OR-Tools 콜백은 이 행렬을 조회만 하므로 탐색 중 Python CO2 계산이 발생하지 않습니다.
+    경로가 없는 아크는 UNREACHABLE_ARC_* 값으로, Segment가 빈 아크는 0으로 채웁니다.
+    segment_data_map은 SegmentStore(또는 dict-of-lists → 변환)에서 구간 배열을 바로 꺼내 씁니다.
+    """
+    store = as_segment_store(segment_data_map, num_locations)
+    eco_cost_matrices = [
+        [[0 if i == j else UNREACHABLE_ARC_COST for j in range(num_locations)] for i in range(num_locations)]
+        for _ in class_vehicle_efs
+    ]
+    time_matrix = [[0 if i == j else UNREACHABLE_ARC_TIME_SEC for j in range(num_locations)] for i in range(num_locations)]
+
+    # Segment가 빈 아크(같은 위치의 노드 사이, 거리 0 경로)는 비용/시간 0
+    arc_i, arc_j = store.present_arcs()
+    off_diagonal = arc_i != arc_j
+    arc_i, arc_j = arc_i[off_diagonal], arc_j[off_diagonal]
+    has_segments = store.arc_lengths(arc_i, arc_j) > 0
+    for i, j in zip(arc_i[~has_segments].tolist(), arc_j[~has_segments].tolist()):
+        time_matrix[i][j] = 0
+        for matrix in eco_cost_matrices:
+            matrix[i][j] = 0
+
+    arcs = list(zip(arc_i[has_segments].tolist(), arc_j[has_segments].tolist()))
+    if not arcs:
+        return eco_cost_matrices, time_matrix
+    distance_km, base_time_sec, arc_offsets = store.arc_arrays(arcs)
+    # 구간 목록 → 아크별 특징 벡터(1회), 차량 클래스별 비용은 특징 벡터의 곱셈·덧셈으로 계산
+    arc_features = arc_co2_features(distance_km, base_time_sec, default_slope, arc_offsets, cong_factors, co2_settings)
+
+    for class_idx, vehicle_info in enumerate(class_vehicle_efs):
+        co2_result = co2_from_arc_features(arc_features, vehicle_info, load_kg, co2_settings, weather_penalty)
+        eco_costs = (co2_weight * (co2_result['co2_total_g'] / co2_scale_factor)) + (time_weight * co2_result['total_time_sec'])
+        eco_costs_int = (eco_costs * 1000).astype(np.int64).tolist()
+        arc_times_int = co2_result['total_time_sec'].astype(np.int64).tolist() if class_idx == 0 else None
+        for k, (from_node, to_node) in enumerate(arcs):
+            eco_cost_matrices[class_idx][from_node][to_node] = eco_costs_int[k]
+            if arc_times_int is not None:
+                time_matrix[from_node][to_node] = arc_times_int[k]
+
+    return eco_cost_matrices, time_matrix
+
+
+# --- Helper Function: 적재량 구간별 Eco-Cost 텐서 (적재량 반영 재평가용) ---
+ECO_LOAD_BUCKETS = getattr(config, "ECO_LOAD_BUCKETS", 5)
+
+
+def _load_bucket_values(max_load_kg: float, num_buckets: int) -> np.ndarray:
+    """0 ~ max_load_kg를 균등 분할한 적재량 구간 대표값. (마지막 값 = max_load_kg)"""
+    return np.linspace(0.0, float(max_load_kg), max(2, int(num_buckets)))
+
+
+def _precompute_load_cost_tensor(num_locations: int, segment_data_map, class_vehicle_efs: List[VehicleEF],
+                                 load_buckets: np.ndarray, cong_factors: Dict[str, float],
+                                 co2_settings: Dict[str, float], weather_penalty: float, default_slope: float,
+                                 co2_weight: float, time_weight: float, co2_scale_factor: float) -> np.ndarray:
+    """
+    아크 × 차량 클래스 × 적재량 구간의 정수 Eco-Cost 텐서를 계산합니다. shape = (클래스, 구간, N, N)
+    아크별 CO2 특징 벡터를 1회 집계한 뒤 (구간 수, 1)로 브로드캐스트하므로 구간 수만큼 구간 목록을 다시 돌지 않습니다.
+    경로가 없는 아크는 UNREACHABLE_ARC_COST, Segment가 빈 아크와 대각선은 0입니다.
+    """
+    store = as_segment_store(segment_data_map, num_locations)
+    tensor = np.full((len(class_vehicle_efs), len(load_buckets), num_locations, num_locations),
+                     UNREACHABLE_ARC_COST, dtype=np.int64)
+    diagonal = np.arange(num_locations)
+    tensor[:, :, diagonal, diagonal] = 0
+
+    arc_i, arc_j = store.present_arcs()
+    off_diagonal = arc_i != arc_j
+    arc_i, arc_j = arc_i[off_diagonal], arc_j[off_diagonal]
+    has_segments = store.arc_lengths(arc_i, arc_j) > 0
+    tensor[:, :, arc_i[~has_segments], arc_j[~has_segments]] = 0
+
+    arcs = list(zip(arc_i[has_segments].tolist(), arc_j[has_segments].tolist()))
+    if not arcs:
+        return tensor
+    distance_km, base_time_sec, arc_offsets = store.arc_arrays(arcs)
+    arc_features = arc_co2_features(distance_km, base_time_sec, default_slope, arc_offsets, cong_factors, co2_settings)
+    for class_idx, vehicle_info in enumerate(class_vehicle_efs):
+        co2_result = co2_from_arc_features(arc_features, vehicle_info, load_buckets[:, None],
+                                           co2_settings, weather_penalty)
+        eco_costs = (co2_weight * (co2_result['co2_total_g'] / co2_scale_factor)) + (time_weight * co2_result['total_time_sec'])
+        tensor[class_idx][:, arc_i[has_segments], arc_j[has_segments]] = (eco_costs * 1000).astype(np.int64)
+    return tensor
+
+
+def _rescore_routes_by_load(routes: List[List[int]], demands: List[int], total_demand: int,
+                            vehicle_class_index: List[int], load_cost_tensor: np.ndarray,
+                            load_buckets: np.ndarray) -> Dict[str, int]:
+    """
+    차량별 방문 순서의 각 아크를 출발 시점 적재량에 가장 가까운 구간 비용으로 다시 합산합니다.
+    적재량은 Capacity 차원과 같이 차고지에서 total_demand로 시작해 Job마다 demands(음수)만큼 줄어듭니다.
+    (차고지 복귀 아크 포함, 텐서 조회만 수행하므로 Assignment 없이 워커 결과 경로에도 적용 가능)
+    반환: 적재량 반영 Eco-Cost, total_demand 가정 Eco-Cost(마지막 구간 = Solver 행렬과 같은 기준)
+    """
+    load_aware, full_load = 0, 0
+    for vehicle_id_idx, route in enumerate(routes):
+        if not route:
+            continue
+        costs = load_cost_tensor[vehicle_class_index[vehicle_id_idx]]
+        tour = np.asarray([0] + list(route) + [0], dtype=np.int64)
+        loads = total_demand + np.concatenate([[0], np.cumsum(np.asarray(demands, dtype=np.int64)[tour[1:-1]])])
+        buckets = np.abs(load_buckets[None, :] - loads[:, None]).argmin(axis=1)
+        load_aware += int(costs[buckets, tour[:-1], tour[1:]].sum())
+        full_load += int(costs[-1, tour[:-1], tour[1:]].sum())
+    return {"eco_cost_load_aware": load_aware, "eco_cost_full_load": full_load}
+
+
+# --- Helper Function: 탐색 시간 예산 / 정체(plateau) 조기 종료 ---
+SOLVER_TIME_LIMIT_SEC = getattr(config, "SOLVER_TIME_LIMIT_SEC", 10)
+SOLVER_PLATEAU_SEC = getattr(config, "SOLVER_PLATEAU_SEC", 1.0)
+SOLVER_PLATEAU_SOLUTIONS = getattr(config, "SOLVER_PLATEAU_SOLUTIONS", 0)
+# Job 수가 이 값을 넘으면 정체 판정 시간을 비례해 늘림 (큰 인스턴스는 GLS가 긴 정체 후에도 개선)
+SOLVER_PLATEAU_JOBS_SCALE = getattr(config, "SOLVER_PLATEAU_JOBS_SCALE", 10)
+SOLVER_MAX_TIME_BUDGET_MS = getattr(config, "SOLVER_MAX_TIME_BUDGET_MS", 60000)
+SOLVER_MIN_TIME_BUDGET_MS = 100
+# 솔버 자체 시간 한도에 더하는 여유 — 한도 판정은 _PlateauMonitor(CustomLimit)가 먼저 하고,
+# 솔버 한도는 첫 해를 찾기 전 등 모니터가 멈추지 못하는 경우의 안전장치로만 동작
+SOLVER_LIMIT_GRACE_MS = 50
+# quality 등급별 (시간 한도 ms, 정체 판정 초) — balanced가 기본값 (config 값 그대로)
+SOLVER_QUALITY_TIERS = {
+    "fast": {"time_limit_ms": 2000, "plateau_sec": 0.3},
+    "balanced": {"time_limit_ms": int(SOLVER_TIME_LIMIT_SEC * 1000), "plateau_sec": SOLVER_PLATEAU_SEC},
+    "best": {"time_limit_ms": 30000, "plateau_sec": 3.0},
+}
+DEFAULT_SOLVER_QUALITY = "balanced"
+
+
+def _resolve_solver_budget(time_budget_ms: Optional[int] = None, quality: Optional[str] = None,
+                           num_jobs: int = 0) -> Dict[str, Any]:
+    """
+    요청의 quality 등급 / time_budget_ms로 탐색 한도를 정합니다.
+    time_budget_ms가 있으면 등급의 시간 한도를 덮어쓰고 [SOLVER_MIN_TIME_BUDGET_MS, SOLVER_MAX_TIME_BUDGET_MS]로 자릅니다.
+    정체 판정 시간은 Job 수 / SOLVER_PLATEAU_JOBS_SCALE 배로 늘립니다 (1배 미만이면 그대로).
+    """
+    tier = quality if quality in SOLVER_QUALITY_TIERS else DEFAULT_SOLVER_QUALITY
+    if quality is not None and quality not in SOLVER_QUALITY_TIERS:
+        print(f"[WARN] 알 수 없는 quality '{quality}' → {DEFAULT_SOLVER_QUALITY}")
+    budget = {"quality": tier, **SOLVER_QUALITY_TIERS[tier], "plateau_solutions": SOLVER_PLATEAU_SOLUTIONS}
+    if SOLVER_PLATEAU_JOBS_SCALE > 0:
+        budget["plateau_sec"] = round(budget["plateau_sec"] * max(1.0, num_jobs / SOLVER_PLATEAU_JOBS_SCALE), 3)
+    if time_budget_ms is not None:
+        budget["time_limit_ms"] = int(min(max(int(time_budget_ms), SOLVER_MIN_TIME_BUDGET_MS), SOLVER_MAX_TIME_BUDGET_MS))
+    return budget
+
+
+class _PlateauMonitor:
+    """
+    RoutingModel에 붙이는 탐색 모니터 (attach()로 AtSolutionCallback + CustomLimit 등록).
+    - 최선 해가 개선될 때마다 (경과 시간, 목적함수)를 trajectory에 기록 (GLS가 받아들인 비개선 해는 제외)
+    - plateau_solutions개 해 동안 개선이 없으면 해 콜백에서 FinishCurrentSearch로 종료
+    - 마지막 개선 후 plateau_sec이 지나거나 time_limit_ms가 다 되면 CustomLimit에서 종료
+      (탐색 중 주기적으로 호출되므로 새 해가 나오지 않는 탐색도 멈춤, 0 이하 = 해당 기준 사용 안 함)
+    stop_reason은 이 모니터가 실제로 탐색을 끝낸 경우에만 채워집니다.
+    """
+
+    def __init__(self, routing: pywrapcp.RoutingModel, plateau_sec: float, plateau_solutions: int = 0,
+                 time_limit_ms: int = 0):
+        self.routing = routing
+        self.plateau_sec = float(plateau_sec or 0)
+        self.plateau_solutions = int(plateau_solutions or 0)
+        self.time_limit_sec = float(time_limit_ms or 0) / 1000
+        self.trajectory: List[Tuple[float, int]] = []
+        self.stop_reason: Optional[str] = None
+        self.started = time.perf_counter()
+        self._last_improved = self.started
+        self._since_improved = 0
+        self._limit = None
+
+    def attach(self) -> None:
+        self.routing.AddAtSolutionCallback(self)
+        # SearchLimit은 파이썬 쪽에서 참조를 잡고 있어야 함
+        self._limit = self.routing.solver().CustomLimit(self.limit_reached)
+        self.routing.AddSearchMonitor(self._limit)
+
+    def start(self, started: Optional[float] = None) -> None:
+        self.started = self._last_improved = time.perf_counter() if started is None else started
+
+    def __call__(self) -> None:
+        now = time.perf_counter()
+        objective = int(self.routing.CostVar().Max())
+        if not self.trajectory or objective < self.trajectory[-1][1]:
+            self.trajectory.append((round(now - self.started, 3), objective))
+            self._last_improved, self._since_improved = now, 0
+            return
+        self._since_improved += 1
+        if self.plateau_solutions > 0 and self._since_improved >= self.plateau_solutions and not self.stop_reason:
+            self.stop_reason = "plateau_solutions"
+            self.routing.solver().FinishCurrentSearch()
+
+    def limit_reached(self) -> bool:
+        """CustomLimit 콜백: True를 돌려주면 탐색 종료. 첫 해를 찾기 전에는 솔버 자체 시간 한도에 맡김."""
+        if self.stop_reason:
+            return True
+        if not self.trajectory:
+            return False
+        now = time.perf_counter()
+        if self.plateau_sec > 0 and now - self._last_improved >= self.plateau_sec:
+            self.stop_reason = "plateau_time"
+        elif self.time_limit_sec > 0 and now - self.started >= self.time_limit_sec:
+            self.stop_reason = "time_limit"
+        return self.stop_reason is not None
+
+
+def _solver_stop_reason(monitor: _PlateauMonitor, routing: pywrapcp.RoutingModel) -> str:
+    """모니터가 끝낸 탐색이면 그 사유, 아니면 솔버 상태로 판단 (시간 초과 실패 → time_limit)."""
+    if monitor.stop_reason:
+        return monitor.stop_reason
+    if routing.status() == routing_enums_pb2.RoutingSearchStatus.ROUTING_FAIL_TIMEOUT:
+        return "time_limit"
+    return "completed"
+
+
+# --- Helper Function: VRP 모델 구성 (단일 모델 / 분할 하위 문제 공용) ---
+def _build_vrp_model(eco_cost_matrices: List[List[List[int]]], transit_time_matrix: List[List[int]],
+                     demands: List[int], time_windows: List[Tuple[int, int]], vehicle_capacities: List[int],
+                     vehicle_class_index: List[int], total_demand: int,
+                     forbidden_arcs: Iterable[Tuple[int, int]] = ()) -> Dict[str, Any]:
+    """
+    Eco-Cost(차량 클래스별) + Capacity + Time 차원을 가진 RoutingModel을 만듭니다.
+    노드 0이 차고지이며, 각 차량은 total_demand를 싣고 출발해 Job마다 demands(음수)만큼 내립니다.
+    행렬은 그대로 등록만 하고(수정하지 않음), forbidden_arcs는 NextVar 도메인에서 제외합니다.
+    반환: manager, routing, capacity_dimension, time_dimension, vehicle_classes, forbidden_arcs(제외한 아크 수)
+    """
+    num_locations = len(transit_time_matrix)
+    num_vehicles = len(vehicle_capacities)
+    manager = pywrapcp.RoutingIndexManager(num_locations, num_vehicles, [0] * num_vehicles, [0] * num_vehicles)
+    routing = pywrapcp.RoutingModel(manager)
+
+    forbidden = 0
+    for i, j in forbidden_arcs:
+        routing.NextVar(manager.NodeToIndex(i)).RemoveValue(manager.NodeToIndex(j))
+        forbidden += 1
+
+    # 차량 클래스별 Eco-Cost 행렬을 1개씩 등록하고 차량마다 자기 클래스 평가기를 지정
+    # (콜백 안에서 차량 → VehicleEF를 조회하지 않으므로 평가 시 Python 코드가 실행되지 않음)
+    class_callback_indices = [routing.RegisterTransitMatrix(matrix) for matrix in eco_cost_matrices]
+    time_callback_index = routing.RegisterTransitMatrix(transit_time_matrix)
+
+    def demand_callback_func(from_index):
+        try:
+            node_index = manager.IndexToNode(from_index)
+            return demands[node_index]
+        except Exception:
+            return 0
+    demand_callback_index = routing.RegisterUnaryTransitCallback(demand_callback_func)
+
+    max_capacity = max(vehicle_capacities) if vehicle_capacities else 0
+    routing.AddDimension(demand_callback_index, 0, max_capacity, False, 'Capacity')
+
+    initial_depot_time = int(time_windows[0][0])
+    routing.AddDimension(time_callback_index, 86400, 86400, True, 'Time')
+    time_dimension = routing.GetDimensionOrDie('Time')
+
+    for vehicle_id_idx in range(num_vehicles):
+        depot_index = routing.Start(vehicle_id_idx)
+        time_dimension.CumulVar(depot_index).SetRange(initial_depot_time, initial_depot_time)
+    for location_idx, time_window in enumerate(time_windows):
+        if location_idx == 0:
+            continue
+        index = manager.NodeToIndex(location_idx)
+        time_dimension.CumulVar(index).SetRange(int(time_window[0]), int(time_window[1]))
+
+    capacity_dimension = routing.GetDimensionOrDie('Capacity')
+    for vehicle_id_idx in range(num_vehicles):
+        depot_index = routing.Start(vehicle_id_idx)
+        capacity_dimension.CumulVar(depot_index).SetRange(total_demand, total_demand)
+
+    if len(class_callback_indices) == 1:
+        routing.SetArcCostEvaluatorOfAllVehicles(class_callback_indices[0])
+    else:
+        for vehicle_id_idx, class_idx in enumerate(vehicle_class_index):
+            routing.SetArcCostEvaluatorOfVehicle(class_callback_indices[class_idx], vehicle_id_idx)
+
+    return {"manager": manager, "routing": routing, "capacity_dimension": capacity_dimension,
+            "time_dimension": time_dimension, "vehicle_classes": len(class_callback_indices),
+            "forbidden_arcs": forbidden}
+
+
+def _default_search_parameters(time_limit_ms: int, first_solution: str = "PATH_CHEAPEST_ARC",
+                               metaheuristic: str = "GUIDED_LOCAL_SEARCH"):
+    """
+    초기해 전략 + 메타휴리스틱(기본 PATH_CHEAPEST_ARC + GUIDED_LOCAL_SEARCH).
+    솔버 시간 한도는 time_limit_ms + SOLVER_LIMIT_GRACE_MS (time_limit_ms 자체는 _PlateauMonitor가 지킴).
+    """
+    search_parameters = pywrapcp.DefaultRoutingSearchParameters()
+    search_parameters.first_solution_strategy = getattr(routing_enums_pb2.FirstSolutionStrategy, first_solution)
+    search_parameters.local_search_metaheuristic = getattr(routing_enums_pb2.LocalSearchMetaheuristic, metaheuristic)
+    search_parameters.time_limit.FromMilliseconds(int(time_limit_ms) + SOLVER_LIMIT_GRACE_MS)
+    return search_parameters
+
+
+def _extract_routes(solution, routing, manager, nodes: Optional[List[int]] = None) -> List[List[int]]:
+    """차량별 방문 노드 목록 (차고지 제외). nodes를 주면 로컬 노드 번호를 nodes[로컬]로 바꿔 반환합니다."""
+    routes = []
+    for vehicle_id_idx in range(manager.GetNumberOfVehicles()):
+        route, index = [], solution.Value(routing.NextVar(routing.Start(vehicle_id_idx)))
+        while not routing.IsEnd(index):
+            node = manager.IndexToNode(index)
+            route.append(nodes[node] if nodes is not None else node)
+            index = solution.Value(routing.NextVar(index))
+        routes.append(route)
+    return routes
+
+
+# --- Helper Function: 소규모 단일 차량 VRP 정확해 (Held-Karp 비트마스크 DP) ---
+EXACT_SOLVER_MAX_JOBS = getattr(config, "EXACT_SOLVER_MAX_JOBS", 10)
+TIME_HORIZON_SEC = 86400
+
+
+def _held_karp_route(eco_cost: List[List[int]], transit_time: List[List[int]], demands: List[int],
+                     time_windows: List[Tuple[int, int]], capacity: int,
+                     total_demand: int) -> Optional[Tuple[List[int], int]]:
+    """
+    차량 1대가 차고지(0)에서 출발해 모든 Job을 방문하고 돌아오는 Eco-Cost 최소 순서를 구합니다.
+    _build_vrp_model과 같은 제약(시간창·대기 허용·TIME_HORIZON_SEC, 적재량 0~capacity)을 지키며,
+    상태 (방문 집합 mask, 마지막 노드)마다 (비용, 도착 시각) 파레토 라벨을 유지하므로 시간창이 있어도 최적입니다.
+    반환: (방문 노드 순서, 목적함수) — 가능한 순서가 없으면 None
+    """
+    num_jobs = len(eco_cost) - 1
+    if num_jobs <= 0 or not (0 <= total_demand <= capacity):
+        return None
+    full_mask = (1 << num_jobs) - 1
+    depot_start = int(time_windows[0][0])
+    # mask별 잔여 적재량 = total_demand + 방문한 Job의 (음수) 수요 합
+    job_demands = np.asarray(demands[1:], dtype=np.int64)
+    bits = (np.arange(full_mask + 1)[:, None] >> np.arange(num_jobs)[None, :]) & 1
+    remaining_load = total_demand + bits @ job_demands
+
+    # labels[mask * (num_jobs + 1) + last] = [(cost, arrival, last, parent_label), ...] (서로 지배하지 않음)
+    labels: Dict[int, List[Tuple[int, int, int, Any]]] = {}
+
+    def _push(key: int, cost: int, arrival: int, node: int, parent) -> None:
+        bucket = labels.setdefault(key, [])
+        for other in bucket:
+            if other[0] <= cost and other[1] <= arrival:
+                return
+        bucket[:] = [other for other in bucket if not (cost <= other[0] and arrival <= other[1])]
+        bucket.append((cost, arrival, node, parent))
+
+    for node in range(1, num_jobs + 1):
+        arrival = max(depot_start + transit_time[0][node], time_windows[node][0])
+        if arrival <= time_windows[node][1]:
+            _push((1 << (node - 1)) * (num_jobs + 1) + node, eco_cost[0][node], arrival, node, None)
+
+    for mask in range(1, full_mask + 1):
+        if not (0 <= remaining_load[mask] <= capacity):
+            continue
+        for last in range(1, num_jobs + 1):
+            for label in labels.get(mask * (num_jobs + 1) + last, ()):
+                cost, arrival = label[0], label[1]
+                for node in range(1, num_jobs + 1):
+                    bit = 1 << (node - 1)
+                    if mask & bit:
+                        continue
+                    next_arrival = max(arrival + transit_time[last][node], time_windows[node][0])
+                    if next_arrival > time_windows[node][1]:
+                        continue
+                    _push((mask | bit) * (num_jobs + 1) + node, cost + eco_cost[last][node],
+                          next_arrival, node, label)
+
+    best = None
+    for last in range(1, num_jobs + 1):
+        for label in labels.get(full_mask * (num_jobs + 1) + last, ()):
+            if label[1] + transit_time[last][0] > TIME_HORIZON_SEC:
+                continue
+            total = label[0] + eco_cost[last][0]
+            if best is None or total < best[0]:
+                best = (total, label)
+    if best is None:
+        return None
+
+    route, label = [], best[1]
+    while label is not None:
+        route.append(label[2])
+        label = label[3]
+    return route[::-1], int(best[0])
+
+
+# --- Helper Function: 솔버 프로세스 풀 (분할 풀이 / 포트폴리오 / Pareto 공용) ---
+# Flask / 작업 큐 프로세스는 oracledb 세션 풀, keep-alive HTTP 세션, SQLite 캐시 연결을 들고 있어
+# fork하면 교착·핸들 손상 위험이 있으므로 spawn 컨텍스트 풀 하나를 지연 생성해 재사용합니다.
+_solver_executor = None
+_solver_executor_lock = threading.Lock()
+
+
+def _solver_worker_limit() -> int:
+    """
+    솔버 풀 프로세스 수 = CPU 수. Run 배치 워커(LLM_RUN_MAX_WORKERS개가 동시에 도는 spawn 프로세스) 안에서
+    호출되면 CPU 수를 배치 워커 수로 나눠 프로세스 수가 곱으로 늘지 않게 합니다.
+    """
+    cpus = os.cpu_count() or 1
+    if multiprocessing.parent_process() is not None:
+        cpus //= max(1, int(getattr(config, "LLM_RUN_MAX_WORKERS", 4)))
+    return max(1, cpus)
+
+
+def _get_solver_executor() -> ProcessPoolExecutor:
+    """워커 기동 비용(모듈 import)을 매 풀이마다 치르지 않도록 풀을 재사용합니다."""
+    global _solver_executor
+    if _solver_executor is None:
+        with _solver_executor_lock:
+            if _solver_executor is None:
+                _solver_executor = ProcessPoolExecutor(max_workers=_solver_worker_limit(),
+                                                       mp_context=multiprocessing.get_context("spawn"))
+    return _solver_executor
+
+
+def _reset_solver_executor() -> None:
+    """워커 프로세스가 비정상 종료되어 풀이 깨진 경우 다음 풀이에서 새로 만들도록 합니다."""
+    global _solver_executor
+    with _solver_executor_lock:
+        if _solver_executor is not None:
+            _solver_executor.shutdown(wait=False, cancel_futures=True)
+            _solver_executor = None
+
+
+@atexit.register
+def _shutdown_solver_executor() -> None:
+    if _solver_executor is not None:
+        _solver_executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _solver_workers(num_tasks: int, configured: int = 0) -> int:
+    """한 번에 돌릴 작업 수 = min(작업 수, 설정값(0 = 제한 없음), 풀 프로세스 수)."""
+    return max(1, min(num_tasks, configured or num_tasks, _solver_worker_limit()))
+
+
+def _map_in_solver_pool(fn: Callable, tasks: List[Dict[str, Any]], workers: int) -> List[Any]:
+    """tasks를 workers개씩 라운드로 나눠 공용 풀에서 실행합니다. (입력 순서대로 결과 반환)"""
+    executor = _get_solver_executor()
+    results: List[Any] = []
+    try:
+        for start in range(0, len(tasks), workers):
+            results.extend(executor.map(fn, tasks[start:start + workers]))
+    except BrokenProcessPool:
+        _reset_solver_executor()
+        raise
+    return results
+
+
+# --- Helper Function: 대규모 VRP 분할 풀이 (클러스터별 하위 VRP → 프로세스 풀) ---
+DECOMPOSE_ENABLED = getattr(config, "DECOMPOSE_ENABLED", True)
+DECOMPOSE_MIN_JOBS = getattr(config, "DECOMPOSE_MIN_JOBS", 100)
+DECOMPOSE_JOBS_PER_CLUSTER = getattr(config, "DECOMPOSE_JOBS_PER_CLUSTER", 40)
+DECOMPOSE_METHOD = getattr(config, "DECOMPOSE_METHOD", "kmeans")
+DECOMPOSE_WORKERS = getattr(config, "DECOMPOSE_WORKERS", 0)
+DECOMPOSE_POLISH_MS = getattr(config, "DECOMPOSE_POLISH_MS", 1500)
+
+
+def _kmeans_labels(points: np.ndarray, k: int, seed: int = 0, max_iter: int = 50) -> np.ndarray:
+    """(n, 2) 좌표의 k-means 라벨 (k-means++ 초기화, 빈 클러스터는 가장 먼 점으로 재시드)."""
+    rng = np.random.default_rng(seed)
+    centers = [points[rng.integers(len(points))]]
+    for _ in range(1, k):
+        d2 = np.min(((points[:, None, :] - np.asarray(centers)[None, :, :]) ** 2).sum(axis=2), axis=1)
+        probs = d2 / d2.sum() if d2.sum() > 0 else None
+        centers.append(points[rng.choice(len(points), p=probs)])
+    centers = np.asarray(centers, dtype=float)
+
+    labels = np.zeros(len(points), dtype=np.int64)
+    for _ in range(max_iter):
+        d2 = ((points[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2)
+        labels = d2.argmin(axis=1)
+        new_centers = centers.copy()
+        for c in range(k):
+            members = points[labels == c]
+            if len(members):
+                new_centers[c] = members.mean(axis=0)
+            else:
+                new_centers[c] = points[d2.min(axis=1).argmax()]
+        if np.allclose(new_centers, centers):
+            break
+        centers = new_centers
+    return labels
+
+
+def _partition_jobs(jobs: List[Dict], num_clusters: int, method: str = "kmeans") -> List[List[int]]:
+    """
+    Job을 지리적으로 묶어 클러스터별 노드 번호(1부터) 목록을 반환합니다.
+    - sector: JOBS.SECTOR_ID로 묶음 (섹터가 2개 미만이거나 num_clusters보다 많으면 k-means로 대체)
+    - kmeans: 위경도(경도는 cos(위도) 보정) k-means
+    """
+    if method == "sector" and all(job.get('sector_id') for job in jobs):
+        groups: Dict[str, List[int]] = {}
+        for node, job in enumerate(jobs, start=1):
+            groups.setdefault(job['sector_id'], []).append(node)
+        if 2 <= len(groups) <= num_clusters:
+            return list(groups.values())
+
+    lat = np.array([float(job['latitude']) for job in jobs])
+    lon = np.array([float(job['longitude']) for job in jobs])
+    points = np.column_stack([lon * math.cos(math.radians(float(lat.mean()))), lat])
+    labels = _kmeans_labels(points, num_clusters)
+    clusters = [(np.flatnonzero(labels == c) + 1).tolist() for c in range(num_clusters)]
+    return [cluster for cluster in clusters if cluster]
+
+
+def _allocate_vehicles(clusters: List[List[int]], demands: List[int],
+                       vehicle_capacities: List[int]) -> List[List[int]]:
+    """
+    클러스터마다 차량 인덱스 목록을 배정합니다.
+    수요가 큰 클러스터부터 큰 차량을 1대씩 준 뒤, 남은 차량은 (수요 - 배정 용량) 부족분이 큰 클러스터,
+    부족분이 없으면 차량당 Job 수(시간창 부담)가 큰 클러스터에 순서대로 배정합니다.
+    """
+    cluster_demand = [-sum(demands[node] for node in cluster) for cluster in clusters]
+    vehicle_order = sorted(range(len(vehicle_capacities)), key=lambda v: -vehicle_capacities[v])
+    allocation: List[List[int]] = [[] for _ in clusters]
+    for c, v in zip(sorted(range(len(clusters)), key=lambda c: -cluster_demand[c]), vehicle_order):
+        allocation[c].append(v)
+    for v in vehicle_order[len(clusters):]:
+        deficit = [cluster_demand[c] - sum(vehicle_capacities[u] for u in allocation[c]) for c in range(len(clusters))]
+        if max(deficit) > 0:
+            target = int(np.argmax(deficit))
+        else:
+            target = max(range(len(clusters)), key=lambda c: len(clusters[c]) / len(allocation[c]))
+        allocation[target].append(v)
+    return allocation
+
+
+def _solve_sub_vrp(task: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    (프로세스 풀 워커) 클러스터 하위 VRP 1개를 풉니다.
+    task의 행렬/시간창은 [차고지] + 클러스터 노드 순서의 로컬 번호이며, 결과 경로는 전역 노드 번호로 돌려줍니다.
+    """
+    started = time.perf_counter()
+    nodes = task["nodes"]
+    model = _build_vrp_model(task["eco_cost_matrices"], task["transit_time_matrix"], task["demands"],
+                             task["time_windows"], task["vehicle_capacities"], task["vehicle_class_index"],
+                             task["total_demand"])
+    routing, manager = model["routing"], model["manager"]
+    monitor = _PlateauMonitor(routing, task["plateau_sec"], time_limit_ms=task["time_limit_ms"])
+    monitor.attach()
+    monitor.start()
+    solution = routing.SolveWithParameters(_default_search_parameters(task["time_limit_ms"]))
+    if solution is None:
+        return {"routes": None, "objective": None, "solve_time_sec": round(time.perf_counter() - started, 3)}
+
+    return {"routes": _extract_routes(solution, routing, manager, nodes), "objective": int(solution.ObjectiveValue()),
+            "solve_time_sec": round(time.perf_counter() - started, 3)}
+
+
+def _decompose_and_solve(input_data: Dict, eco_cost_matrices: List[List[List[int]]],
+                         transit_time_matrix: List[List[int]], demands: List[int],
+                         time_windows: List[Tuple[int, int]], vehicle_capacities: List[int],
+                         vehicle_class_index: List[int],
+                         solver_budget: Dict[str, Any]) -> Tuple[Optional[List[List[int]]], Dict[str, Any]]:
+    """
+    Job을 클러스터로 나누고 차량을 배정한 뒤, 클러스터별 하위 VRP를 프로세스 풀에서 병렬로 풉니다.
+    시간 한도의 최대 1/4(DECOMPOSE_POLISH_MS 이하)는 전역 개선 몫으로 남기고 나머지를 라운드 수로 나눕니다.
+    반환: (전체 모델 차량 순서의 경로 목록, stats). 하위 문제가 하나라도 해를 못 찾거나
+    나눈 시간이 SOLVER_MIN_TIME_BUDGET_MS보다 짧으면(stats["skipped"]) 경로는 None.
+    """
+    jobs = input_data['jobs']
+    num_vehicles = len(vehicle_capacities)
+    # 클러스터당 차량 2대 이상 (1대짜리 하위 문제는 시간창 때문에 해가 없기 쉬움)
+    num_clusters = max(2, min(num_vehicles // 2, math.ceil(len(jobs) / max(1, DECOMPOSE_JOBS_PER_CLUSTER))))
+    clusters = _partition_jobs(jobs, num_clusters, DECOMPOSE_METHOD)
+    allocation = _allocate_vehicles(clusters, demands, vehicle_capacities)
+    stats: Dict[str, Any] = {"method": DECOMPOSE_METHOD, "clusters": len(clusters),
+                             "cluster_jobs": [len(cluster) for cluster in clusters],
+                             "cluster_vehicles": [len(vehicles) for vehicles in allocation]}
+
+    workers = _solver_workers(len(clusters), DECOMPOSE_WORKERS)
+    rounds = math.ceil(len(clusters) / workers)
+    polish_ms = min(DECOMPOSE_POLISH_MS, solver_budget["time_limit_ms"] // 4)
+    sub_time_ms = (solver_budget["time_limit_ms"] - polish_ms) // rounds
+    if sub_time_ms < SOLVER_MIN_TIME_BUDGET_MS:
+        stats["skipped"] = "budget_too_small"
+        return None, stats
+    eco_arrays = [np.asarray(matrix) for matrix in eco_cost_matrices]
+    time_array = np.asarray(transit_time_matrix)
+
+    tasks = []
+    for cluster, vehicles in zip(clusters, allocation):
+        nodes = [0] + cluster
+        grid = np.ix_(nodes, nodes)
+        classes = sorted({vehicle_class_index[v] for v in vehicles})
+        tasks.append({
+            "nodes": nodes,
+            "eco_cost_matrices": [eco_arrays[c][grid].tolist() for c in classes],
+            "transit_time_matrix": time_array[grid].tolist(),
+            "demands": [demands[node] for node in nodes],
+            "time_windows": [time_windows[node] for node in nodes],
+            "vehicle_capacities": [vehicle_capacities[v] for v in vehicles],
+            "vehicle_class_index": [classes.index(vehicle_class_index[v]) for v in vehicles],
+            "total_demand": -sum(demands[node] for node in cluster),
+            "time_limit_ms": sub_time_ms,
+            "plateau_sec": _resolve_solver_budget(sub_time_ms, solver_budget["quality"], len(cluster))["plateau_sec"],
+        })
+
+    started = time.perf_counter()
+    try:
+        results = _map_in_solver_pool(_solve_sub_vrp, tasks, workers)
+    except Exception as e:
+        print(f"[WARN] 분할 풀이 프로세스 풀 오류: {e}")
+        stats["error"] = str(e)
+        return None, stats
+    stats.update({
+        "workers": workers,
+        "sub_time_limit_ms": sub_time_ms,
+        "sub_wall_sec": round(time.perf_counter() - started, 3),
+        "sub_objectives": [result["objective"] for result in results],
+        "sub_solve_sec": [result["solve_time_sec"] for result in results],
+    })
+    if any(result["routes"] is None for result in results):
+        return None, stats
+
+    routes: List[List[int]] = [[] for _ in range(num_vehicles)]
+    for vehicles, result in zip(allocation, results):
+        for v, route in zip(vehicles, result["routes"]):
+            routes[v] = route
+    return routes, stats
+
+
+# --- Helper Function: 다중 시작 솔버 포트폴리오 (설정별 전체 VRP → 프로세스 풀, 공유 메모리 행렬) ---
+PORTFOLIO_ENABLED = getattr(config, "PORTFOLIO_ENABLED", False)
+PORTFOLIO_SIZE = getattr(config, "PORTFOLIO_SIZE", 4)
+PORTFOLIO_WORKERS = getattr(config, "PORTFOLIO_WORKERS", 0)
+# 첫 설정은 단일 풀이와 같은 기본 설정
+PORTFOLIO_CONFIGS = [
+    {"name": "path_cheapest_arc/gls", "first_solution": "PATH_CHEAPEST_ARC", "metaheuristic": "GUIDED_LOCAL_SEARCH", "seed": 0},
+    {"name": "savings/gls", "first_solution": "SAVINGS", "metaheuristic": "GUIDED_LOCAL_SEARCH", "seed": 1},
+    {"name": "parallel_cheapest_insertion/sa", "first_solution": "PARALLEL_CHEAPEST_INSERTION", "metaheuristic": "SIMULATED_ANNEALING", "seed": 2},
+    {"name": "savings/tabu", "first_solution": "SAVINGS", "metaheuristic": "TABU_SEARCH", "seed": 3},
+    {"name": "local_cheapest_insertion/gls", "first_solution": "LOCAL_CHEAPEST_INSERTION", "metaheuristic": "GUIDED_LOCAL_SEARCH", "seed": 4},
+    {"name": "path_cheapest_arc/sa", "first_solution": "PATH_CHEAPEST_ARC", "metaheuristic": "SIMULATED_ANNEALING", "seed": 5},
+]
+
+
+def _solve_portfolio_member(task: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    (프로세스 풀 워커) 포트폴리오 설정 1개로 전체 VRP를 풉니다.
+    Eco-Cost(클래스별) + 시간 행렬은 공유 메모리의 (클래스 수 + 1, N, N) int64 배열에서 읽습니다.
+    task["weights"]가 있으면 (Pareto 모드) 배열은 (CO2 성분 C개, 시간 성분 C개, 시간 행렬)이고
+    Eco-Cost = co2_weight * CO2 성분 + time_weight * 시간 성분으로 조합합니다.
+    """
+    started = time.perf_counter()
+    shm = shared_memory.SharedMemory(name=task["shm_name"])
+    try:
+        matrices = np.ndarray(task["shape"], dtype=np.int64, buffer=shm.buf)
+        if task.get("weights"):
+            eco_cost_matrices = _combine_weighted_costs(matrices[:-1], *task["weights"]).tolist()
+        else:
+            eco_cost_matrices = [matrices[c].tolist() for c in range(task["shape"][0] - 1)]
+        transit_time_matrix = matrices[-1].tolist()
+        del matrices
+    finally:
+        shm.close()
+
+    model = _build_vrp_model(eco_cost_matrices, transit_time_matrix, task["demands"], task["time_windows"],
+                             task["vehicle_capacities"], task["vehicle_class_index"], task["total_demand"],
+                             forbidden_arcs=task.get("forbidden_arcs", ()))
+    routing, manager = model["routing"], model["manager"]
+    routing.solver().ReSeed(int(task["config"]["seed"]))
+    monitor = _PlateauMonitor(routing, task["plateau_sec"], task["plateau_solutions"], task["time_limit_ms"])
+    monitor.attach()
+    monitor.start()
+    solution = routing.SolveWithParameters(_default_search_parameters(
+        task["time_limit_ms"], task["config"]["first_solution"], task["config"]["metaheuristic"]))
+    solve_time = time.perf_counter() - started
+    return {
+        "config": task["config"]["name"],
+        "routes": _extract_routes(solution, routing, manager) if solution else None,
+        "objective": int(solution.ObjectiveValue()) if solution else None,
+        "solve_time_sec": round(solve_time, 3),
+        "stop_reason": _solver_stop_reason(monitor, routing),
+        "trajectory": monitor.trajectory,
+    }
+
+
+def _run_solver_portfolio(eco_cost_matrices: List[List[List[int]]], transit_time_matrix: List[List[int]],
+                          demands: List[int], time_windows: List[Tuple[int, int]], vehicle_capacities: List[int],
+                          vehicle_class_index: List[int], total_demand: int, solver_budget: Dict[str, Any],
+                          forbidden_arcs: List[Tuple[int, int]], load_cost_tensor: Optional[np.ndarray] = None,
+                          load_buckets: Optional[np.ndarray] = None) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any]]:
+    """
+    PORTFOLIO_CONFIGS 앞에서부터 PORTFOLIO_SIZE개 설정을 프로세스 풀에서 동시에 풀고 가장 싼 결과를 고릅니다.
+    적재량 텐서가 있으면 실제 적재량 반영 Eco-Cost로(동률이면 목적함수로), 없으면 목적함수로 비교합니다.
+    행렬은 공유 메모리에 한 번만 올리고, 설정이 워커 수보다 많으면 같은 벽시계 예산을 라운드 수로 나눕니다.
+    설정별 한도가 SOLVER_MIN_TIME_BUDGET_MS보다 짧아지면 예산 안에 들어가는 라운드 수만큼 설정을 줄이고,
+    한 라운드도 들어가지 않으면 풀지 않습니다(stats["skipped"]). (예산 초과 금지)
+    반환: (우승 결과 또는 None, stats)
+    """
+    requested = PORTFOLIO_CONFIGS[:max(1, PORTFOLIO_SIZE)]
+    workers = _solver_workers(len(requested), PORTFOLIO_WORKERS)
+    max_rounds = solver_budget["time_limit_ms"] // SOLVER_MIN_TIME_BUDGET_MS
+    if max_rounds < 1:
+        return None, {"skipped": "budget_too_small", "workers": workers,
+                      "time_limit_ms": solver_budget["time_limit_ms"]}
+    configs = requested[:workers * max_rounds]
+    member_time_ms = solver_budget["time_limit_ms"] // math.ceil(len(configs) / workers)
+
+    matrices = np.asarray(list(eco_cost_matrices) + [transit_time_matrix], dtype=np.int64)
+    shm = shared_memory.SharedMemory(create=True, size=matrices.nbytes)
+    stats: Dict[str, Any] = {"workers": workers, "member_time_limit_ms": member_time_ms,
+                             "configs_dropped": len(requested) - len(configs),
+                             "shared_matrix_mb": round(matrices.nbytes / 2 ** 20, 3)}
+    started = time.perf_counter()
+    try:
+        np.ndarray(matrices.shape, dtype=np.int64, buffer=shm.buf)[:] = matrices
+        tasks = [{
+            "shm_name": shm.name, "shape": matrices.shape, "config": cfg,
+            "demands": demands, "time_windows": time_windows, "vehicle_capacities": vehicle_capacities,
+            "vehicle_class_index": vehicle_class_index, "total_demand": total_demand,
+            "forbidden_arcs": forbidden_arcs, "time_limit_ms": member_time_ms,
+            "plateau_sec": solver_budget["plateau_sec"], "plateau_solutions": solver_budget["plateau_solutions"],
+        } for cfg in configs]
+        results = _map_in_solver_pool(_solve_portfolio_member, tasks, workers)
+    except Exception as e:
+        print(f"[WARN] 솔버 포트폴리오 실행 오류: {e}")
+        stats["error"] = str(e)
+        return None, stats
+    finally:
+        shm.close()
+        shm.unlink()
+
+    stats["wall_sec"] = round(time.perf_counter() - started, 3)
+    stats["members"] = [{"config": r["config"], "objective": r["objective"], "solve_time_sec": r["solve_time_sec"],
+                         "stop_reason": r["stop_reason"]} for r in results]
+    solved = [r for r in results if r["routes"] is not None]
+    if not solved:
+        return None, stats
+    if load_cost_tensor is not None:
+        for r, member in zip(results, stats["members"]):
+            if r["routes"] is not None:
+                r["eco_cost_load_aware"] = _rescore_routes_by_load(
+                    r["routes"], demands, total_demand, vehicle_class_index, load_cost_tensor, load_buckets
+                )["eco_cost_load_aware"]
+                member["eco_cost_load_aware"] = r["eco_cost_load_aware"]
+        winner = min(solved, key=lambda r: (r["eco_cost_load_aware"], r["objective"]))
+    else:
+        winner = min(solved, key=lambda r: r["objective"])
+    stats["winner"] = winner["config"]
+    return winner, stats
+
+
+# --- Helper Function: Pareto 모드 (ECO_CO2_WEIGHT / ECO_TIME_WEIGHT 조합별 풀이 → 비지배 해 집합) ---
+PARETO_ENABLED = getattr(config, "PARETO_ENABLED", False)
+PARETO_WEIGHTS = getattr(config, "PARETO_WEIGHTS", "1.0:0.0,0.5:0.5,0.2:0.8,0.0:1.0")
+
+
+def _parse_weight_pairs(spec: str) -> List[Tuple[float, float]]:
+    """'co2:time,co2:time' 문자열 → [(co2_weight, time_weight), ...] (잘못된 항목은 건너뜀, 중복 제거)"""
+    pairs: List[Tuple[float, float]] = []
+    for item in str(spec or "").split(","):
+        try:
+            co2_weight, time_weight = (float(x) for x in item.split(":"))
+        except ValueError:
+            continue
+        pair = (round(co2_weight, 4), round(time_weight, 4))
+        if co2_weight >= 0 and time_weight >= 0 and co2_weight + time_weight > 0 and pair not in pairs:
+            pairs.append(pair)
+    return pairs
+
+
+def _combine_weighted_costs(components: np.ndarray, co2_weight: float, time_weight: float) -> np.ndarray:
+    """
+    (CO2 성분 C개, 시간 성분 C개, N, N) → 가중치 조합 정수 Eco-Cost (C, N, N).
+    성분은 _precompute_arc_matrices를 가중치 (1, 0) / (0, 1)로 계산한 값이라 같은 스케일입니다.
+    """
+    num_classes = components.shape[0] // 2
+    co2_part, time_part = components[:num_classes], components[num_classes:]
+    combined = np.rint(co2_weight * co2_part.astype(np.float64) + time_weight * time_part).astype(np.int64)
+    unreachable = (co2_part >= UNREACHABLE_ARC_COST) | (time_part >= UNREACHABLE_ARC_COST)
+    combined[unreachable] = UNREACHABLE_ARC_COST
+    return combined
+
+
+def _pareto_front(points: List[Tuple[float, float]]) -> List[int]:
+    """(CO2, 시간) 최소화 기준 비지배 점의 인덱스. 값이 같은 점은 앞의 것만 남깁니다."""
+    front = []
+    for i, (co2_i, time_i) in enumerate(points):
+        dominated = any(
+            (co2_j <= co2_i and time_j <= time_i) and ((co2_j, time_j) != (co2_i, time_i) or j < i)
+            for j, (co2_j, time_j) in enumerate(points) if j != i
+        )
+        if not dominated:
+            front.append(i)
+    return front
+
+
+def _run_pareto_solves(cost_components: np.ndarray, transit_time_matrix: List[List[int]], weight_pairs,
+                       demands: List[int], time_windows: List[Tuple[int, int]], vehicle_capacities: List[int],
+                       vehicle_class_index: List[int], total_demand: int, solver_budget: Dict[str, Any],
+                       forbidden_arcs: List[Tuple[int, int]]) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    가중치 조합별 전체 VRP를 프로세스 풀에서 동시에 풉니다. (경로 재조회 없음)
+    solver_budget["time_limit_ms"]를 라운드 수로 나눠 조합별 한도로 쓰고, 너무 짧으면 풀지 않습니다.
+    CO2/시간 성분 행렬과 시간 행렬은 공유 메모리에 한 번만 올리고 워커가 가중치대로 Eco-Cost를 조합합니다.
+    반환: ([{weights, routes, objective, ...}, ...] 해를 찾은 조합만, stats)
+    """
+    workers = _solver_workers(len(weight_pairs), PORTFOLIO_WORKERS)
+    member_time_ms = solver_budget["time_limit_ms"] // math.ceil(len(weight_pairs) / workers)
+    if member_time_ms < SOLVER_MIN_TIME_BUDGET_MS:
+        return [], {"skipped": "budget_too_small", "workers": workers, "time_limit_ms": solver_budget["time_limit_ms"]}
+    matrices = np.concatenate([cost_components, np.asarray([transit_time_matrix], dtype=np.int64)])
+    shm = shared_memory.SharedMemory(create=True, size=matrices.nbytes)
+    stats: Dict[str, Any] = {"workers": workers, "time_limit_ms": solver_budget["time_limit_ms"],
+                             "member_time_limit_ms": member_time_ms,
+                             "shared_matrix_mb": round(matrices.nbytes / 2 ** 20, 3)}
+    started = time.perf_counter()
+    try:
+        np.ndarray(matrices.shape, dtype=np.int64, buffer=shm.buf)[:] = matrices
+        tasks = [{
+            "shm_name": shm.name, "shape": matrices.shape, "weights": pair,
+            "config": dict(PORTFOLIO_CONFIGS[0], name=f"co2 {pair[0]:.2f} / time {pair[1]:.2f}"),
+            "demands": demands, "time_windows": time_windows, "vehicle_capacities": vehicle_capacities,
+            "vehicle_class_index": vehicle_class_index, "total_demand": total_demand,
+            "forbidden_arcs": forbidden_arcs, "time_limit_ms": member_time_ms,
+            "plateau_sec": solver_budget["plateau_sec"], "plateau_solutions": solver_budget["plateau_solutions"],
+        } for pair in weight_pairs]
+        results = _map_in_solver_pool(_solve_portfolio_member, tasks, workers)
+    except Exception as e:
+        print(f"[WARN] Pareto 풀이 오류: {e}")
+        stats["error"] = str(e)
+        return [], stats
+    finally:
+        shm.close()
+        shm.unlink()
+
+    stats["wall_sec"] = round(time.perf_counter() - started, 3)
+    solved = []
+    for pair, result in zip(weight_pairs, results):
+        if result["routes"] is not None:
+            solved.append(dict(result, weights=pair))
+    return solved, stats
+
+
+# --- Helper Function: 이전 Run 경로로 초기해 구성 (warm start) ---
+WARM_START_ENABLED = getattr(config, "WARM_START_ENABLED", True)
+WARM_START_LOOKBACK_RUNS = getattr(config, "WARM_START_LOOKBACK_RUNS", 5)
+WARM_START_MIN_OVERLAP = getattr(config, "WARM_START_MIN_OVERLAP", 0.5)
+
+
+def _map_previous_routes(previous: Optional[Dict[str, Any]], input_data: Dict,
+                         vehicle_class_index: List[int], eco_cost_matrices: List[List[List[int]]],
+                         transit_time_matrix: List[List[int]], time_windows: List[Tuple[int, int]],
+                         coord_precision: int = 4) -> Tuple[Optional[List[List[int]]], Dict[str, Any]]:
+    """
+    이전 Run의 차량별 방문 순서를 현재 노드 번호로 옮겨 ReadAssignmentFromRoutes용 경로를 만듭니다.
+    - Job은 좌표(격자 스냅)로 대응시키고, 이전 Run에 없던 Job은 Eco-Cost 기준 최저 비용 위치에 삽입
+    - 차량은 vehicle_id가 같으면 그대로, 나머지 경로는 빈 차량에 순서대로 배정
+    - 삽입 위치는 시간창을 지키는 곳만 허용 (ReadAssignmentFromRoutes는 제약 위반 시 None 반환)
+    대응된 Job 비율이 WARM_START_MIN_OVERLAP 미만이거나, 옮긴 경로가 현재 시간창을 어기거나,
+    삽입할 곳이 없으면 (None, stats)를 반환합니다. (호출 측은 콜드 스타트)
+    """
+    stats: Dict[str, Any] = {"used": False}
+    if not previous or not previous.get("routes"):
+        return None, stats
+    jobs = input_data['jobs']
+    num_vehicles = len(input_data['vehicles'])
+    stats["source_run_id"] = previous.get("run_id")
+
+    def _key(lon, lat):
+        return (round(float(lon), coord_precision), round(float(lat), coord_precision))
+
+    nodes_by_key: Dict[Tuple[float, float], List[int]] = {}
+    for node, job in enumerate(jobs, start=1):
+        nodes_by_key.setdefault(_key(job['longitude'], job['latitude']), []).append(node)
+
+    mapped_routes = []
+    for route in previous["routes"]:
+        nodes = []
+        for job_id in route.get("job_ids", []):
+            coord = previous.get("jobs", {}).get(job_id)
+            candidates = nodes_by_key.get(_key(*coord)) if coord else None
+            if candidates:
+                nodes.append(candidates.pop(0))
+        mapped_routes.append((route.get("vehicle_id"), nodes))
+
+    # 차량 배정: 같은 vehicle_id 우선, 남은 경로는 빈 차량 순서대로 (차량보다 많으면 삽입 대상으로)
+    vehicle_index = {v['vehicle_id']: idx for idx, v in enumerate(input_data['vehicles'])}
+    routes: List[List[int]] = [[] for _ in range(num_vehicles)]
+    assigned = [False] * num_vehicles
+    pending = []
+    for vehicle_id, nodes in mapped_routes:
+        idx = vehicle_index.get(vehicle_id)
+        if idx is not None and not assigned[idx]:
+            routes[idx], assigned[idx] = nodes, True
+        else:
+            pending.append(nodes)
+    unplaced: List[int] = []
+    for nodes in pending:
+        free = next((idx for idx in range(num_vehicles) if not assigned[idx]), None)
+        if free is None:
+            unplaced.extend(nodes)
+        else:
+            routes[free], assigned[free] = nodes, True
+
+    matched = sum(len(route) for route in routes)
+    stats["matched_jobs"] = matched
+    if not jobs or matched / len(jobs) < WARM_START_MIN_OVERLAP:
+        return None, stats
+
+    def _time_feasible(route: List[int]) -> bool:
+        arrival, prev_node = time_windows[0][0], 0
+        for node in route:
+            arrival = max(arrival + transit_time_matrix[prev_node][node], time_windows[node][0])
+            if arrival > time_windows[node][1]:
+                return False
+            prev_node = node
+        return True
+
+    # 이전 순서 그대로는 현재 시간창을 못 지키는 경로 (시간창 / 이동 시간이 바뀐 경우)
+    broken = next((v_idx for v_idx, route in enumerate(routes) if not _time_feasible(route)), None)
+    if broken is not None:
+        stats["time_window_violation_vehicle"] = input_data['vehicles'][broken]['vehicle_id']
+        return None, stats
+
+    # 이전 Run에 없던 Job (+ 배정 못 한 경로의 Job): 시간창을 지키는 최저 삽입 비용 위치에 삽입
+    placed = {node for route in routes for node in route}
+    unplaced = sorted(set(unplaced) | {node for node in range(1, len(jobs) + 1) if node not in placed})
+    for node in unplaced:
+        candidates = []
+        for v_idx, route in enumerate(routes):
+            cost = eco_cost_matrices[vehicle_class_index[v_idx]]
+            for pos in range(len(route) + 1):
+                prev_node = route[pos - 1] if pos > 0 else 0
+                next_node = route[pos] if pos < len(route) else 0
+                delta = cost[prev_node][node] + cost[node][next_node] - cost[prev_node][next_node]
+                candidates.append((delta, v_idx, pos))
+        best = next((c for c in sorted(candidates)
+                     if _time_feasible(routes[c[1]][:c[2]] + [node] + routes[c[1]][c[2]:])), None)
+        if best is None:
+            stats["infeasible_job_node"] = node
+            return None, stats
+        routes[best[1]].insert(best[2], node)
+    stats["inserted_jobs"] = len(unplaced)
+    return routes, stats
+
+
+# --- Helper Function: 희소 행렬의 추정 아크 처리 ---
+ROUTE_ESTIMATE_COST_PENALTY = getattr(config, "ROUTE_ESTIMATE_COST_PENALTY", 1.5)
+ROUTE_SPARSE_FORBID_ESTIMATED = getattr(config, "ROUTE_SPARSE_FORBID_ESTIMATED", False)
+
+
+def _apply_estimated_arc_policy(eco_cost_matrices: List[List[List[int]]], estimated_arcs: set,
+                                forbid: bool) -> Tuple[List[List[List[int]]], List[Tuple[int, int]]]:
+    """
+    추정 아크(실제 경로 미조회)의 Eco-Cost에 패널티를 곱한 새 행렬과,
+    forbid=True이면 NextVar 도메인에서 제외할 아크 목록을 반환합니다. (차고지 아크는 항상 실측이므로 대상 아님)
+    입력 행렬은 수정하지 않습니다.
+    """
+    penalized = [[list(row) for row in matrix] for matrix in eco_cost_matrices]
+    for matrix in penalized:
+        for i, j in estimated_arcs:
+            matrix[i][j] = int(matrix[i][j] * ROUTE_ESTIMATE_COST_PENALTY)
+    forbidden_arcs = [(i, j) for i, j in estimated_arcs if i and j] if forbid else []
+    return penalized, forbidden_arcs
+
+
+def _route_arcs(routes: List[List[int]]) -> List[Tuple[int, int]]:
+    """차량별 방문 순서에 사용된 (출발 노드, 도착 노드) 아크 목록. 차고지 복귀 아크는 제외합니다. (편도 계산과 동일)"""
+    arcs = []
+    for route in routes:
+        tour = [0] + list(route)
+        arcs.extend(zip(tour[:-1], tour[1:]))
+    return arcs
+
+
+# --- Helper Function: 진행 상황 보고 ---
+def _report_progress(progress_callback: Optional[Callable[[str, float], None]], phase: str, progress: float):
+    """progress_callback(phase, 0.0~1.0)을 호출합니다. 콜백 오류는 최적화에 영향을 주지 않습니다."""
+    if progress_callback is None:
+        return
+    try:
+        progress_callback(phase, round(min(1.0, max(0.0, progress)), 3))
+    except Exception as e:
+        print(f"[WARN] 진행 상황 콜백 오류: {e}")
+
+
 # --- 2. 메인 최적화 함수 정의 ---
-def run_optimization(run_id: str, vehicle_ids: List[str]) -> Dict:
-    """P2P: 거리/CO2 두 경로 비교, VRP: 기존 Eco-Cost 최적화."""
+def run_optimization(run_id: str, vehicle_ids: List[str],
+                     progress_callback: Optional[Callable[[str, float], None]] = None,
+                     time_budget_ms: Optional[int] = None, quality: Optional[str] = None,
+                     portfolio: Optional[bool] = None, pareto: Optional[bool] = None) -> Dict:
+    """
+    P2P: 거리/CO2 두 경로 비교, VRP: 기존 Eco-Cost 최적화.
+    progress_callback(phase, progress)를 넘기면 단계별 진행 상황을 보고합니다.
+    (phase: load_input / fetch_routes / solve / save / done)
+    VRP 탐색 한도는 quality(fast/balanced/best)와 time_budget_ms로 조정하며,
+    한도 전이라도 목적함수가 정체되면 조기 종료합니다.
+    portfolio=True(기본값 PORTFOLIO_ENABLED)이면 여러 솔버 설정을 프로세스 풀에서 동시에 풀어 최선 해를 씁니다.
+    pareto=True(기본값 PARETO_ENABLED)이면 같은 행렬로 PARETO_WEIGHTS 가중치 조합을 추가로 풀어
+    (CO2, 시간) 비지배 해를 별도 경로 옵션으로 저장합니다.
+    """
     ECO_ROUTE_NAME = "CO2 Optimal Route"  # legacy label (kept for compatibility)
     KAKAO_ROUTE_NAME = "Kakao Route"
     ORS_ROUTE_NAME = "ORS Route"
@@ -79,9 +1096,12 @@ def run_optimization(run_id: str, vehicle_ids: List[str]) -> Dict:
     eco_assignments, kakao_assignments = [], []
     route_results_payload: List[Dict[str, Any]] = []
     comparison_payload: Dict[str, Any] = {}
+    matrix_stats: Dict[str, Any] = {}
+    solver_stats: Dict[str, Any] = {}
 
     # --- 단계 A: DB 데이터 및 SETTINGS 가져오기 ---
     try:
+        _report_progress(progress_callback, "load_input", 0.0)
         print("   DB에서 데이터 가져오는 중...")
         input_data = get_optimizer_input_data(run_id, vehicle_ids)
         if not input_data.get("depot") or not input_data.get("jobs") or not input_data.get("vehicles"):
@@ -128,6 +1148,7 @@ def run_optimization(run_id: str, vehicle_ids: List[str]) -> Dict:
             vehicle_id = input_data['vehicles'][0]['vehicle_id']
             vehicle_info = vehicle_ef_data[vehicle_id]
 
+            _report_progress(progress_callback, "fetch_routes", 0.1)
             alternative_routes = get_combined_route_alternatives(origin_coord, dest_coord)
             if not alternative_routes:
                 raise ValueError("대안 경로를 가져오지 못했습니다.")
@@ -136,40 +1157,31 @@ def run_optimization(run_id: str, vehicle_ids: List[str]) -> Dict:
 
             print(f"   {len(alternative_routes)}개의 대안 경로 CO2 재평가 시작...")
 
+            # 모든 대안 경로의 구간을 한 번에 평탄화해 배치로 CO2를 재평가
+            route_segment_lists = []
             for route in alternative_routes:
-                route_label = route.get('route_name') or route.get('priority') or "ROUTE"
-                raw_segments = route.get('segments', []) or []
                 segments = [
-                    Segment(
-                        distance_km=s.get('distance_km', 0.0),
-                        link_id=s.get('link_id'),
-                        base_time_sec=s.get('base_time_sec', 0.0),
-                        slope_pct=DEFAULT_SLOPE,
-                        load_kg=float(total_demand)
-                    )
-                    for s in raw_segments
+                    {"distance_km": s.get('distance_km'), "base_time_sec": s.get('base_time_sec', 0.0)}
+                    for s in (route.get('segments', []) or [])
                     if s.get('distance_km', 0) is not None
                 ]
                 # ORS가 세그먼트를 비워서 줄 경우를 대비해 단일 구간으로 보정
                 if not segments:
-                    segments = [
-                        Segment(
-                            distance_km=float(route.get('total_distance_km', 0.0)),
-                            link_id=None,
-                            base_time_sec=float(route.get('total_time_sec', 0.0)),
-                            slope_pct=DEFAULT_SLOPE,
-                            load_kg=float(total_demand)
-                        )
-                    ]
-
-                co2_result = co2_for_route(
-                    segments=segments,
-                    v=vehicle_info,
-                    start_time=base_datetime,
-                    congestion_factors=CONG_FACTORS,
-                    settings=CO2_SETTINGS,
-                    weather_penalty_value=WEATHER_PENALTY
-                )
+                    segments = [{
+                        "distance_km": float(route.get('total_distance_km', 0.0)),
+                        "base_time_sec": float(route.get('total_time_sec', 0.0))
+                    }]
+                route_segment_lists.append(segments)
+
+            distance_km, base_time_sec, arc_offsets = flatten_segment_lists(route_segment_lists)
+            batch_result = co2_for_route_batch(
+                distance_km, base_time_sec, DEFAULT_SLOPE, float(total_demand), arc_offsets,
+                vehicle_info, CONG_FACTORS, CO2_SETTINGS, WEATHER_PENALTY
+            )
+
+            for route_idx, route in enumerate(alternative_routes):
+                route_label = route.get('route_name') or route.get('priority') or "ROUTE"
+                co2_result = {key: float(values[route_idx]) for key, values in batch_result.items()}
 
                 arrival_time_sec = co2_result['total_time_sec']
                 if arrival_time_sec > tw_p2p[1]:
@@ -222,6 +1234,7 @@ def run_optimization(run_id: str, vehicle_ids: List[str]) -> Dict:
                 recommended, run_id, rec_route_name, vehicle_id, job['job_id'],
                 total_demand, DEFAULT_SLOPE, origin_coord, dest_coord
             )
+            _report_progress(progress_callback, "save", 0.9)
             rec_summary_response = _build_p2p_response_summary(
                 rec_summary, rec_route_name, origin_coord, dest_coord, vehicle_id,
                 recommended.get("route_name"), recommended.get("provider"), recommended.get("polyline")
@@ -289,7 +1302,13 @@ def run_optimization(run_id: str, vehicle_ids: List[str]) -> Dict:
             locations_data = [input_data["depot"]] + input_data["jobs"]
             num_locations = len(locations_data)
 
-            distance_matrix, time_matrix, segment_data_map = create_kakao_route_matrices(locations_data)
+            _report_progress(progress_callback, "fetch_routes", 0.1)
+            distance_matrix, time_matrix, segment_data_map = create_route_matrices(
+                locations_data, stats=matrix_stats,
+                progress_callback=lambda done, total: _report_progress(
+                    progress_callback, "fetch_routes", 0.1 + 0.5 * done / max(1, total))
+            )
+            segment_data_map = as_segment_store(segment_data_map, num_locations)
 
             demands = [0] + [-int(float(job.get('demand_kg', 0))) for job in input_data['jobs']]
             num_vehicles = len(input_data['vehicles'])
@@ -300,103 +1319,215 @@ def run_optimization(run_id: str, vehicle_ids: List[str]) -> Dict:
                 tw = convert_time_window_to_seconds(job.get('tw_start'), job.get('tw_end'), base_datetime)
                 time_windows.append(tw)
 
-            starts = [0] * num_vehicles
-            ends = [0] * num_vehicles
-            manager = pywrapcp.RoutingIndexManager(num_locations, num_vehicles, starts, ends)
-            routing = pywrapcp.RoutingModel(manager)
-
-            capacity_dimension_name = 'Capacity'
             CO2_WEIGHT = CO2_SETTINGS.get('ECO_CO2_WEIGHT', 0.8)
             TIME_WEIGHT = CO2_SETTINGS.get('ECO_TIME_WEIGHT', 0.2)
             CO2_SCALE_FACTOR = 1000
 
-            def eco_cost_callback_func(from_index, to_index):
-                try:
-                    from_node = manager.IndexToNode(from_index)
-                    to_node = manager.IndexToNode(to_index)
-                    vehicle_index = routing.VehicleIndex(from_index)
-                    segments_raw = segment_data_map.get((from_node, to_node), [])
-                    if not segments_raw:
-                        return math.inf
-
-                    current_load_approximation = total_demand
-                    segments_for_co2 = [
-                        Segment(s['distance_km'], s['link_id'], s['base_time_sec'], DEFAULT_SLOPE, float(current_load_approximation))
-                        for s in segments_raw
-                    ]
-                    current_vehicle_id = input_data['vehicles'][vehicle_index]['vehicle_id']
-                    vehicle_info = vehicle_ef_data[current_vehicle_id]
-                    co2_result = co2_for_route(segments_for_co2, vehicle_info, base_datetime, CONG_FACTORS, CO2_SETTINGS, WEATHER_PENALTY)
-                    co2_g = co2_result['co2_total_g']
-                    time_sec_actual = co2_result['total_time_sec']
-                    eco_cost = (CO2_WEIGHT * (co2_g / CO2_SCALE_FACTOR)) + (TIME_WEIGHT * time_sec_actual)
-                    return int(eco_cost * 1000)
-                except Exception:
-                    return math.inf
-            transit_callback_index = routing.RegisterTransitCallback(eco_cost_callback_func)
-
-            def time_callback_func(from_index, to_index):
-                try:
-                    from_node = manager.IndexToNode(from_index)
-                    segments_raw = segment_data_map.get((from_node, manager.IndexToNode(to_index)), [])
-                    if not segments_raw:
-                        return 86400
-
-                    vehicle_index = routing.VehicleIndex(from_index)
-                    current_vehicle_id = input_data['vehicles'][vehicle_index]['vehicle_id']
-                    vehicle_info = vehicle_ef_data[current_vehicle_id]
-
-                    segments_for_co2 = [Segment(s['distance_km'], s['link_id'], s['base_time_sec']) for s in segments_raw]
-                    co2_result = co2_for_route(segments_for_co2, vehicle_info, base_datetime, CONG_FACTORS, CO2_SETTINGS, WEATHER_PENALTY)
-                    return int(co2_result['total_time_sec'])
-                except Exception:
-                    return 86400
-            time_callback_index = routing.RegisterTransitCallback(time_callback_func)
-
-            def demand_callback_func(from_index):
-                try:
-                    node_index = manager.IndexToNode(from_index)
-                    return demands[node_index]
-                except Exception:
-                    return 0
-            demand_callback_index = routing.RegisterUnaryTransitCallback(demand_callback_func)
-
-            max_capacity = max(vehicle_capacities) if vehicle_capacities else 0
-            routing.AddDimension(demand_callback_index, 0, max_capacity, False, capacity_dimension_name)
-
-            time_dimension_name = 'Time'
-            initial_depot_time = int(time_windows[0][0])
-            routing.AddDimension(time_callback_index, 86400, 86400, True, time_dimension_name)
-            time_dimension = routing.GetDimensionOrDie(time_dimension_name)
-
-            for vehicle_id_idx in range(num_vehicles):
-                depot_index = routing.Start(vehicle_id_idx)
-                time_dimension.CumulVar(depot_index).SetRange(initial_depot_time, initial_depot_time)
-            for location_idx, time_window in enumerate(time_windows):
-                if location_idx == 0:
-                    continue
-                index = manager.NodeToIndex(location_idx)
-                time_dimension.CumulVar(index).SetRange(int(time_window[0]), int(time_window[1]))
-
-            capacity_dimension = routing.GetDimensionOrDie(capacity_dimension_name)
-            for vehicle_id_idx in range(num_vehicles):
-                depot_index = routing.Start(vehicle_id_idx)
-                capacity_dimension.CumulVar(depot_index).SetRange(total_demand, total_demand)
+            # 차량 클래스(동일 VehicleEF)별 Eco-Cost 행렬과 공통 시간 행렬을 Solve 전에 1회만 계산
+            vehicle_class_keys: List[Tuple[float, float, float]] = []
+            vehicle_class_index: List[int] = []
+            for v in input_data['vehicles']:
+                ef = vehicle_ef_data[v['vehicle_id']]
+                class_key = (ef.ef_gpkm, ef.idle_gps, ef.capacity_kg)
+                if class_key not in vehicle_class_keys:
+                    vehicle_class_keys.append(class_key)
+                vehicle_class_index.append(vehicle_class_keys.index(class_key))
+            class_vehicle_efs = [VehicleEF(*key) for key in vehicle_class_keys]
+
+            eco_cost_matrices, transit_time_matrix = _precompute_arc_matrices(
+                num_locations, segment_data_map, class_vehicle_efs, float(total_demand),
+                base_datetime, CONG_FACTORS, CO2_SETTINGS, WEATHER_PENALTY, DEFAULT_SLOPE,
+                CO2_WEIGHT, TIME_WEIGHT, CO2_SCALE_FACTOR
+            )
 
-            search_parameters = pywrapcp.DefaultRoutingSearchParameters()
-            search_parameters.first_solution_strategy = routing_enums_pb2.FirstSolutionStrategy.PATH_CHEAPEST_ARC
-            search_parameters.local_search_metaheuristic = routing_enums_pb2.LocalSearchMetaheuristic.GUIDED_LOCAL_SEARCH
-            search_parameters.time_limit.FromSeconds(10)
+            # 적재량 구간별 Eco-Cost 텐서: Solver는 total_demand 기준 행렬로 풀고, 후보 해는 실제 적재량으로 재평가
+            load_buckets = _load_bucket_values(total_demand, ECO_LOAD_BUCKETS) if ECO_LOAD_BUCKETS > 1 and total_demand > 0 else None
+            load_cost_tensor = None
+            if load_buckets is not None:
+                load_cost_tensor = _precompute_load_cost_tensor(
+                    num_locations, segment_data_map, class_vehicle_efs, load_buckets,
+                    CONG_FACTORS, CO2_SETTINGS, WEATHER_PENALTY, DEFAULT_SLOPE,
+                    CO2_WEIGHT, TIME_WEIGHT, CO2_SCALE_FACTOR
+                )
 
+            # 희소 모드: 추정 아크는 비용 패널티 (옵션: NextVar 도메인에서 제외)
+            # 이후 본 모델 / Held-Karp / warm start / 분할 풀이 / 포트폴리오는 모두 이 최종 정수 행렬을 사용
+            estimated_arcs = set(segment_data_map.flagged_arcs(ARC_FLAG_ESTIMATED))
+            detailed_arcs = set()
+            forbidden_arcs: List[Tuple[int, int]] = []
+            if estimated_arcs:
+                eco_cost_matrices, forbidden_arcs = _apply_estimated_arc_policy(
+                    eco_cost_matrices, estimated_arcs, ROUTE_SPARSE_FORBID_ESTIMATED)
+
+            solver_budget = _resolve_solver_budget(time_budget_ms, quality, num_jobs)
+            # Pareto 모드: 하나의 시간 한도를 본 풀이 1몫 + 가중치 조합 라운드 수만큼 나눠 씀
+            use_pareto = PARETO_ENABLED if pareto is None else bool(pareto)
+            weight_pairs = [pair for pair in _parse_weight_pairs(PARETO_WEIGHTS)
+                            if pair != (round(CO2_WEIGHT, 4), round(TIME_WEIGHT, 4))] if use_pareto else []
+            total_time_limit_ms = solver_budget["time_limit_ms"]
+            if weight_pairs:
+                pareto_rounds = math.ceil(len(weight_pairs) / _solver_workers(len(weight_pairs), PORTFOLIO_WORKERS))
+                solver_budget = dict(solver_budget, time_limit_ms=max(
+                    SOLVER_MIN_TIME_BUDGET_MS, total_time_limit_ms // (1 + pareto_rounds)))
+
+            _report_progress(progress_callback, "solve", 0.6)
             print("   OR-Tools 최적화 (Eco-Cost) 실행 중...")
-            routing.SetArcCostEvaluatorOfAllVehicles(transit_callback_index)
-            solution = routing.SolveWithParameters(search_parameters)
 
-            if solution:
+            # 소규모 단일 차량: Held-Karp 정확해를 그대로 최종 경로로 사용 (RoutingModel 구성 / 탐색 생략)
+            solve_started = time.perf_counter()
+            exact_route = None
+            if num_vehicles == 1 and num_jobs <= EXACT_SOLVER_MAX_JOBS and not forbidden_arcs:
+                exact_route = _held_karp_route(eco_cost_matrices[vehicle_class_index[0]], transit_time_matrix,
+                                               demands, time_windows, vehicle_capacities[0], total_demand)
+            final_routes = None
+            if exact_route is not None:
+                final_routes = [exact_route[0]]
+                solver_stats["vehicle_classes"] = len(set(vehicle_class_index))
+                solver_stats["exact"] = {"method": "held_karp", "objective": exact_route[1], "used": True}
+                solver_stats["warm_start"] = {"used": False}
+                solve_time_sec = time.perf_counter() - solve_started
+                solver_stats["objective_trajectory"] = [(round(solve_time_sec, 3), exact_route[1])]
+                solver_stats.update({
+                    "quality": solver_budget["quality"],
+                    "time_limit_ms": solver_budget["time_limit_ms"],
+                    "plateau_sec": solver_budget["plateau_sec"],
+                    "stop_reason": "exact",
+                    "solver_status": None,
+                    "solve_time_sec": round(solve_time_sec, 3),
+                    "objective": exact_route[1],
+                })
+                print(f"   Held-Karp 정확해: Eco-Cost {exact_route[1]} (OR-Tools 탐색 생략)")
+            else:
+                model = _build_vrp_model(eco_cost_matrices, transit_time_matrix, demands, time_windows,
+                                         vehicle_capacities, vehicle_class_index, total_demand,
+                                         forbidden_arcs=forbidden_arcs)
+                manager, routing = model["manager"], model["routing"]
+                if estimated_arcs:
+                    print(f"   희소 행렬: 추정 아크 {len(estimated_arcs)}개 (패널티 x{ROUTE_ESTIMATE_COST_PENALTY}, 금지 {model['forbidden_arcs']}개)")
+                search_parameters = _default_search_parameters(solver_budget["time_limit_ms"])
+                solver_stats["vehicle_classes"] = model["vehicle_classes"]
+
+                plateau_monitor = _PlateauMonitor(routing, solver_budget["plateau_sec"], solver_budget["plateau_solutions"],
+                                                  solver_budget["time_limit_ms"])
+                plateau_monitor.attach()
+
+                # 겹치는 이전 Run이 있으면 그 경로를 초기해로 사용 (실패 시 PATH_CHEAPEST_ARC로 콜드 스타트)
+                warm_routes, warm_stats = None, {"used": False}
+                if WARM_START_ENABLED:
+                    try:
+                        previous_routes = get_previous_run_routes(run_id, route_option_name=ECO_ROUTE_NAME,
+                                                                  lookback_runs=WARM_START_LOOKBACK_RUNS)
+                        warm_routes, warm_stats = _map_previous_routes(previous_routes, input_data, vehicle_class_index,
+                                                                       eco_cost_matrices, transit_time_matrix, time_windows)
+                    except Exception as e:
+                        print(f"[WARN] 이전 Run 경로 조회 실패 (콜드 스타트): {e}")
+
+                # 분할 풀이 / 단일 풀이의 남은 한도와 같은 기준 (solve_started부터 time_limit_ms)
+                plateau_monitor.start(solve_started)
+                solution = None
+                if warm_routes:
+                    routing.CloseModelWithParameters(search_parameters)
+                    initial_assignment = routing.ReadAssignmentFromRoutes(warm_routes, True)
+                    if initial_assignment is not None:
+                        solution = routing.SolveFromAssignmentWithParameters(initial_assignment, search_parameters)
+                    warm_stats["used"] = solution is not None
+                    print(f"   Warm start: 이전 Run {warm_stats.get('source_run_id')} 경로 사용 "
+                          f"(대응 {warm_stats.get('matched_jobs')}, 삽입 {warm_stats.get('inserted_jobs')}, "
+                          f"{'성공' if warm_stats['used'] else '실패 → 콜드 스타트'})")
+                decompose_eligible = DECOMPOSE_ENABLED and num_jobs >= DECOMPOSE_MIN_JOBS and num_vehicles >= 4
+                use_portfolio = PORTFOLIO_ENABLED if portfolio is None else bool(portfolio)
+                if solution is None and not warm_stats["used"] and use_portfolio and not decompose_eligible:
+                    # 초기해 전략 / 메타휴리스틱 / 시드가 다른 설정들을 같은 벽시계 예산으로 동시에 풀고 최선 해 채택
+                    winner, portfolio_stats = _run_solver_portfolio(
+                        eco_cost_matrices, transit_time_matrix, demands, time_windows, vehicle_capacities,
+                        vehicle_class_index, total_demand, solver_budget, forbidden_arcs, load_cost_tensor, load_buckets)
+                    if winner is not None:
+                        routing.CloseModelWithParameters(search_parameters)
+                        solution = routing.ReadAssignmentFromRoutes(winner["routes"], True)
+                        if solution is not None:
+                            plateau_monitor.trajectory = list(winner["trajectory"])
+                            plateau_monitor.stop_reason = winner["stop_reason"]
+                    portfolio_stats["used"] = solution is not None
+                    solver_stats["portfolio"] = portfolio_stats
+                    print(f"   솔버 포트폴리오: {len(portfolio_stats.get('members', []))}개 설정, "
+                          f"최선 {portfolio_stats.get('winner')} "
+                          f"({'사용' if portfolio_stats['used'] else portfolio_stats.get('skipped', '실패') + ' → 단일 풀이'})")
+                if solution is None and not warm_stats["used"] and decompose_eligible:
+                    # 대규모: 지리 클러스터별 하위 VRP를 프로세스 풀에서 풀고 이어 붙인 뒤 짧게 전역 개선
+                    decomposed_routes, decompose_stats = _decompose_and_solve(
+                        input_data, eco_cost_matrices, transit_time_matrix, demands, time_windows,
+                        vehicle_capacities, vehicle_class_index, solver_budget)
+                    if decomposed_routes is not None:
+                        routing.CloseModelWithParameters(search_parameters)
+                        initial_assignment = routing.ReadAssignmentFromRoutes(decomposed_routes, True)
+                        # 전역 개선은 시간 한도 중 남은 시간만 사용 (하위 풀이 / 프로세스 기동이 길어져도 한도 유지)
+                        polish_ms = solver_budget["time_limit_ms"] - int((time.perf_counter() - solve_started) * 1000)
+                        decompose_stats["polish_ms"] = max(0, polish_ms)
+                        if initial_assignment is not None and DECOMPOSE_POLISH_MS > 0 \
+                                and polish_ms >= SOLVER_MIN_TIME_BUDGET_MS:
+                            polish_parameters = _default_search_parameters(polish_ms)
+                            solution = routing.SolveFromAssignmentWithParameters(initial_assignment, polish_parameters)
+                        decompose_stats["polished"] = solution is not None
+                        solution = solution or initial_assignment
+                    decompose_stats["used"] = solution is not None
+                    solver_stats["decomposition"] = decompose_stats
+                    print(f"   분할 풀이: 클러스터 {decompose_stats.get('clusters')}개, "
+                          f"{'성공' if decompose_stats['used'] else decompose_stats.get('skipped', '실패') + ' → 단일 모델'}")
+                if solution is None:
+                    # 앞 단계(분할 풀이 등)에서 쓴 시간을 뺀 나머지 한도로 단일 모델 풀이
+                    remaining_ms = solver_budget["time_limit_ms"] - int((time.perf_counter() - solve_started) * 1000)
+                    solution = routing.SolveWithParameters(
+                        _default_search_parameters(max(SOLVER_MIN_TIME_BUDGET_MS, remaining_ms)))
+                solver_stats["warm_start"] = warm_stats
+                solve_time_sec = time.perf_counter() - solve_started
+                solver_stats["objective_trajectory"] = plateau_monitor.trajectory
+                solver_stats.update({
+                    "quality": solver_budget["quality"],
+                    "time_limit_ms": solver_budget["time_limit_ms"],
+                    "plateau_sec": solver_budget["plateau_sec"],
+                    "stop_reason": _solver_stop_reason(plateau_monitor, routing),
+                    "solver_status": int(routing.status()),
+                    "solve_time_sec": round(solve_time_sec, 3),
+                    "objective": int(solution.ObjectiveValue()) if solution else None,
+                })
+                final_routes = _extract_routes(solution, routing, manager) if solution else None
+
+
+            if final_routes and load_cost_tensor is not None:
+                rescored = _rescore_routes_by_load(final_routes, demands, total_demand,
+                                                   vehicle_class_index, load_cost_tensor, load_buckets)
+                solver_stats.update({"load_buckets": len(load_buckets), **rescored})
+                print(f"   적재량 반영 재평가: Eco-Cost {rescored['eco_cost_full_load']} (total_demand 가정) "
+                      f"→ {rescored['eco_cost_load_aware']} (적재량 구간 {len(load_buckets)}개)")
+
+            if final_routes and estimated_arcs:
+                # 해에 쓰인 추정 아크만 실제 경로로 조회해 결과 CO2/거리를 실측 기준으로 맞춘다
+                used_arcs = _route_arcs(final_routes)
+                used_estimated = [arc for arc in used_arcs if arc in estimated_arcs]
+                detailed_arcs.update(used_estimated)
+                resolved = resolve_estimated_arcs(locations_data, used_estimated,
+                                                  distance_matrix, time_matrix, segment_data_map)
+                solver_stats.update({
+                    "arcs_used": len(used_arcs),
+                    "estimated_arcs_used": len(used_estimated),
+                    "estimated_arc_ratio": round(len(used_estimated) / len(used_arcs), 4) if used_arcs else 0.0,
+                    "estimated_arcs_resolved": resolved,
+                })
+                print(f"   해에 사용된 추정 아크: {len(used_estimated)}/{len(used_arcs)} (실측 재조회 {resolved}개)")
+
+            if final_routes:
+                # 행렬 API(요약 거리/시간)로 푼 경우 해에 쓰인 아크만 도로 구간 상세를 조회
+                used_summary = [arc for arc in _route_arcs(final_routes) if is_summary_arc(segment_data_map, arc)]
+                if used_summary:
+                    detailed = fetch_arc_details(locations_data, used_summary, segment_data_map)
+                    solver_stats.update({"summary_arcs_used": len(used_summary), "summary_arcs_detailed": detailed})
+                    print(f"   해에 사용된 요약 아크 상세 조회: {detailed}/{len(used_summary)}개")
+
+            if final_routes:
+                _report_progress(progress_callback, "save", 0.9)
                 print(f"✅ {ECO_ROUTE_NAME} 파싱 시작 (편도 경로 계산).")
                 eco_summary, eco_assignments, _ = parse_and_save_solution(
-                    solution, routing, manager, input_data, vehicle_ef_data, segment_data_map,
-                    capacity_dimension, time_dimension,
+                    final_routes, demands, total_demand, input_data, vehicle_ef_data, segment_data_map,
                     base_datetime, ECO_ROUTE_NAME, DEFAULT_SLOPE,
                     CONG_FACTORS, CO2_SETTINGS, WEATHER_PENALTY, distance_matrix, run_id
                 )
@@ -409,6 +1540,76 @@ def run_optimization(run_id: str, vehicle_ids: List[str]) -> Dict:
             else:
                 print("⚠️ OR-Tools 해답을 찾지 못했습니다.")
 
+            # 본 풀이 / 파싱에 쓰고 남은 시간 한도만 가중치 조합 풀이에 사용
+            pareto_time_ms = total_time_limit_ms - int((time.perf_counter() - solve_started) * 1000)
+            if final_routes and weight_pairs and pareto_time_ms < SOLVER_MIN_TIME_BUDGET_MS:
+                solver_stats["pareto"] = {"skipped": "budget_exhausted", "time_limit_ms": max(0, pareto_time_ms)}
+            elif final_routes and weight_pairs:
+                # 경로 재조회 없이 CO2 / 시간 성분 행렬을 만들고 가중치 조합별 풀이를 동시에 실행
+                co2_component, _ = _precompute_arc_matrices(
+                    num_locations, segment_data_map, class_vehicle_efs, float(total_demand),
+                    base_datetime, CONG_FACTORS, CO2_SETTINGS, WEATHER_PENALTY, DEFAULT_SLOPE,
+                    1.0, 0.0, CO2_SCALE_FACTOR)
+                time_component, _ = _precompute_arc_matrices(
+                    num_locations, segment_data_map, class_vehicle_efs, float(total_demand),
+                    base_datetime, CONG_FACTORS, CO2_SETTINGS, WEATHER_PENALTY, DEFAULT_SLOPE,
+                    0.0, 1.0, CO2_SCALE_FACTOR)
+                if estimated_arcs:
+                    co2_component, _ = _apply_estimated_arc_policy(co2_component, estimated_arcs, False)
+                    time_component, _ = _apply_estimated_arc_policy(time_component, estimated_arcs, False)
+                pareto_plans, pareto_stats = _run_pareto_solves(
+                    np.asarray(co2_component + time_component, dtype=np.int64), transit_time_matrix, weight_pairs,
+                    demands, time_windows, vehicle_capacities, vehicle_class_index, total_demand,
+                    dict(solver_budget, time_limit_ms=pareto_time_ms), forbidden_arcs)
+
+                # 기본 가중치 해(이미 저장) + 조합별 해를 실측 CO2 / 시간으로 파싱 (같은 경로는 한 번만)
+                candidates = [{"route_name": ECO_ROUTE_NAME, "weights": (CO2_WEIGHT, TIME_WEIGHT),
+                               "routes": final_routes, "summary": eco_summary, "assignments": eco_assignments}]
+                for plan in pareto_plans:
+                    if any(plan["routes"] == c["routes"] for c in candidates):
+                        continue
+                    plan_arcs = _route_arcs(plan["routes"])
+                    plan_estimated = [arc for arc in plan_arcs if arc in estimated_arcs and arc not in detailed_arcs]
+                    detailed_arcs.update(plan_estimated)
+                    resolve_estimated_arcs(locations_data, plan_estimated, distance_matrix, time_matrix, segment_data_map)
+                    fetch_arc_details(locations_data, [arc for arc in plan_arcs if is_summary_arc(segment_data_map, arc)],
+                                      segment_data_map)
+                    route_name = f"{PARETO_ROUTE_PREFIX} CO2 {plan['weights'][0]:.2f} / Time {plan['weights'][1]:.2f}"
+                    plan_summary, plan_assignments, _ = parse_and_save_solution(
+                        plan["routes"], demands, total_demand, input_data, vehicle_ef_data, segment_data_map,
+                        base_datetime, route_name, DEFAULT_SLOPE,
+                        CONG_FACTORS, CO2_SETTINGS, WEATHER_PENALTY, distance_matrix, run_id
+                    )
+                    candidates.append({"route_name": route_name, "weights": plan["weights"], "routes": plan["routes"],
+                                       "summary": plan_summary, "assignments": plan_assignments})
+
+                front = _pareto_front([(c["summary"]["total_co2_g"], c["summary"]["total_time_min"]) for c in candidates])
+                for idx in front:
+                    if idx == 0:
+                        continue
+                    plan = candidates[idx]
+                    save_optimization_results(run_id, plan["summary"], plan["assignments"])
+                    route_results_payload.append({
+                        "route_name": plan["route_name"],
+                        "summary": plan["summary"],
+                        "assignments": plan["assignments"],
+                        "pareto": {"co2_weight": plan["weights"][0], "time_weight": plan["weights"][1]},
+                    })
+                pareto_stats.update({
+                    "weights": [list(pair) for pair in weight_pairs],
+                    "solved": len(pareto_plans),
+                    "distinct_plans": len(candidates),
+                    "default_dominated": 0 not in front,
+                    "front": [{"route_name": candidates[idx]["route_name"],
+                               "co2_weight": candidates[idx]["weights"][0],
+                               "time_weight": candidates[idx]["weights"][1],
+                               "total_co2_g": candidates[idx]["summary"]["total_co2_g"],
+                               "total_time_min": candidates[idx]["summary"]["total_time_min"]} for idx in front],
+                })
+                solver_stats["pareto"] = pareto_stats
+                print(f"   Pareto 모드: 가중치 {len(weight_pairs)}개 조합, 서로 다른 해 {len(candidates)}개 "
+                      f"→ 비지배 {len(front)}개 ({pareto_stats.get('wall_sec')}s)")
+
         except Exception as e:
             print(f"❌ VRP 최적화 중 오류 발생: {e}")
             return {"status": "failed", "message": f"VRP 최적화 오류: {e}", "run_id": run_id}
@@ -418,10 +1619,15 @@ def run_optimization(run_id: str, vehicle_ids: List[str]) -> Dict:
 
     if comparison_payload:
         final_result['comparison'] = comparison_payload
+    if matrix_stats:
+        final_result['matrix_stats'] = matrix_stats
+    if solver_stats:
+        final_result['solver_stats'] = solver_stats
 
     if not final_result['results']:
         final_result = {"status": "failed", "message": "최적화 및 비교 경로를 모두 찾지 못했습니다.", "run_id": run_id}
 
+    _report_progress(progress_callback, "done", 1.0)
     return final_result
 
 
@@ -429,58 +1635,49 @@ def run_optimization(run_id: str, vehicle_ids: List[str]) -> Dict:
 # 3. 헬퍼 함수: OR-Tools 결과 파싱 (VRP용)
 # (이 함수는 VRP 시나리오에서만 사용됨)
 # --------------------------------------------------------------------------
-def parse_and_save_solution(solution, routing, manager, input_data, vehicle_ef_data, segment_data_map,
-                            capacity_dimension, time_dimension,
+def parse_and_save_solution(routes, demands, total_demand, input_data, vehicle_ef_data, segment_data_map,
                             base_datetime, route_option_name, default_slope,
                             CONG_FACTORS, CO2_SETTINGS, WEATHER_PENALTY, distance_matrix, run_id):
-    """ OR-Tools Solution을 파싱하여 DB 저장용 Summary와 Assignments를 반환합니다. (편도 계산) """
+    """
+    차량별 방문 순서(차고지 제외, _extract_routes / Held-Karp 형식)를 파싱하여 DB 저장용 Summary와 Assignments를 반환합니다. (편도 계산)
+    스텝 적재량은 Capacity 차원 누적값과 같습니다: total_demand에서 출발 노드 이전까지 방문한 Job의 demands를 더한 값.
+    """
+    store = as_segment_store(segment_data_map, len(distance_matrix))
     total_distance = 0
     assignments_to_save = []
     total_co2_g_accurate = 0.0
-    num_vehicles = manager.GetNumberOfVehicles()
 
     max_end_time_sec = 0.0
 
-    for vehicle_id_idx in range(num_vehicles):
-        index = routing.Start(vehicle_id_idx)
-        step_order = 1
+    for vehicle_id_idx, route in enumerate(routes):
+        current_vehicle_id = input_data['vehicles'][vehicle_id_idx]['vehicle_id']
+        vehicle_info = vehicle_ef_data.get(current_vehicle_id)
+
+        # 1) 경로 순회: 스텝별 (출발 노드, 도착 노드, 적재량) 수집 (마지막 Job → 차고지 복귀 아크 제외)
+        steps = []
+        current_load_kg = total_demand
+        tour = [0] + list(route)
+        for start_node_index, end_node_index in zip(tour[:-1], tour[1:]):
+            steps.append((start_node_index, end_node_index, float(current_load_kg)))
+            current_load_kg += demands[start_node_index]
+        if not steps:
+            continue
+        print(f"   [One-Way Stop] Vehicle {vehicle_id_idx} reached final job. Skipping return arc to depot.")
+
+        # 2) 차량의 모든 스텝 CO2를 배치로 계산 (스텝별 적재량을 구간 단위로 펼침)
+        distance_km, base_time_sec, arc_offsets = store.arc_arrays([(start, end) for start, end, _ in steps])
+        step_segment_counts = np.diff(arc_offsets)
+        segment_loads = np.repeat([load for _, _, load in steps], step_segment_counts)
+        co2_result = co2_for_route_batch(distance_km, base_time_sec, default_slope, segment_loads, arc_offsets,
+                                         vehicle_info, CONG_FACTORS, CO2_SETTINGS, WEATHER_PENALTY)
+
+        # 3) 스텝별 Assignment 생성
         vehicle_total_time_sec = 0.0
-
-        while not routing.IsEnd(index):
-            previous_index = index
-            start_node_index = manager.IndexToNode(previous_index)
-
-            time_start_sec = solution.Value(time_dimension.CumulVar(previous_index))
-            time_start_dt = base_datetime + dt.timedelta(seconds=time_start_sec)
-            current_load_kg = solution.Value(capacity_dimension.CumulVar(previous_index))
-
-            index = solution.Value(routing.NextVar(index))
-
-            if routing.IsEnd(index):
-                print(f"   [One-Way Stop] Vehicle {vehicle_id_idx} reached final job. Skipping return arc to depot.")
-                break
-
-            end_node_index = manager.IndexToNode(index)
-
-            segments_raw = segment_data_map.get((start_node_index, end_node_index), [])
+        for step_idx, (start_node_index, end_node_index, current_load_kg) in enumerate(steps):
             step_actual_distance = distance_matrix[start_node_index][end_node_index]
-
-            current_vehicle_id = input_data['vehicles'][vehicle_id_idx]['vehicle_id']
-            vehicle_info = vehicle_ef_data.get(current_vehicle_id)
-
-            if segments_raw:
-                segments_for_co2 = [
-                    Segment(
-                        distance_km=s['distance_km'], link_id=s['link_id'], base_time_sec=s['base_time_sec'],
-                        slope_pct=default_slope, load_kg=float(current_load_kg)
-                    ) for s in segments_raw
-                ]
-
-                co2_result = co2_for_route(segments=segments_for_co2, v=vehicle_info, start_time=time_start_dt,
-                                             congestion_factors=CONG_FACTORS, settings=CO2_SETTINGS,
-                                             weather_penalty_value=WEATHER_PENALTY)
-                step_co2 = co2_result['co2_total_g']
-                step_time_sec_accurate = co2_result['total_time_sec']
+            if step_segment_counts[step_idx] > 0:
+                step_co2 = float(co2_result['co2_total_g'][step_idx])
+                step_time_sec_accurate = float(co2_result['total_time_sec'][step_idx])
             else:
                 step_co2 = 0.0
                 step_time_sec_accurate = 0.0
@@ -491,16 +1688,15 @@ def parse_and_save_solution(solution, routing, manager, input_data, vehicle_ef_d
 
             assignment = {
                 "run_id": run_id, "route_option_name": route_option_name,
-                "vehicle_id": current_vehicle_id, "step_order": step_order,
+                "vehicle_id": current_vehicle_id, "step_order": step_idx + 1,
                 "start_job_id": None if start_node_index == 0 else input_data['jobs'][start_node_index-1]['job_id'],
                 "end_job_id": None if end_node_index == 0 else input_data['jobs'][end_node_index-1]['job_id'],
                 "distance_km": step_actual_distance, "co2_g": round(step_co2, 5),
-                "load_kg": float(current_load_kg),
+                "load_kg": current_load_kg,
                 "time_min": round(step_time_sec_accurate / 60, 2),
                 "avg_gradient_pct": default_slope, "congestion_factor": 1.0
             }
             assignments_to_save.append(assignment)
-            step_order += 1
 
         max_end_time_sec = max(max_end_time_sec, vehicle_total_time_sec)
 
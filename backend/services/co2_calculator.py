@@ -1,8 +1,10 @@
 from dataclasses import dataclass
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Sequence, Tuple
 import datetime as dt
 import math
 
+import numpy as np
+
 # [핵심] DB 직접 접근 함수를 모두 제거하고, 상수 로드 함수만 유지합니다.
 from services.db_handler import (
     get_settings_from_db,
@@ -124,6 +126,186 @@ def co2_for_route(segments: List[Segment], v: VehicleEF, start_time: dt.datetime
         "total_time_sec": round(total_time_sec, 2)
     }
 
+
+# --- 배치 CO2 계산 함수 (NumPy, 행렬 사전 계산/솔루션 파싱에서 사용) ---
+
+def flatten_segment_lists(segment_lists: Sequence[Sequence[Dict[str, Any]]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    아크별 segment dict 리스트들을 구조-배열(SoA) 형태로 펼칩니다.
+    반환: (distance_km, base_time_sec, arc_offsets) — arc k의 구간은 [arc_offsets[k], arc_offsets[k+1])
+    """
+    lengths = np.fromiter((len(segs) for segs in segment_lists), dtype=np.int64, count=len(segment_lists))
+    arc_offsets = np.zeros(len(segment_lists) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=arc_offsets[1:])
+    total = int(arc_offsets[-1])
+    distance_km = np.fromiter((s['distance_km'] for segs in segment_lists for s in segs), dtype=np.float64, count=total)
+    base_time_sec = np.fromiter((s['base_time_sec'] for segs in segment_lists for s in segs), dtype=np.float64, count=total)
+    return distance_km, base_time_sec, arc_offsets
+
+
+def _sequential_arc_sums(values: np.ndarray, arc_offsets: np.ndarray) -> np.ndarray:
+    """
+    values(행 = 지표, 열 = 구간)를 아크별로 *앞에서부터 순서대로* 더합니다.
+    co2_for_route의 누적 덧셈과 같은 순서로 더해야 부동소수점 결과가 비트 단위로 같아집니다.
+    (np.add.reduceat/sum은 pairwise 합산이라 결과가 미세하게 달라질 수 있음)
+    """
+    num_arcs = len(arc_offsets) - 1
+    totals = np.zeros((values.shape[0], num_arcs), dtype=np.float64)
+    if num_arcs == 0 or values.shape[1] == 0:
+        return totals
+    starts = arc_offsets[:-1]
+    lengths = np.diff(arc_offsets)
+    max_len = int(lengths.max())
+
+    if num_arcs < max_len:
+        # 아크 수가 적고 아크가 길면: 아크별 누적합(cumsum은 순차 누적)
+        for k in range(num_arcs):
+            if lengths[k] > 0:
+                totals[:, k] = np.cumsum(values[:, starts[k]:starts[k] + lengths[k]], axis=1)[:, -1]
+        return totals
+
+    # 아크가 많으면: 구간 위치별로 모든 아크를 한 번에 누적 (길이 내림차순 정렬로 활성 아크가 앞쪽에 모임)
+    order = np.argsort(-lengths, kind='stable')
+    sorted_starts = starts[order]
+    sorted_lengths = lengths[order]
+    sorted_totals = np.zeros_like(totals)
+    active = num_arcs
+    for pos in range(max_len):
+        while active > 0 and sorted_lengths[active - 1] <= pos:
+            active -= 1
+        sorted_totals[:, :active] += values[:, sorted_starts[:active] + pos]
+    totals[:, order] = sorted_totals
+    return totals
+
+
+def _round2(values: np.ndarray) -> np.ndarray:
+    """Python round(x, 2)와 동일한 반올림 (np.round는 경계값에서 결과가 다를 수 있음)."""
+    return np.fromiter((round(x, 2) for x in values.tolist()), dtype=np.float64, count=values.size)
+
+
+def co2_for_route_batch(distance_km: np.ndarray, base_time_sec: np.ndarray,
+                        slope_pct, load_kg, arc_offsets: np.ndarray,
+                        v: VehicleEF, congestion_factors: Dict[str, float],
+                        settings: Dict[str, float], weather_penalty_value: float) -> Dict[str, np.ndarray]:
+    """
+    co2_for_route의 벡터화 버전입니다. 모든 아크의 구간을 평탄화한 배열로 받아 아크별 결과를 한 번에 계산합니다.
+    - distance_km / base_time_sec: 구간별 값 (길이 = 전체 구간 수)
+    - slope_pct / load_kg: 구간별 배열 또는 스칼라 (브로드캐스트)
+    - arc_offsets: 길이 = 아크 수 + 1, arc k의 구간은 [arc_offsets[k], arc_offsets[k+1])
+    반환: 아크별 co2_drive_g / co2_idle_g / co2_total_g / total_time_sec 배열 (co2_for_route와 동일한 값)
+    """
+    s = settings
+    cong = congestion_factors
+    distance_km = np.asarray(distance_km, dtype=np.float64)
+    base_time_sec = np.asarray(base_time_sec, dtype=np.float64)
+    arc_offsets = np.asarray(arc_offsets, dtype=np.int64)
+    slope_pct = np.broadcast_to(np.asarray(slope_pct, dtype=np.float64), distance_km.shape)
+    load_kg = np.broadcast_to(np.asarray(load_kg, dtype=np.float64), distance_km.shape)
+
+    active = distance_km > 0
+
+    # 1. 속도 및 시간 계산 (co2_for_route와 동일한 연산 순서 유지)
+    base_avg_speed_kmh = np.full(distance_km.shape, float(s["max_free_flow_speed"]))
+    has_time = base_time_sec > 0
+    base_avg_speed_kmh[has_time] = distance_km[has_time] / (base_time_sec[has_time] / 3600)
+    final_speed_kmh = base_avg_speed_kmh / cong["tf"]
+    t_drive = np.zeros(distance_km.shape)
+    t_drive[active] = (distance_km[active] / final_speed_kmh[active]) * 3600
+
+    # 2. CO2 가중치 계산 (적재, 경사)
+    if v.capacity_kg <= 0:
+        load_ratio = np.zeros(distance_km.shape)
+    else:
+        load_ratio = np.minimum(1.0, load_kg / v.capacity_kg)
+    load_w = 1.0 + s["alpha_load"] * load_ratio
+    grade_w = 1.0 + np.minimum(s["grade_cap"], s["beta_grade"] * np.maximum(0.0, slope_pct))
+
+    # 3. 주행 CO2 / 4. 저속·공회전 CO2
+    drive_co2 = np.where(active, distance_km * v.ef_gpkm * load_w * grade_w * weather_penalty_value, 0.0)
+    idle_factor = np.maximum(0.0, (s["speed_idle_threshold"] - final_speed_kmh) / s["speed_idle_threshold"])
+    idle_co2 = np.where(active, t_drive * v.idle_gps * (idle_factor + cong["idle_f"]), 0.0)
+
+    totals = _sequential_arc_sums(np.vstack([drive_co2, idle_co2, t_drive]), arc_offsets)
+    total_drive_co2, total_idle_co2, total_time_sec = totals
+
+    return {
+        "co2_drive_g": _round2(total_drive_co2),
+        "co2_idle_g": _round2(total_idle_co2),
+        "co2_total_g": _round2(total_drive_co2 + total_idle_co2),
+        "total_time_sec": _round2(total_time_sec),
+    }
+
+
+# --- 아크별 CO2 특징 벡터 (차량/적재량과 무관한 부분을 1회 사전 집계) ---
+# 혼잡도/날씨/경사가 고정이면 co2_for_route의 아크 CO2는
+#   drive = ef_gpkm * weather * (1 + alpha_load * load_ratio) * Σ(distance_km * grade_w)
+#   idle  = idle_gps * Σ(t_drive * (idle_factor + idle_f))
+# 로 분해되므로, 구간 목록을 아래 4개 스칼라로 줄이면 차량/적재량 조합은 곱셈·덧셈 몇 번으로 계산됩니다.
+ARC_FEATURE_NAMES = ("distance_km", "grade_distance_km", "idle_weighted_sec", "drive_time_sec")
+
+
+def arc_co2_features(distance_km: np.ndarray, base_time_sec: np.ndarray, slope_pct, arc_offsets: np.ndarray,
+                     congestion_factors: Dict[str, float], settings: Dict[str, float]) -> np.ndarray:
+    """
+    평탄화된 구간 배열(co2_for_route_batch와 같은 입력)을 아크별 특징 벡터로 집계합니다.
+    반환: (아크 수, 4) 배열 — 열 순서는 ARC_FEATURE_NAMES
+    """
+    s = settings
+    cong = congestion_factors
+    distance_km = np.asarray(distance_km, dtype=np.float64)
+    base_time_sec = np.asarray(base_time_sec, dtype=np.float64)
+    arc_offsets = np.asarray(arc_offsets, dtype=np.int64)
+    slope_pct = np.broadcast_to(np.asarray(slope_pct, dtype=np.float64), distance_km.shape)
+
+    active = distance_km > 0
+    base_avg_speed_kmh = np.full(distance_km.shape, float(s["max_free_flow_speed"]))
+    has_time = base_time_sec > 0
+    base_avg_speed_kmh[has_time] = distance_km[has_time] / (base_time_sec[has_time] / 3600)
+    final_speed_kmh = base_avg_speed_kmh / cong["tf"]
+    t_drive = np.zeros(distance_km.shape)
+    t_drive[active] = (distance_km[active] / final_speed_kmh[active]) * 3600
+
+    grade_w = 1.0 + np.minimum(s["grade_cap"], s["beta_grade"] * np.maximum(0.0, slope_pct))
+    idle_factor = np.maximum(0.0, (s["speed_idle_threshold"] - final_speed_kmh) / s["speed_idle_threshold"])
+
+    per_segment = np.vstack([
+        np.where(active, distance_km, 0.0),
+        np.where(active, distance_km * grade_w, 0.0),
+        np.where(active, t_drive * (idle_factor + cong["idle_f"]), 0.0),
+        t_drive,
+    ])
+    return _sequential_arc_sums(per_segment, arc_offsets).T.copy()
+
+
+def co2_from_arc_features(features: np.ndarray, v: VehicleEF, load_kg,
+                          settings: Dict[str, float], weather_penalty_value: float) -> Dict[str, np.ndarray]:
+    """
+    arc_co2_features 결과로 차량 v, 적재량 load_kg의 아크 CO2를 계산합니다. (구간 순회 없음)
+    load_kg는 스칼라, 아크별 배열 또는 (적재량 수, 1)처럼 브로드캐스트 가능한 배열을 받습니다.
+    반환 값은 co2_for_route_batch와 같은 키의 배열이며 반올림하지 않습니다. (부동소수점 합산 순서 차이만 존재)
+    """
+    s = settings
+    features = np.asarray(features, dtype=np.float64)
+    grade_distance_km = features[..., 1]
+    idle_weighted_sec = features[..., 2]
+    drive_time_sec = features[..., 3]
+
+    load_kg = np.asarray(load_kg, dtype=np.float64)
+    if v.capacity_kg <= 0:
+        load_ratio = np.zeros_like(load_kg)
+    else:
+        load_ratio = np.minimum(1.0, load_kg / v.capacity_kg)
+    load_w = 1.0 + s["alpha_load"] * load_ratio
+
+    co2_drive = grade_distance_km * (v.ef_gpkm * weather_penalty_value) * load_w
+    co2_idle = np.broadcast_to(idle_weighted_sec * v.idle_gps, co2_drive.shape)
+    return {
+        "co2_drive_g": co2_drive,
+        "co2_idle_g": co2_idle,
+        "co2_total_g": co2_drive + co2_idle,
+        "total_time_sec": np.broadcast_to(drive_time_sec, co2_drive.shape),
+    }
+
 # -------------------------------------------------------------------
 # 🧪 테스트 코드 
 # -------------------------------------------------------------------
@@ -1,21 +1,16 @@
 # -*- coding: utf-8 -*-
 import requests, csv, datetime as dt, json, time, math
 from pathlib import Path
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 from urllib.parse import quote
 
+from services.http_client import get_http_client
+
 DATA_DIR = Path(__file__).resolve().parent.parent / "data"
 DATA_DIR.mkdir(exist_ok=True)
 
-def _session(retry_total=3, backoff=1.5):
-    s = requests.Session()
-    s.headers.update({"User-Agent": "EcoLogistics/ITS-Weather (requests)"})
-    r = Retry(total=retry_total, backoff_factor=backoff,
-              status_forcelist=[500,502,503,504],
-              allowed_methods=["GET"], raise_on_status=False)
-    s.mount("https://", HTTPAdapter(max_retries=r))
-    return s
+def _session():
+    # 공용 HTTP 클라이언트(keep-alive 풀 + 재시도 3회, backoff 1.5)의 세션을 재사용
+    return get_http_client("its").session
 
 # ----------------------------
 # ITS: 교통 소통정보 → CSV 직행
@@ -90,22 +85,9 @@ def fetch_its_traffic(api_key: str,
 # ----------------------------
 # Weather: 기상청 단기예보 → CSV 직행
 # ----------------------------
-def _session_retriable(total=6, backoff=1.3):
-    s = requests.Session()
-    s.headers.update({
-        "User-Agent": "EcoLogistics/WeatherFetcher",
-        "Accept-Encoding": "gzip, deflate"
-    })
-    r = Retry(
-        total=total, connect=total, read=total,
-        backoff_factor=backoff,
-        status_forcelist=[500,502,503,504],
-        allowed_methods=["GET"],
-        raise_on_status=False,
-    )
-    s.mount("https://", HTTPAdapter(max_retries=r))
-    s.mount("http://",  HTTPAdapter(max_retries=r))
-    return s
+def _session_retriable():
+    # 공용 HTTP 클라이언트(keep-alive 풀 + 재시도 6회, backoff 1.3, http/https)의 세션을 재사용
+    return get_http_client("weather").session
 
 def _vilage_bases_to_try():
     # 현재 기준 발표시각부터 과거 3 슬롯까지 시도 (공공망 느릴 때 최신 슬롯이 자주 막힘)
@@ -1,38 +1,114 @@
 import oracledb
 import config
+import atexit
+import threading
+import time
 import datetime as dt
 from typing import List, Dict, Tuple, Any, Optional
 
+# Pareto 모드(optimizer.engine)가 추가로 저장하는 경로 옵션 이름 접두사 — 대시보드 합계에서 제외
+PARETO_ROUTE_PREFIX = "Pareto"
+
+# --------------------------------------------------------------------------
+# DB 커넥션 풀 (프로세스 전역)
+# --------------------------------------------------------------------------
+_db_pool = None
+_db_pool_lock = threading.Lock()
+_db_pool_counters = {
+    "acquired": 0,
+    "acquire_failures": 0,
+    "acquire_wait_ms_total": 0.0,
+    "acquire_wait_ms_max": 0.0,
+}
+
+
+def get_db_pool():
+    """Wallet 인증 Oracle 세션 풀을 (최초 1회) 생성해 반환합니다."""
+    global _db_pool
+    if _db_pool is None:
+        with _db_pool_lock:
+            if _db_pool is None:
+                try:
+                    _db_pool = oracledb.create_pool(
+                        user=config.DB_USER,
+                        password=config.DB_PASSWORD,
+                        dsn=config.DB_DSN,
+                        config_dir=config.OCI_WALLET_DIR,
+                        wallet_location=config.OCI_WALLET_DIR,
+                        wallet_password=config.OCI_WALLET_PASSWORD,
+                        min=config.DB_POOL_MIN,
+                        max=config.DB_POOL_MAX,
+                        increment=config.DB_POOL_INCREMENT,
+                        stmtcachesize=config.DB_STMT_CACHE_SIZE,
+                        getmode=oracledb.POOL_GETMODE_TIMEDWAIT,
+                        wait_timeout=config.DB_POOL_WAIT_TIMEOUT_MS
+                    )
+                except Exception as e:
+                    raise ConnectionError(f"DB 커넥션 풀 생성 실패: {e}")
+    return _db_pool
+
+
+def close_db_pool():
+    """프로세스 종료 시 풀의 모든 세션을 정리합니다."""
+    global _db_pool
+    with _db_pool_lock:
+        if _db_pool is not None:
+            try:
+                _db_pool.close(force=True)
+            except Exception as e:
+                print(f"[WARN] DB 커넥션 풀 종료 중 오류: {e}")
+            _db_pool = None
+
+
+atexit.register(close_db_pool)
+
+
+def get_db_pool_stats() -> Dict[str, Any]:
+    """커넥션 풀 사용 통계 (열린/사용 중 세션 수, 획득 대기 시간 등)를 반환합니다."""
+    stats: Dict[str, Any] = {
+        "pool_created": _db_pool is not None,
+        "min": config.DB_POOL_MIN,
+        "max": config.DB_POOL_MAX,
+        "increment": config.DB_POOL_INCREMENT,
+        "stmt_cache_size": config.DB_STMT_CACHE_SIZE,
+        "wait_timeout_ms": config.DB_POOL_WAIT_TIMEOUT_MS,
+        **_db_pool_counters,
+    }
+    if _db_pool is not None:
+        try:
+            stats.update({"opened": _db_pool.opened, "busy": _db_pool.busy})
+        except Exception as e:
+            stats["error"] = str(e)
+    if stats["acquired"]:
+        stats["acquire_wait_ms_avg"] = round(stats["acquire_wait_ms_total"] / stats["acquired"], 3)
+    return stats
+
+
 # --------------------------------------------------------------------------
 # DB 연결 헬퍼 함수
 # --------------------------------------------------------------------------
 def get_db_connection():
-    """Oracle DB 연결 객체를 생성하고 반환합니다."""
+    """커넥션 풀에서 Oracle DB 연결을 가져와 반환합니다. (conn.close() 시 풀로 반환됨)"""
+    started = time.perf_counter()
     try:
-        conn = oracledb.connect(
-            user=config.DB_USER,
-            password=config.DB_PASSWORD,
-            dsn=config.DB_DSN,
-            config_dir=config.OCI_WALLET_DIR,
-            wallet_location=config.OCI_WALLET_DIR,
-            wallet_password=config.OCI_WALLET_PASSWORD
-        )
-        return conn
+        conn = get_db_pool().acquire()
     except Exception as e:
+        with _db_pool_lock:
+            _db_pool_counters["acquire_failures"] += 1
         # 연결 실패 시 ConnectionError를 발생시켜 상위 로직에서 처리하도록 합니다.
         raise ConnectionError(f"DB 연결 실패: {e}")
 
+    wait_ms = (time.perf_counter() - started) * 1000.0
+    with _db_pool_lock:
+        _db_pool_counters["acquired"] += 1
+        _db_pool_counters["acquire_wait_ms_total"] += wait_ms
+        _db_pool_counters["acquire_wait_ms_max"] = max(_db_pool_counters["acquire_wait_ms_max"], wait_ms)
+    return conn
+
 def test_db_connection() -> Dict:
     """app.py에서 사용: DB 연결을 테스트하고, 성공 시 버전 정보를 반환하는 함수"""
     try:
-        conn = oracledb.connect(
-            user=config.DB_USER,
-            password=config.DB_PASSWORD,
-            dsn=config.DB_DSN,
-            config_dir=config.OCI_WALLET_DIR,
-            wallet_location=config.OCI_WALLET_DIR,
-            wallet_password=config.OCI_WALLET_PASSWORD
-        )
+        conn = get_db_connection()
         db_version = conn.version
         conn.close()
         return {"status": "success", "db_version": db_version}
@@ -169,7 +245,7 @@ def get_optimizer_input_data(run_id: str, vehicle_ids: List[str]) -> Dict:
         
         # 2. JOBS 테이블에서 해당 RUN_ID의 배송 작업 목록 조회
         cursor.execute("""
-            SELECT JOB_ID, LATITUDE, LONGITUDE, DEMAND_KG, TW_START, TW_END
+            SELECT JOB_ID, SECTOR_ID, LATITUDE, LONGITUDE, DEMAND_KG, TW_START, TW_END
             FROM JOBS WHERE RUN_ID = :run_id ORDER BY JOB_ID
         """, {'run_id': run_id})
         job_columns = [d[0].lower() for d in cursor.description]
@@ -200,6 +276,70 @@ def get_optimizer_input_data(run_id: str, vehicle_ids: List[str]) -> Dict:
         cursor.close()
         conn.close()
 
+def get_previous_run_routes(run_id: str, route_option_name: str = "CO2 Optimal Route",
+                            lookback_runs: int = 5, coord_precision: int = 4) -> Optional[Dict[str, Any]]:
+    """
+    현재 Run과 배송지 좌표가 겹치는 최근 완료 Run의 경로(ASSIGNMENTS)를 조회합니다. (Solver warm start용)
+    최근 lookback_runs개 후보 중 겹치는 Job 수가 가장 많은 Run을 고릅니다. 없으면 None.
+    반환: {"run_id", "overlap", "jobs": {job_id: (lon, lat)}, "routes": [{"vehicle_id", "job_ids": [...]}]}
+    """
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        # 1. 좌표(격자 스냅)가 겹치는 최근 완료 Run 후보
+        cursor.execute(f"""
+            SELECT p.RUN_ID, COUNT(*) AS OVERLAP, MAX(r.RUN_DATE) AS RUN_DATE
+            FROM JOBS p
+            JOIN RUNS r ON r.RUN_ID = p.RUN_ID
+            JOIN (SELECT DISTINCT ROUND(LATITUDE, {int(coord_precision)}) AS LAT,
+                                  ROUND(LONGITUDE, {int(coord_precision)}) AS LON
+                  FROM JOBS WHERE RUN_ID = :run_id) c
+              ON ROUND(p.LATITUDE, {int(coord_precision)}) = c.LAT AND ROUND(p.LONGITUDE, {int(coord_precision)}) = c.LON
+            WHERE p.RUN_ID <> :run_id
+              AND r.OPTIMIZATION_STATUS = 'COMPLETED'
+              AND r.RUN_DATE <= (SELECT RUN_DATE FROM RUNS WHERE RUN_ID = :run_id)
+              AND EXISTS (SELECT 1 FROM ASSIGNMENTS a
+                          WHERE a.RUN_ID = p.RUN_ID AND a.ROUTE_OPTION_NAME = :route_option_name)
+            GROUP BY p.RUN_ID
+            ORDER BY MAX(r.RUN_DATE) DESC
+            FETCH FIRST :lookback ROWS ONLY
+        """, {'run_id': run_id, 'route_option_name': route_option_name, 'lookback': int(lookback_runs)})
+        candidates = cursor.fetchall()
+        if not candidates:
+            return None
+        previous_run_id, overlap, _ = max(candidates, key=lambda row: row[1])
+
+        # 2. 이전 Run의 Job 좌표와 차량별 방문 순서
+        cursor.execute("""
+            SELECT JOB_ID, LONGITUDE, LATITUDE FROM JOBS WHERE RUN_ID = :run_id
+        """, {'run_id': previous_run_id})
+        jobs = {row[0]: (float(row[1]), float(row[2])) for row in cursor.fetchall()
+                if row[1] is not None and row[2] is not None}
+
+        cursor.execute("""
+            SELECT VEHICLE_ID, STEP_ORDER, END_JOB_ID
+            FROM ASSIGNMENTS
+            WHERE RUN_ID = :run_id AND ROUTE_OPTION_NAME = :route_option_name
+            ORDER BY VEHICLE_ID, STEP_ORDER
+        """, {'run_id': previous_run_id, 'route_option_name': route_option_name})
+        routes: Dict[str, List[int]] = {}
+        for vehicle_id, _, end_job_id in cursor.fetchall():
+            if end_job_id is not None:
+                routes.setdefault(vehicle_id, []).append(end_job_id)
+
+        return {
+            "run_id": previous_run_id,
+            "overlap": int(overlap),
+            "jobs": jobs,
+            "routes": [{"vehicle_id": vid, "job_ids": job_ids} for vid, job_ids in routes.items()],
+        }
+    except Exception as e:
+        print(f"get_previous_run_routes 오류: {e}")
+        return None
+    finally:
+        cursor.close()
+        conn.close()
+
 # --------------------------------------------------------------------------
 # 데이터 저장 함수들
 # --------------------------------------------------------------------------
@@ -284,8 +424,9 @@ def get_dashboard_data(limit: int = 20) -> dict:
             SELECT rs.run_id, r.run_date, rs.route_option_name, rs.total_distance_km, rs.total_co2_g, rs.total_time_min, rs.saving_pct
             FROM RUN_SUMMARY rs
             JOIN RUNS r ON rs.run_id = r.run_id
+            WHERE rs.route_option_name IS NULL OR rs.route_option_name NOT LIKE :pareto_prefix
             ORDER BY r.run_date DESC
-        """)
+        """, {"pareto_prefix": PARETO_ROUTE_PREFIX + " %"})
 
         rows = cursor.fetchall()
         if not rows:
@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+"""
+외부 API 공용 HTTP 클라이언트.
+- 제공자(호스트)별 requests.Session 1개를 프로세스 전역으로 재사용 → HTTP keep-alive로 TCP/TLS 핸드셰이크 절약
+- 호스트별 커넥션 풀 크기 제한 (pool_maxsize), urllib3 Retry 기반 재시도 + 지수 백오프
+- (connect, read) 타임아웃 기본값
+- deadline_sec를 주면 재시도/백오프를 포함한 요청 전체를 데드라인 안으로 제한
+- 새 커넥션 수(= 핸드셰이크 수)와 요청 수를 집계해 풀 재사용률을 확인할 수 있습니다.
+"""
+import threading
+import time
+from typing import Any, Dict, Optional, Sequence, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import config
+
+HTTP_POOL_MAXSIZE = getattr(config, "HTTP_POOL_MAXSIZE", 16)
+HTTP_RETRY_TOTAL = getattr(config, "HTTP_RETRY_TOTAL", 2)
+HTTP_RETRY_BACKOFF = getattr(config, "HTTP_RETRY_BACKOFF", 0.5)
+HTTP_CONNECT_TIMEOUT_SEC = getattr(config, "HTTP_CONNECT_TIMEOUT_SEC", 5.0)
+
+TimeoutType = Union[None, float, Tuple[float, float]]
+
+
+class HttpClient:
+    """keep-alive 커넥션 풀 + 재시도 + 기본 타임아웃을 갖춘 공유 세션 래퍼 (스레드 간 공유 가능)."""
+
+    def __init__(self, name: str, pool_maxsize: int = HTTP_POOL_MAXSIZE,
+                 retry_total: int = HTTP_RETRY_TOTAL, backoff: float = HTTP_RETRY_BACKOFF,
+                 status_forcelist: Sequence[int] = (429, 500, 502, 503, 504),
+                 allowed_methods: Sequence[str] = ("GET",),
+                 connect_timeout: float = HTTP_CONNECT_TIMEOUT_SEC,
+                 read_timeout: float = 20.0,
+                 headers: Optional[Dict[str, str]] = None):
+        self.name = name
+        self.connect_timeout = float(connect_timeout)
+        self.read_timeout = float(read_timeout)
+
+        self.retry_total = int(retry_total)
+        self.backoff = float(backoff)
+        self.status_forcelist = frozenset(status_forcelist)
+        self.allowed_methods = frozenset(m.upper() for m in allowed_methods)
+
+        retry = Retry(total=retry_total, connect=retry_total, read=retry_total,
+                      backoff_factor=backoff, status_forcelist=list(status_forcelist),
+                      allowed_methods=list(allowed_methods), raise_on_status=False,
+                      respect_retry_after_header=True)
+        self._adapter = HTTPAdapter(pool_connections=4, pool_maxsize=int(pool_maxsize),
+                                    max_retries=retry, pool_block=False)
+        self.session = requests.Session()
+        self.session.headers.update({"User-Agent": "EcoLogistics/HttpClient (requests)"})
+        if headers:
+            self.session.headers.update(headers)
+        self.session.mount("https://", self._adapter)
+        self.session.mount("http://", self._adapter)
+
+        # 데드라인 요청용: urllib3 재시도 없이 같은 커넥션 풀을 쓰고, 재시도는 _request_within_deadline에서 직접 수행
+        # (urllib3 Retry는 시도마다 같은 소켓 타임아웃을 다시 쓰므로 요청 전체 시간을 제한할 수 없음)
+        self._deadline_adapter = HTTPAdapter(max_retries=0)
+        self._deadline_adapter.poolmanager = self._adapter.poolmanager
+        self._deadline_session = requests.Session()
+        self._deadline_session.headers.update(self.session.headers)
+        self._deadline_session.mount("https://", self._deadline_adapter)
+        self._deadline_session.mount("http://", self._deadline_adapter)
+
+        self._lock = threading.Lock()
+        self._counters = {"requests": 0, "errors": 0}
+
+    def _timeout(self, timeout: TimeoutType) -> Tuple[float, float]:
+        if timeout is None:
+            return (self.connect_timeout, self.read_timeout)
+        if isinstance(timeout, tuple):
+            return timeout
+        return (min(self.connect_timeout, float(timeout)), float(timeout))
+
+    def request(self, method: str, url: str, timeout: TimeoutType = None,
+                deadline_sec: Optional[float] = None, **kwargs) -> requests.Response:
+        """deadline_sec: 재시도·백오프를 포함한 요청 전체 시간 한도 (None이면 시도별 timeout만 적용)"""
+        with self._lock:
+            self._counters["requests"] += 1
+        try:
+            if deadline_sec is not None:
+                return self._request_within_deadline(method, url, timeout, float(deadline_sec), **kwargs)
+            return self.session.request(method, url, timeout=self._timeout(timeout), **kwargs)
+        except requests.exceptions.RequestException:
+            with self._lock:
+                self._counters["errors"] += 1
+            raise
+
+    def _request_within_deadline(self, method: str, url: str, timeout: TimeoutType,
+                                 deadline_sec: float, **kwargs) -> requests.Response:
+        """
+        시도마다 (connect, read) 타임아웃을 남은 시간으로 줄이고, 백오프가 데드라인을 넘기면 재시도하지 않습니다.
+        재시도 조건(횟수 / status_forcelist / 허용 메서드 / 지수 백오프)은 세션의 urllib3 Retry 설정과 같습니다.
+        """
+        deadline = time.monotonic() + deadline_sec
+        connect_timeout, read_timeout = self._timeout(timeout)
+        retryable = method.upper() in self.allowed_methods
+        attempt = 0
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise requests.exceptions.Timeout(f"{self.name}: {deadline_sec:.2f}s 데드라인 초과 ({url})")
+            try:
+                response = self._deadline_session.request(
+                    method, url, timeout=(min(connect_timeout, remaining), min(read_timeout, remaining)), **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                response = None
+                if not retryable or attempt >= self.retry_total:
+                    raise
+            else:
+                if response.status_code not in self.status_forcelist or not retryable or attempt >= self.retry_total:
+                    return response
+
+            attempt += 1
+            backoff_sec = self.backoff * (2 ** (attempt - 1)) if attempt > 1 else 0.0
+            if time.monotonic() + backoff_sec >= deadline:
+                if response is not None:
+                    return response
+                raise requests.exceptions.Timeout(f"{self.name}: {deadline_sec:.2f}s 데드라인 안에 재시도 불가 ({url})")
+            if response is not None:
+                response.close()
+            if backoff_sec:
+                time.sleep(backoff_sec)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def stats(self) -> Dict[str, Any]:
+        """호스트별 새 커넥션 수(핸드셰이크)와 요청 수, 풀 재사용률."""
+        hosts = {}
+        pools = self._adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            hosts[f"{pool.scheme}://{pool.host}:{pool.port}"] = {
+                "new_connections": pool.num_connections,
+                "requests": pool.num_requests,
+                "idle_connections": pool.pool.qsize() if pool.pool is not None else 0,
+            }
+        new_connections = sum(h["new_connections"] for h in hosts.values())
+        pool_requests = sum(h["requests"] for h in hosts.values())
+        with self._lock:
+            counters = dict(self._counters)
+        return {
+            **counters,
+            "new_connections": new_connections,
+            "pool_requests": pool_requests,
+            "connection_reuse_rate": round(1 - new_connections / pool_requests, 4) if pool_requests else 0.0,
+            "hosts": hosts,
+        }
+
+    def close(self) -> None:
+        self.session.close()
+        self._deadline_session.close()
+
+
+# ----------------------------------------------------------------------
+# 제공자별 프리셋 / 프로세스 전역 레지스트리
+# ----------------------------------------------------------------------
+_CLIENT_PRESETS: Dict[str, Dict[str, Any]] = {
+    # 카카오 모빌리티 길찾기 (행렬 생성 시 동시 호출이 많음)
+    "kakao_mobility": {"read_timeout": 20.0},
+    # 카카오 로컬 (주소 → 좌표)
+    "kakao_local": {"read_timeout": 10.0},
+    # OpenRouteService (Directions POST는 멱등 → 재시도 허용)
+    "ors": {"read_timeout": 25.0, "allowed_methods": ("GET", "POST")},
+    # ITS 교통 소통정보 수집
+    "its": {"retry_total": 3, "backoff": 1.5, "status_forcelist": (500, 502, 503, 504), "read_timeout": 30.0,
+            "headers": {"User-Agent": "EcoLogistics/ITS-Weather (requests)"}},
+    # 기상청 단기예보 수집 (공공망이 느려 재시도 많이)
+    "weather": {"retry_total": 6, "backoff": 1.3, "status_forcelist": (500, 502, 503, 504), "read_timeout": 30.0,
+                "headers": {"User-Agent": "EcoLogistics/WeatherFetcher", "Accept-Encoding": "gzip, deflate"}},
+}
+
+_clients: Dict[str, HttpClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_http_client(name: str) -> HttpClient:
+    """이름별 공유 HttpClient를 반환합니다. (프리셋이 없으면 기본 설정)"""
+    client = _clients.get(name)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(name)
+            if client is None:
+                client = HttpClient(name, **_CLIENT_PRESETS.get(name, {}))
+                _clients[name] = client
+    return client
+
+
+def get_http_client_stats() -> Dict[str, Any]:
+    with _clients_lock:
+        clients = list(_clients.items())
+    return {name: client.stats() for name, client in clients}
+
+
+def close_http_clients() -> None:
+    with _clients_lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+"""
+비동기 최적화 작업 큐.
+- POST /optimize {"async": true} 요청을 작업으로 등록하고 job_id를 즉시 반환
+- 워커 스레드 풀이 run_optimization을 실행하며 단계/진행률을 기록
+- 작업별 대기열 길이(제출 시점), 대기 시간, 실행 시간을 추적
+"""
+import threading
+import time
+import uuid
+import datetime as dt
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+import config
+
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+_FINISHED_STATUSES = (JOB_SUCCEEDED, JOB_FAILED)
+
+
+class QueueFullError(RuntimeError):
+    """대기 중/실행 중 작업 수가 max_queue에 도달해 새 작업을 받을 수 없을 때 발생합니다."""
+
+
+def _iso(ts: Optional[float]) -> Optional[str]:
+    return dt.datetime.fromtimestamp(ts).isoformat() if ts else None
+
+
+class OptimizationJobQueue:
+    """run_optimization을 백그라운드에서 실행하는 작업 큐 (스레드 안전)."""
+
+    def __init__(self, runner: Callable[..., Dict[str, Any]], max_workers: int = 2,
+                 max_queue: int = 50, retention_sec: float = 3600):
+        self._runner = runner
+        self.max_workers = max(1, int(max_workers))
+        self.max_queue = max(1, int(max_queue))
+        self.retention_sec = float(retention_sec)
+
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                            thread_name_prefix="optimize-job")
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._counters = {"submitted": 0, "succeeded": 0, "failed": 0, "rejected": 0}
+
+    # ------------------------------------------------------------------
+    # 제출 / 조회
+    # ------------------------------------------------------------------
+    def submit(self, run_id: str, vehicle_ids: List[str],
+               solver_options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        작업을 등록하고 스냅샷을 반환합니다. 대기열이 가득 차면 QueueFullError.
+        solver_options(time_budget_ms / quality / portfolio / pareto)는 runner에 키워드 인자로 전달됩니다.
+        """
+        with self._lock:
+            self._prune_finished(time.time())
+            depth = self._pending_count()
+            if depth >= self.max_queue:
+                self._counters["rejected"] += 1
+                raise QueueFullError(f"Optimization job queue is full ({depth}/{self.max_queue}).")
+
+            job_id = uuid.uuid4().hex
+            job = {
+                "job_id": job_id,
+                "run_id": run_id,
+                "vehicle_ids": list(vehicle_ids),
+                "solver_options": dict(solver_options or {}),
+                "status": JOB_QUEUED,
+                "phase": JOB_QUEUED,
+                "progress": 0.0,
+                "submitted_at": time.time(),
+                "started_at": None,
+                "finished_at": None,
+                "queue_depth_at_submit": depth,
+                "result": None,
+                "error": None,
+            }
+            self._jobs[job_id] = job
+            self._counters["submitted"] += 1
+            snapshot = self._snapshot(job)
+
+        self._executor.submit(self._execute, job_id)
+        return snapshot
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return self._snapshot(job) if job is not None else None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            jobs = list(self._jobs.values())
+            waits = [j["started_at"] - j["submitted_at"] for j in jobs if j["started_at"]]
+            runs = [j["finished_at"] - j["started_at"] for j in jobs if j["finished_at"] and j["started_at"]]
+            return {
+                **self._counters,
+                "queued": sum(1 for j in jobs if j["status"] == JOB_QUEUED),
+                "running": sum(1 for j in jobs if j["status"] == JOB_RUNNING),
+                "retained_jobs": len(jobs),
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "avg_wait_time_sec": round(sum(waits) / len(waits), 3) if waits else 0.0,
+                "max_wait_time_sec": round(max(waits), 3) if waits else 0.0,
+                "avg_run_time_sec": round(sum(runs) / len(runs), 3) if runs else 0.0,
+                "max_run_time_sec": round(max(runs), 3) if runs else 0.0,
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+
+    # ------------------------------------------------------------------
+    # 워커
+    # ------------------------------------------------------------------
+    def _execute(self, job_id: str) -> None:
+        with self._lock:
+            job = self._jobs[job_id]
+            job["status"] = JOB_RUNNING
+            job["phase"] = "starting"
+            job["started_at"] = time.time()
+            run_id, vehicle_ids, solver_options = job["run_id"], job["vehicle_ids"], job["solver_options"]
+
+        def _on_progress(phase: str, progress: float) -> None:
+            with self._lock:
+                job["phase"] = phase
+                job["progress"] = progress
+
+        try:
+            result = self._runner(run_id, vehicle_ids, progress_callback=_on_progress, **solver_options)
+            status = JOB_SUCCEEDED if isinstance(result, dict) and result.get("status") == "success" else JOB_FAILED
+            error = None if status == JOB_SUCCEEDED else (result or {}).get("message")
+        except Exception as e:
+            print(f"❌ 최적화 작업 {job_id} 실행 오류: {e}")
+            result, status, error = None, JOB_FAILED, str(e)
+
+        with self._lock:
+            job["status"] = status
+            job["phase"] = "done"
+            job["progress"] = 1.0
+            job["finished_at"] = time.time()
+            job["result"] = result
+            job["error"] = error
+            self._counters[status] += 1
+
+    # ------------------------------------------------------------------
+    # 내부 (호출 측에서 lock 보유)
+    # ------------------------------------------------------------------
+    def _pending_count(self) -> int:
+        return sum(1 for j in self._jobs.values() if j["status"] in (JOB_QUEUED, JOB_RUNNING))
+
+    def _prune_finished(self, now: float) -> None:
+        expired = [job_id for job_id, j in self._jobs.items()
+                   if j["status"] in _FINISHED_STATUSES and now - j["finished_at"] > self.retention_sec]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    @staticmethod
+    def _snapshot(job: Dict[str, Any]) -> Dict[str, Any]:
+        now = time.time()
+        started, finished = job["started_at"], job["finished_at"]
+        wait_end = started or now
+        run_end = finished or now
+        return {
+            "job_id": job["job_id"],
+            "run_id": job["run_id"],
+            "solver_options": job["solver_options"],
+            "status": job["status"],
+            "phase": job["phase"],
+            "progress": job["progress"],
+            "queue_depth_at_submit": job["queue_depth_at_submit"],
+            "submitted_at": _iso(job["submitted_at"]),
+            "started_at": _iso(started),
+            "finished_at": _iso(finished),
+            "wait_time_sec": round(wait_end - job["submitted_at"], 3),
+            "run_time_sec": round(run_end - started, 3) if started else None,
+            "error": job["error"],
+            "result": job["result"],
+        }
+
+
+# ----------------------------------------------------------------------
+# 프로세스 전역 큐 (지연 생성)
+# ----------------------------------------------------------------------
+_job_queue: Optional[OptimizationJobQueue] = None
+_job_queue_lock = threading.Lock()
+
+
+def get_optimization_job_queue() -> OptimizationJobQueue:
+    global _job_queue
+    if _job_queue is None:
+        with _job_queue_lock:
+            if _job_queue is None:
+                from optimizer.engine import run_optimization
+                _job_queue = OptimizationJobQueue(
+                    run_optimization,
+                    max_workers=getattr(config, "OPTIMIZE_JOB_WORKERS", 2),
+                    max_queue=getattr(config, "OPTIMIZE_JOB_MAX_QUEUE", 50),
+                    retention_sec=getattr(config, "OPTIMIZE_JOB_RETENTION_SEC", 3600),
+                )
+    return _job_queue
+
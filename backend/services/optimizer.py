@@ -1,5 +1,16 @@
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Tuple, Optional
 from math import radians, sin, cos, asin, sqrt
+import time
+
+import numpy as np
+
+QUOTE_ROUTE_NAME = "Quick Quote"
+EARTH_RADIUS_KM = 6371.0
+# Clarke-Wright 절약값은 노드별 최근접 이웃 k개 쌍만 후보로 사용 (N² 정렬 회피)
+SAVINGS_NEIGHBORS = 40
+# 2-opt / or-opt 개선 단계 시간 한도 (ms)
+IMPROVE_TIME_BUDGET_MS = 40.0
+OR_OPT_MAX_SEGMENT = 3
 
 
 def _haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
@@ -13,12 +24,158 @@ def _haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     return R * c
 
 
+def _haversine_matrix(lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+    """(N,) 위경도 배열 → (N, N) Haversine 거리 행렬(km)."""
+    lat_r, lon_r = np.radians(lat), np.radians(lon)
+    dlat = lat_r[:, None] - lat_r[None, :]
+    dlon = lon_r[:, None] - lon_r[None, :]
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat_r)[:, None] * np.cos(lat_r)[None, :] * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
 def _co2_g(distance_km: float, ef_gpkm: float) -> float:
     if ef_gpkm is None:
         return 0.0
     return float(distance_km) * float(ef_gpkm)
 
 
+def _job_coord(job: Dict[str, Any]) -> Tuple[float, float]:
+    return float(job.get("latitude") or job.get("lat") or 0), float(job.get("longitude") or job.get("lon") or 0)
+
+
+def _job_demand_kg(job: Dict[str, Any]) -> float:
+    # weight가 500 미만이면 톤 단위로 보고 kg으로 환산
+    return float(job.get("demand_kg") or job.get("weight") or 0) * (1000.0 if job.get("weight") and job.get("weight") < 500 else 1.0)
+
+
+# --------------------------------------------------------------------------
+# 구성 휴리스틱: Clarke-Wright 절약법 (병렬, 용량 확인)
+# --------------------------------------------------------------------------
+def _clarke_wright_routes(dist: np.ndarray, demand: np.ndarray, max_capacity: float) -> List[List[int]]:
+    """
+    노드 0 = 차고지. 각 Job을 단독 경로로 시작해 절약값 s(i,j) = d(0,i) + d(0,j) - d(i,j)이 큰 순서로
+    경로 끝점끼리 병합합니다. 병합 후 적재량이 max_capacity를 넘으면 병합하지 않습니다.
+    """
+    n = len(dist) - 1
+    if n == 0:
+        return []
+    k = min(n - 1, SAVINGS_NEIGHBORS)
+    routes: Dict[int, List[int]] = {node: [node] for node in range(1, n + 1)}
+    if k <= 0:
+        return list(routes.values())
+
+    job_dist = dist[1:, 1:].copy()
+    np.fill_diagonal(job_dist, np.inf)
+    neighbors = np.argpartition(job_dist, k - 1, axis=1)[:, :k] + 1
+    ii = np.repeat(np.arange(1, n + 1), k)
+    jj = neighbors.ravel()
+    keep = ii < jj
+    # 이웃 관계가 비대칭이면 (j, i)로만 들어온 쌍도 포함
+    extra = ~keep & ~np.isin(jj * (n + 1) + ii, ii[keep] * (n + 1) + jj[keep])
+    ii, jj = np.concatenate([ii[keep], jj[extra]]), np.concatenate([jj[keep], ii[extra]])
+    savings = dist[0, ii] + dist[0, jj] - dist[ii, jj]
+    order = np.argsort(-savings, kind="stable")
+
+    route_of = np.arange(n + 1)
+    load = {node: float(demand[node]) for node in range(1, n + 1)}
+    for i, j, saving in zip(ii[order].tolist(), jj[order].tolist(), savings[order].tolist()):
+        if saving <= 0:
+            break
+        ri, rj = int(route_of[i]), int(route_of[j])
+        if ri == rj or load[ri] + load[rj] > max_capacity:
+            continue
+        a, b = routes[ri], routes[rj]
+        # i, j가 각 경로의 끝점일 때만 병합 (i ... ] + [ j ...)
+        if a[-1] == i and b[0] == j:
+            merged = a + b
+        elif a[0] == i and b[-1] == j:
+            merged = b + a
+        elif a[-1] == i and b[-1] == j:
+            merged = a + b[::-1]
+        elif a[0] == i and b[0] == j:
+            merged = a[::-1] + b
+        else:
+            continue
+        routes[ri] = merged
+        load[ri] += load.pop(rj)
+        del routes[rj]
+        route_of[np.asarray(b)] = ri
+    return list(routes.values())
+
+
+# --------------------------------------------------------------------------
+# 개선: 경로 내 2-opt / or-opt (NumPy 벡터화)
+# --------------------------------------------------------------------------
+def _two_opt_move(tour: np.ndarray, dist: np.ndarray) -> Optional[Tuple[float, int, int]]:
+    """tour = [0, ..., 0]. 가장 좋은 2-opt (구간 tour[i..j] 뒤집기) 이동 (delta < 0일 때만)."""
+    m = len(tour)
+    if m < 5:
+        return None
+    a, b = tour[:-1], tour[1:]
+    edge = dist[a, b]
+    # i: 끊는 첫 간선 (a[i], b[i]), j: 두 번째 간선 (a[j], b[j]), i < j
+    delta = dist[a[:, None], a[None, :]] + dist[b[:, None], b[None, :]] - edge[:, None] - edge[None, :]
+    delta = np.triu(delta, k=2)
+    flat = int(np.argmin(delta))
+    i, j = divmod(flat, m - 1)
+    best = float(delta[i, j])
+    return (best, i + 1, j) if best < -1e-9 else None
+
+
+def _or_opt_move(tour: np.ndarray, dist: np.ndarray) -> Optional[Tuple[float, int, int, int, bool]]:
+    """길이 1~OR_OPT_MAX_SEGMENT 구간을 같은 경로의 다른 간선 사이로 옮기는 최선 이동 (정/역방향)."""
+    m = len(tour)
+    best = None
+    for length in range(1, min(OR_OPT_MAX_SEGMENT, m - 3) + 1):
+        starts = np.arange(1, m - length)          # 구간 tour[s : s + length]
+        first, last = tour[starts], tour[starts + length - 1]
+        prev, nxt = tour[starts - 1], tour[starts + length]
+        removal = dist[prev, first] + dist[last, nxt] - dist[prev, nxt]
+        u, v = tour[:-1], tour[1:]                  # 삽입 간선 (u[e], v[e])
+        forward = dist[u[None, :], first[:, None]] + dist[last[:, None], v[None, :]] - dist[u, v][None, :]
+        backward = dist[u[None, :], last[:, None]] + dist[first[:, None], v[None, :]] - dist[u, v][None, :]
+        # 구간과 겹치거나 맞닿은 간선(e = s-1 ... s+length-1)은 제외
+        edges = np.arange(m - 1)[None, :]
+        overlap = (edges >= starts[:, None] - 1) & (edges <= starts[:, None] + length - 1)
+        for reverse, insert in ((False, forward), (True, backward)):
+            delta = np.where(overlap, np.inf, insert - removal[:, None])
+            flat = int(np.argmin(delta))
+            s_idx, e = divmod(flat, m - 1)
+            value = float(delta[s_idx, e])
+            if value < -1e-9 and (best is None or value < best[0]):
+                best = (value, int(starts[s_idx]), length, e, reverse)
+    return best
+
+
+def _improve_route(route: List[int], dist: np.ndarray, deadline: float) -> List[int]:
+    """2-opt → or-opt 순서로 개선 이동이 없거나 deadline까지 반복합니다."""
+    tour = np.asarray([0] + route + [0], dtype=np.int64)
+    while time.perf_counter() < deadline:
+        move = _two_opt_move(tour, dist)
+        if move is not None:
+            _, i, j = move
+            tour[i:j + 1] = tour[i:j + 1][::-1]
+            continue
+        move = _or_opt_move(tour, dist)
+        if move is None:
+            break
+        _, start, length, edge, reverse = move
+        segment = tour[start:start + length]
+        segment = segment[::-1] if reverse else segment
+        rest = np.concatenate([tour[:start], tour[start + length:]])
+        insert_at = edge + 1 if edge < start else edge + 1 - length
+        tour = np.concatenate([rest[:insert_at], segment, rest[insert_at:]])
+    return tour[1:-1].tolist()
+
+
+def _route_distance(route: List[int], dist: np.ndarray) -> float:
+    tour = [0] + route + [0]
+    return float(dist[tour[:-1], tour[1:]].sum())
+
+
+# --------------------------------------------------------------------------
+# 메인: 빠른 견적(quote) 배차
+# --------------------------------------------------------------------------
 def optimize_plan(
     run_id: str,
     run_date: str,
@@ -28,70 +185,93 @@ def optimize_plan(
     depot: Tuple[float, float] = (0.0, 0.0),
 ) -> Dict[str, Any]:
     """
-    간단한 MVP 최적화:
-    - 모든 작업을 첫 번째 차량에 순서대로 할당
-    - 인접 점 간 Haversine 거리 합산
-    - CO2는 차량 타입별 고정 EF를 입력으로 받는다고 가정(없으면 0)
+    빠른 견적(quote)용 배차 — 전체 엔진(run_optimization)이 도는 동안 UI에 즉시 보여줄 계획:
+    - 차고지 + Job의 Haversine 거리 행렬을 NumPy로 한 번에 계산
+    - Clarke-Wright 절약법으로 경로 구성 (최대 차량 용량 기준 병합)
+    - 경로별 2-opt / or-opt 개선 (IMPROVE_TIME_BUDGET_MS 이내)
+    - 경로를 차량에 배정: 긴 경로부터 용량이 되는 차량 중 운행 횟수가 적고 배출계수가 낮은 차량
+      (경로가 차량보다 많으면 차고지로 돌아와 다음 운행)
+    - 운행마다 차고지 복귀 구간까지 포함하고, load_kg는 운행 안에서 누적한 적재량 (차고지에서 0으로 초기화)
+    - CO2는 차량 배출계수(g/km) × 거리 (없으면 0), saving_pct는 입력 순서 단일 차량 왕복 경로 대비
     반환 키:
       assignments: List[dict]
       summary: dict
       gradients: List[dict]
     """
     if not jobs:
-        return {"assignments": [], "summary": {"route_option_name": "MVP", "total_distance_km": 0, "total_time_min": 0, "total_co2_g": 0, "saving_pct": 0}, "gradients": []}
+        return {"assignments": [], "summary": {"route_option_name": QUOTE_ROUTE_NAME, "total_distance_km": 0, "total_time_min": 0, "total_co2_g": 0, "saving_pct": 0}, "gradients": []}
+
+    started = time.perf_counter()
+    coords = np.array([depot] + [_job_coord(job) for job in jobs], dtype=float)
+    dist = _haversine_matrix(coords[:, 0], coords[:, 1])
+    demand = np.array([0.0] + [_job_demand_kg(job) for job in jobs])
 
-    # 차량 선택 (MVP: 첫 차량)
-    vehicle_id = vehicles[0].get("id") if vehicles else "VEHICLE_1"
-    vehicle_type = vehicles[0].get("type") if vehicles else "GENERIC"
-    ef_gpkm = vehicles[0].get("ef_gpkm") if vehicles else None
+    fleet = vehicles or [{"id": "VEHICLE_1", "type": "GENERIC"}]
+    capacities = [float(v.get("capacity_kg") or np.inf) for v in fleet]
+    ef_values = [v.get("ef_gpkm", v.get("co2_gpkm")) for v in fleet]
+
+    routes = _clarke_wright_routes(dist, demand, max(capacities))
+    deadline = time.perf_counter() + IMPROVE_TIME_BUDGET_MS / 1000.0
+    routes = [_improve_route(route, dist, deadline) for route in routes]
+
+    # 경로 → 차량 배정
+    route_distances = [_route_distance(route, dist) for route in routes]
+    trips: List[List[List[int]]] = [[] for _ in fleet]
+    for r in sorted(range(len(routes)), key=lambda r: -route_distances[r]):
+        route_demand = float(demand[routes[r]].sum())
+        candidates = [v for v in range(len(fleet)) if capacities[v] >= route_demand] or list(range(len(fleet)))
+        v = min(candidates, key=lambda v: (len(trips[v]), float(ef_values[v]) if ef_values[v] is not None else 0.0, v))
+        trips[v].append(routes[r])
 
-    # 경로 구성: depot -> job1 -> job2 -> ...
-    prev_lat, prev_lon = depot
     total_distance = 0.0
     total_time_min = 0.0  # 속도 정보를 모르면 0
     total_co2_g = 0.0
-
     assignments: List[Dict[str, Any]] = []
-    step_order = 1
-    load_kg_running = 0.0
-
-    for job in jobs:
-        lat = float(job.get("latitude") or job.get("lat") or 0)
-        lon = float(job.get("longitude") or job.get("lon") or 0)
-        demand_kg = float(job.get("demand_kg") or job.get("weight") or 0) * (1000.0 if job.get("weight") and job.get("weight") < 500 else 1.0)
-
-        dist = _haversine_km(prev_lat, prev_lon, lat, lon)
-        total_distance += dist
-        seg_co2 = _co2_g(dist, ef_gpkm)
-        total_co2_g += seg_co2
-        load_kg_running += demand_kg
-
-        assignments.append({
-            "run_id": run_id,
-            "route_option_name": "MVP",
-            "vehicle_id": vehicle_id,
-            "step_order": step_order,
-            "start_job_id": None,
-            "end_job_id": job.get("job_id") or job.get("id"),
-            "distance_km": round(dist, 3),
-            "co2_g": round(seg_co2, 3),
-            "load_kg": round(load_kg_running, 2),
-            "time_min": 0.0,
-            "avg_gradient_pct": 0.0,
-            "congestion_factor": 1.0,
-        })
-
-        step_order += 1
-        prev_lat, prev_lon = lat, lon
+
+    for v, vehicle_trips in enumerate(trips):
+        vehicle_id = fleet[v].get("id") or fleet[v].get("vehicle_id") or f"VEHICLE_{v + 1}"
+        ef_gpkm = ef_values[v]
+        step_order = 1
+        for route in vehicle_trips:
+            # 운행 = 차고지 출발 → Job들 → 차고지 복귀 (Clarke-Wright / 2-opt가 최적화한 닫힌 경로와 같은 거리)
+            prev, load_kg_running = 0, 0.0
+            for node in route + [0]:
+                seg_dist = float(dist[prev, node])
+                seg_co2 = _co2_g(seg_dist, ef_gpkm)
+                total_distance += seg_dist
+                total_co2_g += seg_co2
+                load_kg_running = load_kg_running + float(demand[node]) if node != 0 else 0.0
+                assignments.append({
+                    "run_id": run_id,
+                    "route_option_name": QUOTE_ROUTE_NAME,
+                    "vehicle_id": vehicle_id,
+                    "step_order": step_order,
+                    "start_job_id": None if prev == 0 else (jobs[prev - 1].get("job_id") or jobs[prev - 1].get("id")),
+                    "end_job_id": None if node == 0 else (jobs[node - 1].get("job_id") or jobs[node - 1].get("id")),
+                    "distance_km": round(seg_dist, 3),
+                    "co2_g": round(seg_co2, 3),
+                    "load_kg": round(load_kg_running, 2),
+                    "time_min": 0.0,
+                    "avg_gradient_pct": 0.0,
+                    "congestion_factor": 1.0,
+                })
+                step_order += 1
+                prev = node
+
+    # 기준: 입력 순서대로 첫 차량이 모두 방문 후 차고지 복귀 (이전 MVP 방식 + 복귀 구간)
+    baseline_km = _route_distance(list(range(1, len(jobs) + 1)), dist)
+    baseline_co2_g = _co2_g(baseline_km, ef_values[0])
+    saving_pct = (baseline_co2_g - total_co2_g) / baseline_co2_g * 100 if baseline_co2_g > 0 else 0.0
 
     summary = {
-        "route_option_name": "MVP",
+        "route_option_name": QUOTE_ROUTE_NAME,
         "total_distance_km": round(total_distance, 3),
         "total_time_min": round(total_time_min, 2),
         "total_co2_g": round(total_co2_g, 3),
-        "saving_pct": 0.0,
+        "saving_pct": round(saving_pct, 2),
+        "num_routes": len(routes),
+        "vehicles_used": sum(1 for vehicle_trips in trips if vehicle_trips),
+        "compute_ms": round((time.perf_counter() - started) * 1000, 2),
     }
 
     return {"assignments": assignments, "summary": summary, "gradients": []}
-
-
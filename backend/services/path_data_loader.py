@@ -1,26 +1,152 @@
 # -*- coding: utf-8 -*-
 import requests
-from typing import Dict, List, Tuple, Any, Optional
+from typing import Dict, List, Tuple, Any, Optional, Callable
+import atexit
 import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
 import requests.exceptions  # 예외 처리 import 추가
 
 import config
+from services.route_cache import RouteCache
+from services.http_client import get_http_client
+from services.segment_store import SegmentStore, ARC_FLAG_ESTIMATED, ARC_FLAG_SUMMARY
 
 KAKAO_API_KEY = getattr(config, "KAKAOMAP_REST_API", None)
 ORS_API_KEY = getattr(config, "ORS_API_KEY", None)
+ORS_BASE_URL = getattr(config, "ORS_BASE_URL", "https://api.openrouteservice.org").rstrip("/")
+ORS_MATRIX_PROFILE = getattr(config, "ORS_MATRIX_PROFILE", "driving-car")
+ORS_MATRIX_CHUNK_SIZE = getattr(config, "ORS_MATRIX_CHUNK_SIZE", 50)
+ROUTE_MATRIX_PROVIDER = getattr(config, "ROUTE_MATRIX_PROVIDER", "kakao")
+
+# --- 행렬 생성 동시성 설정 ---
+ROUTE_MATRIX_MAX_WORKERS = getattr(config, "ROUTE_MATRIX_MAX_WORKERS", 8)
+ROUTE_MATRIX_RATE_PER_SEC = getattr(config, "ROUTE_MATRIX_RATE_PER_SEC", 10.0)
+ROUTE_REQUEST_DEADLINE_SEC = getattr(config, "ROUTE_REQUEST_DEADLINE_SEC", 20.0)
+
+# --- 희소(k-최근접) 행렬 설정 ---
+ROUTE_MATRIX_SPARSE_K = getattr(config, "ROUTE_MATRIX_SPARSE_K", 0)
+ROUTE_MATRIX_SPARSE_MIN_NODES = getattr(config, "ROUTE_MATRIX_SPARSE_MIN_NODES", 30)
+ROUTE_ESTIMATE_DETOUR_FACTOR = getattr(config, "ROUTE_ESTIMATE_DETOUR_FACTOR", 1.3)
+ROUTE_ESTIMATE_SPEED_KMH = getattr(config, "ROUTE_ESTIMATE_SPEED_KMH", 40.0)
+
+# --- P2P 대안 경로 (Kakao + ORS 동시 조회) ---
+# 제공자별 요청 타임아웃은 전체 데드라인을 넘지 않도록 함께 줄임 (기본 데드라인은 가장 긴 타임아웃 이상)
+ROUTE_ALTERNATIVES_DEADLINE_SEC = getattr(config, "ROUTE_ALTERNATIVES_DEADLINE_SEC", 30.0)
+KAKAO_ALTERNATIVES_TIMEOUT_SEC = min(20.0, ROUTE_ALTERNATIVES_DEADLINE_SEC)
+ORS_ALTERNATIVES_TIMEOUT_SEC = min(25.0, ROUTE_ALTERNATIVES_DEADLINE_SEC)
+ROUTE_HEDGE_ENABLED = getattr(config, "ROUTE_HEDGE_ENABLED", True)
+ROUTE_HEDGE_MIN_SAMPLES = getattr(config, "ROUTE_HEDGE_MIN_SAMPLES", 20)
+ROUTE_HEDGE_PERCENTILE = getattr(config, "ROUTE_HEDGE_PERCENTILE", 95.0)
+
+# --- 동일 좌표 위치 병합 ---
+ROUTE_DEDUPE_LOCATIONS = getattr(config, "ROUTE_DEDUPE_LOCATIONS", True)
+# 2단계 모드: 행렬은 요약(거리/시간)만 조회하고 도로 구간(road_details)은 해에 쓰인 아크만 조회
+ROUTE_LAZY_SEGMENTS = getattr(config, "ROUTE_LAZY_SEGMENTS", False)
+
+# --- 경로 캐시 설정 ---
+ROUTE_CACHE_ENABLED = getattr(config, "ROUTE_CACHE_ENABLED", True)
+ROUTE_CACHE_PATH = getattr(config, "ROUTE_CACHE_PATH", None)
+ROUTE_CACHE_MEMORY_MB = getattr(config, "ROUTE_CACHE_MEMORY_MB", 64)
+ROUTE_CACHE_TTL_SEC = getattr(config, "ROUTE_CACHE_TTL_SEC", 7 * 24 * 3600)
+ROUTE_CACHE_COORD_PRECISION = getattr(config, "ROUTE_CACHE_COORD_PRECISION", 4)
 
 # --- API URL ---
 KAKAO_DIRECTIONS_URL = "https://apis-navi.kakaomobility.com/v1/directions"
-ORS_DIRECTIONS_URL = "https://api.openrouteservice.org/v2/directions"
+ORS_DIRECTIONS_URL = f"{ORS_BASE_URL}/v2/directions"
+ORS_MATRIX_URL = f"{ORS_BASE_URL}/v2/matrix"
+
+# --------------------------------------------------------------------------
+# 0. 경로 캐시 (Read-through)
+# --------------------------------------------------------------------------
+_route_cache: Optional[RouteCache] = None
+_route_cache_lock = threading.Lock()
+
+
+def get_route_cache() -> Optional[RouteCache]:
+    """프로세스 전역 경로 캐시를 반환합니다. (비활성화 시 None)"""
+    global _route_cache
+    if not ROUTE_CACHE_ENABLED:
+        return None
+    if _route_cache is None:
+        with _route_cache_lock:
+            if _route_cache is None:
+                _route_cache = RouteCache(
+                    db_path=ROUTE_CACHE_PATH,
+                    max_memory_bytes=int(ROUTE_CACHE_MEMORY_MB * 1024 * 1024),
+                    ttl_sec=ROUTE_CACHE_TTL_SEC,
+                    coord_precision=ROUTE_CACHE_COORD_PRECISION,
+                )
+    return _route_cache
+
+
+def get_route_cache_stats() -> Dict[str, Any]:
+    """경로 캐시 hit/miss/eviction 통계를 반환합니다."""
+    cache = get_route_cache()
+    return cache.stats() if cache else {"enabled": False}
+
+
+def _peek_route_cache(provider: str, car_type: Any,
+                      origin_coord: Tuple[float, float], destination_coord: Tuple[float, float]) -> Any:
+    """네트워크 호출 없이 캐시만 확인합니다. (속도 제한 토큰을 소모하기 전에 사용)"""
+    cache = get_route_cache()
+    if cache is None:
+        return None
+    try:
+        return cache.get(cache.make_key(provider, car_type, origin_coord, destination_coord))
+    except Exception as e:
+        print(f"[WARN] 경로 캐시 조회 실패: {e}")
+        return None
+
+
+def _store_in_route_cache(provider: str, car_type: Any,
+                          origin_coord: Tuple[float, float], destination_coord: Tuple[float, float],
+                          result: Any) -> None:
+    cache = get_route_cache()
+    if cache is None or not result:
+        return
+    try:
+        cache.put(cache.make_key(provider, car_type, origin_coord, destination_coord), result)
+    except Exception as e:
+        print(f"[WARN] 경로 캐시 저장 실패: {e}")
+
+
+def _read_through_route_cache(provider: str, car_type: Any,
+                              origin_coord: Tuple[float, float], destination_coord: Tuple[float, float],
+                              fetch: Callable[[], Any]) -> Any:
+    """캐시에 있으면 그대로 반환하고, 없으면 fetch() 결과를 캐시에 저장한 뒤 반환합니다."""
+    cached = _peek_route_cache(provider, car_type, origin_coord, destination_coord)
+    if cached is not None:
+        return cached
+    result = fetch()
+    _store_in_route_cache(provider, car_type, origin_coord, destination_coord, result)
+    return result
+
 
 # --------------------------------------------------------------------------
 # 1. 단일 경로 조회 함수 (Single Route Lookup - VRP 행렬 생성용)
 # --------------------------------------------------------------------------
 
-def get_kakao_route(origin_coord: Tuple[float, float], destination_coord: Tuple[float, float], car_type: int = 6) -> Optional[Dict]:
+def get_kakao_route(origin_coord: Tuple[float, float], destination_coord: Tuple[float, float], car_type: int = 6,
+                    timeout: float = 20) -> Optional[Dict]:
     """
     카카오 모빌리티 길찾기 API를 호출하여 *단일 기본 경로* 정보를 반환합니다.
-    (VRP 행렬 생성에 사용됨)
+    (VRP 행렬 생성에 사용됨, 경로 캐시를 먼저 확인)
+    """
+    return _read_through_route_cache(
+        "kakao", car_type, origin_coord, destination_coord,
+        lambda: _timed_provider_request(
+            "kakao", lambda: _request_kakao_route(origin_coord, destination_coord, car_type, timeout))
+    )
+
+
+def _request_kakao_route(origin_coord: Tuple[float, float], destination_coord: Tuple[float, float],
+                         car_type: int, timeout: float, road_details: bool = True) -> Optional[Dict]:
+    """
+    get_kakao_route의 실제 API 호출부 (캐시 미적용).
+    road_details=False면 요약(summary=true)만 요청하고 segments는 요약 Segment 1개로 채웁니다.
     """
     # ⭐ [오류 수정] 정의된 변수 'KAKAO_API_KEY'를 사용하도록 수정
     if not KAKAO_API_KEY or KAKAO_API_KEY == "YOUR_KAKAOMAP_REST_API":
@@ -36,11 +162,14 @@ def get_kakao_route(origin_coord: Tuple[float, float], destination_coord: Tuple[
         "destination": f"{destination_coord[0]},{destination_coord[1]}",
         "car_type": car_type, 
         "priority": "RECOMMEND",
-        "road_details": "true"
+        "road_details": "true" if road_details else "false"
     }
+    if not road_details:
+        params["summary"] = "true"
 
     try:
-        response = requests.get(KAKAO_DIRECTIONS_URL, headers=headers, params=params, timeout=20) 
+        response = get_http_client("kakao_mobility").get(KAKAO_DIRECTIONS_URL, headers=headers, params=params,
+                                                         deadline_sec=timeout)
         response.raise_for_status() 
         data = response.json()
         
@@ -53,7 +182,9 @@ def get_kakao_route(origin_coord: Tuple[float, float], destination_coord: Tuple[
         total_time_sec = route['summary']['duration']
 
         segments = []
-        if total_distance_km > 0:
+        if not road_details:
+            segments = summary_segments(total_distance_km, total_time_sec, "kakao") if total_distance_km > 0 else []
+        elif total_distance_km > 0:
             for section in route['sections']:
                 for road in section['roads']:
                     segment_distance = road['distance'] / 1000.0
@@ -96,8 +227,18 @@ def get_kakao_route(origin_coord: Tuple[float, float], destination_coord: Tuple[
 def get_kakao_route_alternatives(origin_coord: Tuple[float, float], destination_coord: Tuple[float, float], car_type: int = 6) -> Optional[List[Dict]]:
     """
     카카오 모빌리티 길찾기 API를 호출하여 *모든 대안 경로* 리스트를 반환합니다.
-    (단일 작업(P2P) 시나리오에서 사용됨)
+    (단일 작업(P2P) 시나리오에서 사용됨, 경로 캐시를 먼저 확인)
     """
+    return _read_through_route_cache(
+        "kakao_alt", car_type, origin_coord, destination_coord,
+        lambda: _timed_provider_request(
+            "kakao_alt", lambda: _request_kakao_route_alternatives(origin_coord, destination_coord, car_type))
+    )
+
+
+def _request_kakao_route_alternatives(origin_coord: Tuple[float, float], destination_coord: Tuple[float, float],
+                                      car_type: int) -> Optional[List[Dict]]:
+    """get_kakao_route_alternatives의 실제 API 호출부 (캐시 미적용)."""
     # ⭐ [오류 수정] 정의된 변수 'KAKAO_API_KEY'를 사용하도록 수정
     if not KAKAO_API_KEY or KAKAO_API_KEY == "YOUR_KAKAOMAP_REST_API":
         return None
@@ -119,7 +260,8 @@ def get_kakao_route_alternatives(origin_coord: Tuple[float, float], destination_
     all_routes = []
 
     try:
-        response = requests.get(KAKAO_DIRECTIONS_URL, headers=headers, params=params, timeout=20) 
+        response = get_http_client("kakao_mobility").get(KAKAO_DIRECTIONS_URL, headers=headers, params=params,
+                                                         timeout=KAKAO_ALTERNATIVES_TIMEOUT_SEC)
         response.raise_for_status()
         data = response.json()
         
@@ -188,11 +330,57 @@ def _haversine_km(lon1, lat1, lon2, lat2):
     return r * c
 
 
+def _ors_feature_to_route(feat: Dict) -> Dict:
+    """ORS feature(요약 + geometry 좌표열)를 경로 dict로 변환합니다. (좌표 간 구간을 Segment로 사용)"""
+    summary = feat.get("properties", {}).get("summary", {}) or {}
+    total_distance_km = (summary.get("distance") or 0) / 1000.0
+    total_time_sec = summary.get("duration") or 0.0
+    geometry = feat.get("geometry", {}) or {}
+    coords = []
+    if isinstance(geometry, dict):
+        coords = geometry.get("coordinates") or []
+
+    segments = []
+    if len(coords) >= 2:
+        segment_lengths = []
+        for i in range(len(coords) - 1):
+            lon1, lat1 = coords[i]
+            lon2, lat2 = coords[i + 1]
+            segment_lengths.append(_haversine_km(lon1, lat1, lon2, lat2))
+        total_seg_len = sum(segment_lengths) or 1e-6
+        # 좌표열(단순화된 geometry) 길이 합을 요약 거리에 맞춰 보정 → 행렬 API 요약 거리와 일치
+        scale = total_distance_km / total_seg_len if total_distance_km else 1.0
+        for i, seg_len in enumerate(segment_lengths):
+            seg_time = total_time_sec * (seg_len / total_seg_len) if total_time_sec else 0.0
+            segments.append({
+                "link_id": None,
+                "distance_km": seg_len * scale,
+                "base_time_sec": seg_time
+            })
+
+    return {
+        "total_distance_km": total_distance_km,
+        "total_time_sec": total_time_sec,
+        "segments": segments,
+        "polyline": coords
+    }
+
+
 def get_ors_route_alternatives(origin_coord: Tuple[float, float], destination_coord: Tuple[float, float],
                                profile: str = "driving-car") -> Optional[List[Dict]]:
     """
-    OpenRouteService Directions API로 대안 경로를 요청합니다.
+    OpenRouteService Directions API로 대안 경로를 요청합니다. (경로 캐시를 먼저 확인)
     """
+    return _read_through_route_cache(
+        "ors_alt", profile, origin_coord, destination_coord,
+        lambda: _timed_provider_request(
+            "ors_alt", lambda: _request_ors_route_alternatives(origin_coord, destination_coord, profile))
+    )
+
+
+def _request_ors_route_alternatives(origin_coord: Tuple[float, float], destination_coord: Tuple[float, float],
+                                    profile: str) -> Optional[List[Dict]]:
+    """get_ors_route_alternatives의 실제 API 호출부 (캐시 미적용)."""
     if not ORS_API_KEY:
         return None
 
@@ -213,7 +401,8 @@ def get_ors_route_alternatives(origin_coord: Tuple[float, float], destination_co
     }
 
     def _request(payload):
-        resp = requests.post(f"{ORS_DIRECTIONS_URL}/{profile}/json", json=payload, headers=headers, timeout=25)
+        resp = get_http_client("ors").post(f"{ORS_DIRECTIONS_URL}/{profile}/json", json=payload, headers=headers,
+                                           timeout=ORS_ALTERNATIVES_TIMEOUT_SEC)
         resp.raise_for_status()
         data = resp.json()
         if data.get("features"):
@@ -243,92 +432,881 @@ def get_ors_route_alternatives(origin_coord: Tuple[float, float], destination_co
 
         if not features:
             return None
-
-        routes = []
-        for idx, feat in enumerate(features):
-            summary = feat.get("properties", {}).get("summary", {}) or {}
-            total_distance_km = (summary.get("distance") or 0) / 1000.0
-            total_time_sec = summary.get("duration") or 0.0
-            geometry = feat.get("geometry", {}) or {}
-            coords = []
-            if isinstance(geometry, dict):
-                coords = geometry.get("coordinates") or []
-
-            segments = []
-            if len(coords) >= 2:
-                segment_lengths = []
-                for i in range(len(coords) - 1):
-                    lon1, lat1 = coords[i]
-                    lon2, lat2 = coords[i + 1]
-                    segment_lengths.append(_haversine_km(lon1, lat1, lon2, lat2))
-                total_seg_len = sum(segment_lengths) or 1e-6
-                for i, seg_len in enumerate(segment_lengths):
-                    seg_time = total_time_sec * (seg_len / total_seg_len) if total_time_sec else 0.0
-                    segments.append({
-                        "link_id": None,
-                        "distance_km": seg_len,
-                        "base_time_sec": seg_time
-                    })
-
-            routes.append({
-                "provider": "ors",
-                "route_name": f"ORS_ALT_{idx+1}",
-                "total_distance_km": total_distance_km,
-                "total_time_sec": total_time_sec,
-                "segments": segments,
-                "polyline": coords
-            })
-        return routes
+        return [
+            {"provider": "ors", "route_name": f"ORS_ALT_{idx+1}", **_ors_feature_to_route(feat)}
+            for idx, feat in enumerate(features)
+        ]
     except Exception as e:
         print(f"[WARN] ORS Directions 호출 오류: {e}")
         return None
 
 
 # --------------------------------------------------------------------------
-# 2-c. 복합 대안 경로 (Kakao + ORS)
+# 2-c. 제공자별 응답 지연 히스토그램
 # --------------------------------------------------------------------------
+class LatencyHistogram:
+    """
+    고정 버킷(ms) 누적 히스토그램 + 최근 성공 표본 창(p50/p95 계산용). 스레드 안전.
+    실패(ok=False)는 버킷/실패 수에만 집계하고 백분위 표본에는 넣지 않습니다. (빠른 실패가 hedge 시점을 앞당기지 않도록)
+    """
+    BUCKET_BOUNDS_MS = (50, 100, 200, 300, 500, 750, 1000, 1500, 2000, 3000, 5000, 8000, 12000, 20000, 30000)
+
+    def __init__(self, window: int = 512):
+        self._lock = threading.Lock()
+        self._counts = [0] * (len(self.BUCKET_BOUNDS_MS) + 1)
+        self._recent = deque(maxlen=window)
+        self._count = 0
+        self._total_ms = 0.0
+        self._failures = 0
+
+    def record(self, elapsed_sec: float, ok: bool = True) -> None:
+        elapsed_ms = elapsed_sec * 1000.0
+        bucket = len(self.BUCKET_BOUNDS_MS)
+        for k, bound in enumerate(self.BUCKET_BOUNDS_MS):
+            if elapsed_ms <= bound:
+                bucket = k
+                break
+        with self._lock:
+            self._counts[bucket] += 1
+            self._count += 1
+            self._total_ms += elapsed_ms
+            if ok:
+                self._recent.append(elapsed_ms)
+            else:
+                self._failures += 1
+
+    def percentile(self, q: float) -> Optional[float]:
+        """최근 성공 표본 기준 q 백분위 지연(초). 표본이 없으면 None."""
+        with self._lock:
+            samples = sorted(self._recent)
+        if not samples:
+            return None
+        rank = min(len(samples) - 1, max(0, int(math.ceil(q / 100.0 * len(samples))) - 1))
+        return samples[rank] / 1000.0
+
+    def sample_count(self) -> int:
+        with self._lock:
+            return len(self._recent)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = list(self._counts)
+            count, total_ms, failures = self._count, self._total_ms, self._failures
+        labels = [f"<={b}ms" for b in self.BUCKET_BOUNDS_MS] + [f">{self.BUCKET_BOUNDS_MS[-1]}ms"]
+        p50, p95, p99 = self.percentile(50), self.percentile(95), self.percentile(99)
+        return {
+            "count": count,
+            "failures": failures,
+            "mean_ms": round(total_ms / count, 1) if count else 0.0,
+            "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            "p99_ms": round(p99 * 1000, 1) if p99 is not None else None,
+            "buckets": {label: c for label, c in zip(labels, counts) if c},
+        }
+
+
+_provider_latency: Dict[str, LatencyHistogram] = {}
+_provider_counters: Dict[str, Dict[str, int]] = {}
+_provider_stats_lock = threading.Lock()
+
+
+def _latency_histogram(provider: str) -> LatencyHistogram:
+    with _provider_stats_lock:
+        if provider not in _provider_latency:
+            _provider_latency[provider] = LatencyHistogram()
+            _provider_counters[provider] = {"calls": 0, "hedges_sent": 0, "hedges_won": 0, "deadline_misses": 0}
+        return _provider_latency[provider]
+
+
+def _count_provider_event(provider: str, event: str) -> None:
+    _latency_histogram(provider)
+    with _provider_stats_lock:
+        _provider_counters[provider][event] += 1
+
+
+def _timed_provider_request(provider: str, request_fn: Callable[[], Any]) -> Any:
+    """실제 네트워크 요청 시간만 제공자 히스토그램에 기록합니다. (캐시 hit 제외)"""
+    started = time.perf_counter()
+    result = None
+    try:
+        result = request_fn()
+        return result
+    finally:
+        _latency_histogram(provider).record(time.perf_counter() - started, ok=bool(result))
+
+
+def get_provider_latency_stats() -> Dict[str, Any]:
+    """제공자별 지연 히스토그램과 hedge/데드라인 통계를 반환합니다."""
+    with _provider_stats_lock:
+        providers = list(_provider_latency.items())
+        counters = {name: dict(c) for name, c in _provider_counters.items()}
+    return {name: {**counters.get(name, {}), **hist.snapshot()} for name, hist in providers}
+
+
+# --------------------------------------------------------------------------
+# 2-d. 복합 대안 경로 (Kakao + ORS 동시 조회, 데드라인 + hedged request)
+# --------------------------------------------------------------------------
+_alternatives_executor: Optional[ThreadPoolExecutor] = None
+_alternatives_executor_lock = threading.Lock()
+
+
+def _get_alternatives_executor() -> ThreadPoolExecutor:
+    """대안 경로 조회용 스레드 풀을 (최초 호출 시) 생성해 반환합니다."""
+    global _alternatives_executor
+    if _alternatives_executor is None:
+        with _alternatives_executor_lock:
+            if _alternatives_executor is None:
+                _alternatives_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="route-alt")
+    return _alternatives_executor
+
+
+@atexit.register
+def _shutdown_alternatives_executor() -> None:
+    if _alternatives_executor is not None:
+        _alternatives_executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _hedge_delay_sec(provider: str) -> Optional[float]:
+    """표본이 충분하면 p95 지연을 hedge 시점으로 사용합니다. (부족하면 hedge 안 함)"""
+    hist = _latency_histogram(provider)
+    if hist.sample_count() < ROUTE_HEDGE_MIN_SAMPLES:
+        return None
+    return hist.percentile(ROUTE_HEDGE_PERCENTILE)
+
+
+def fetch_alternatives_concurrently(providers: List[Tuple[str, Callable[[], Optional[List[Dict]]]]],
+                                    deadline_sec: Optional[float] = None,
+                                    hedge: Optional[bool] = None) -> Dict[str, Optional[List[Dict]]]:
+    """
+    여러 제공자를 동시에 조회하고 데드라인 안에 도착한 결과만 돌려줍니다.
+    - providers: [(provider 이름, 인자 없는 조회 함수), ...]
+    - hedge: 응답이 p95 지연을 넘긴 제공자에 같은 요청을 한 번 더 보내 먼저 온 결과를 사용
+    - 데드라인을 넘긴 요청은 백그라운드에서 끝나며, 결과는 경로 캐시에 남아 다음 호출에 쓰입니다.
+    반환: {provider: 결과 또는 None}
+    """
+    deadline_sec = ROUTE_ALTERNATIVES_DEADLINE_SEC if deadline_sec is None else float(deadline_sec)
+    hedge = ROUTE_HEDGE_ENABLED if hedge is None else hedge
+    executor = _get_alternatives_executor()
+    started = time.monotonic()
+
+    results: Dict[str, Optional[List[Dict]]] = {name: None for name, _ in providers}
+    fetchers = dict(providers)
+    pending: Dict[Any, Tuple[str, bool]] = {}
+    in_flight: Dict[str, int] = {}
+    hedged = set()
+    hedge_at: Dict[str, Optional[float]] = {}
+
+    for name, fetch in providers:
+        _count_provider_event(name, "calls")
+        pending[executor.submit(fetch)] = (name, False)
+        in_flight[name] = 1
+        hedge_at[name] = _hedge_delay_sec(name) if hedge else None
+
+    finished = set()
+    while len(finished) < len(providers):
+        elapsed = time.monotonic() - started
+        if elapsed >= deadline_sec:
+            break
+        # 다음 이벤트: 데드라인 또는 가장 이른 hedge 시점
+        next_event = deadline_sec
+        for name, delay in hedge_at.items():
+            if delay is not None and name not in hedged and name not in finished:
+                next_event = min(next_event, delay)
+        done, _ = wait(list(pending), timeout=max(0.0, next_event - elapsed), return_when=FIRST_COMPLETED)
+
+        for future in done:
+            name, is_hedge = pending.pop(future)
+            in_flight[name] -= 1
+            if name in finished:
+                continue
+            try:
+                value = future.result()
+            except Exception as e:
+                print(f"[WARN] {name} 대안 경로 조회 오류: {e}")
+                value = None
+            if value:
+                results[name] = value
+                finished.add(name)
+                if is_hedge:
+                    _count_provider_event(name, "hedges_won")
+            elif in_flight[name] == 0:
+                finished.add(name)  # 모든 요청이 빈 결과로 끝남
+
+        elapsed = time.monotonic() - started
+        for name, delay in hedge_at.items():
+            if delay is None or name in hedged or name in finished or elapsed < delay:
+                continue
+            hedged.add(name)
+            _count_provider_event(name, "hedges_sent")
+            pending[executor.submit(fetchers[name])] = (name, True)
+            in_flight[name] += 1
+            print(f"   ⏱️ {name} 응답 지연 {elapsed:.2f}s > p{ROUTE_HEDGE_PERCENTILE:.0f} {delay:.2f}s → hedge 요청 전송")
+
+    for name, _ in providers:
+        if name not in finished:
+            _count_provider_event(name, "deadline_misses")
+            print(f"[WARN] {name} 대안 경로가 데드라인({deadline_sec:.1f}s) 안에 도착하지 않았습니다.")
+    return results
+
+
 def get_combined_route_alternatives(origin_coord: Tuple[float, float], destination_coord: Tuple[float, float]) -> List[Dict]:
+    """Kakao/ORS 대안 경로를 동시에 조회해 (Kakao, ORS 순서로) 합칩니다. 데드라인 안에 온 결과만 포함합니다."""
+    results = fetch_alternatives_concurrently([
+        ("kakao_alt", lambda: get_kakao_route_alternatives(origin_coord, destination_coord)),
+        ("ors_alt", lambda: get_ors_route_alternatives(origin_coord, destination_coord)),
+    ])
     candidates: List[Dict] = []
-    kakao_routes = get_kakao_route_alternatives(origin_coord, destination_coord) or []
-    ors_routes = get_ors_route_alternatives(origin_coord, destination_coord) or []
-    candidates.extend(kakao_routes)
-    candidates.extend(ors_routes)
+    candidates.extend(results.get("kakao_alt") or [])
+    candidates.extend(results.get("ors_alt") or [])
     return candidates
 
-def create_kakao_route_matrices(locations: List[Dict]) -> Tuple[List[List[float]], List[List[float]], Dict[Tuple[int, int], List[Dict]]]:
+class TokenBucket:
     """
-    모든 위치 쌍에 대해 카카오 API를 호출하여 거리 행렬, 시간 행렬 및 Segment 맵을 생성합니다.
-    (get_kakao_route를 사용)
+    초당 rate_per_sec개의 토큰을 채우는 스레드 안전 토큰 버킷입니다.
+    (외부 경로 API 호출 속도 제한용, rate_per_sec <= 0 이면 제한 없음)
+    """
+
+    def __init__(self, rate_per_sec: float, capacity: Optional[float] = None):
+        self.rate_per_sec = float(rate_per_sec or 0.0)
+        self.capacity = float(capacity) if capacity else max(1.0, self.rate_per_sec)
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """토큰 1개를 얻을 때까지 대기합니다. timeout 안에 얻지 못하면 False를 반환합니다."""
+        if self.rate_per_sec <= 0:
+            return True
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.rate_per_sec)
+                self._last_refill = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return True
+                wait_sec = (1.0 - self._tokens) / self.rate_per_sec
+            if deadline is not None and now + wait_sec > deadline:
+                return False
+            time.sleep(wait_sec)
+
+
+def build_route_matrices_concurrent(locations: List[Dict],
+                                    route_fetcher: Optional[Callable[..., Optional[Dict]]] = None,
+                                    car_type: int = 6,
+                                    max_workers: Optional[int] = None,
+                                    rate_per_sec: Optional[float] = None,
+                                    request_deadline_sec: Optional[float] = None,
+                                    progress_callback: Optional[Callable[[int, int], None]] = None,
+                                    cache_lookup: Optional[Callable[[Tuple[float, float], Tuple[float, float]], Optional[Dict]]] = None,
+                                    pairs: Optional[List[Tuple[int, int]]] = None
+                                    ) -> Tuple[List[List[float]], List[List[float]], Dict[Tuple[int, int], List[Dict]], Dict[str, Any]]:
+    """
+    모든 위치 쌍 (i != j) (또는 pairs로 지정한 쌍)의 경로를 제한된 스레드 풀로 동시에 조회해 거리/시간 행렬과 Segment 맵을 만듭니다.
+    - route_fetcher: get_kakao_route와 같은 시그니처 (origin, destination, car_type, timeout=...)
+    - rate_per_sec: 토큰 버킷 기반 초당 호출 한도 (<= 0 이면 무제한)
+    - request_deadline_sec: 요청당 데드라인 (토큰 대기 시간 포함, 남은 시간이 재시도 포함 요청 전체 한도).
+      토큰을 얻지 못하면 timed_out, 데드라인 뒤에 도착한 유효한 응답은 버리지 않고 late로 집계합니다.
+    - cache_lookup: 토큰을 소모하기 전에 확인할 캐시 조회 함수 (hit이면 API 호출 생략)
+    - pairs: 조회할 (i, j) 목록. 지정하지 않은 쌍은 math.inf로 남습니다. (희소 모드)
+    반환: (distance_matrix_km, time_matrix_sec, segment_data_map(SegmentStore), stats)
     """
+    route_fetcher = route_fetcher or get_kakao_route
+    max_workers = max(1, int(max_workers or ROUTE_MATRIX_MAX_WORKERS))
+    rate_per_sec = ROUTE_MATRIX_RATE_PER_SEC if rate_per_sec is None else rate_per_sec
+    request_deadline_sec = float(request_deadline_sec or ROUTE_REQUEST_DEADLINE_SEC)
+
     num_locations = len(locations)
     distance_matrix_km = [[math.inf] * num_locations for _ in range(num_locations)]
     time_matrix_sec = [[math.inf] * num_locations for _ in range(num_locations)]
-    segment_data_map = {}
-    
-    CAR_TYPE = 6
-    
-    print("   🧭 카카오 모빌리티 API를 사용하여 경로 행렬 생성 시작...")
-    
+    segment_data_map = SegmentStore(num_locations)
     for i in range(num_locations):
-        for j in range(num_locations):
-            if i == j:
-                distance_matrix_km[i][j] = 0.0
-                time_matrix_sec[i][j] = 0.0
-                continue
+        distance_matrix_km[i][i] = 0.0
+        time_matrix_sec[i][i] = 0.0
 
-            origin = (locations[i]['longitude'], locations[i]['latitude'])
-            destination = (locations[j]['longitude'], locations[j]['latitude']) 
+    if pairs is None:
+        pairs = [(i, j) for i in range(num_locations) for j in range(num_locations) if i != j]
+    else:
+        pairs = [(i, j) for i, j in pairs if i != j]
+    stats = {
+        "total_pairs": len(pairs),
+        "fetched": 0,
+        "cache_hits": 0,
+        "failed": 0,
+        "timed_out": 0,
+        "late": 0,
+        "max_workers": max_workers,
+        "rate_per_sec": rate_per_sec,
+        "wall_time_sec": 0.0,
+    }
+    if not pairs:
+        return distance_matrix_km, time_matrix_sec, segment_data_map, stats
 
-            route_info = get_kakao_route(origin, destination, CAR_TYPE)
-            
+    bucket = TokenBucket(rate_per_sec)
+
+    def _fetch(pair):
+        i, j = pair
+        origin = (locations[i]['longitude'], locations[i]['latitude'])
+        destination = (locations[j]['longitude'], locations[j]['latitude'])
+        if cache_lookup:
+            cached = cache_lookup(origin, destination)
+            if cached:
+                return pair, cached, False, True
+
+        started = time.monotonic()
+        if not bucket.acquire(timeout=request_deadline_sec):
+            return pair, None, True, False
+        remaining = max(0.1, request_deadline_sec - (time.monotonic() - started))
+        try:
+            route_info = route_fetcher(origin, destination, car_type, timeout=remaining)
+        except Exception as e:
+            print(f"❌ 경로 조회 오류 ({i}->{j}): {e}")
+            route_info = None
+        # 이미 받아 캐시에 저장된 응답은 늦게 와도 사용 (late), 응답 없이 데드라인을 넘긴 경우만 timed_out
+        late = (time.monotonic() - started) > request_deadline_sec
+        return pair, route_info, late, False
+
+    started_at = time.perf_counter()
+    done = 0
+    progress_step = max(10, len(pairs) // 10)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_fetch, pair) for pair in pairs]
+        for future in as_completed(futures):
+            (i, j), route_info, late, from_cache = future.result()
             if route_info:
                 distance_matrix_km[i][j] = route_info['total_distance_km']
                 time_matrix_sec[i][j] = route_info['total_time_sec']
                 segment_data_map[(i, j)] = route_info['segments']
+                stats["fetched"] += 1
+                if from_cache:
+                    stats["cache_hits"] += 1
+                if late:
+                    stats["late"] += 1
+            else:
+                stats["failed"] += 1
+                if late:
+                    stats["timed_out"] += 1
+
+            done += 1
+            if progress_callback:
+                progress_callback(done, len(pairs))
+            if done % progress_step == 0 or done == len(pairs):
+                print(f"   ... 경로 행렬 진행률 {done}/{len(pairs)} (성공 {stats['fetched']}, 실패 {stats['failed']})")
 
+    segment_data_map.shrink_to_fit()
+    stats["wall_time_sec"] = round(time.perf_counter() - started_at, 3)
+    return distance_matrix_km, time_matrix_sec, segment_data_map, stats
+
+
+# --------------------------------------------------------------------------
+# 3-1. 희소(k-최근접) 아크 그래프
+# --------------------------------------------------------------------------
+
+def select_sparse_pairs(locations: List[Dict], k: int, depot_index: int = 0) -> List[Tuple[int, int]]:
+    """
+    각 노드의 직선거리 기준 k-최근접 이웃 아크(양방향)와 차고지 왕복 아크만 고릅니다.
+    조회 쌍 수는 O(N·k)가 됩니다.
+    """
+    num_locations = len(locations)
+    selected = set()
+    for i in range(num_locations):
+        if i != depot_index:
+            selected.add((depot_index, i))
+            selected.add((i, depot_index))
+        distances = sorted(
+            (_haversine_km(locations[i]['longitude'], locations[i]['latitude'],
+                           locations[j]['longitude'], locations[j]['latitude']), j)
+            for j in range(num_locations) if j != i
+        )
+        for _, j in distances[:k]:
+            selected.add((i, j))
+            selected.add((j, i))
+    return sorted(selected)
+
+
+def estimate_route(origin_coord: Tuple[float, float], destination_coord: Tuple[float, float]) -> Dict:
+    """직선거리 × 우회 계수와 평균 속도로 추정한 경로 (단일 구간, estimated=True)."""
+    distance_km = _haversine_km(origin_coord[0], origin_coord[1],
+                                destination_coord[0], destination_coord[1]) * ROUTE_ESTIMATE_DETOUR_FACTOR
+    time_sec = distance_km / max(1e-6, ROUTE_ESTIMATE_SPEED_KMH) * 3600.0
+    return {
+        "total_distance_km": distance_km,
+        "total_time_sec": time_sec,
+        "segments": [{"link_id": None, "distance_km": distance_km, "base_time_sec": time_sec, "estimated": True}],
+    }
+
+
+def is_estimated_arc(segment_data_map: Dict[Tuple[int, int], List[Dict]], arc: Tuple[int, int]) -> bool:
+    if isinstance(segment_data_map, SegmentStore):
+        return segment_data_map.has_flag(arc, ARC_FLAG_ESTIMATED)
+    segments = segment_data_map.get(arc)
+    return bool(segments) and bool(segments[0].get("estimated"))
+
+
+def fill_estimated_arcs(locations: List[Dict], distance_matrix_km: List[List[float]],
+                        time_matrix_sec: List[List[float]],
+                        segment_data_map: Dict[Tuple[int, int], List[Dict]]) -> int:
+    """조회하지 않았거나 실패한 아크(math.inf)를 추정 경로로 채우고, 채운 개수를 반환합니다."""
+    filled = 0
+    num_locations = len(locations)
+    for i in range(num_locations):
+        origin = (locations[i]['longitude'], locations[i]['latitude'])
+        for j in range(num_locations):
+            if i == j or not math.isinf(distance_matrix_km[i][j]):
+                continue
+            route_info = estimate_route(origin, (locations[j]['longitude'], locations[j]['latitude']))
+            distance_matrix_km[i][j] = route_info['total_distance_km']
+            time_matrix_sec[i][j] = route_info['total_time_sec']
+            segment_data_map[(i, j)] = route_info['segments']
+            filled += 1
+    return filled
+
+
+def resolve_estimated_arcs(locations: List[Dict], arcs: List[Tuple[int, int]],
+                           distance_matrix_km: List[List[float]], time_matrix_sec: List[List[float]],
+                           segment_data_map: Dict[Tuple[int, int], List[Dict]]) -> int:
+    """
+    최종 해에 쓰인 추정 아크만 실제 경로로 다시 조회해 행렬/Segment 맵을 덮어씁니다.
+    (조회 실패 시 추정값 유지) 실제 경로로 바뀐 아크 수를 반환합니다.
+    """
+    if not arcs:
+        return 0
+    resolved_dist, resolved_time, resolved_segments, _ = build_route_matrices_concurrent(
+        locations, _fetch_kakao_route_and_cache, 6, pairs=list(arcs),
+        cache_lookup=lambda origin, destination: _peek_route_cache("kakao", 6, origin, destination)
+    )
+    resolved = 0
+    for i, j in arcs:
+        if (i, j) in resolved_segments:
+            distance_matrix_km[i][j] = resolved_dist[i][j]
+            time_matrix_sec[i][j] = resolved_time[i][j]
+            segment_data_map[(i, j)] = resolved_segments[(i, j)]
+            resolved += 1
+    return resolved
+
+
+# --------------------------------------------------------------------------
+# 3-2. 동일 좌표 위치 병합 / 복원
+# --------------------------------------------------------------------------
+
+def dedupe_locations(locations: List[Dict], coord_precision: Optional[int] = None) -> Tuple[List[Dict], List[int]]:
+    """
+    경로 캐시와 같은 격자(coord_precision 자리)로 좌표를 스냅해 같은 위치의 노드를 하나로 합칩니다.
+    반환: (고유 위치 목록, 노드별 고유 위치 인덱스). 첫 등장 순서를 유지하므로 차고지(0)는 항상 0번입니다.
+    """
+    p = ROUTE_CACHE_COORD_PRECISION if coord_precision is None else int(coord_precision)
+    unique_locations: List[Dict] = []
+    node_to_unique: List[int] = []
+    seen: Dict[Tuple[float, float], int] = {}
+    for loc in locations:
+        key = (round(float(loc['longitude']), p), round(float(loc['latitude']), p))
+        if key not in seen:
+            seen[key] = len(unique_locations)
+            unique_locations.append(loc)
+        node_to_unique.append(seen[key])
+    return unique_locations, node_to_unique
+
+
+def expand_route_matrices(distance_matrix_km: List[List[float]], time_matrix_sec: List[List[float]],
+                          segment_data_map: Dict[Tuple[int, int], List[Dict]], node_to_unique: List[int]
+                          ) -> Tuple[List[List[float]], List[List[float]], Dict[Tuple[int, int], List[Dict]]]:
+    """
+    고유 위치 기준 행렬을 노드(Job) 기준으로 펼칩니다.
+    같은 위치의 노드 사이 아크는 거리/시간 0, Segment 없음(= 비용 0)으로 채웁니다.
+    """
+    num_nodes = len(node_to_unique)
+    expanded_dist = [[0.0] * num_nodes for _ in range(num_nodes)]
+    expanded_time = [[0.0] * num_nodes for _ in range(num_nodes)]
+    if isinstance(segment_data_map, SegmentStore):
+        for i, ui in enumerate(node_to_unique):
+            dist_row, time_row = distance_matrix_km[ui], time_matrix_sec[ui]
+            for j, uj in enumerate(node_to_unique):
+                if ui != uj:
+                    expanded_dist[i][j] = dist_row[uj]
+                    expanded_time[i][j] = time_row[uj]
+        return expanded_dist, expanded_time, segment_data_map.expand(node_to_unique)
+
+    expanded_segments: Dict[Tuple[int, int], List[Dict]] = {}
+    for i, ui in enumerate(node_to_unique):
+        dist_row, time_row = distance_matrix_km[ui], time_matrix_sec[ui]
+        for j, uj in enumerate(node_to_unique):
+            if i == j:
+                continue
+            if ui == uj:
+                expanded_segments[(i, j)] = []
+                continue
+            expanded_dist[i][j] = dist_row[uj]
+            expanded_time[i][j] = time_row[uj]
+            if (ui, uj) in segment_data_map:
+                expanded_segments[(i, j)] = segment_data_map[(ui, uj)]
+    return expanded_dist, expanded_time, expanded_segments
+
+
+def _fetch_kakao_route_and_cache(origin, destination, car_type, timeout=ROUTE_REQUEST_DEADLINE_SEC):
+    """행렬 생성용 fetcher: 캐시는 cache_lookup에서 이미 확인했으므로 요청 후 저장만 합니다."""
+    route_info = _timed_provider_request(
+        "kakao", lambda: _request_kakao_route(origin, destination, car_type, timeout))
+    _store_in_route_cache("kakao", car_type, origin, destination, route_info)
+    return route_info
+
+
+def _fetch_kakao_summary_and_cache(origin, destination, car_type, timeout=ROUTE_REQUEST_DEADLINE_SEC):
+    """2단계 모드 행렬용 fetcher: 요약만 요청해 별도 캐시 키(car_type:summary)로 저장합니다."""
+    route_info = _timed_provider_request(
+        "kakao", lambda: _request_kakao_route(origin, destination, car_type, timeout, road_details=False))
+    _store_in_route_cache("kakao", f"{car_type}:summary", origin, destination, route_info)
+    return route_info
+
+
+def _peek_kakao_route_or_summary(origin, destination, car_type):
+    """상세 경로가 캐시에 있으면 그대로 쓰고, 없으면 요약 캐시를 확인합니다."""
+    return (_peek_route_cache("kakao", car_type, origin, destination)
+            or _peek_route_cache("kakao", f"{car_type}:summary", origin, destination))
+
+
+def _select_route_pairs(locations: List[Dict], sparse_k: int) -> Optional[List[Tuple[int, int]]]:
+    """희소 모드 조건을 만족하면 조회할 k-최근접 + 차고지 쌍 목록, 아니면 None(전체 쌍)."""
+    num_locations = len(locations)
+    if 0 < sparse_k < num_locations - 1 and num_locations >= ROUTE_MATRIX_SPARSE_MIN_NODES:
+        return select_sparse_pairs(locations, sparse_k)
+    return None
+
+
+def _route_pair_count(locations: List[Dict], pairs: Optional[List[Tuple[int, int]]]) -> int:
+    return len(pairs) if pairs is not None else len(locations) * (len(locations) - 1)
+
+
+def create_kakao_route_matrices(locations: List[Dict],
+                                stats: Optional[Dict[str, Any]] = None,
+                                progress_callback: Optional[Callable[[int, int], None]] = None,
+                                sparse_k: Optional[int] = None,
+                                lazy_segments: Optional[bool] = None
+                                ) -> Tuple[List[List[float]], List[List[float]], Dict[Tuple[int, int], List[Dict]]]:
+    """
+    모든 위치 쌍에 대해 카카오 API를 호출하여 거리 행렬, 시간 행렬 및 Segment 맵을 생성합니다.
+    (get_kakao_route를 제한된 동시성 + 속도 제한으로 호출, stats를 넘기면 조회 통계를 채워줍니다)
+    sparse_k(기본 ROUTE_MATRIX_SPARSE_K) > 0이고 노드 수가 ROUTE_MATRIX_SPARSE_MIN_NODES 이상이면
+    k-최근접 + 차고지 아크만 실제로 조회하고 나머지는 추정 경로(segments[0]['estimated']=True)로 채웁니다.
+    lazy_segments(기본 ROUTE_LAZY_SEGMENTS)가 True면 요약만 조회하고(segments[0]['summary']=True),
+    도로 구간 상세는 해가 정해진 뒤 fetch_arc_details로 쓰인 아크만 조회합니다.
+    """
+    CAR_TYPE = 6
+    num_nodes = len(locations)
+    # 같은 좌표의 Job은 한 위치로 합쳐 조회하고, 마지막에 노드 기준으로 다시 펼친다
+    if ROUTE_DEDUPE_LOCATIONS:
+        unique_locations, node_to_unique = dedupe_locations(locations)
+    else:
+        unique_locations, node_to_unique = locations, list(range(num_nodes))
+    num_locations = len(unique_locations)
+
+    sparse_k = ROUTE_MATRIX_SPARSE_K if sparse_k is None else int(sparse_k)
+    pairs = _select_route_pairs(unique_locations, sparse_k)
+    use_sparse = pairs is not None
+
+    if use_sparse:
+        print(f"   🧭 카카오 모빌리티 API를 사용하여 희소 경로 행렬 생성 시작 (k={sparse_k}, 조회 {len(pairs)}/{num_locations * (num_locations - 1)}쌍)...")
+    else:
+        print("   🧭 카카오 모빌리티 API를 사용하여 경로 행렬 생성 시작...")
+
+    lazy_segments = ROUTE_LAZY_SEGMENTS if lazy_segments is None else bool(lazy_segments)
+    if lazy_segments:
+        fetcher = _fetch_kakao_summary_and_cache
+        cache_lookup = lambda origin, destination: _peek_kakao_route_or_summary(origin, destination, CAR_TYPE)
+    else:
+        fetcher = _fetch_kakao_route_and_cache
+        cache_lookup = lambda origin, destination: _peek_route_cache("kakao", CAR_TYPE, origin, destination)
+
+    distance_matrix_km, time_matrix_sec, segment_data_map, build_stats = build_route_matrices_concurrent(
+        unique_locations, fetcher, CAR_TYPE, progress_callback=progress_callback,
+        cache_lookup=cache_lookup, pairs=pairs
+    )
+    build_stats["lazy_segments"] = lazy_segments
+    if use_sparse:
+        build_stats["sparse_k"] = sparse_k
+        build_stats["dense_pairs"] = num_locations * (num_locations - 1)
+        build_stats["estimated_arcs"] = fill_estimated_arcs(unique_locations, distance_matrix_km, time_matrix_sec, segment_data_map)
+
+    build_stats["nodes"] = num_nodes
+    build_stats["unique_locations"] = num_locations
+    # 병합하지 않았다면 노드 기준으로 골랐을 쌍 수(희소 모드면 노드 기준 k-최근접) - 실제 조회한 쌍 수
+    build_stats["dedupe_pairs_saved"] = (
+        _route_pair_count(locations, _select_route_pairs(locations, sparse_k)) - build_stats["total_pairs"]
+        if num_locations < num_nodes else 0
+    )
+    if num_locations < num_nodes:
+        distance_matrix_km, time_matrix_sec, segment_data_map = expand_route_matrices(
+            distance_matrix_km, time_matrix_sec, segment_data_map, node_to_unique
+        )
+    if stats is not None:
+        stats.update(build_stats)
+
+    print(f"   ✅ 경로 행렬 생성 완료: 성공 {build_stats['fetched']}/{build_stats['total_pairs']} "
+          f"(캐시 {build_stats['cache_hits']}), 실패 {build_stats['failed']}, 소요 {build_stats['wall_time_sec']:.2f}s")
+    if num_locations < num_nodes:
+        print(f"   ✅ 동일 좌표 병합: 노드 {num_nodes}개 → 위치 {num_locations}개 "
+              f"(API 조회 {build_stats['dedupe_pairs_saved']}쌍 절약)")
+    if use_sparse:
+        print(f"   ✅ 희소 모드: 추정 아크 {build_stats['estimated_arcs']}개 (전체 {build_stats['dense_pairs']}쌍 중)")
+    print(f" -------------------------------")
+    return distance_matrix_km, time_matrix_sec, segment_data_map
+
+# --------------------------------------------------------------------------
+# 3-3. ORS /v2/matrix 일괄 행렬 (요약 거리/시간) + 해에 쓰인 아크만 상세 조회
+# --------------------------------------------------------------------------
+
+def get_ors_route(origin_coord: Tuple[float, float], destination_coord: Tuple[float, float],
+                  profile: str = "driving-car", timeout: float = 25) -> Optional[Dict]:
+    """ORS Directions(geojson)로 단일 경로와 좌표 구간 Segment를 조회합니다. (경로 캐시를 먼저 확인)"""
+    return _read_through_route_cache(
+        "ors", profile, origin_coord, destination_coord,
+        lambda: _timed_provider_request(
+            "ors", lambda: _request_ors_route(origin_coord, destination_coord, profile, timeout))
+    )
+
+
+def _request_ors_route(origin_coord: Tuple[float, float], destination_coord: Tuple[float, float],
+                       profile: str, timeout: float) -> Optional[Dict]:
+    """get_ors_route의 실제 API 호출부 (캐시 미적용)."""
+    if not ORS_API_KEY:
+        return None
+    headers = {"Authorization": ORS_API_KEY, "Content-Type": "application/json"}
+    payload = {
+        "coordinates": [[origin_coord[0], origin_coord[1]], [destination_coord[0], destination_coord[1]]],
+        "instructions": False
+    }
+    try:
+        resp = get_http_client("ors").post(f"{ORS_DIRECTIONS_URL}/{profile}/geojson",
+                                           json=payload, headers=headers, deadline_sec=timeout)
+        resp.raise_for_status()
+        features = resp.json().get("features") or []
+        if not features:
+            return None
+        route = _ors_feature_to_route(features[0])
+        route.pop("polyline", None)
+        return route
+    except Exception as e:
+        print(f"[WARN] ORS Directions(단일 경로) 호출 오류: {e}")
+        return None
+
+
+def _fetch_ors_route_and_cache(origin, destination, profile, timeout=ROUTE_REQUEST_DEADLINE_SEC):
+    """상세 조회용 fetcher: 캐시는 cache_lookup에서 이미 확인했으므로 요청 후 저장만 합니다."""
+    route_info = _timed_provider_request(
+        "ors", lambda: _request_ors_route(origin, destination, profile, timeout))
+    _store_in_route_cache("ors", profile, origin, destination, route_info)
+    return route_info
+
+
+def _request_ors_matrix_block(coords: List[List[float]], sources: List[int], destinations: List[int],
+                              profile: str, timeout: float = 30) -> Optional[Tuple[List[List[Any]], List[List[Any]]]]:
+    """ORS /v2/matrix 1회 호출. 반환: (distances_km, durations_sec) — 경로가 없으면 원소가 None."""
+    if not ORS_API_KEY:
+        return None
+    headers = {"Authorization": ORS_API_KEY, "Content-Type": "application/json"}
+    payload = {
+        "locations": coords,
+        "sources": sources,
+        "destinations": destinations,
+        "metrics": ["distance", "duration"],
+        "units": "km",
+    }
+    try:
+        resp = get_http_client("ors").post(f"{ORS_MATRIX_URL}/{profile}", json=payload, headers=headers, timeout=timeout)
+        resp.raise_for_status()
+        data = resp.json()
+        return data.get("distances") or [], data.get("durations") or []
+    except requests.exceptions.HTTPError as e:
+        print(f"❌ ORS Matrix HTTP 오류 ({e.response.status_code}): {e.response.text[:200]}")
+    except Exception as e:
+        print(f"❌ ORS Matrix 호출 오류: {e}")
+    return None
+
+
+def build_ors_matrix(locations: List[Dict], profile: Optional[str] = None, chunk_size: Optional[int] = None,
+                     progress_callback: Optional[Callable[[int, int], None]] = None
+                     ) -> Tuple[List[List[float]], List[List[float]], Dict[str, Any]]:
+    """
+    ORS /v2/matrix로 N×N 거리/시간 행렬을 만듭니다.
+    N이 chunk_size보다 크면 (출발 블록 × 도착 블록) 단위로 나눠 요청합니다. (요청 수 = ceil(N/chunk)²)
+    반환: (distance_matrix_km, time_matrix_sec, stats) — 경로가 없는 아크는 math.inf
+    """
+    profile = profile or ORS_MATRIX_PROFILE
+    chunk_size = max(1, int(chunk_size or ORS_MATRIX_CHUNK_SIZE))
+    num_locations = len(locations)
+    coords = [[float(loc['longitude']), float(loc['latitude'])] for loc in locations]
+
+    distance_matrix_km = [[math.inf] * num_locations for _ in range(num_locations)]
+    time_matrix_sec = [[math.inf] * num_locations for _ in range(num_locations)]
+    for i in range(num_locations):
+        distance_matrix_km[i][i] = 0.0
+        time_matrix_sec[i][i] = 0.0
+
+    ranges = [list(range(start, min(start + chunk_size, num_locations)))
+              for start in range(0, num_locations, chunk_size)]
+    blocks = [(src, dst) for src in ranges for dst in ranges]
+    stats = {
+        "provider": "ors_matrix",
+        "total_pairs": num_locations * (num_locations - 1),
+        "requests": len(blocks),
+        "failed_requests": 0,
+        "fetched": 0,
+        "failed": 0,
+        "cache_hits": 0,
+        "wall_time_sec": 0.0,
+    }
+    if num_locations < 2:
+        stats["requests"] = 0
+        return distance_matrix_km, time_matrix_sec, stats
+
+    def _fetch_block(block):
+        src, dst = block
+        if src is dst:
+            block_coords, sources, destinations = [coords[i] for i in src], list(range(len(src))), list(range(len(src)))
+        else:
+            block_coords = [coords[i] for i in src] + [coords[j] for j in dst]
+            sources, destinations = list(range(len(src))), list(range(len(src), len(src) + len(dst)))
+        return block, _request_ors_matrix_block(block_coords, sources, destinations, profile)
+
+    started_at = time.perf_counter()
+    done = 0
+    with ThreadPoolExecutor(max_workers=min(4, len(blocks))) as executor:
+        for future in as_completed([executor.submit(_fetch_block, block) for block in blocks]):
+            (src, dst), result = future.result()
+            done += 1
+            if progress_callback:
+                progress_callback(done, len(blocks))
+            if result is None:
+                stats["failed_requests"] += 1
+                continue
+            distances, durations = result
+            for a, i in enumerate(src):
+                for b, j in enumerate(dst):
+                    if i == j:
+                        continue
+                    try:
+                        d, t = distances[a][b], durations[a][b]
+                    except (IndexError, TypeError):
+                        d, t = None, None
+                    if d is None or t is None:
+                        continue
+                    distance_matrix_km[i][j] = float(d)
+                    time_matrix_sec[i][j] = float(t)
+
+    stats["fetched"] = sum(1 for i in range(num_locations) for j in range(num_locations)
+                           if i != j and not math.isinf(distance_matrix_km[i][j]))
+    stats["failed"] = stats["total_pairs"] - stats["fetched"]
+    stats["wall_time_sec"] = round(time.perf_counter() - started_at, 3)
+    return distance_matrix_km, time_matrix_sec, stats
+
+
+def summary_segments(distance_km: float, time_sec: float, detail_provider: str) -> List[Dict]:
+    """요약 거리/시간만 있는 아크의 임시 Segment (해에 쓰이면 fetch_arc_details로 도로 구간 상세로 교체)."""
+    return [{"link_id": None, "distance_km": distance_km, "base_time_sec": time_sec,
+             "summary": True, "detail_provider": detail_provider}]
+
+
+def is_summary_arc(segment_data_map: Dict[Tuple[int, int], List[Dict]], arc: Tuple[int, int]) -> bool:
+    if isinstance(segment_data_map, SegmentStore):
+        return segment_data_map.has_flag(arc, ARC_FLAG_SUMMARY)
+    segments = segment_data_map.get(arc)
+    return bool(segments) and bool(segments[0].get("summary"))
+
+
+def fetch_arc_details(locations: List[Dict], arcs: List[Tuple[int, int]],
+                      segment_data_map: Dict[Tuple[int, int], List[Dict]]) -> int:
+    """
+    요약 Segment로 채운 아크 중 지정한 아크(보통 최종 해의 아크)만 도로 구간 상세로 교체합니다.
+    (조회 실패 시 요약 Segment 유지) 상세로 바뀐 아크 수를 반환합니다.
+    """
+    # 같은 좌표 쌍(동일 좌표 병합 후 펼친 아크)은 한 번만 조회
+    unique_locations, node_to_unique = dedupe_locations(locations)
+    by_provider: Dict[str, List[Tuple[int, int]]] = {}
+    arcs_by_unique: Dict[Tuple[int, int], List[Tuple[int, int]]] = {}
+    for arc in arcs:
+        if not is_summary_arc(segment_data_map, arc):
+            continue
+        unique_arc = (node_to_unique[arc[0]], node_to_unique[arc[1]])
+        if unique_arc not in arcs_by_unique:
+            if isinstance(segment_data_map, SegmentStore):
+                provider = segment_data_map.detail_provider(arc) or "kakao"
+            else:
+                provider = segment_data_map[arc][0].get("detail_provider", "kakao")
+            by_provider.setdefault(provider, []).append(unique_arc)
+        arcs_by_unique.setdefault(unique_arc, []).append(arc)
+
+    detailed = 0
+    for provider, provider_arcs in by_provider.items():
+        if provider == "ors":
+            fetcher, car_type, cache_provider = _fetch_ors_route_and_cache, ORS_MATRIX_PROFILE, "ors"
+        else:
+            fetcher, car_type, cache_provider = _fetch_kakao_route_and_cache, 6, "kakao"
+        _, _, detail_segments, _ = build_route_matrices_concurrent(
+            unique_locations, fetcher, car_type, pairs=provider_arcs,
+            cache_lookup=lambda origin, destination: _peek_route_cache(cache_provider, car_type, origin, destination)
+        )
+        for unique_arc in provider_arcs:
+            if not detail_segments.get(unique_arc):
+                continue
+            for arc in arcs_by_unique[unique_arc]:
+                segment_data_map[arc] = detail_segments[unique_arc]
+                detailed += 1
+    return detailed
+
+
+def create_ors_matrix_route_matrices(locations: List[Dict],
+                                     stats: Optional[Dict[str, Any]] = None,
+                                     progress_callback: Optional[Callable[[int, int], None]] = None
+                                     ) -> Tuple[List[List[float]], List[List[float]], Dict[Tuple[int, int], List[Dict]]]:
+    """
+    ORS /v2/matrix로 거리/시간 행렬을 만들고, Segment 맵은 아크별 요약 Segment로 채웁니다.
+    (create_kakao_route_matrices와 같은 반환 형식, 도로 구간 상세는 fetch_arc_details로 지연 조회)
+    """
+    num_nodes = len(locations)
+    if ROUTE_DEDUPE_LOCATIONS:
+        unique_locations, node_to_unique = dedupe_locations(locations)
+    else:
+        unique_locations, node_to_unique = locations, list(range(num_nodes))
+    num_locations = len(unique_locations)
+
+    print(f"   🧭 ORS Matrix API로 경로 행렬 생성 시작 (위치 {num_locations}개)...")
+    distance_matrix_km, time_matrix_sec, build_stats = build_ors_matrix(unique_locations, progress_callback=progress_callback)
+    segment_data_map = SegmentStore(num_locations, capacity=num_locations * num_locations)
+    for i in range(num_locations):
+        for j in range(num_locations):
+            if i != j and not math.isinf(distance_matrix_km[i][j]):
+                segment_data_map.set_arc(i, j, [distance_matrix_km[i][j]], [time_matrix_sec[i][j]],
+                                         flags=ARC_FLAG_SUMMARY, detail_provider="ors")
+
+    build_stats["nodes"] = num_nodes
+    build_stats["unique_locations"] = num_locations
+    # ORS는 항상 전체 쌍을 블록 단위로 요청하므로 노드 기준 전체 쌍/블록 수와 실제 요청한 수의 차이
+    build_stats["dedupe_pairs_saved"] = num_nodes * (num_nodes - 1) - build_stats["total_pairs"]
+    build_stats["dedupe_requests_saved"] = (
+        math.ceil(num_nodes / max(1, ORS_MATRIX_CHUNK_SIZE)) ** 2 - build_stats["requests"] if num_nodes >= 2 else 0
+    )
+    if num_locations < num_nodes:
+        distance_matrix_km, time_matrix_sec, segment_data_map = expand_route_matrices(
+            distance_matrix_km, time_matrix_sec, segment_data_map, node_to_unique
+        )
+    if stats is not None:
+        stats.update(build_stats)
+
+    print(f"   ✅ ORS 행렬 생성 완료: 요청 {build_stats['requests']}회 (실패 {build_stats['failed_requests']}), "
+          f"아크 {build_stats['fetched']}/{build_stats['total_pairs']}, 소요 {build_stats['wall_time_sec']:.2f}s")
     print(f" -------------------------------")
     return distance_matrix_km, time_matrix_sec, segment_data_map
 
+
+def create_route_matrices(locations: List[Dict],
+                          stats: Optional[Dict[str, Any]] = None,
+                          progress_callback: Optional[Callable[[int, int], None]] = None
+                          ) -> Tuple[List[List[float]], List[List[float]], Dict[Tuple[int, int], List[Dict]]]:
+    """ROUTE_MATRIX_PROVIDER 설정에 따라 VRP 경로 행렬 제공자를 선택합니다. (kakao | ors_matrix)"""
+    if ROUTE_MATRIX_PROVIDER == "ors_matrix":
+        return create_ors_matrix_route_matrices(locations, stats=stats, progress_callback=progress_callback)
+    return create_kakao_route_matrices(locations, stats=stats, progress_callback=progress_callback)
+
 # --------------------------------------------------------------------------
 # 4. 테스트 코드
 # --------------------------------------------------------------------------
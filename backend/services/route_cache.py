@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""
+경로 API 응답용 2단 캐시.
+- 1단: 프로세스 내 LRU (직렬화 크기 기준으로 축출)
+- 2단: SQLite 디스크 저장소 (프로세스 재시작 후에도 유지)
+키 = provider + car_type(또는 profile) + 격자 스냅된 출발/도착 좌표 (+ 호출자가 넘긴 경우 시간대 hour bucket)
+경로 API 요청에는 출발 시각이 없으므로 기본 키에는 시간대를 넣지 않습니다.
+(시간대별 혼잡은 엔진이 Run 출발 시각의 혼잡 계수로 반영 — 벽시계 시각으로 키를 나누면 재실행이 항상 miss)
+"""
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+
+class RouteCache:
+    """메모리 LRU + SQLite 2단 경로 캐시 (스레드 안전)."""
+
+    def __init__(self, db_path: Optional[str], max_memory_bytes: int = 64 * 1024 * 1024,
+                 ttl_sec: float = 7 * 24 * 3600, coord_precision: int = 4):
+        self.max_memory_bytes = int(max_memory_bytes)
+        self.ttl_sec = float(ttl_sec)
+        self.coord_precision = int(coord_precision)
+
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, Tuple[float, Any, int]]" = OrderedDict()
+        self._memory_bytes = 0
+        self._counters = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "puts": 0,
+            "evictions": 0,
+            "expired": 0,
+        }
+
+        self._conn = None
+        if db_path:
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(db_path, check_same_thread=False)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS route_cache (
+                    cache_key  TEXT PRIMARY KEY,
+                    payload    TEXT NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+            """)
+            self._conn.execute("DELETE FROM route_cache WHERE expires_at < ?", (time.time(),))
+            self._conn.commit()
+
+    # ------------------------------------------------------------------
+    # 키 생성
+    # ------------------------------------------------------------------
+    def make_key(self, provider: str, car_type: Any,
+                 origin_coord: Tuple[float, float], destination_coord: Tuple[float, float],
+                 hour_bucket: Optional[int] = None) -> str:
+        """
+        좌표를 coord_precision 자리로 스냅해 캐시 키를 만듭니다.
+        hour_bucket(Run 출발 시각의 시)을 넘기면 시간대별로 키를 나눕니다. (None = 시간대 무관)
+        """
+        p = self.coord_precision
+        parts = [
+            str(provider), str(car_type),
+            f"{round(float(origin_coord[0]), p):.{p}f},{round(float(origin_coord[1]), p):.{p}f}",
+            f"{round(float(destination_coord[0]), p):.{p}f},{round(float(destination_coord[1]), p):.{p}f}",
+        ]
+        if hour_bucket is not None:
+            parts.append(f"h{int(hour_bucket):02d}")
+        return "|".join(parts)
+
+    # ------------------------------------------------------------------
+    # 조회 / 저장
+    # ------------------------------------------------------------------
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, value, _ = entry
+                if expires_at >= now:
+                    self._memory.move_to_end(key)
+                    self._counters["memory_hits"] += 1
+                    return value
+                self._drop_memory_entry(key)
+                self._counters["expired"] += 1
+
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT payload, expires_at FROM route_cache WHERE cache_key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    payload, expires_at = row
+                    if expires_at >= now:
+                        value = json.loads(payload)
+                        self._remember(key, value, len(payload), expires_at)
+                        self._counters["disk_hits"] += 1
+                        return value
+                    self._conn.execute("DELETE FROM route_cache WHERE cache_key = ?", (key,))
+                    self._conn.commit()
+                    self._counters["expired"] += 1
+
+            self._counters["misses"] += 1
+            return None
+
+    def put(self, key: str, value: Any, ttl_sec: Optional[float] = None) -> None:
+        if value is None:
+            return
+        payload = json.dumps(value, ensure_ascii=False)
+        expires_at = time.time() + (self.ttl_sec if ttl_sec is None else float(ttl_sec))
+        with self._lock:
+            self._remember(key, value, len(payload), expires_at)
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO route_cache (cache_key, payload, expires_at) VALUES (?, ?, ?)",
+                    (key, payload, expires_at)
+                )
+                self._conn.commit()
+            self._counters["puts"] += 1
+
+    def clear_memory(self) -> None:
+        """메모리 계층만 비웁니다. (디스크 계층 검증/벤치마크용)"""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hits = self._counters["memory_hits"] + self._counters["disk_hits"]
+            lookups = hits + self._counters["misses"]
+            return {
+                **self._counters,
+                "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "max_memory_bytes": self.max_memory_bytes,
+            }
+
+    # ------------------------------------------------------------------
+    # 내부: 메모리 LRU 관리 (호출 측에서 lock 보유)
+    # ------------------------------------------------------------------
+    def _remember(self, key: str, value: Any, size: int, expires_at: float) -> None:
+        if key in self._memory:
+            self._drop_memory_entry(key)
+        if size > self.max_memory_bytes:
+            return
+        self._memory[key] = (expires_at, value, size)
+        self._memory_bytes += size
+        while self._memory_bytes > self.max_memory_bytes and self._memory:
+            oldest_key = next(iter(self._memory))
+            self._drop_memory_entry(oldest_key)
+            self._counters["evictions"] += 1
+
+    def _drop_memory_entry(self, key: str) -> None:
+        _, _, size = self._memory.pop(key)
+        self._memory_bytes -= size
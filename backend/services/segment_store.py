@@ -0,0 +1,268 @@
+# -*- coding: utf-8 -*-
+"""
+경로 행렬 Segment 저장소.
+- 모든 아크의 도로 구간을 NumPy 구조 배열 1개(link_id int64, distance_km, base_time_sec)에 연속 저장
+- 아크 (i, j)의 구간 = segments[arc_start[i, j] : arc_start[i, j] + arc_len[i, j]]
+- 아크 플래그(추정/요약)와 상세 조회 제공자는 (N, N) 정수 배열로 보관
+- 덮어쓰기/삭제로 버려진 구간은 배열을 키우기 전에 compact()로 회수
+구간 1개당 dict 1개를 만드는 dict-of-lists 대비 메모리가 크게 줄고,
+엔진/CO2 배치 계산은 arc_arrays()로 평탄화된 배열을 바로 받습니다.
+기존 코드와의 호환을 위해 (i, j) → segment dict 리스트 매핑 인터페이스도 제공합니다. (조회 시 dict 생성)
+"""
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+SEGMENT_DTYPE = np.dtype([("link_id", np.int64), ("distance_km", np.float64), ("base_time_sec", np.float64)])
+NO_LINK_ID = -1
+
+ARC_FLAG_ESTIMATED = 1   # 직선거리 기반 추정 아크 (희소 모드)
+ARC_FLAG_SUMMARY = 2     # 요약 거리/시간만 있는 아크 (해에 쓰이면 상세 조회)
+
+DETAIL_PROVIDERS = ("", "kakao", "ors")
+
+
+def _to_link_id(value: Any) -> int:
+    """link_id를 int64로 변환합니다. (None/숫자가 아닌 값은 NO_LINK_ID)"""
+    if value is None:
+        return NO_LINK_ID
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return NO_LINK_ID
+
+
+class SegmentStore(MutableMapping):
+    """(i, j) → Segment 목록을 연속 구조 배열 + 아크별 오프셋으로 보관하는 저장소."""
+
+    def __init__(self, num_locations: int, capacity: int = 1024):
+        self.num_locations = int(num_locations)
+        self._segments = np.zeros(max(1, int(capacity)), dtype=SEGMENT_DTYPE)
+        self._size = 0
+        self._garbage = 0    # 덮어쓰기/삭제로 참조가 끊긴 구간 수 (상한, 공유 블록은 compact에서 실제로 판정)
+        shape = (self.num_locations, self.num_locations)
+        self._arc_start = np.full(shape, -1, dtype=np.int64)    # -1 = 아크 없음
+        self._arc_len = np.zeros(shape, dtype=np.int32)
+        self._arc_flags = np.zeros(shape, dtype=np.uint8)
+        self._arc_provider = np.zeros(shape, dtype=np.uint8)
+
+    # ------------------------------------------------------------------
+    # 생성 / 변환
+    # ------------------------------------------------------------------
+    @classmethod
+    def from_dict(cls, num_locations: int, segment_data_map: Dict[Tuple[int, int], List[Dict]]) -> "SegmentStore":
+        total = sum(len(segs) for segs in segment_data_map.values())
+        store = cls(num_locations, capacity=total)
+        for arc, segments in segment_data_map.items():
+            store[arc] = segments
+        return store
+
+    def _reserve(self, extra: int) -> None:
+        needed = self._size + extra
+        if needed <= len(self._segments):
+            return
+        # 버려진 구간이 충분하면 배열을 키우기 전에 먼저 회수
+        if self._garbage >= extra and self._garbage * 2 >= self._size:
+            self.compact()
+            needed = self._size + extra
+            if needed <= len(self._segments):
+                return
+        grown = np.zeros(max(needed, 2 * len(self._segments)), dtype=SEGMENT_DTYPE)
+        grown[:self._size] = self._segments[:self._size]
+        self._segments = grown
+
+    def set_arc(self, i: int, j: int, distance_km: Sequence[float], base_time_sec: Sequence[float],
+                link_ids: Optional[Sequence[int]] = None, flags: int = 0, detail_provider: str = "") -> None:
+        """아크 (i, j)의 구간을 배열로 바로 기록합니다. (기존 구간은 버려지고 새 구간을 뒤에 추가, 공간은 compact로 회수)"""
+        count = len(distance_km)
+        self._release(i, j)
+        self._reserve(count)
+        start = self._size
+        block = self._segments[start:start + count]
+        block["distance_km"] = distance_km
+        block["base_time_sec"] = base_time_sec
+        block["link_id"] = NO_LINK_ID if link_ids is None else link_ids
+        self._size += count
+        self._arc_start[i, j] = start
+        self._arc_len[i, j] = count
+        self._arc_flags[i, j] = flags
+        self._arc_provider[i, j] = DETAIL_PROVIDERS.index(detail_provider) if detail_provider in DETAIL_PROVIDERS else 0
+
+    def _release(self, i: int, j: int) -> None:
+        """아크 (i, j)의 기존 구간 참조를 끊고 버려진 구간 수에 더합니다."""
+        if self._arc_start[i, j] >= 0:
+            self._garbage += int(self._arc_len[i, j])
+            self._arc_start[i, j] = -1
+            self._arc_len[i, j] = 0
+
+    def compact(self) -> None:
+        """
+        어느 아크도 참조하지 않는 구간을 제거하고 살아 있는 블록을 앞으로 모읍니다.
+        expand()로 여러 아크가 같은 블록을 공유하면 블록은 한 번만 복사하고 공유를 유지합니다.
+        """
+        present = self._arc_start >= 0
+        blocks, inverse = np.unique(
+            np.stack([self._arc_start[present], self._arc_len[present].astype(np.int64)], axis=1),
+            axis=0, return_inverse=True)
+        lengths = blocks[:, 1]
+        new_starts = np.zeros(len(blocks), dtype=np.int64)
+        np.cumsum(lengths[:-1], out=new_starts[1:])
+        total = int(lengths.sum())
+        positions = np.arange(total, dtype=np.int64) - np.repeat(new_starts, lengths)
+        segments = np.zeros(max(1, total, len(self._segments) // 2), dtype=SEGMENT_DTYPE)
+        segments[:total] = self._segments[np.repeat(blocks[:, 0], lengths) + positions]
+        self._arc_start[present] = new_starts[inverse.reshape(-1)]
+        self._segments, self._size, self._garbage = segments, total, 0
+
+    def expand(self, node_to_unique: Sequence[int]) -> "SegmentStore":
+        """
+        고유 위치 기준 저장소를 노드 기준으로 펼칩니다. (구간 배열은 그대로 1회 복사, 아크 인덱스만 재배치)
+        같은 위치의 노드 사이 아크는 구간 없음(= 비용 0)으로 채웁니다.
+        """
+        index = np.asarray(node_to_unique, dtype=np.int64)
+        expanded = SegmentStore.__new__(SegmentStore)
+        expanded.num_locations = len(index)
+        expanded._segments = self._segments[:max(1, self._size)].copy()
+        expanded._size = self._size
+        expanded._garbage = self._garbage
+        grid = np.ix_(index, index)
+        expanded._arc_start = self._arc_start[grid]
+        expanded._arc_len = self._arc_len[grid]
+        expanded._arc_flags = self._arc_flags[grid]
+        expanded._arc_provider = self._arc_provider[grid]
+
+        same_location = (index[:, None] == index[None, :])
+        np.fill_diagonal(same_location, False)
+        expanded._arc_start[same_location] = 0
+        expanded._arc_len[same_location] = 0
+        expanded._arc_flags[same_location] = 0
+        np.fill_diagonal(expanded._arc_start, -1)
+        np.fill_diagonal(expanded._arc_len, 0)
+        return expanded
+
+    def shrink_to_fit(self) -> None:
+        """버려진 구간을 회수하고 증가용 여유 공간을 잘라 구간 배열을 사용 중인 크기로 줄입니다."""
+        if self._garbage:
+            self.compact()
+        if len(self._segments) > max(1, self._size):
+            self._segments = self._segments[:max(1, self._size)].copy()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # 직렬화(프로세스 풀 전달/캐시) 시 여유 공간은 제외
+        state = dict(self.__dict__)
+        state["_segments"] = self._segments[:max(1, self._size)]
+        return state
+
+    # ------------------------------------------------------------------
+    # 배치 계산용 조회 (dict 생성 없음)
+    # ------------------------------------------------------------------
+    def arc_arrays(self, arcs: Sequence[Tuple[int, int]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        flatten_segment_lists와 같은 형식으로 지정한 아크들의 구간을 평탄화합니다.
+        반환: (distance_km, base_time_sec, arc_offsets) — 없는 아크는 구간 0개
+        """
+        if len(arcs) == 0:
+            return np.zeros(0), np.zeros(0), np.zeros(1, dtype=np.int64)
+        ii, jj = np.asarray(arcs, dtype=np.int64).T
+        starts = self._arc_start[ii, jj]
+        lengths = np.where(starts >= 0, self._arc_len[ii, jj], 0).astype(np.int64)
+        arc_offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=arc_offsets[1:])
+        # 아크별 [start, start + len) 구간 인덱스를 한 번에 생성
+        positions = np.arange(int(arc_offsets[-1]), dtype=np.int64) - np.repeat(arc_offsets[:-1], lengths)
+        rows = self._segments[np.repeat(starts, lengths) + positions]
+        return rows["distance_km"].copy(), rows["base_time_sec"].copy(), arc_offsets
+
+    def present_arcs(self) -> Tuple[np.ndarray, np.ndarray]:
+        """저장된 아크의 (i 배열, j 배열)을 행 우선 순서로 반환합니다."""
+        return np.nonzero(self._arc_start >= 0)
+
+    def arc_lengths(self, ii: np.ndarray, jj: np.ndarray) -> np.ndarray:
+        return np.where(self._arc_start[ii, jj] >= 0, self._arc_len[ii, jj], 0)
+
+    def flagged_arcs(self, flag: int) -> List[Tuple[int, int]]:
+        ii, jj = np.nonzero((self._arc_flags & flag) != 0)
+        return list(zip(ii.tolist(), jj.tolist()))
+
+    def has_flag(self, arc: Tuple[int, int], flag: int) -> bool:
+        i, j = arc
+        return bool(self._arc_start[i, j] >= 0 and self._arc_flags[i, j] & flag)
+
+    def detail_provider(self, arc: Tuple[int, int]) -> str:
+        return DETAIL_PROVIDERS[int(self._arc_provider[arc[0], arc[1]])]
+
+    @property
+    def nbytes(self) -> int:
+        """구간 배열(할당된 용량) + 아크 인덱스 배열의 메모리 크기."""
+        return int(self._segments.nbytes + self._arc_start.nbytes + self._arc_len.nbytes
+                   + self._arc_flags.nbytes + self._arc_provider.nbytes)
+
+    @property
+    def num_segments(self) -> int:
+        """현재 아크들이 참조하는 구간 수."""
+        return int(self._arc_len[self._arc_start >= 0].sum())
+
+    # ------------------------------------------------------------------
+    # MutableMapping 호환 인터페이스: (i, j) → segment dict 리스트
+    # ------------------------------------------------------------------
+    def __getitem__(self, arc: Tuple[int, int]) -> List[Dict[str, Any]]:
+        i, j = arc
+        if not (0 <= i < self.num_locations and 0 <= j < self.num_locations) or self._arc_start[i, j] < 0:
+            raise KeyError(arc)
+        start, count = int(self._arc_start[i, j]), int(self._arc_len[i, j])
+        flags = int(self._arc_flags[i, j])
+        segments = []
+        for link_id, distance_km, base_time_sec in self._segments[start:start + count].tolist():
+            segment = {"link_id": None if link_id == NO_LINK_ID else link_id,
+                       "distance_km": distance_km, "base_time_sec": base_time_sec}
+            if flags & ARC_FLAG_ESTIMATED:
+                segment["estimated"] = True
+            if flags & ARC_FLAG_SUMMARY:
+                segment["summary"] = True
+                segment["detail_provider"] = self.detail_provider(arc)
+            segments.append(segment)
+        return segments
+
+    def __setitem__(self, arc: Tuple[int, int], segments: List[Dict[str, Any]]) -> None:
+        flags, provider = 0, ""
+        if segments:
+            head = segments[0]
+            if head.get("estimated"):
+                flags |= ARC_FLAG_ESTIMATED
+            if head.get("summary"):
+                flags |= ARC_FLAG_SUMMARY
+                provider = head.get("detail_provider", "kakao")
+        self.set_arc(arc[0], arc[1],
+                     [s["distance_km"] for s in segments], [s["base_time_sec"] for s in segments],
+                     [_to_link_id(s.get("link_id")) for s in segments], flags, provider)
+
+    def __delitem__(self, arc: Tuple[int, int]) -> None:
+        i, j = arc
+        if self._arc_start[i, j] < 0:
+            raise KeyError(arc)
+        self._release(i, j)
+        self._arc_flags[i, j] = 0
+        self._arc_provider[i, j] = 0
+
+    def __contains__(self, arc: object) -> bool:
+        try:
+            i, j = arc
+            return 0 <= i < self.num_locations and 0 <= j < self.num_locations and self._arc_start[i, j] >= 0
+        except (TypeError, ValueError):
+            return False
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        ii, jj = self.present_arcs()
+        return iter(zip(ii.tolist(), jj.tolist()))
+
+    def __len__(self) -> int:
+        return int((self._arc_start >= 0).sum())
+
+
+def as_segment_store(segment_data_map: Any, num_locations: int) -> SegmentStore:
+    """dict-of-lists Segment 맵이면 SegmentStore로 변환하고, 이미 저장소면 그대로 반환합니다."""
+    if isinstance(segment_data_map, SegmentStore):
+        return segment_data_map
+    return SegmentStore.from_dict(num_locations, segment_data_map)
+
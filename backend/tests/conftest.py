@@ -0,0 +1,6 @@
+# -*- coding: utf-8 -*-
+"""backend 디렉토리를 import 경로에 추가합니다. (services / optimizer 패키지를 그대로 import)"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""services/co2_calculator.py 단위 테스트 (스칼라 co2_for_route 기준 검증)."""
+import datetime as dt
+import random
+
+import numpy as np
+import pytest
+
+from services.co2_calculator import (
+    ARC_FEATURE_NAMES,
+    Segment,
+    VehicleEF,
+    arc_co2_features,
+    co2_for_route,
+    co2_for_route_batch,
+    co2_from_arc_features,
+    flatten_segment_lists,
+)
+
+SETTINGS = {
+    "alpha_load": 0.10, "beta_grade": 0.03, "speed_idle_threshold": 15.0, "grade_cap": 0.30,
+    "weather_penalty": 0.05, "max_free_flow_speed": 90.0,
+}
+CONG = {"tf": 1.4, "idle_f": 0.15}
+WEATHER = 1.05
+START = dt.datetime(2025, 1, 6, 8)
+KEYS = ("co2_drive_g", "co2_idle_g", "co2_total_g", "total_time_sec")
+
+
+def _random_arcs(num_arcs: int, max_segments: int, seed: int):
+    """거리 0 / 기준 시간 0 구간과 빈 아크를 섞은 아크별 구간 목록 (경사 / 적재량은 구간마다 다름)."""
+    rng = random.Random(seed)
+    arcs = []
+    for _ in range(num_arcs):
+        arcs.append([{
+            "distance_km": rng.choice([0.0, rng.uniform(0.01, 5.0)]),
+            "base_time_sec": rng.choice([0.0, rng.uniform(1.0, 600.0)]),
+            "slope_pct": rng.uniform(-4.0, 12.0),
+            "load_kg": rng.uniform(0.0, 1500.0),
+        } for _ in range(rng.randint(0, max_segments))])
+    return arcs
+
+
+@pytest.mark.parametrize("num_arcs, max_segments", [(3, 40), (200, 6)])
+@pytest.mark.parametrize("vehicle", [VehicleEF(180.0, 1.2, 1000.0), VehicleEF(250.0, 2.0, 0.0)])
+def test_co2_for_route_batch_equals_scalar(num_arcs, max_segments, vehicle):
+    # (3, 40): 아크가 적고 긴 경로, (200, 6): 아크가 많은 경로 — 아크별 누적 합산의 두 분기를 모두 검증
+    arcs = _random_arcs(num_arcs, max_segments, seed=num_arcs)
+    distance_km, base_time_sec, arc_offsets = flatten_segment_lists(arcs)
+    slope = np.array([s["slope_pct"] for segs in arcs for s in segs])
+    load = np.array([s["load_kg"] for segs in arcs for s in segs])
+
+    batch = co2_for_route_batch(distance_km, base_time_sec, slope, load, arc_offsets,
+                                vehicle, CONG, SETTINGS, WEATHER)
+
+    for k, segs in enumerate(arcs):
+        expected = co2_for_route([Segment(**s) for s in segs], vehicle, START, CONG, SETTINGS, WEATHER)
+        for key in KEYS:
+            assert batch[key][k] == expected[key], (k, key)
+
+
+def test_co2_for_route_batch_broadcasts_scalar_slope_and_load():
+    arcs = _random_arcs(20, 5, seed=7)
+    distance_km, base_time_sec, arc_offsets = flatten_segment_lists(arcs)
+    vehicle = VehicleEF(200.0, 1.5, 2000.0)
+
+    batch = co2_for_route_batch(distance_km, base_time_sec, 2.0, 900.0, arc_offsets,
+                                vehicle, CONG, SETTINGS, WEATHER)
+
+    for k, segs in enumerate(arcs):
+        segments = [Segment(distance_km=s["distance_km"], base_time_sec=s["base_time_sec"],
+                            slope_pct=2.0, load_kg=900.0) for s in segs]
+        expected = co2_for_route(segments, vehicle, START, CONG, SETTINGS, WEATHER)
+        assert [batch[key][k] for key in KEYS] == [expected[key] for key in KEYS]
+
+
+def test_flatten_segment_lists_offsets():
+    distance_km, base_time_sec, arc_offsets = flatten_segment_lists([
+        [{"distance_km": 1.0, "base_time_sec": 10.0}, {"distance_km": 2.0, "base_time_sec": 20.0}],
+        [],
+        [{"distance_km": 3.0, "base_time_sec": 30.0}],
+    ])
+    assert arc_offsets.tolist() == [0, 2, 2, 3]
+    assert distance_km.tolist() == [1.0, 2.0, 3.0]
+    assert base_time_sec.tolist() == [10.0, 20.0, 30.0]
+
+
+# --- 아크별 CO2 특징 벡터 (user-016) ---
+@pytest.mark.parametrize("vehicle", [VehicleEF(180.0, 1.2, 1000.0), VehicleEF(320.0, 2.5, 0.0)])
+def test_arc_features_reproduce_batch_co2(vehicle):
+    arcs = _random_arcs(60, 8, seed=16)
+    distance_km, base_time_sec, arc_offsets = flatten_segment_lists(arcs)
+    features = arc_co2_features(distance_km, base_time_sec, 2.5, arc_offsets, CONG, SETTINGS)
+    assert features.shape == (len(arcs), len(ARC_FEATURE_NAMES))
+
+    for load_kg in (0.0, 450.0, 5000.0):
+        batch = co2_for_route_batch(distance_km, base_time_sec, 2.5, load_kg, arc_offsets,
+                                    vehicle, CONG, SETTINGS, WEATHER)
+        from_features = co2_from_arc_features(features, vehicle, load_kg, SETTINGS, WEATHER)
+        for key in KEYS:
+            # 특징 벡터 경로는 반올림 전 값이고 합산 순서만 다름
+            np.testing.assert_allclose(from_features[key], batch[key], atol=0.006)
+
+
+def test_arc_features_broadcast_over_load_axis():
+    arcs = _random_arcs(10, 4, seed=5)
+    distance_km, base_time_sec, arc_offsets = flatten_segment_lists(arcs)
+    features = arc_co2_features(distance_km, base_time_sec, 0.0, arc_offsets, CONG, SETTINGS)
+    vehicle = VehicleEF(200.0, 1.0, 1000.0)
+    loads = np.array([0.0, 500.0, 1000.0])
+
+    stacked = co2_from_arc_features(features, vehicle, loads[:, None], SETTINGS, WEATHER)
+    assert stacked["co2_total_g"].shape == (len(loads), len(arcs))
+    for row, load_kg in enumerate(loads):
+        single = co2_from_arc_features(features, vehicle, load_kg, SETTINGS, WEATHER)
+        np.testing.assert_allclose(stacked["co2_total_g"][row], single["co2_total_g"])
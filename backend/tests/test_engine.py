@@ -0,0 +1,522 @@
+# -*- coding: utf-8 -*-
+"""optimizer/engine.py 헬퍼 단위 테스트 (DB / 경로 API / OR-Tools 탐색 없이)."""
+import datetime as dt
+import itertools
+import math
+import random
+
+import numpy as np
+import pytest
+
+import optimizer.engine as engine
+from benchmarks.synthetic import BENCH_SETTINGS, make_input_data, stub_route_matrices
+from services.co2_calculator import Segment, VehicleEF, co2_for_route
+
+CO2_SETTINGS = {
+    "alpha_load": 0.10, "beta_grade": 0.03, "speed_idle_threshold": 15.0, "grade_cap": 0.30,
+    "weather_penalty": 0.05, "max_free_flow_speed": 90.0,
+}
+CONG_FACTORS = {"tf": 1.3, "idle_f": 0.1}
+WEATHER_PENALTY = 1.05
+DEFAULT_SLOPE = 1.5
+
+
+def _random_segment_map(num_locations: int, seed: int):
+    rng = random.Random(seed)
+    segment_data_map = {}
+    for i in range(num_locations):
+        for j in range(num_locations):
+            if i != j:
+                segment_data_map[(i, j)] = [
+                    {"link_id": None, "distance_km": rng.uniform(0.0, 3.0), "base_time_sec": rng.uniform(0.0, 300.0)}
+                    for _ in range(rng.randint(1, 6))
+                ]
+    return segment_data_map
+
+
+# --- 정수 Eco-Cost / 시간 행렬 사전 계산 (user-003) ---
+def test_precomputed_matrices_match_scalar_co2_for_route():
+    num_locations = 5
+    segment_data_map = _random_segment_map(num_locations, seed=3)
+    vehicles = [VehicleEF(180.0, 1.2, 1000.0), VehicleEF(320.0, 2.5, 5000.0)]
+    load_kg, co2_weight, time_weight, scale = 800.0, 0.7, 0.3, 1000.0
+
+    eco_cost_matrices, time_matrix = engine._precompute_arc_matrices(
+        num_locations, segment_data_map, vehicles, load_kg, dt.datetime(2025, 1, 6, 9), CONG_FACTORS,
+        CO2_SETTINGS, WEATHER_PENALTY, DEFAULT_SLOPE, co2_weight, time_weight, scale)
+
+    for (i, j), segments in segment_data_map.items():
+        route_segments = [Segment(distance_km=s["distance_km"], base_time_sec=s["base_time_sec"],
+                                  slope_pct=DEFAULT_SLOPE, load_kg=load_kg) for s in segments]
+        for class_idx, vehicle in enumerate(vehicles):
+            expected = co2_for_route(route_segments, vehicle, dt.datetime(2025, 1, 6, 9),
+                                     CONG_FACTORS, CO2_SETTINGS, WEATHER_PENALTY)
+            eco_cost = co2_weight * (expected["co2_total_g"] / scale) + time_weight * expected["total_time_sec"]
+            # co2_for_route는 소수 둘째 자리 반올림(±0.005), 행렬은 반올림 전 값을 ×1000 후 버림
+            tolerance = 1 + 5 * (time_weight + co2_weight / scale)
+            assert abs(eco_cost_matrices[class_idx][i][j] - int(eco_cost * 1000)) <= tolerance
+        assert abs(time_matrix[i][j] - expected["total_time_sec"]) <= 1
+    for i in range(num_locations):
+        assert time_matrix[i][i] == 0 and all(m[i][i] == 0 for m in eco_cost_matrices)
+
+
+def test_precomputed_matrices_mark_missing_and_empty_arcs():
+    segment_data_map = {(0, 1): [{"link_id": None, "distance_km": 1.0, "base_time_sec": 60.0}], (1, 0): []}
+    eco_cost_matrices, time_matrix = engine._precompute_arc_matrices(
+        3, segment_data_map, [VehicleEF(200.0, 1.0, 1000.0)], 0.0, dt.datetime(2025, 1, 6, 9), CONG_FACTORS,
+        CO2_SETTINGS, WEATHER_PENALTY, DEFAULT_SLOPE, 1.0, 0.0, 1.0)
+
+    assert eco_cost_matrices[0][0][1] > 0 and time_matrix[0][1] > 0
+    assert eco_cost_matrices[0][1][0] == 0 and time_matrix[1][0] == 0          # Segment가 빈 아크
+    assert eco_cost_matrices[0][0][2] == engine.UNREACHABLE_ARC_COST           # 경로가 없는 아크
+    assert time_matrix[2][0] == engine.UNREACHABLE_ARC_TIME_SEC
+
+
+# --- 적재량 구간별 Eco-Cost 텐서 / 해 재평가 (user-017) ---
+def test_load_cost_tensor_matches_per_load_matrices():
+    num_locations = 4
+    segment_data_map = _random_segment_map(num_locations, seed=17)
+    vehicles = [VehicleEF(180.0, 1.2, 1000.0), VehicleEF(320.0, 2.5, 5000.0)]
+    load_buckets = engine._load_bucket_values(900.0, 4)
+    assert load_buckets.tolist() == [0.0, 300.0, 600.0, 900.0]
+
+    tensor = engine._precompute_load_cost_tensor(
+        num_locations, segment_data_map, vehicles, load_buckets, CONG_FACTORS, CO2_SETTINGS,
+        WEATHER_PENALTY, DEFAULT_SLOPE, 0.7, 0.3, 1000.0)
+    assert tensor.shape == (2, 4, num_locations, num_locations)
+    for bucket_idx, load_kg in enumerate(load_buckets):
+        eco_cost_matrices, _ = engine._precompute_arc_matrices(
+            num_locations, segment_data_map, vehicles, float(load_kg), dt.datetime(2025, 1, 6, 9), CONG_FACTORS,
+            CO2_SETTINGS, WEATHER_PENALTY, DEFAULT_SLOPE, 0.7, 0.3, 1000.0)
+        assert tensor[:, bucket_idx].tolist() == eco_cost_matrices
+    # 적재량이 많을수록 같은 아크 비용이 커짐
+    assert (np.diff(tensor[:, :, 0, 1], axis=1) > 0).all()
+
+
+def test_rescore_routes_uses_load_at_each_arc_origin():
+    # 클래스 1개, 구간 [0, 50, 100]: 비용 = 구간 번호 * 100 + 아크 번호(from*10 + to)
+    load_buckets = np.array([0.0, 50.0, 100.0])
+    arc_ids = np.add.outer(np.arange(3) * 10, np.arange(3))
+    tensor = (np.arange(3)[:, None, None] * 100 + arc_ids[None])[None].astype(np.int64)
+    demands = [0, -50, -50]
+
+    rescored = engine._rescore_routes_by_load([[1, 2]], demands, 100, [0], tensor, load_buckets)
+    # 0→1 적재 100(구간 2), 1→2 적재 50(구간 1), 2→0 적재 0(구간 0)
+    assert rescored["eco_cost_load_aware"] == (200 + 1) + (100 + 12) + (0 + 20)
+    assert rescored["eco_cost_full_load"] == (200 + 1) + (200 + 12) + (200 + 20)
+
+    # 빈 경로 차량은 비용 없음, 차량별 클래스 인덱스를 따름
+    assert engine._rescore_routes_by_load([[], [2]], demands, 50, [0, 0], tensor, load_buckets) == {
+        "eco_cost_load_aware": (100 + 2) + (0 + 20), "eco_cost_full_load": (200 + 2) + (200 + 20)}
+
+
+def test_portfolio_winner_prefers_lower_load_aware_cost(monkeypatch):
+    load_buckets = np.array([0.0, 100.0])
+    tensor = np.zeros((1, 2, 3, 3), dtype=np.int64)
+    tensor[0, 1, 0, 1] = 10      # 만재 상태로 0→1 출발은 비쌈
+    tensor[0, 1, 0, 2] = 1
+    tensor[0, 0, 1, 2] = 1
+    tensor[0, 0, 2, 1] = 1
+    tensor[0, 0, 1, 0] = 1
+    tensor[0, 0, 2, 0] = 1
+    members = {"a": [[1, 2]], "b": [[2, 1]]}
+
+    def fake_map(fn, tasks, workers):
+        return [{"config": t["config"]["name"], "objective": 5 if t["config"]["name"] == "a" else 6,
+                 "solve_time_sec": 0.1, "stop_reason": "completed", "routes": members[t["config"]["name"]]}
+                for t in tasks]
+
+    monkeypatch.setattr(engine, "PORTFOLIO_CONFIGS", [{"name": "a"}, {"name": "b"}])
+    monkeypatch.setattr(engine, "PORTFOLIO_SIZE", 2)
+    monkeypatch.setattr(engine, "_map_in_solver_pool", fake_map)
+    args = ([[[0] * 3] * 3], [[0] * 3] * 3, [0, -50, -50], [(0, 100)] * 3, [100], [0], 100,
+            {"time_limit_ms": 10_000, "plateau_sec": 0, "plateau_solutions": 0}, [])
+
+    winner, _ = engine._run_solver_portfolio(*args)
+    assert winner["config"] == "a"                                   # 목적함수 기준
+    winner, stats = engine._run_solver_portfolio(*args, tensor, load_buckets)
+    assert winner["config"] == "b"                                   # 적재량 반영 비용 기준
+    assert [m["eco_cost_load_aware"] for m in stats["members"]] == [10 + 1 + 1, 1 + 1 + 1]
+
+
+# --- 솔버 포트폴리오 시간 예산 (user-024) ---
+@pytest.mark.parametrize("time_limit_ms,workers,expected_configs,expected_member_ms", [
+    (1000, 1, 4, 250),     # 4라운드 × 250ms
+    (250, 1, 2, 125),      # 100ms 미만이 되지 않도록 2개만
+    (250, 2, 4, 125),
+    (150, 2, 2, 150),
+])
+def test_portfolio_shrinks_configs_to_fit_budget(monkeypatch, time_limit_ms, workers, expected_configs, expected_member_ms):
+    submitted = []
+
+    def fake_map(fn, tasks, pool_workers):
+        submitted.extend(tasks)
+        return [{"config": t["config"]["name"], "objective": 1, "solve_time_sec": 0.0,
+                 "stop_reason": "completed", "routes": [[1]]} for t in tasks]
+
+    monkeypatch.setattr(engine, "PORTFOLIO_CONFIGS", [{"name": str(k)} for k in range(4)])
+    monkeypatch.setattr(engine, "PORTFOLIO_SIZE", 4)
+    monkeypatch.setattr(engine, "_solver_workers", lambda num_tasks, configured: min(num_tasks, workers))
+    monkeypatch.setattr(engine, "_map_in_solver_pool", fake_map)
+    budget = {"time_limit_ms": time_limit_ms, "plateau_sec": 0, "plateau_solutions": 0}
+
+    winner, stats = engine._run_solver_portfolio([[[0, 0], [0, 0]]], [[0, 0], [0, 0]], [0, -1], [(0, 10)] * 2,
+                                                 [10], [0], 1, budget, [])
+    assert winner is not None and len(submitted) == expected_configs
+    assert all(t["time_limit_ms"] == expected_member_ms for t in submitted)
+    assert stats["configs_dropped"] == 4 - expected_configs
+    assert math.ceil(expected_configs / workers) * expected_member_ms <= time_limit_ms
+
+
+def test_portfolio_skips_budget_below_one_member(monkeypatch):
+    monkeypatch.setattr(engine, "_map_in_solver_pool", lambda *args: pytest.fail("풀이하면 안 됨"))
+    winner, stats = engine._run_solver_portfolio(
+        [[[0]]], [[0]], [0], [(0, 10)], [10], [0], 0,
+        {"time_limit_ms": engine.SOLVER_MIN_TIME_BUDGET_MS - 1, "plateau_sec": 0, "plateau_solutions": 0}, [])
+    assert winner is None and stats["skipped"] == "budget_too_small"
+
+
+# --- 대규모 VRP 분할: 클러스터링 / 차량 배정 (user-021) ---
+def _random_jobs(num_jobs: int, seed: int, sectors: int = 0):
+    rng = random.Random(seed)
+    return [{"latitude": 37.4 + rng.random() * 0.3, "longitude": 126.8 + rng.random() * 0.4,
+             "sector_id": f"S{k % sectors}" if sectors else None} for k in range(num_jobs)]
+
+
+@pytest.mark.parametrize("k", [1, 3, 8])
+def test_kmeans_labels_cover_every_point(k):
+    rng = np.random.default_rng(0)
+    points = np.vstack([rng.normal(center, 0.01, size=(30, 2)) for center in ((0, 0), (1, 1), (0, 1))])
+    labels = engine._kmeans_labels(points, k)
+    assert labels.shape == (len(points),)
+    assert set(labels.tolist()) <= set(range(k))
+
+
+def test_kmeans_labels_separate_distant_groups():
+    rng = np.random.default_rng(1)
+    points = np.vstack([rng.normal(center, 0.01, size=(20, 2)) for center in ((0, 0), (5, 5))])
+    labels = engine._kmeans_labels(points, 2)
+    assert len(set(labels[:20].tolist())) == 1 and len(set(labels[20:].tolist())) == 1
+    assert labels[0] != labels[-1]
+
+
+@pytest.mark.parametrize("method, sectors", [("kmeans", 0), ("sector", 3), ("sector", 0)])
+def test_partition_jobs_keeps_every_job_once(method, sectors):
+    jobs = _random_jobs(130, seed=2, sectors=sectors)
+    clusters = engine._partition_jobs(jobs, 4, method)
+    nodes = sorted(node for cluster in clusters for node in cluster)
+    assert nodes == list(range(1, len(jobs) + 1))
+    assert all(clusters)
+
+
+@pytest.mark.parametrize("num_vehicles", [3, 4, 9])
+def test_allocate_vehicles_assigns_each_vehicle_once(num_vehicles):
+    rng = random.Random(num_vehicles)
+    clusters = [[1, 2, 3], [4, 5], [6, 7, 8, 9, 10]]
+    demands = [0] + [-rng.randint(50, 400) for _ in range(10)]
+    capacities = [rng.choice([1000, 2500, 5000]) for _ in range(num_vehicles)]
+
+    allocation = engine._allocate_vehicles(clusters, demands, capacities)
+
+    assert len(allocation) == len(clusters)
+    assert sorted(v for vehicles in allocation for v in vehicles) == list(range(num_vehicles))
+    assert all(allocation)
+
+
+def test_allocate_vehicles_covers_cluster_demand_when_possible():
+    clusters = [[1, 2], [3, 4]]
+    demands = [0, -2000, -2000, -300, -200]
+    allocation = engine._allocate_vehicles(clusters, demands, [3000, 1000, 1000, 1000])
+    for cluster, vehicles in zip(clusters, allocation):
+        assert sum([3000, 1000, 1000, 1000][v] for v in vehicles) >= -sum(demands[n] for n in cluster)
+
+
+# --- 소규모 단일 차량 정확해 (user-022) ---
+def _brute_force_route(eco_cost, transit_time, demands, time_windows, capacity, total_demand):
+    """모든 방문 순서를 나열해 _held_karp_route와 같은 제약의 최소 Eco-Cost를 구합니다."""
+    best = None
+    for order in itertools.permutations(range(1, len(eco_cost))):
+        clock, load, cost, prev, feasible = int(time_windows[0][0]), total_demand, 0, 0, True
+        for node in order:
+            clock = max(clock + transit_time[prev][node], time_windows[node][0])
+            load += demands[node]
+            if clock > time_windows[node][1] or not (0 <= load <= capacity):
+                feasible = False
+                break
+            cost += eco_cost[prev][node]
+            prev = node
+        if not feasible or clock + transit_time[prev][0] > engine.TIME_HORIZON_SEC:
+            continue
+        cost += eco_cost[prev][0]
+        if best is None or cost < best:
+            best = cost
+    return best
+
+
+def _random_tsp_instance(num_jobs: int, seed: int, window_sec: int):
+    rng = random.Random(seed)
+    n = num_jobs + 1
+    eco_cost = [[0 if i == j else rng.randint(100, 5000) for j in range(n)] for i in range(n)]
+    transit_time = [[0 if i == j else rng.randint(60, 900) for j in range(n)] for i in range(n)]
+    demands = [0] + [-rng.randint(10, 200) for _ in range(num_jobs)]
+    time_windows = [(28800, 28800 + 8 * 3600)]
+    for _ in range(num_jobs):
+        start = 28800 + rng.randint(0, 3 * 3600)
+        time_windows.append((start, start + window_sec))
+    return eco_cost, transit_time, demands, time_windows, -sum(demands)
+
+
+@pytest.mark.parametrize("num_jobs", [1, 2, 4, 6, 7])
+@pytest.mark.parametrize("window_sec", [600, 1800, 8 * 3600])
+def test_held_karp_matches_brute_force(num_jobs, window_sec):
+    for seed in range(5):
+        eco_cost, transit_time, demands, time_windows, total_demand = _random_tsp_instance(num_jobs, seed, window_sec)
+        expected = _brute_force_route(eco_cost, transit_time, demands, time_windows, total_demand, total_demand)
+        result = engine._held_karp_route(eco_cost, transit_time, demands, time_windows, total_demand, total_demand)
+        if expected is None:
+            assert result is None
+            continue
+        route, objective = result
+        assert objective == expected
+        assert sorted(route) == list(range(1, num_jobs + 1))
+        tour = [0] + route + [0]
+        assert sum(eco_cost[a][b] for a, b in zip(tour, tour[1:])) == objective
+
+
+def test_held_karp_rejects_demand_over_capacity():
+    eco_cost, transit_time, demands, time_windows, total_demand = _random_tsp_instance(3, 0, 8 * 3600)
+    assert engine._held_karp_route(eco_cost, transit_time, demands, time_windows,
+                                   total_demand - 1, total_demand) is None
+
+
+def test_held_karp_route_is_saved_without_routing_model(monkeypatch):
+    instance = make_input_data(5, 1, seed=1)
+    saved = []
+    monkeypatch.setattr(engine, "get_optimizer_input_data", lambda run_id, vehicle_ids: instance)
+    monkeypatch.setattr(engine, "create_route_matrices", lambda locations, **kwargs: stub_route_matrices(locations))
+    monkeypatch.setattr(engine, "save_optimization_results", lambda run_id, summary, assignments: saved.append(assignments))
+    monkeypatch.setattr(engine, "get_settings", lambda: dict(BENCH_SETTINGS))
+    monkeypatch.setattr(engine, "get_congestion_factors", lambda when: {"tf": 1.0, "idle_f": 0.0})
+    monkeypatch.setattr(engine, "get_weather_penalty_value", lambda when, settings: 1.0)
+    monkeypatch.setattr(engine, "_build_vrp_model", lambda *args, **kwargs: pytest.fail("RoutingModel을 만들면 안 됨"))
+
+    result = engine.run_optimization("RUN_EXACT", [v["vehicle_id"] for v in instance["vehicles"]])
+
+    assert result["status"] == "success"
+    assert result["solver_stats"]["exact"]["used"] and result["solver_stats"]["stop_reason"] == "exact"
+    steps = saved[0]
+    assert [step["step_order"] for step in steps] == list(range(1, 6))
+    assert sorted(step["end_job_id"] for step in steps) == sorted(job["job_id"] for job in instance["jobs"])
+    # 스텝 적재량 = 출발 노드 도착 시점 적재량 (Capacity 차원 누적값)
+    demand_by_job = {job["job_id"]: int(float(job["demand_kg"])) for job in instance["jobs"]}
+    load = sum(demand_by_job.values())
+    for step in steps:
+        assert step["load_kg"] == load
+        if step["start_job_id"] is not None:
+            load -= demand_by_job[step["start_job_id"]]
+
+
+def test_route_arcs_skip_return_to_depot():
+    assert engine._route_arcs([[3, 1], [], [2]]) == [(0, 3), (3, 1), (0, 2)]
+
+
+# --- Warm start: 이전 Run 경로 대응 (user-019) ---
+def _warm_start_instance(num_jobs: int = 5, num_vehicles: int = 2):
+    jobs = [{"job_id": f"J{k}", "longitude": 127.0 + 0.01 * k, "latitude": 37.5} for k in range(1, num_jobs + 1)]
+    vehicles = [{"vehicle_id": f"TRUCK{v}"} for v in range(1, num_vehicles + 1)]
+    # 일직선 위 위치: 비용 = 거리 차이, 이동 시간 = 100초 × 거리 차이
+    cost = [[abs(i - j) * 10 for j in range(num_jobs + 1)] for i in range(num_jobs + 1)]
+    transit = [[abs(i - j) * 100 for j in range(num_jobs + 1)] for i in range(num_jobs + 1)]
+    time_windows = [(0, 86400)] * (num_jobs + 1)
+    return {"jobs": jobs, "vehicles": vehicles}, [cost], transit, time_windows
+
+
+def _previous_run(routes, coords):
+    return {"run_id": "RUN_PREV", "jobs": coords,
+            "routes": [{"vehicle_id": vehicle_id, "job_ids": job_ids} for vehicle_id, job_ids in routes]}
+
+
+def test_map_previous_routes_partial_overlap_inserts_new_jobs():
+    input_data, eco_cost, transit, time_windows = _warm_start_instance()
+    coords = {f"OLD{k}": (job["longitude"], job["latitude"]) for k, job in enumerate(input_data["jobs"][:4], start=1)}
+    previous = _previous_run([("TRUCK2", ["OLD3", "OLD4"]), ("TRUCK1", ["OLD2", "OLD1"])], coords)
+
+    routes, stats = engine._map_previous_routes(previous, input_data, [0, 0], eco_cost, transit, time_windows)
+
+    assert routes[0] == [2, 1] and stats["matched_jobs"] == 4 and stats["inserted_jobs"] == 1
+    # 새 Job 5는 이전 순서(3 → 4)를 유지한 채 최저 비용 위치에 삽입 (3-5-4 / 3-4-5 동률 → 먼저 찾은 위치)
+    assert routes[1] == [3, 5, 4]
+    assert sorted(node for route in routes for node in route) == [1, 2, 3, 4, 5]
+
+
+def test_map_previous_routes_skips_disappeared_jobs_and_vehicles():
+    input_data, eco_cost, transit, time_windows = _warm_start_instance(num_jobs=3)
+    coords = {"OLD1": (127.01, 37.5), "OLD2": (127.02, 37.5), "OLD3": (127.03, 37.5),
+              "GONE": (128.5, 36.0)}
+    previous = _previous_run([("RETIRED", ["OLD1", "GONE", "OLD2"]), ("TRUCK1", ["OLD3", "MISSING"])], coords)
+
+    routes, stats = engine._map_previous_routes(previous, input_data, [0, 0], eco_cost, transit, time_windows)
+
+    # 사라진 Job은 건너뛰고, 없는 차량의 경로는 빈 차량(TRUCK2)에 배정
+    assert routes == [[3], [1, 2]]
+    assert stats["matched_jobs"] == 3 and stats["inserted_jobs"] == 0
+
+
+def test_map_previous_routes_rejects_low_overlap():
+    input_data, eco_cost, transit, time_windows = _warm_start_instance(num_jobs=4)
+    previous = _previous_run([("TRUCK1", ["OLD1"])], {"OLD1": (127.01, 37.5)})
+    routes, stats = engine._map_previous_routes(previous, input_data, [0, 0], eco_cost, transit, time_windows)
+    assert routes is None and stats["matched_jobs"] == 1
+    assert engine._map_previous_routes(None, input_data, [0, 0], eco_cost, transit, time_windows) == (None, {"used": False})
+
+
+def test_map_previous_routes_falls_back_when_old_order_breaks_time_window():
+    input_data, eco_cost, transit, time_windows = _warm_start_instance(num_jobs=3, num_vehicles=1)
+    coords = {f"OLD{k}": (127.0 + 0.01 * k, 37.5) for k in range(1, 4)}
+    previous = _previous_run([("TRUCK1", ["OLD3", "OLD1", "OLD2"])], coords)
+    assert engine._map_previous_routes(previous, input_data, [0], eco_cost, transit, time_windows)[0] == [[3, 1, 2]]
+
+    # Job 1의 시간창이 당겨져 3 → 1 순서로는 도착이 늦음 (0 → 3: 300초, 3 → 1: +200초)
+    time_windows = list(time_windows)
+    time_windows[1] = (0, 400)
+    routes, stats = engine._map_previous_routes(previous, input_data, [0], eco_cost, transit, time_windows)
+    assert routes is None and stats["time_window_violation_vehicle"] == "TRUCK1"
+
+
+def test_map_previous_routes_falls_back_when_new_job_cannot_be_inserted():
+    input_data, eco_cost, transit, time_windows = _warm_start_instance(num_jobs=3, num_vehicles=1)
+    coords = {"OLD1": (127.01, 37.5), "OLD2": (127.02, 37.5)}
+    previous = _previous_run([("TRUCK1", ["OLD1", "OLD2"])], coords)
+    time_windows = list(time_windows)
+    time_windows[3] = (0, 100)                                        # 0 → 3만 300초라 어디에도 못 넣음
+    routes, stats = engine._map_previous_routes(previous, input_data, [0], eco_cost, transit, time_windows)
+    assert routes is None and stats["infeasible_job_node"] == 3
+
+
+# --- 정체(plateau) 조기 종료 모니터 (user-020) ---
+class _FakeRouting:
+    """_PlateauMonitor가 쓰는 RoutingModel 메서드만 흉내: 현재 목적함수 / FinishCurrentSearch 호출 기록."""
+
+    def __init__(self):
+        self.objective = 0
+        self.finished = 0
+        self.monitors = []
+
+    def CostVar(self):
+        return type("CostVar", (), {"Max": lambda _: self.objective})()
+
+    def solver(self):
+        routing = self
+
+        class _Solver:
+            def FinishCurrentSearch(self):
+                routing.finished += 1
+
+            def CustomLimit(self, limit_reached):
+                return limit_reached
+
+        return _Solver()
+
+    def AddAtSolutionCallback(self, callback):
+        self.monitors.append(callback)
+
+    def AddSearchMonitor(self, monitor):
+        self.monitors.append(monitor)
+
+
+def _drive_monitor(monkeypatch, sequence, plateau_sec=0.0, plateau_solutions=0, time_limit_ms=0):
+    """
+    (시각, 목적함수 또는 None) 순서대로 모니터를 구동합니다.
+    목적함수가 있으면 해 콜백, None이면 새 해 없이 CustomLimit만 확인 (종료되면 중단).
+    """
+    clock = [0.0]
+    monkeypatch.setattr(engine, "time", type("FakeTime", (), {"perf_counter": staticmethod(lambda: clock[0])}))
+    routing = _FakeRouting()
+    monitor = engine._PlateauMonitor(routing, plateau_sec, plateau_solutions, time_limit_ms)
+    monitor.attach()
+    monitor.start()
+    for now, objective in sequence:
+        clock[0] = now
+        if objective is not None:
+            routing.objective = objective
+            monitor()
+        if routing.finished or monitor.limit_reached():
+            break
+    return monitor, routing
+
+
+def test_plateau_monitor_records_only_improvements(monkeypatch):
+    monitor, routing = _drive_monitor(monkeypatch, [(0.1, 100), (0.2, 105), (0.3, 90), (0.4, 90), (0.5, 80)])
+    assert monitor.trajectory == [(0.1, 100), (0.3, 90), (0.5, 80)]
+    assert monitor.stop_reason is None and routing.finished == 0
+    assert len(routing.monitors) == 2                                 # 해 콜백 + CustomLimit
+
+
+def test_plateau_monitor_stops_without_new_solutions(monkeypatch):
+    # 0.2초 이후 해가 더 나오지 않아도 CustomLimit 확인만으로 정체 판정
+    sequence = [(0.1, 100), (0.2, 90)] + [(0.2 + 0.1 * k, None) for k in range(1, 20)]
+    monitor, routing = _drive_monitor(monkeypatch, sequence, plateau_sec=0.5)
+    assert monitor.stop_reason == "plateau_time" and monitor.limit_reached()
+    assert routing.finished == 0                                      # CustomLimit이 True를 돌려 종료
+
+
+def test_plateau_monitor_stops_after_non_improving_solutions(monkeypatch):
+    sequence = [(0.1, 100), (0.2, 101), (0.3, 102), (0.4, 99), (0.5, 100), (0.6, 100), (0.7, 100), (0.8, 50)]
+    monitor, routing = _drive_monitor(monkeypatch, sequence, plateau_solutions=3)
+    assert monitor.stop_reason == "plateau_solutions" and routing.finished == 1
+    assert monitor.trajectory == [(0.1, 100), (0.4, 99)]
+
+
+def test_plateau_monitor_enforces_time_limit_only_after_first_solution(monkeypatch):
+    monitor, _ = _drive_monitor(monkeypatch, [(0.5, None), (1.5, None)], time_limit_ms=1000)
+    assert monitor.stop_reason is None                                # 첫 해 전에는 솔버 한도에 맡김
+    monitor, _ = _drive_monitor(monkeypatch, [(0.5, 100), (0.9, 90), (1.0, None)], plateau_sec=5, time_limit_ms=1000)
+    assert monitor.stop_reason == "time_limit"
+
+
+def test_solver_stop_reason_without_monitor_stop(monkeypatch):
+    monitor, routing = _drive_monitor(monkeypatch, [(0.1, 100)])
+    status = engine.routing_enums_pb2.RoutingSearchStatus
+    routing.status = lambda: status.ROUTING_SUCCESS
+    assert engine._solver_stop_reason(monitor, routing) == "completed"
+    routing.status = lambda: status.ROUTING_FAIL_TIMEOUT
+    assert engine._solver_stop_reason(monitor, routing) == "time_limit"
+    monitor.stop_reason = "plateau_time"
+    assert engine._solver_stop_reason(monitor, routing) == "plateau_time"
+
+
+# --- Pareto 모드 (user-025) ---
+def test_pareto_front_drops_dominated_points():
+    points = [(100.0, 50.0), (80.0, 60.0), (120.0, 40.0), (110.0, 55.0), (80.0, 70.0), (130.0, 40.0)]
+    # (110, 55)는 (100, 50)에, (80, 70)은 (80, 60)에, (130, 40)은 (120, 40)에 지배됨
+    assert engine._pareto_front(points) == [0, 1, 2]
+
+
+def test_pareto_front_keeps_first_of_equal_points():
+    assert engine._pareto_front([(10.0, 10.0), (10.0, 10.0), (5.0, 20.0)]) == [0, 2]
+    assert engine._pareto_front([(1.0, 1.0)]) == [0]
+    assert engine._pareto_front([]) == []
+
+
+def test_pareto_front_matches_pairwise_definition():
+    rng = random.Random(25)
+    points = [(float(rng.randint(0, 20)), float(rng.randint(0, 20))) for _ in range(60)]
+    front = engine._pareto_front(points)
+    for i, p in enumerate(points):
+        dominated = any(q[0] <= p[0] and q[1] <= p[1] and q != p for q in points)
+        duplicate_of_earlier = p in points[:i]
+        assert (i in front) == (not dominated and not duplicate_of_earlier)
+
+
+def test_parse_weight_pairs_skips_invalid_and_duplicates():
+    assert engine._parse_weight_pairs("1.0:0.0, 0.5:0.5,bad,0.5:0.50,-1:2,0:0,0.2:0.8") == [
+        (1.0, 0.0), (0.5, 0.5), (0.2, 0.8)]
+    assert engine._parse_weight_pairs("") == []
+
+
+def test_combine_weighted_costs_keeps_unreachable_arcs():
+    unreachable = engine.UNREACHABLE_ARC_COST
+    co2 = np.array([[[0, 1000], [unreachable, 0]]], dtype=np.int64)
+    time_part = np.array([[[0, 3000], [unreachable, 0]]], dtype=np.int64)
+    combined = engine._combine_weighted_costs(np.concatenate([co2, time_part]), 0.25, 0.75)
+    assert combined.tolist() == [[[0, 2500], [unreachable, 0]]]
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""services/http_client.py 단위 테스트 (로컬 HTTP 서버, 외부 API 호출 없음)."""
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from services.http_client import HttpClient
+
+
+class _FlakyHandler(BaseHTTPRequestHandler):
+    """앞의 fail_times번은 delay_sec 뒤 503, 그 다음부터 200을 돌려줍니다."""
+    protocol_version = "HTTP/1.1"
+    fail_times = 0
+    delay_sec = 0.0
+    calls = 0
+
+    def do_GET(self):
+        _FlakyHandler.calls += 1
+        failing = _FlakyHandler.calls <= _FlakyHandler.fail_times
+        if failing and self.delay_sec:
+            time.sleep(self.delay_sec)
+        body = b"fail" if failing else b"ok"
+        self.send_response(503 if failing else 200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def flaky_server():
+    _FlakyHandler.fail_times, _FlakyHandler.delay_sec, _FlakyHandler.calls = 0, 0.0, 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FlakyHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}/", _FlakyHandler
+    server.shutdown()
+    server.server_close()
+
+
+def test_deadline_request_retries_like_session(flaky_server):
+    url, handler = flaky_server
+    handler.fail_times = 2
+    client = HttpClient("test", retry_total=2, backoff=0.01)
+    response = client.get(url, deadline_sec=5.0)
+    assert response.status_code == 200 and handler.calls == 3
+
+
+def test_deadline_request_returns_last_response_when_retries_exhausted(flaky_server):
+    url, handler = flaky_server
+    handler.fail_times = 10
+    client = HttpClient("test", retry_total=1, backoff=0.01)
+    assert client.get(url, deadline_sec=5.0).status_code == 503
+    assert handler.calls == 2
+
+
+def test_deadline_bounds_total_time_across_retries(flaky_server):
+    url, handler = flaky_server
+    handler.fail_times, handler.delay_sec = 10, 0.3
+    # 시도당 타임아웃(1초)과 재시도 4회를 합하면 데드라인보다 훨씬 길지만 전체는 데드라인 안에서 끝나야 함
+    client = HttpClient("test", retry_total=4, backoff=0.2, read_timeout=1.0)
+    started = time.monotonic()
+    with pytest.raises(requests.exceptions.RequestException):
+        client.get(url, deadline_sec=0.5).raise_for_status()
+    assert time.monotonic() - started < 0.75
+    assert handler.calls <= 2
+    assert client.stats()["requests"] == 1
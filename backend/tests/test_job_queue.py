@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+"""services/job_queue.py 단위 테스트 (가짜 runner, DB / 최적화 엔진 없음)."""
+import threading
+import time
+
+import pytest
+
+from services.job_queue import (
+    JOB_FAILED,
+    JOB_QUEUED,
+    JOB_RUNNING,
+    JOB_SUCCEEDED,
+    OptimizationJobQueue,
+    QueueFullError,
+)
+
+
+class _GatedRunner:
+    """release()될 때까지 실행 중 상태로 머무는 가짜 run_optimization."""
+
+    def __init__(self, result=None, error=None):
+        self.result = result if result is not None else {"status": "success", "results": []}
+        self.error = error
+        self.started = threading.Event()
+        self.gate = threading.Event()
+        self.calls = []
+
+    def __call__(self, run_id, vehicle_ids, progress_callback=None, **solver_options):
+        self.calls.append((run_id, vehicle_ids, solver_options))
+        progress_callback("solve", 0.6)
+        self.started.set()
+        assert self.gate.wait(5.0)
+        if self.error:
+            raise self.error
+        return dict(self.result, run_id=run_id)
+
+    def release(self):
+        self.gate.set()
+
+
+def _wait_for(queue, job_id, status, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = queue.get(job_id)
+        if job["status"] == status:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"{job_id}: {queue.get(job_id)['status']} != {status}")
+
+
+# --- 상태 전이 ---
+def test_job_moves_from_queued_to_running_to_succeeded():
+    runner = _GatedRunner()
+    queue = OptimizationJobQueue(runner, max_workers=1)
+    first = queue.submit("RUN_A", ["TRUCK01"], solver_options={"quality": "fast"})
+    second = queue.submit("RUN_B", ["TRUCK02"])
+    assert first["status"] == JOB_QUEUED and second["queue_depth_at_submit"] == 1
+
+    assert runner.started.wait(5.0)
+    running = _wait_for(queue, first["job_id"], JOB_RUNNING)
+    assert running["phase"] == "solve" and running["progress"] == 0.6
+    assert queue.get(second["job_id"])["status"] == JOB_QUEUED       # 워커 1개라 대기
+    assert queue.stats()["running"] == 1 and queue.stats()["queued"] == 1
+
+    runner.release()
+    done = _wait_for(queue, first["job_id"], JOB_SUCCEEDED)
+    assert done["phase"] == "done" and done["progress"] == 1.0 and done["error"] is None
+    assert done["result"]["run_id"] == "RUN_A" and done["run_time_sec"] >= 0
+    _wait_for(queue, second["job_id"], JOB_SUCCEEDED)
+    queue.shutdown()
+    assert runner.calls[0] == ("RUN_A", ["TRUCK01"], {"quality": "fast"})
+    assert queue.stats()["succeeded"] == 2 and queue.stats()["failed"] == 0
+
+
+@pytest.mark.parametrize("runner", [
+    _GatedRunner(result={"status": "failed", "message": "no solution"}),
+    _GatedRunner(error=RuntimeError("boom")),
+])
+def test_failed_result_or_exception_marks_job_failed(runner):
+    runner.release()
+    queue = OptimizationJobQueue(runner, max_workers=1)
+    job = queue.submit("RUN_F", ["TRUCK01"])
+    failed = _wait_for(queue, job["job_id"], JOB_FAILED)
+    queue.shutdown()
+    assert failed["error"] in ("no solution", "boom")
+    assert queue.stats()["failed"] == 1
+
+
+# --- 대기열 한도 ---
+def test_submit_raises_queue_full_when_pending_jobs_reach_limit():
+    runner = _GatedRunner()
+    queue = OptimizationJobQueue(runner, max_workers=1, max_queue=2)
+    jobs = [queue.submit("RUN_1", ["TRUCK01"]), queue.submit("RUN_2", ["TRUCK01"])]
+    with pytest.raises(QueueFullError):
+        queue.submit("RUN_3", ["TRUCK01"])
+    assert queue.stats()["rejected"] == 1
+
+    runner.release()
+    for job in jobs:
+        _wait_for(queue, job["job_id"], JOB_SUCCEEDED)
+    queue.submit("RUN_4", ["TRUCK01"])                                # 끝난 작업은 한도에서 빠짐
+    queue.shutdown()
+
+
+def test_optimize_endpoint_returns_503_when_queue_is_full(monkeypatch):
+    import app as app_module
+
+    runner = _GatedRunner()
+    queue = OptimizationJobQueue(runner, max_workers=1, max_queue=1)
+    monkeypatch.setattr(app_module, "get_optimization_job_queue", lambda: queue)
+    client = app_module.app.test_client()
+    body = {"run_id": "RUN_API", "vehicle_ids": ["TRUCK01"], "async": True}
+
+    accepted = client.post("/optimize", json=body)
+    rejected = client.post("/optimize", json=body)
+    runner.release()
+    queue.shutdown()
+
+    assert accepted.status_code == 202 and accepted.get_json()["job_status"] == JOB_QUEUED
+    assert rejected.status_code == 503 and rejected.get_json()["status"] == "failed"
+
+
+# --- 완료 작업 보관 기간 ---
+def test_finished_jobs_are_pruned_after_retention(monkeypatch):
+    runner = _GatedRunner()
+    runner.release()
+    queue = OptimizationJobQueue(runner, max_workers=1, retention_sec=60)
+    old = queue.submit("RUN_OLD", ["TRUCK01"])
+    _wait_for(queue, old["job_id"], JOB_SUCCEEDED)
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 61)
+    recent = queue.submit("RUN_NEW", ["TRUCK01"])                     # 제출 시 만료 작업 정리
+    assert queue.get(old["job_id"]) is None
+    assert queue.get(recent["job_id"]) is not None
+    queue.shutdown()
+    assert queue.stats()["retained_jobs"] == 1
+
+
+def test_running_jobs_are_never_pruned(monkeypatch):
+    runner = _GatedRunner()
+    queue = OptimizationJobQueue(runner, max_workers=1, retention_sec=0)
+    job = queue.submit("RUN_LONG", ["TRUCK01"])
+    assert runner.started.wait(5.0)
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 3600)
+    queue.submit("RUN_NEXT", ["TRUCK01"])
+    assert queue.get(job["job_id"])["status"] == JOB_RUNNING
+    runner.release()
+    queue.shutdown()
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""services/optimizer.py(빠른 견적 배차) 단위 테스트."""
+import random
+import time
+
+import numpy as np
+import pytest
+
+from services.optimizer import (
+    QUOTE_ROUTE_NAME,
+    _clarke_wright_routes,
+    _haversine_matrix,
+    _improve_route,
+    _route_distance,
+    optimize_plan,
+)
+
+
+def _random_instance(num_jobs: int, seed: int):
+    rng = np.random.default_rng(seed)
+    lat = np.concatenate([[37.5], 37.4 + rng.random(num_jobs) * 0.3])
+    lon = np.concatenate([[127.0], 126.8 + rng.random(num_jobs) * 0.4])
+    demand = np.concatenate([[0.0], rng.integers(50, 600, num_jobs).astype(float)])
+    return _haversine_matrix(lat, lon), demand
+
+
+# --- Clarke-Wright 절약법 ---
+@pytest.mark.parametrize("num_jobs", [1, 2, 15, 120])
+@pytest.mark.parametrize("max_capacity", [600.0, 2000.0, np.inf])
+def test_clarke_wright_visits_each_job_once_within_capacity(num_jobs, max_capacity):
+    dist, demand = _random_instance(num_jobs, seed=num_jobs)
+    routes = _clarke_wright_routes(dist, demand, max_capacity)
+
+    assert sorted(node for route in routes for node in route) == list(range(1, num_jobs + 1))
+    assert all(demand[route].sum() <= max_capacity for route in routes)
+
+
+def test_clarke_wright_merges_when_capacity_allows():
+    dist, demand = _random_instance(30, seed=3)
+    unlimited = _clarke_wright_routes(dist, demand, np.inf)
+    tight = _clarke_wright_routes(dist, demand, 1000.0)
+    assert len(unlimited) < len(tight) < 30
+    assert sum(_route_distance(r, dist) for r in unlimited) < sum(_route_distance([n], dist) for n in range(1, 31))
+
+
+# --- 2-opt / or-opt 개선 ---
+@pytest.mark.parametrize("seed", range(5))
+def test_improve_route_keeps_jobs_and_never_lengthens(seed):
+    dist, _ = _random_instance(25, seed=seed)
+    route = list(range(1, 26))
+    random.Random(seed).shuffle(route)
+
+    improved = _improve_route(route, dist, time.perf_counter() + 5.0)
+
+    assert sorted(improved) == sorted(route)
+    assert _route_distance(improved, dist) <= _route_distance(route, dist) + 1e-9
+
+
+def test_improve_route_reaches_two_opt_local_optimum():
+    dist, _ = _random_instance(12, seed=9)
+    improved = _improve_route(list(range(1, 13)), dist, time.perf_counter() + 5.0)
+    tour = [0] + improved + [0]
+    for i in range(1, len(tour) - 2):
+        for j in range(i + 1, len(tour) - 1):
+            candidate = tour[:i] + tour[i:j + 1][::-1] + tour[j + 1:]
+            assert _route_distance(candidate[1:-1], dist) >= _route_distance(improved, dist) - 1e-9
+
+
+# --- optimize_plan ---
+def test_optimize_plan_respects_capacity_and_returns_to_depot():
+    rng = random.Random(4)
+    jobs = [{"job_id": f"J{k}", "latitude": 37.4 + rng.random() * 0.3, "longitude": 126.8 + rng.random() * 0.4,
+             "demand_kg": rng.randint(100, 900)} for k in range(40)]
+    vehicles = [{"id": "V1", "capacity_kg": 3000, "ef_gpkm": 200.0},
+                {"id": "V2", "capacity_kg": 3000, "ef_gpkm": 250.0}]
+
+    result = optimize_plan("RUN_TEST", "2025-01-06", vehicles, jobs, {}, depot=(37.5, 127.0))
+    assignments = result["assignments"]
+
+    assert all(a["route_option_name"] == QUOTE_ROUTE_NAME for a in assignments)
+    visited = [a["end_job_id"] for a in assignments if a["end_job_id"] is not None]
+    assert sorted(visited) == sorted(job["job_id"] for job in jobs)
+    assert max(a["load_kg"] for a in assignments) <= 3000
+    # 운행마다 차고지 복귀 구간(end_job_id=None)이 하나씩, 복귀 시 적재량 0
+    returns = [a for a in assignments if a["end_job_id"] is None]
+    assert len(returns) == result["summary"]["num_routes"]
+    assert all(a["load_kg"] == 0 for a in returns)
+    assert result["summary"]["total_distance_km"] == pytest.approx(sum(a["distance_km"] for a in assignments), abs=0.05)
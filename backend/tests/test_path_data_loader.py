@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+"""services/path_data_loader.py 단위 테스트 (외부 API 호출 없음)."""
+import math
+import threading
+import time
+
+import pytest
+
+import services.path_data_loader as path_data_loader
+from benchmarks.ors_stub_server import OrsStubHandler, start_ors_stub_server
+from benchmarks.stub_providers import build_stub_route, make_stub_kakao_route
+from benchmarks.synthetic import random_locations
+from services.path_data_loader import LatencyHistogram, TokenBucket
+
+
+# --- TokenBucket ---
+def test_token_bucket_without_rate_never_blocks():
+    bucket = TokenBucket(0)
+    assert all(bucket.acquire(timeout=0) for _ in range(100))
+
+
+def test_token_bucket_allows_burst_up_to_capacity():
+    bucket = TokenBucket(10, capacity=3)
+    assert all(bucket.acquire(timeout=0) for _ in range(3))
+    # 다음 토큰은 0.1초 뒤에 채워지므로 더 짧은 timeout 안에는 얻지 못함
+    assert bucket.acquire(timeout=0.01) is False
+
+
+def test_token_bucket_refills_at_rate():
+    bucket = TokenBucket(20, capacity=1)
+    assert bucket.acquire(timeout=0)
+    started = time.monotonic()
+    assert bucket.acquire(timeout=1.0)
+    assert time.monotonic() - started >= 0.04
+
+
+def test_token_bucket_limits_concurrent_callers():
+    bucket = TokenBucket(50, capacity=1)
+    acquired = []
+
+    def worker():
+        for _ in range(3):
+            acquired.append(bucket.acquire(timeout=5.0))
+
+    started = time.monotonic()
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    # 12개 토큰 = 처음 1개 + 11개 × 20ms
+    assert acquired == [True] * 12
+    assert time.monotonic() - started >= 0.2
+
+
+# --- ORS /v2/matrix 블록 조립 / 해에 쓰인 아크만 상세 조회 (user-013, 로컬 대역 서버) ---
+@pytest.fixture
+def ors_stub(monkeypatch):
+    server = start_ors_stub_server(port=0)
+    base_url = f"http://127.0.0.1:{server.server_port}"
+    monkeypatch.setattr(path_data_loader, "ORS_API_KEY", "stub")
+    monkeypatch.setattr(path_data_loader, "ORS_MATRIX_URL", f"{base_url}/v2/matrix")
+    monkeypatch.setattr(path_data_loader, "ORS_DIRECTIONS_URL", f"{base_url}/v2/directions")
+    monkeypatch.setattr(path_data_loader, "ROUTE_CACHE_ENABLED", False)
+    monkeypatch.setattr(path_data_loader, "ROUTE_MATRIX_RATE_PER_SEC", 0)
+    yield OrsStubHandler
+    server.shutdown()
+    server.server_close()
+
+
+def _stub_arc(locations, i, j):
+    route = build_stub_route((locations[i]["longitude"], locations[i]["latitude"]),
+                             (locations[j]["longitude"], locations[j]["latitude"]))
+    return round(route["total_distance_km"], 3), round(route["total_time_sec"], 1)
+
+
+@pytest.mark.parametrize("num_locations,chunk_size", [(7, 3), (6, 3), (5, 10), (4, 1)])
+def test_build_ors_matrix_assembles_blocks(ors_stub, monkeypatch, num_locations, chunk_size):
+    locations = random_locations(num_locations, seed=num_locations)
+    block_requests = []
+    request_block = path_data_loader._request_ors_matrix_block
+
+    def recording_request(coords, sources, destinations, profile, timeout=30):
+        block_requests.append((len(coords), len(sources), len(destinations)))
+        return request_block(coords, sources, destinations, profile, timeout)
+
+    monkeypatch.setattr(path_data_loader, "_request_ors_matrix_block", recording_request)
+    distance_km, time_sec, stats = path_data_loader.build_ors_matrix(locations, chunk_size=chunk_size)
+
+    num_chunks = math.ceil(num_locations / chunk_size)
+    assert stats["requests"] == ors_stub.counts["matrix"] == len(block_requests) == num_chunks ** 2
+    assert stats["failed_requests"] == 0 and stats["failed"] == 0
+    assert stats["fetched"] == num_locations * (num_locations - 1)
+    for i in range(num_locations):
+        assert distance_km[i][i] == 0.0 and time_sec[i][i] == 0.0
+        for j in range(num_locations):
+            if i != j:
+                assert (distance_km[i][j], time_sec[i][j]) == _stub_arc(locations, i, j)
+    # 대각 블록(src is dst)은 좌표를 한 번만 보내고, 나머지 블록은 출발 + 도착 좌표를 이어 붙여 보냄
+    diagonal = [r for r in block_requests if r[0] == r[1] == r[2]]
+    assert len(diagonal) == num_chunks
+    assert all(coords == sources + destinations for coords, sources, destinations in block_requests
+               if (coords, sources, destinations) not in diagonal)
+
+
+def test_build_ors_matrix_marks_failed_blocks_unreachable(ors_stub, monkeypatch):
+    locations = random_locations(4, seed=1)
+    request_block = path_data_loader._request_ors_matrix_block
+
+    def failing_off_diagonal(coords, sources, destinations, profile, timeout=30):
+        if len(coords) != len(sources):
+            return None
+        return request_block(coords, sources, destinations, profile, timeout)
+
+    monkeypatch.setattr(path_data_loader, "_request_ors_matrix_block", failing_off_diagonal)
+    distance_km, _, stats = path_data_loader.build_ors_matrix(locations, chunk_size=2)
+    assert stats["failed_requests"] == 2
+    assert math.isinf(distance_km[0][2]) and math.isinf(distance_km[3][1])
+    assert distance_km[0][1] == _stub_arc(locations, 0, 1)[0]
+    assert stats["fetched"] + stats["failed"] == stats["total_pairs"] == 12
+
+
+def test_fetch_arc_details_only_replaces_requested_arcs(ors_stub, monkeypatch):
+    monkeypatch.setattr(path_data_loader, "ORS_MATRIX_CHUNK_SIZE", 3)
+    locations = random_locations(5, seed=13)
+    _, _, segment_data_map = path_data_loader.create_ors_matrix_route_matrices(locations)
+    all_arcs = [(i, j) for i in range(5) for j in range(5) if i != j]
+    assert all(path_data_loader.is_summary_arc(segment_data_map, arc) for arc in all_arcs)
+    assert ors_stub.counts["directions"] == 0
+
+    solution_arcs = [(0, 2), (2, 4), (4, 0)]
+    detailed = path_data_loader.fetch_arc_details(locations, solution_arcs, segment_data_map)
+
+    assert detailed == len(solution_arcs)
+    assert ors_stub.counts["directions"] == len(solution_arcs)
+    for arc in all_arcs:
+        assert path_data_loader.is_summary_arc(segment_data_map, arc) == (arc not in solution_arcs)
+    # 이미 상세로 바뀐 아크는 다시 조회하지 않음
+    assert path_data_loader.fetch_arc_details(locations, solution_arcs, segment_data_map) == 0
+    assert ors_stub.counts["directions"] == len(solution_arcs)
+
+
+# --- 요청당 데드라인: 늦게 도착한 응답 유지 (user-001) ---
+def test_route_matrix_keeps_late_responses(monkeypatch):
+    locations = random_locations(3, seed=2)
+    index_of = {(loc["longitude"], loc["latitude"]): k for k, loc in enumerate(locations)}
+    slow_pairs = {(0, 1), (2, 0)}
+
+    def fetcher(origin, destination, car_type, timeout):
+        pair = (index_of[origin], index_of[destination])
+        if pair in slow_pairs:
+            time.sleep(0.15)
+        return None if pair == (2, 0) else build_stub_route(origin, destination)
+
+    distance_km, _, segment_data_map, stats = path_data_loader.build_route_matrices_concurrent(
+        locations, fetcher, rate_per_sec=0, request_deadline_sec=0.1, max_workers=6)
+
+    assert stats["fetched"] == 5 and stats["late"] == 1
+    assert stats["failed"] == 1 and stats["timed_out"] == 1
+    assert distance_km[0][1] == build_stub_route((locations[0]["longitude"], locations[0]["latitude"]),
+                                                 (locations[1]["longitude"], locations[1]["latitude"]))["total_distance_km"]
+    assert segment_data_map.get((0, 1)) and math.isinf(distance_km[2][0])
+
+
+# --- 제공자 지연 히스토그램: 성공 표본만 hedge 백분위에 사용 (user-011) ---
+def test_latency_histogram_percentile_ignores_failures():
+    hist = LatencyHistogram()
+    for _ in range(50):
+        hist.record(0.005, ok=False)          # 빠른 실패 (연결 거부, 4xx 등)
+    for k in range(20):
+        hist.record(0.100 + k * 0.010)
+    assert hist.sample_count() == 20
+    assert hist.percentile(95) == pytest.approx(0.280)
+    snapshot = hist.snapshot()
+    assert snapshot["count"] == 70 and snapshot["failures"] == 50
+    assert snapshot["buckets"]["<=50ms"] == 50
+
+
+def test_hedge_delay_uses_successful_requests_only(monkeypatch):
+    monkeypatch.setattr(path_data_loader, "_provider_latency", {})
+    monkeypatch.setattr(path_data_loader, "_provider_counters", {})
+    monkeypatch.setattr(path_data_loader, "ROUTE_HEDGE_MIN_SAMPLES", 5)
+    monkeypatch.setattr(path_data_loader, "ROUTE_HEDGE_PERCENTILE", 95)
+
+    for _ in range(10):
+        path_data_loader._timed_provider_request("stub", lambda: None)     # 실패 응답만으로는 hedge 안 함
+    assert path_data_loader._hedge_delay_sec("stub") is None
+
+    for _ in range(5):
+        path_data_loader._timed_provider_request("stub", lambda: time.sleep(0.02) or {"ok": True})
+    assert path_data_loader._hedge_delay_sec("stub") >= 0.02
+
+
+# --- 동일 좌표 병합: 실제 조회 쌍 기준 절약 수 (user-010) ---
+def _colocated_locations(num_unique: int, copies: int, seed: int):
+    unique = random_locations(num_unique, seed=seed)
+    return unique + [dict(unique[k]) for k in range(1, num_unique) for _ in range(copies)]
+
+
+def test_kakao_dedupe_pairs_saved_counts_sparse_pairs(monkeypatch):
+    stub = make_stub_kakao_route(latency_sec=0.0)
+    monkeypatch.setattr(path_data_loader, "_request_kakao_route", stub)
+    monkeypatch.setattr(path_data_loader, "ROUTE_CACHE_ENABLED", False)
+    monkeypatch.setattr(path_data_loader, "ROUTE_MATRIX_RATE_PER_SEC", 0)
+    monkeypatch.setattr(path_data_loader, "ROUTE_DEDUPE_LOCATIONS", True)
+    monkeypatch.setattr(path_data_loader, "ROUTE_MATRIX_SPARSE_MIN_NODES", 4)
+    locations = _colocated_locations(8, copies=1, seed=5)
+    unique_locations, _ = path_data_loader.dedupe_locations(locations)
+
+    stats = {}
+    path_data_loader.create_kakao_route_matrices(locations, stats=stats, sparse_k=2, lazy_segments=False)
+
+    requested = len(path_data_loader.select_sparse_pairs(unique_locations, 2))
+    without_dedupe = len(path_data_loader.select_sparse_pairs(locations, 2))
+    assert stats["total_pairs"] == stub.calls == requested
+    assert stats["dedupe_pairs_saved"] == without_dedupe - requested
+
+
+def test_ors_dedupe_savings_count_pairs_and_requests(ors_stub, monkeypatch):
+    monkeypatch.setattr(path_data_loader, "ORS_MATRIX_CHUNK_SIZE", 4)
+    monkeypatch.setattr(path_data_loader, "ROUTE_DEDUPE_LOCATIONS", True)
+    locations = _colocated_locations(5, copies=2, seed=6)          # 노드 13개 → 위치 5개
+
+    stats = {}
+    path_data_loader.create_ors_matrix_route_matrices(locations, stats=stats)
+    assert stats["requests"] == ors_stub.counts["matrix"] == 4
+    assert stats["dedupe_pairs_saved"] == 13 * 12 - 5 * 4
+    assert stats["dedupe_requests_saved"] == 16 - 4
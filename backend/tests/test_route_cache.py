@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""services/route_cache.py 단위 테스트 (메모리 LRU → SQLite 2단 캐시)."""
+import json
+
+from services.route_cache import RouteCache
+
+
+def _payload(size: int) -> dict:
+    return {"data": "x" * size}
+
+
+def _entry_size(value) -> int:
+    return len(json.dumps(value, ensure_ascii=False))
+
+
+def test_make_key_snaps_coordinates_and_ignores_wall_clock():
+    cache = RouteCache(None, coord_precision=4)
+    key = cache.make_key("kakao", 6, (127.000012, 37.500049), (127.1, 37.6))
+    assert key == cache.make_key("kakao", 6, (127.000004, 37.499951), (127.1, 37.6))
+    assert key == "kakao|6|127.0000,37.5000|127.1000,37.6000"
+    assert cache.make_key("kakao", 6, (127.0, 37.5), (127.1, 37.6), hour_bucket=8).endswith("|h08")
+
+
+def test_memory_lru_evicts_least_recently_used():
+    value = _payload(100)
+    cache = RouteCache(None, max_memory_bytes=2 * _entry_size(value))
+    cache.put("a", value)
+    cache.put("b", value)
+    assert cache.get("a") == value      # a가 최근 사용 → 다음 축출 대상은 b
+    cache.put("c", value)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == value
+    assert cache.get("c") == value
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["memory_entries"] == 2
+    assert stats["memory_bytes"] <= stats["max_memory_bytes"]
+
+
+def test_evicted_entry_falls_through_to_sqlite(tmp_path):
+    value = _payload(100)
+    cache = RouteCache(str(tmp_path / "route_cache.sqlite3"), max_memory_bytes=_entry_size(value))
+    cache.put("a", value)
+    cache.put("b", value)               # 메모리 1개 한도 → a는 메모리에서 축출, 디스크에는 남음
+
+    assert cache.get("a") == value
+    assert cache.stats()["disk_hits"] == 1
+    assert cache.get("a") == value      # 디스크 적중 후 메모리로 승격
+    assert cache.stats()["memory_hits"] == 1
+
+
+def test_sqlite_tier_survives_restart(tmp_path):
+    db_path = str(tmp_path / "route_cache.sqlite3")
+    route = [{"distance_km": 1.2, "base_time_sec": 90.0}]
+    RouteCache(db_path).put("kakao|6|a|b", route)
+
+    reopened = RouteCache(db_path)
+    assert reopened.get("kakao|6|a|b") == route
+    assert reopened.stats()["disk_hits"] == 1
+
+
+def test_expired_entries_are_not_returned(tmp_path):
+    cache = RouteCache(str(tmp_path / "route_cache.sqlite3"))
+    cache.put("a", _payload(10), ttl_sec=-1)
+    assert cache.get("a") is None
+    cache.clear_memory()
+    assert cache.get("a") is None
+    assert cache.stats()["misses"] == 2
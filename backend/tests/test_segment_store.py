@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""services/segment_store.py 단위 테스트."""
+import pickle
+
+import numpy as np
+import pytest
+
+from services.segment_store import ARC_FLAG_ESTIMATED, ARC_FLAG_SUMMARY, SegmentStore, as_segment_store
+
+LEGACY = {
+    (0, 1): [{"link_id": "1001", "distance_km": 1.0, "base_time_sec": 60.0},
+             {"link_id": None, "distance_km": 2.0, "base_time_sec": 90.0}],
+    (1, 0): [{"link_id": None, "distance_km": 3.0, "base_time_sec": 200.0, "estimated": True}],
+    (1, 2): [],
+}
+
+
+def _segments(n: int, base: float):
+    return [{"link_id": k, "distance_km": base + k, "base_time_sec": 10.0 * (base + k)} for k in range(n)]
+
+
+def test_from_dict_round_trip_and_arc_arrays():
+    store = SegmentStore.from_dict(3, LEGACY)
+    assert len(store) == 3 and (1, 2) in store and (2, 1) not in store
+    assert store[(0, 1)][0]["link_id"] == 1001 and store[(0, 1)][1]["link_id"] is None
+    assert store[(1, 0)][0]["estimated"] and store[(1, 2)] == []
+    distance_km, base_time_sec, offsets = store.arc_arrays([(0, 1), (2, 1), (1, 0)])
+    assert distance_km.tolist() == [1.0, 2.0, 3.0] and offsets.tolist() == [0, 2, 2, 3]
+    assert base_time_sec.tolist() == [60.0, 90.0, 200.0]
+    assert as_segment_store(store, 3) is store
+
+
+# --- 덮어쓰기 / 삭제 ---
+def test_overwrite_replaces_segments_and_flags():
+    store = SegmentStore.from_dict(3, LEGACY)
+    store[(1, 0)] = _segments(3, 5.0)
+    assert [s["distance_km"] for s in store[(1, 0)]] == [5.0, 6.0, 7.0]
+    assert "estimated" not in store[(1, 0)][0]
+    assert store.flagged_arcs(ARC_FLAG_ESTIMATED) == []
+    assert [s["distance_km"] for s in store[(0, 1)]] == [1.0, 2.0]      # 다른 아크는 그대로
+    assert store.num_segments == 5
+
+
+def test_repeated_overwrite_reuses_space():
+    store = SegmentStore(4, capacity=16)
+    for i in range(4):
+        for j in range(4):
+            if i != j:
+                store[(i, j)] = _segments(4, i * 10 + j)
+    for round_idx in range(200):
+        arc = (round_idx % 4, (round_idx + 1) % 4)
+        store[arc] = _segments(4, 100.0 + round_idx)
+    # 덮어쓴 만큼 계속 뒤에 붙이면 12 + 200개 블록 → 회수하면 살아 있는 48개 구간의 수 배 이내
+    assert len(store._segments) <= 4 * store.num_segments
+    for round_idx in range(196, 200):
+        arc = (round_idx % 4, (round_idx + 1) % 4)
+        assert store[arc][0]["distance_km"] == 100.0 + round_idx
+    assert store[(0, 2)][0]["distance_km"] == 2.0
+
+    store.shrink_to_fit()
+    assert len(store._segments) == store.num_segments == 48
+
+
+def test_delete_removes_arc_and_space():
+    store = SegmentStore.from_dict(3, LEGACY)
+    del store[(0, 1)]
+    assert (0, 1) not in store and len(store) == 2
+    with pytest.raises(KeyError):
+        store[(0, 1)]
+    with pytest.raises(KeyError):
+        del store[(0, 1)]
+    del store[(1, 0)]
+    assert store.flagged_arcs(ARC_FLAG_ESTIMATED) == []
+    store.shrink_to_fit()
+    assert store.num_segments == 0 and len(store._segments) == 1
+    assert store.arc_arrays([(0, 1), (1, 2)])[2].tolist() == [0, 0, 0]
+
+
+def test_flagged_arcs_and_detail_provider():
+    store = SegmentStore(3)
+    store.set_arc(0, 1, [1.0], [60.0], flags=ARC_FLAG_SUMMARY, detail_provider="ors")
+    store.set_arc(1, 2, [2.0], [90.0], flags=ARC_FLAG_ESTIMATED)
+    store[(2, 0)] = [{"link_id": None, "distance_km": 3.0, "base_time_sec": 1.0,
+                      "summary": True, "detail_provider": "kakao"}]
+    assert store.flagged_arcs(ARC_FLAG_SUMMARY) == [(0, 1), (2, 0)]
+    assert store.flagged_arcs(ARC_FLAG_ESTIMATED) == [(1, 2)]
+    assert store.flagged_arcs(ARC_FLAG_SUMMARY | ARC_FLAG_ESTIMATED) == [(0, 1), (1, 2), (2, 0)]
+    assert store.detail_provider((0, 1)) == "ors" and store[(0, 1)][0]["detail_provider"] == "ors"
+    assert store.has_flag((2, 0), ARC_FLAG_SUMMARY) and not store.has_flag((1, 0), ARC_FLAG_SUMMARY)
+
+    store[(0, 1)] = _segments(2, 1.0)      # 상세로 교체하면 요약 플래그 해제
+    assert store.flagged_arcs(ARC_FLAG_SUMMARY) == [(2, 0)]
+
+
+# --- 노드 기준 펼치기 ---
+def test_expand_maps_nodes_and_zeroes_same_location_arcs():
+    store = SegmentStore.from_dict(3, LEGACY)
+    expanded = store.expand([0, 1, 1, 2])
+    assert expanded.num_locations == 4
+    assert expanded[(0, 2)] == expanded[(0, 1)] == store[(0, 1)]
+    assert expanded[(2, 0)] == store[(1, 0)] and expanded.flagged_arcs(ARC_FLAG_ESTIMATED) == [(1, 0), (2, 0)]
+    assert expanded[(1, 2)] == [] and expanded[(2, 1)] == []          # 같은 위치의 노드 사이
+    assert (3, 3) not in expanded and (0, 0) not in expanded
+    assert (3, 0) not in expanded                                      # 원래 없던 아크
+
+
+def test_expand_is_independent_and_keeps_shared_blocks_on_overwrite():
+    store = SegmentStore.from_dict(3, LEGACY)
+    expanded = store.expand([0, 1, 1, 2])
+    expanded[(0, 2)] = [{"link_id": 7, "distance_km": 5.0, "base_time_sec": 10.0}]
+    assert store[(0, 1)][0]["distance_km"] == 1.0
+    assert expanded[(0, 1)][0]["distance_km"] == 1.0                   # 같은 블록을 쓰던 아크는 그대로
+
+    for k in range(50):
+        expanded[(0, 2)] = _segments(2, 10.0 + k)
+    expanded.shrink_to_fit()
+    assert expanded[(0, 1)] == store[(0, 1)] and expanded[(0, 2)][0]["distance_km"] == 59.0
+    # 공유 블록은 한 번만 남김: (0,1) 2개 + (1,0)=(2,0) 1개 + 새 (0,2) 2개
+    assert len(expanded._segments) == 2 + 1 + 2
+
+
+def test_pickle_drops_spare_capacity():
+    store = SegmentStore.from_dict(3, LEGACY)
+    store._reserve(1000)
+    restored = pickle.loads(pickle.dumps(store))
+    assert len(restored._segments) == store._size
+    assert dict(restored) == dict(store)
+    assert np.array_equal(restored._arc_start, store._arc_start)